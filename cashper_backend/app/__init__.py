@@ -7,7 +7,15 @@ import os
 from pathlib import Path
 import traceback
 from app.database.db import connect_to_mongo, close_mongo_connection
-from app.startup_migration import migrate_inquiry_status
+from app.database.indexes import apply_indexes
+from app.database.repository.home_repository import home_repository
+from app.utils.data_export import data_export_worker, data_export_retention_sweeper
+from app.utils.report_jobs import report_worker, report_cleanup_sweeper
+from app.utils.metrics_rollup import metrics_rollup_scheduler
+from app.utils.policy_lifecycle import policy_lifecycle_sweeper
+from app.utils.emi_reconciliation import emi_reconciler
+from app.utils.calculation_log import calculation_log
+from app.startup_migration import migrate_inquiry_status, backfill_inquiries_index, backfill_loan_status_keys, backfill_business_service_status_keys, migrate_notification_reads, backfill_policy_fields, backfill_search_keys
 from app.routes.auth_routes import router as auth_router
 from app.routes.contact_routes import router as contact_router
 from app.routes.about_routes import router as about_router
@@ -42,6 +50,16 @@ from app.routes.inquiry.corporate_inquiry import router as corporate_inquiry_rou
 from app.utils.file_upload import init_upload_directories
 
 
+def _startup_step(name: str, step):
+    """Run one startup step; a failure is logged without skipping the steps after it"""
+    try:
+        return step()
+    except Exception as e:
+        print(f"[ERROR] Startup step '{name}' failed: {e}")
+        traceback.print_exc()
+        return None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -49,19 +67,49 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("Starting up application...")
-    try:
-        connect_to_mongo()
-        print("[+] Connected to MongoDB successfully!")
-        print("Running inquiry status migration...")
-        migrate_inquiry_status()
-    except Exception as e:
-        print(f"[ERROR] Startup error: {e}")
-        import traceback
-        traceback.print_exc()
+    _startup_step("connect to MongoDB", connect_to_mongo)
+    if _startup_step("apply indexes", apply_indexes):
+        print("[+] Database indexes are up to date")
+
+    # Migrations and backfills: each one is independent of the others
+    print("Running inquiry status migration...")
+    _startup_step("inquiry status migration", migrate_inquiry_status)
+    _startup_step("inquiries index backfill", backfill_inquiries_index)
+    _startup_step("loan status key backfill", backfill_loan_status_keys)
+    _startup_step("business service status key backfill", backfill_business_service_status_keys)
+    _startup_step("notification reads migration", migrate_notification_reads)
+    _startup_step("policy fields backfill", backfill_policy_fields)
+    _startup_step("search keys backfill", backfill_search_keys)
+
+    # In-process services start even when the database or a migration is unavailable
+    _startup_step("blog view flusher", home_repository.blog_views.start)
+    _startup_step("calculation log", calculation_log.start)
+    _startup_step("metrics rollup scheduler", metrics_rollup_scheduler.start)
+    _startup_step("policy lifecycle sweeper", policy_lifecycle_sweeper.start)
+    _startup_step("EMI reconciliation", emi_reconciler.start)
+    _startup_step("data export retention sweeper", data_export_retention_sweeper.start)
+    _startup_step("report cleanup sweeper", report_cleanup_sweeper.start)
+    queued = _startup_step("resume data exports", data_export_worker.resume_queued)
+    if queued:
+        print(f"[+] Resumed {queued} queued data exports")
+    queued = _startup_step("resume report jobs", report_worker.resume_queued)
+    if queued:
+        print(f"[+] Resumed {queued} queued report jobs")
     yield
     # Shutdown - graceful
     print("Shutting down application...")
     try:
+        flushed = home_repository.blog_views.stop()
+        print(f"[+] Flushed pending blog views ({flushed} posts)")
+        written = calculation_log.stop()
+        print(f"[+] Drained calculation log ({written} records)")
+        data_export_worker.shutdown()
+        report_worker.shutdown()
+        metrics_rollup_scheduler.stop()
+        policy_lifecycle_sweeper.stop()
+        emi_reconciler.stop()
+        data_export_retention_sweeper.stop()
+        report_cleanup_sweeper.stop()
         close_mongo_connection()
     except Exception as e:
         print(f"Error during shutdown: {e}")
@@ -215,5 +263,6 @@ def health_check():
     """Health check endpoint for monitoring"""
     return {
         "status": "healthy",
-        "service": "cashper-backend"
+        "service": "cashper-backend",
+        "calculationLog": calculation_log.stats()
     }
\ No newline at end of file
@@ -15,4 +15,80 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
 # Development/Testing Configuration
 # WARNING: Set to False in production!
-DISABLE_AUTH_FOR_TESTING = os.getenv("DISABLE_AUTH_FOR_TESTING", "False").lower() == "true"
\ No newline at end of file
+DISABLE_AUTH_FOR_TESTING = os.getenv("DISABLE_AUTH_FOR_TESTING", "False").lower() == "true"
+# OTP Configuration
+# "mongo" shares OTPs between workers through TTL collections; "memory" keeps them per process
+OTP_STORE_BACKEND = os.getenv("OTP_STORE_BACKEND", "mongo").lower()
+OTP_EXPIRE_MINUTES = int(os.getenv("OTP_EXPIRE_MINUTES", "5"))
+# Maximum OTP sends per email/phone within the rate-limit window
+OTP_SEND_LIMIT = int(os.getenv("OTP_SEND_LIMIT", "5"))
+OTP_SEND_WINDOW_SECONDS = int(os.getenv("OTP_SEND_WINDOW_SECONDS", "900"))
+
+# Authenticated-user cache used by get_current_user (0 disables it)
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "5000"))
+
+# Rendered public responses (home, about, FAQs) kept in process; least recently used evicted first
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+
+# Blog views are buffered in process and written in batches every BLOG_VIEW_FLUSH_SECONDS
+BLOG_VIEW_FLUSH_SECONDS = int(os.getenv("BLOG_VIEW_FLUSH_SECONDS", "10"))
+# Maximum age of the popular-blogs ranking before it is read again
+BLOG_POPULAR_REFRESH_SECONDS = int(os.getenv("BLOG_POPULAR_REFRESH_SECONDS", "60"))
+
+# GDPR data exports: archives are built by a bounded background pool into DATA_EXPORT_DIR
+# (kept outside the public /uploads mount) and can be downloaded for DATA_EXPORT_RETENTION_DAYS
+DATA_EXPORT_WORKERS = int(os.getenv("DATA_EXPORT_WORKERS", "2"))
+DATA_EXPORT_DIR = os.getenv("DATA_EXPORT_DIR", "exports")
+DATA_EXPORT_RETENTION_DAYS = int(os.getenv("DATA_EXPORT_RETENTION_DAYS", "7"))
+# Expired archives are deleted (and their requests marked expired) every DATA_EXPORT_SWEEP_INTERVAL_SECONDS
+DATA_EXPORT_SWEEP_INTERVAL_SECONDS = int(os.getenv("DATA_EXPORT_SWEEP_INTERVAL_SECONDS", "3600"))
+
+# Admin reports: rendered by a background pool into REPORTS_DIR; identical requests
+# on the same day share one job and file
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+REPORTS_DIR = os.getenv("REPORTS_DIR", "uploads/reports")
+# Longest date range a report may cover
+REPORT_MAX_MONTHS = int(os.getenv("REPORT_MAX_MONTHS", "36"))
+# A report still processing after this long is presumed lost and requeued on the next request
+REPORT_JOB_TIMEOUT_SECONDS = int(os.getenv("REPORT_JOB_TIMEOUT_SECONDS", "1800"))
+# Report files older than REPORT_RETENTION_DAYS are deleted every REPORT_CLEANUP_INTERVAL_SECONDS
+# (a job whose file is gone is rendered again when requested)
+REPORT_RETENTION_DAYS = int(os.getenv("REPORT_RETENTION_DAYS", "7"))
+REPORT_CLEANUP_INTERVAL_SECONDS = int(os.getenv("REPORT_CLEANUP_INTERVAL_SECONDS", "3600"))
+
+# Daily analytics rollup: recent days are rebuilt every METRICS_ROLLUP_INTERVAL_SECONDS and
+# missing days within METRICS_ROLLUP_BACKFILL_DAYS are built on startup; the backfill always
+# covers the longest analytics range (REPORT_MAX_MONTHS)
+METRICS_ROLLUP_INTERVAL_SECONDS = int(os.getenv("METRICS_ROLLUP_INTERVAL_SECONDS", "900"))
+METRICS_ROLLUP_BACKFILL_DAYS = max(
+    int(os.getenv("METRICS_ROLLUP_BACKFILL_DAYS", "0")), REPORT_MAX_MONTHS * 31
+)
+
+# Insurance policy lifecycle: every POLICY_SWEEP_INTERVAL_SECONDS, policies ending within
+# POLICY_EXPIRING_WINDOW_DAYS become "Expiring Soon" and those past their end date "Expired"
+POLICY_SWEEP_INTERVAL_SECONDS = int(os.getenv("POLICY_SWEEP_INTERVAL_SECONDS", "3600"))
+POLICY_EXPIRING_WINDOW_DAYS = int(os.getenv("POLICY_EXPIRING_WINDOW_DAYS", "30"))
+
+# EMI payments still "processing" after EMI_RECONCILE_STALE_SECONDS (their request died) are
+# closed every EMI_RECONCILE_INTERVAL_SECONDS: completed if the loan lists them, else failed
+EMI_RECONCILE_INTERVAL_SECONDS = int(os.getenv("EMI_RECONCILE_INTERVAL_SECONDS", "300"))
+EMI_RECONCILE_STALE_SECONDS = int(os.getenv("EMI_RECONCILE_STALE_SECONDS", "300"))
+
+# Admin search: also declare a MongoDB text index over names and match multi-word
+# terms through $text (prefix matching on the normalized search keys is always on)
+SEARCH_TEXT_INDEX = os.getenv("SEARCH_TEXT_INDEX", "False").lower() == "true"
+
+# Calculator engine: grids of up to CALCULATOR_CACHE_MAX_POINTS points are kept in an LRU
+# cache of at most CALCULATOR_CACHE_MAX_BYTES; CALCULATOR_MAX_GRID_POINTS is the largest
+# grid (amounts x rates x tenures) a batch request may evaluate
+CALCULATOR_CACHE_MAX_BYTES = int(os.getenv("CALCULATOR_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+CALCULATOR_CACHE_MAX_POINTS = int(os.getenv("CALCULATOR_CACHE_MAX_POINTS", "100"))
+CALCULATOR_MAX_GRID_POINTS = int(os.getenv("CALCULATOR_MAX_GRID_POINTS", "5000"))
+
+# Calculator records are queued in process and written with insert_many every
+# CALCULATION_LOG_FLUSH_SECONDS or once CALCULATION_LOG_BATCH_SIZE are waiting; beyond
+# CALCULATION_LOG_MAX_PENDING queued records new ones are dropped (and counted)
+CALCULATION_LOG_FLUSH_SECONDS = int(os.getenv("CALCULATION_LOG_FLUSH_SECONDS", "5"))
+CALCULATION_LOG_BATCH_SIZE = int(os.getenv("CALCULATION_LOG_BATCH_SIZE", "200"))
+CALCULATION_LOG_MAX_PENDING = int(os.getenv("CALCULATION_LOG_MAX_PENDING", "10000"))
@@ -1,19 +1,27 @@
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from app.config import mongo_url, mongo_db
 
 # MongoDB client
 client = None
 database = None
 
+# Async MongoDB client (used from async route handlers so they don't block the event loop)
+async_client = None
+async_database = None
+
 
 def connect_to_mongo():
     """Connect to MongoDB - graceful fallback if unavailable"""
-    global client, database
+    global client, database, async_client, async_database
     try:
         client = MongoClient(mongo_url, serverSelectionTimeoutMS=5000, connectTimeoutMS=5000)
         database = client[mongo_db]
         # Test the connection
         client.admin.command('ping')
+        # Async client shares the same server; it connects lazily on first use
+        async_client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=5000, connectTimeoutMS=5000)
+        async_database = async_client[mongo_db]
         print("[+] Connected to MongoDB successfully!")
     except Exception as e:
         print(f"[!] Warning: MongoDB connection failed: {e}")
@@ -21,21 +29,30 @@ def connect_to_mongo():
         # Don't raise - allow server to continue with fallback data
         client = None
         database = None
+        async_client = None
+        async_database = None
 
 
 def close_mongo_connection():
     """Close MongoDB connection"""
-    global client
+    global client, async_client
+    if async_client:
+        async_client.close()
     if client:
         client.close()
         print("MongoDB connection closed")
 
 
 def get_database():
-    """Get database instance"""
+    """Get database instance (synchronous - for scripts and legacy code paths)"""
     return database
 
 
+def get_async_database():
+    """Get async (Motor) database instance - use with `await` inside async handlers"""
+    return async_database
+
+
 def is_mongo_connected():
     """Check if MongoDB is connected"""
     return client is not None and database is not None
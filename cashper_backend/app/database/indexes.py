@@ -0,0 +1,278 @@
+"""
+Declarative index registry.
+
+Every collection the repositories and routes query is listed here together with
+the indexes its hot queries need. `apply_indexes()` runs from the application
+lifespan and creates them idempotently; `get_index_report()` backs the admin
+endpoint that lists missing and unused indexes.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from app.database.db import get_database
+from app.database.repository.business_services_repository import BUSINESS_SERVICE_COLLECTIONS
+from app.database.repository.inquiry_index_repository import INQUIRY_INDEX_COLLECTION
+from app.config import SEARCH_TEXT_INDEX
+from app.utils.loan_status import LOAN_APPLICATION_COLLECTIONS
+from app.utils.search import SEARCH_SPECS
+
+
+def _index(*keys, **options) -> IndexModel:
+    """IndexModel from (field, direction) pairs; a bare field name means ascending"""
+    return IndexModel(
+        [key if isinstance(key, tuple) else (key, ASCENDING) for key in keys],
+        **options
+    )
+
+
+def _user_scoped(user_field: str = "userId", date_field: str = "createdAt") -> List[IndexModel]:
+    """Indexes for collections listed per user, newest first, and filtered by status in admin"""
+    return [
+        _index(user_field, (date_field, DESCENDING)),
+        _index("status", (date_field, DESCENDING)),
+        _index((date_field, DESCENDING)),
+    ]
+
+
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    # ---------- Users & account ----------
+    "users": [
+        _index("email"),
+        _index("phone"),
+        _index("isActive"),
+        _index(("createdAt", DESCENDING)),
+    ],
+    "login_sessions": [_index("userId", ("loginTime", DESCENDING))],
+    "data_download_requests": [
+        _index("userId", "status"),
+        _index("status", "requestedAt"),
+        # Retention sweep: completed exports past their expiry
+        _index("status", "expiresAt"),
+    ],
+    "account_deletion_requests": [_index("userId", "status")],
+    "user_documents": [
+        _index("userId", ("uploadedAt", DESCENDING)),
+        _index("verificationStatus"),
+    ],
+    "dashboard_support": [_index("userId", ("createdAt", DESCENDING))],
+    "notifications": [
+        _index("isActive", "targetUsers", ("createdAt", DESCENDING)),
+        _index("isActive", ("createdAt", DESCENDING)),
+    ],
+
+    # ---------- Loans ----------
+    "personal_loan_applications": _user_scoped(),
+    "home_loan_applications": _user_scoped(),
+    "business_loan_applications": _user_scoped(),
+    "short_term_loan_applications": _user_scoped(date_field="created_at") + [_index("application_id")],
+    "admin_loan_applications": [_index(("appliedDate", DESCENDING))],
+    "personal_loan_get_in_touch": _user_scoped(),
+    "home_loan_get_in_touch": _user_scoped(),
+    "business_loan_get_in_touch": _user_scoped(),
+    "short_term_loan_get_in_touch": _user_scoped(),
+    "active_loans": [_index("user_id", "status", ("created_at", DESCENDING))],
+    "loan_applications": [_index("user_id", ("created_at", DESCENDING))],
+    "emi_payments": [
+        _index("loan_id", "user_id", ("payment_date", DESCENDING)),
+        # Payments left "processing" are closed by the periodic reconciliation
+        _index("status", "created_at"),
+        # Client idempotency keys: a retried payment request finds the first one
+        _index("user_id", "idempotency_key", unique=True,
+               partialFilterExpression={"idempotency_key": {"$type": "string"}}),
+    ],
+
+    # ---------- Insurance ----------
+    "health_insurance_inquiries": _user_scoped(),
+    "motor_insurance_inquiries": _user_scoped(),
+    "term_insurance_inquiries": _user_scoped(),
+    "health_insurance_applications": _user_scoped(),
+    "motor_insurance_applications": _user_scoped(),
+    "term_insurance_applications": _user_scoped(),
+    "insurance_policies": [
+        _index("policyId"),
+        _index("status", ("createdAt", DESCENDING)),
+        _index("type", ("createdAt", DESCENDING)),
+        _index("status", "endDateAt"),
+    ],
+    "insurance_claims": [_index("userId", ("claimDate", DESCENDING))],
+
+    # ---------- Investments ----------
+    "sip_inquiries": _user_scoped(),
+    "mutual_fund_inquiries": _user_scoped(),
+    "sip_applications": _user_scoped(),
+    "mutual_fund_applications": _user_scoped(),
+    "investments": [_index("userEmail", "status")],
+    "investment_transactions": [_index("userEmail", ("createdAt", DESCENDING))],
+
+    # ---------- Services ----------
+    "RetailServiceApplications": [
+        _index("serviceType", ("createdAt", DESCENDING)),
+        _index("status", ("createdAt", DESCENDING)),
+        _index("userId", ("createdAt", DESCENDING)),
+        _index("applicationId"),
+    ],
+    "CorporateServiceInquiries": _user_scoped(),
+
+    # ---------- Public content (about page) ----------
+    "testimonials": [_index("isActive", "order"), _index("rating")],
+    "achievements": [_index("isActive", "order"), _index("year")],
+    "stats": [_index("isActive", "order")],
+    "milestones": [_index("isActive", "order"), _index("year")],
+    "leadership": [_index("isActive", "order")],
+
+    # ---------- Auth (TTL: MongoDB removes documents once expiresAt passes) ----------
+    "otp_codes": [_index("expiresAt", expireAfterSeconds=0)],
+    "otp_send_counters": [_index("expiresAt", expireAfterSeconds=0)],
+
+    # ---------- Admin ----------
+    "stored_files": [_index("path", unique=True)],
+    "report_jobs": [
+        # One live job per report/range/format/day; failed jobs drop their key
+        _index("dedupeKey", unique=True, partialFilterExpression={"dedupeKey": {"$type": "string"}}),
+        _index("filename", ("createdAt", DESCENDING)),
+        _index("status", "createdAt"),
+        _index(("createdAt", DESCENDING)),
+    ],
+    "admin_activity_log": [
+        _index(("timestamp", DESCENDING)),
+        _index("admin_email", "action", ("timestamp", DESCENDING)),
+    ],
+    INQUIRY_INDEX_COLLECTION: [
+        _index("source", "sourceId", unique=True),
+        _index(("createdAt", DESCENDING), ("_id", DESCENDING)),
+        _index("productType", ("createdAt", DESCENDING), ("_id", DESCENDING)),
+        _index("status", ("createdAt", DESCENDING), ("_id", DESCENDING)),
+    ],
+}
+
+# Corporate service applications: admin listing is keyset-paginated on (created_at, _id),
+# optionally filtered on the normalized statusKey; users list their own applications by email
+for _collection in BUSINESS_SERVICE_COLLECTIONS:
+    INDEX_REGISTRY[_collection] = [
+        _index(("created_at", DESCENDING), ("_id", DESCENDING)),
+        _index("statusKey", ("created_at", DESCENDING), ("_id", DESCENDING)),
+        _index("email", ("created_at", DESCENDING)),
+        _index("application_id"),
+    ]
+
+# Normalized loan status used by admin loan management filters and statistics
+for _collection in LOAN_APPLICATION_COLLECTIONS:
+    INDEX_REGISTRY.setdefault(_collection, []).append(_index("statusKey"))
+
+# The daily metrics rollup matches a day on createdAt or created_at; each $or branch needs
+# an index, so loan collections also get the creation field they do not list by
+for _collection in ("personal_loan_applications", "home_loan_applications", "business_loan_applications"):
+    INDEX_REGISTRY[_collection].append(_index(("created_at", DESCENDING)))
+INDEX_REGISTRY["short_term_loan_applications"].append(_index(("createdAt", DESCENDING)))
+INDEX_REGISTRY["users"].append(_index(("created_at", DESCENDING)))
+
+# Admin search: anchored prefix regexes on the normalized search keys (app.utils.search)
+for _collection, _spec in SEARCH_SPECS.items():
+    _search_indexes = [_index("searchKeys.name"), _index("searchKeys.words"),
+                       _index("searchKeys.email"), _index("searchKeys.phone")]
+    if _spec.ref:
+        _search_indexes.append(_index("searchKeys.ref"))
+    if SEARCH_TEXT_INDEX:
+        _search_indexes.append(_index(("searchKeys.name", TEXT), ("searchKeys.words", TEXT), name="searchKeys_text"))
+    INDEX_REGISTRY.setdefault(_collection, []).extend(_search_indexes)
+
+
+def _key_signature(key: Any) -> tuple:
+    """Comparable form of an index key spec (SON/dict/list of pairs)"""
+    items = key.items() if hasattr(key, "items") else key
+    return tuple((field, int(direction) if isinstance(direction, (int, float)) else direction)
+                 for field, direction in items)
+
+
+def apply_indexes(db=None) -> Dict[str, List[str]]:
+    """Create every registered index (idempotent).
+
+    One createIndexes command is sent per collection. A collection whose
+    existing index conflicts with its declaration is reported and skipped
+    rather than aborting startup; without a database nothing is done.
+    """
+    db = db if db is not None else get_database()
+    created: Dict[str, List[str]] = {}
+    if db is None:
+        print("[WARN] Skipping index creation - MongoDB not connected")
+        return created
+    for collection_name, indexes in INDEX_REGISTRY.items():
+        try:
+            created[collection_name] = db[collection_name].create_indexes(indexes)
+        except OperationFailure as e:
+            print(f"[WARN] Could not create indexes on {collection_name}: {e}")
+    return created
+
+
+def _index_usage(collection) -> Dict[str, Dict[str, Any]]:
+    """Per-index access counters from $indexStats (empty if not permitted)"""
+    try:
+        return {
+            row["name"]: {"ops": row.get("accesses", {}).get("ops", 0),
+                          "since": row.get("accesses", {}).get("since")}
+            for row in collection.aggregate([{"$indexStats": {}}])
+        }
+    except Exception:
+        return {}
+
+
+def get_index_report(db=None, collection: Optional[str] = None) -> Dict[str, Any]:
+    """Compare declared indexes with what the server has and how often each is used.
+
+    - missing:    declared but not present on the server
+    - unused:     present but not used since the server last started ($indexStats)
+    - undeclared: present on the server but not in the registry
+    """
+    db = db if db is not None else get_database()
+    names = [collection] if collection else list(INDEX_REGISTRY.keys())
+    existing_collections = set(db.list_collection_names())
+
+    collections = []
+    for collection_name in names:
+        declared = INDEX_REGISTRY.get(collection_name, [])
+        declared_keys = {_key_signature(index.document["key"]): index.document["name"] for index in declared}
+
+        if collection_name not in existing_collections:
+            collections.append({
+                "collection": collection_name,
+                "exists": False,
+                "declared": list(declared_keys.values()),
+                "missing": list(declared_keys.values()),
+                "unused": [],
+                "undeclared": [],
+            })
+            continue
+
+        coll = db[collection_name]
+        existing = {
+            _key_signature(info["key"]): name
+            for name, info in coll.index_information().items()
+        }
+        usage = _index_usage(coll)
+
+        unused = []
+        for name in existing.values():
+            stats = usage.get(name)
+            if name != "_id_" and stats is not None and stats["ops"] == 0:
+                since = stats["since"]
+                unused.append({
+                    "name": name,
+                    "since": since.isoformat() if isinstance(since, datetime) else since,
+                })
+
+        collections.append({
+            "collection": collection_name,
+            "exists": True,
+            "declared": list(declared_keys.values()),
+            "missing": [name for key, name in declared_keys.items() if key not in existing],
+            "unused": unused,
+            "undeclared": [name for key, name in existing.items()
+                           if key not in declared_keys and name != "_id_"],
+        })
+
+    return {
+        "collections": collections,
+        "totalMissing": sum(len(c["missing"]) for c in collections),
+        "totalUnused": sum(len(c["unused"]) for c in collections),
+    }
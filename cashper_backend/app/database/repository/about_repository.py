@@ -9,6 +9,7 @@ from app.database.schema.about_schema import (
 from datetime import datetime
 from bson import ObjectId
 from typing import List, Optional
+from app.utils.response_cache import response_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,82 +22,40 @@ class AboutRepository:
         self.stats_collection_name = "stats"
         self.milestones_collection_name = "milestones"
         self.leadership_collection_name = "leadership"
-        self._indexes_created = False
     
     def get_testimonials_collection(self):
         """Get testimonials collection"""
         db = get_database()
         collection = db[self.testimonials_collection_name]
-        self._ensure_indexes()
         return collection
     
     def get_achievements_collection(self):
         """Get achievements collection"""
         db = get_database()
         collection = db[self.achievements_collection_name]
-        self._ensure_indexes()
         return collection
     
     def get_stats_collection(self):
         """Get stats collection"""
         db = get_database()
         collection = db[self.stats_collection_name]
-        self._ensure_indexes()
         return collection
     
     def get_milestones_collection(self):
         """Get milestones collection"""
         db = get_database()
         collection = db[self.milestones_collection_name]
-        self._ensure_indexes()
         return collection
     
     def get_leadership_collection(self):
         """Get leadership collection"""
         db = get_database()
         collection = db[self.leadership_collection_name]
-        self._ensure_indexes()
         return collection
     
-    def _ensure_indexes(self):
-        """Create indexes if not already created"""
-        if self._indexes_created:
-            return
-        
-        try:
-            db = get_database()
-            
-            # Testimonials indexes
-            testimonials_coll = db[self.testimonials_collection_name]
-            testimonials_coll.create_index("isActive")
-            testimonials_coll.create_index("order")
-            testimonials_coll.create_index("rating")
-            
-            # Achievements indexes
-            achievements_coll = db[self.achievements_collection_name]
-            achievements_coll.create_index("isActive")
-            achievements_coll.create_index("order")
-            achievements_coll.create_index("year")
-            
-            # Stats indexes
-            stats_coll = db[self.stats_collection_name]
-            stats_coll.create_index("isActive")
-            stats_coll.create_index("order")
-            
-            # Milestones indexes
-            milestones_coll = db[self.milestones_collection_name]
-            milestones_coll.create_index("isActive")
-            milestones_coll.create_index("order")
-            milestones_coll.create_index("year")
-            
-            # Leadership indexes
-            leadership_coll = db[self.leadership_collection_name]
-            leadership_coll.create_index("isActive")
-            leadership_coll.create_index("order")
-            
-            self._indexes_created = True
-        except Exception as e:
-            logger.warning(f"Could not create indexes: {e}")
+    def _invalidate_cache(self, section: str):
+        """Drop cached public responses for an about-page section after a write"""
+        response_cache.invalidate(f"about:{section}")
 
     # ===================== TESTIMONIALS =====================
 
@@ -108,6 +67,7 @@ class AboutRepository:
         result = collection.insert_one(testimonial_dict)
         testimonial_dict["_id"] = result.inserted_id
         
+        self._invalidate_cache("testimonials")
         return TestimonialResponse(
             id=str(result.inserted_id),
             **testimonial_dict
@@ -150,6 +110,7 @@ class AboutRepository:
                 {"$set": testimonial_data}
             )
             
+            self._invalidate_cache("testimonials")
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating testimonial: {e}")
@@ -160,6 +121,7 @@ class AboutRepository:
         try:
             collection = self.get_testimonials_collection()
             result = collection.delete_one({"_id": ObjectId(testimonial_id)})
+            self._invalidate_cache("testimonials")
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting testimonial: {e}")
@@ -178,6 +140,7 @@ class AboutRepository:
                     }
                 }
             )
+            self._invalidate_cache("testimonials")
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating testimonial order: {e}")
@@ -193,6 +156,7 @@ class AboutRepository:
         result = collection.insert_one(achievement_dict)
         achievement_dict["_id"] = result.inserted_id
         
+        self._invalidate_cache("achievements")
         return AchievementResponse(
             id=str(result.inserted_id),
             **achievement_dict
@@ -235,6 +199,7 @@ class AboutRepository:
                 {"$set": achievement_data}
             )
             
+            self._invalidate_cache("achievements")
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating achievement: {e}")
@@ -245,6 +210,7 @@ class AboutRepository:
         try:
             collection = self.get_achievements_collection()
             result = collection.delete_one({"_id": ObjectId(achievement_id)})
+            self._invalidate_cache("achievements")
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting achievement: {e}")
@@ -260,6 +226,7 @@ class AboutRepository:
         result = collection.insert_one(stat_dict)
         stat_dict["_id"] = result.inserted_id
         
+        self._invalidate_cache("stats")
         return StatResponse(
             id=str(result.inserted_id),
             **stat_dict
@@ -302,6 +269,7 @@ class AboutRepository:
                 {"$set": stat_data}
             )
             
+            self._invalidate_cache("stats")
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating stat: {e}")
@@ -312,6 +280,7 @@ class AboutRepository:
         try:
             collection = self.get_stats_collection()
             result = collection.delete_one({"_id": ObjectId(stat_id)})
+            self._invalidate_cache("stats")
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting stat: {e}")
@@ -327,6 +296,7 @@ class AboutRepository:
         result = collection.insert_one(milestone_dict)
         milestone_dict["_id"] = result.inserted_id
         
+        self._invalidate_cache("milestones")
         return MilestoneResponse(
             id=str(result.inserted_id),
             **milestone_dict
@@ -369,6 +339,7 @@ class AboutRepository:
                 {"$set": milestone_data}
             )
             
+            self._invalidate_cache("milestones")
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating milestone: {e}")
@@ -379,6 +350,7 @@ class AboutRepository:
         try:
             collection = self.get_milestones_collection()
             result = collection.delete_one({"_id": ObjectId(milestone_id)})
+            self._invalidate_cache("milestones")
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting milestone: {e}")
@@ -394,6 +366,7 @@ class AboutRepository:
         result = collection.insert_one(leadership_dict)
         leadership_dict["_id"] = result.inserted_id
         
+        self._invalidate_cache("leadership")
         return LeadershipResponse(
             id=str(result.inserted_id),
             **leadership_dict
@@ -436,6 +409,7 @@ class AboutRepository:
                 {"$set": leadership_data}
             )
             
+            self._invalidate_cache("leadership")
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating leadership: {e}")
@@ -446,6 +420,7 @@ class AboutRepository:
         try:
             collection = self.get_leadership_collection()
             result = collection.delete_one({"_id": ObjectId(leadership_id)})
+            self._invalidate_cache("leadership")
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting leadership: {e}")
@@ -0,0 +1,229 @@
+import asyncio
+from typing import Dict, List, Any
+from datetime import datetime, timedelta
+from app.database.db import get_async_database
+
+
+# Loan collections whose approved applications make up the "Active Loans" card
+LOAN_COLLECTIONS = [
+    "personal_loan_applications",
+    "home_loan_applications",
+    "business_loan_applications",
+]
+
+# Insurance collections counted on the "Insurance Policies" card
+INSURANCE_COLLECTIONS = [
+    "health_insurance_inquiries",
+    "motor_insurance_inquiries",
+    "term_insurance_inquiries",
+    "insurance_policies",
+]
+
+# Non-insurance inquiry collections counted on the "Total Inquiries" card
+INQUIRY_COLLECTIONS = [
+    "short_term_loan_get_in_touch",
+    "personal_loan_get_in_touch",
+    "business_loan_get_in_touch",
+    "home_loan_get_in_touch",
+    "sip_inquiries",
+    "mutual_fund_inquiries",
+    "consultations",
+    "contact_submissions",
+    "RetailServiceApplications",
+]
+
+# Insurance and investment collections counted per user on the user management page
+USER_INSURANCE_COLLECTIONS = [
+    "health_insurance_inquiries",
+    "motor_insurance_inquiries",
+    "term_insurance_inquiries",
+]
+
+USER_INVESTMENT_COLLECTIONS = ["sip_applications"]
+
+ACTIVE_LOAN_STATUSES = ["approved", "disbursed"]
+
+
+def _growth(this_month: int, last_month: int) -> str:
+    """Format month-over-month growth the way the dashboard cards expect it"""
+    if last_month <= 0:
+        return "+0%"
+    growth_percent = ((this_month - last_month) / last_month) * 100
+    return f"{'+' if growth_percent >= 0 else ''}{growth_percent:.1f}%"
+
+
+def _count(match: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """$facet branch that counts documents matching `match`"""
+    return [{"$match": match}, {"$count": "value"}]
+
+
+def _sum(match: Dict[str, Any], field: str) -> List[Dict[str, Any]]:
+    """$facet branch that sums a (possibly string-typed) numeric field"""
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": None,
+            "value": {"$sum": {"$convert": {"input": f"${field}", "to": "double", "onError": 0, "onNull": 0}}}
+        }}
+    ]
+
+
+class AdminDashboardRepository:
+    """Computes the admin dashboard cards with one $facet aggregation per collection"""
+
+    def __init__(self):
+        self.db = None
+
+    def get_db(self):
+        """Lazy initialization for the async database"""
+        if self.db is None:
+            self.db = get_async_database()
+        return self.db
+
+    async def _facet(self, collection_name: str, facets: Dict[str, List[Dict[str, Any]]]) -> Dict[str, float]:
+        """Run a single $facet aggregation and flatten each branch to a number.
+
+        Missing collections simply aggregate over no documents, so there is no
+        need to call list_collection_names() before querying.
+        """
+        pipeline = [{"$facet": facets}]
+        results = await self.get_db()[collection_name].aggregate(pipeline).to_list(length=1)
+        row = results[0] if results else {}
+        return {
+            name: (row.get(name) or [{"value": 0}])[0].get("value", 0)
+            for name in facets
+        }
+
+    async def get_dashboard_stats(self) -> Dict[str, Any]:
+        """Get every dashboard card; per-collection aggregations run concurrently.
+
+        A collection whose aggregation fails is reported as 0 on its cards.
+        """
+        today = datetime.utcnow()
+        first_day_this_month = today.replace(day=1)
+        first_day_last_month = (first_day_this_month - timedelta(days=1)).replace(day=1)
+
+        this_month = {"$gte": first_day_this_month}
+        last_month = {"$gte": first_day_last_month, "$lt": first_day_this_month}
+        created_facets = {
+            "total": _count({}),
+            "this_month": _count({"createdAt": this_month}),
+            "last_month": _count({"createdAt": last_month}),
+        }
+        loan_facets = {
+            "approved_amount": _sum({"status": "approved"}, "loanAmount"),
+            "approved_this_month": _count({"status": "approved", "updatedAt": this_month}),
+            "approved_last_month": _count({"status": "approved", "updatedAt": last_month}),
+            "active": _count({"status": {"$in": ACTIVE_LOAN_STATUSES}}),
+        }
+        short_term_facets = {
+            "approved_amount": _sum({"status": "approved"}, "loanAmount"),
+            "active": _count({"status": {"$in": ACTIVE_LOAN_STATUSES}}),
+        }
+
+        jobs = {"users": self._facet("users", created_facets)}
+        for name in LOAN_COLLECTIONS:
+            jobs[name] = self._facet(name, loan_facets)
+        jobs["short_term_loans"] = self._facet("short_term_loans", short_term_facets)
+        jobs["admin_loan_applications"] = self._facet(
+            "admin_loan_applications",
+            {"active": _count({"status": {"$in": ACTIVE_LOAN_STATUSES}})}
+        )
+        for name in INSURANCE_COLLECTIONS + INQUIRY_COLLECTIONS:
+            jobs[name] = self._facet(name, created_facets)
+
+        values = await asyncio.gather(*jobs.values(), return_exceptions=True)
+        results: Dict[str, Dict[str, float]] = {}
+        for name, value in zip(jobs.keys(), values):
+            if isinstance(value, Exception):
+                # A failing collection counts as empty instead of failing every card
+                print(f"Warning: Error accessing collection {name}: {value}")
+                value = {}
+            results[name] = value
+
+        def total(names: List[str], key: str) -> float:
+            return sum(results[name].get(key, 0) for name in names)
+
+        users = results["users"]
+        loan_sources = LOAN_COLLECTIONS + ["short_term_loans"]
+        active_loan_amount = total(loan_sources, "approved_amount")
+        active_loans_count = int(total(loan_sources + ["admin_loan_applications"], "active"))
+        loans_this_month = int(total(LOAN_COLLECTIONS, "approved_this_month"))
+        loans_last_month = int(total(LOAN_COLLECTIONS, "approved_last_month"))
+
+        insurance_total = int(total(INSURANCE_COLLECTIONS, "total"))
+        insurance_this_month = int(total(INSURANCE_COLLECTIONS, "this_month"))
+        insurance_last_month = int(total(INSURANCE_COLLECTIONS, "last_month"))
+
+        # Insurance inquiries are part of the inquiry total as well (policies are not)
+        insurance_inquiries = [name for name in INSURANCE_COLLECTIONS if name != "insurance_policies"]
+        inquiries_total = int(total(INQUIRY_COLLECTIONS + insurance_inquiries, "total"))
+        inquiries_this_month = int(total(INQUIRY_COLLECTIONS, "this_month")) + insurance_this_month
+        inquiries_last_month = int(total(INQUIRY_COLLECTIONS, "last_month")) + insurance_last_month
+
+        return {
+            "total_users": int(users.get("total", 0)),
+            "user_growth": _growth(users.get("this_month", 0), users.get("last_month", 0)),
+            "active_loans_count": active_loans_count,
+            "active_loan_amount": round(active_loan_amount, 2),
+            "loan_growth": _growth(loans_this_month, loans_last_month),
+            "insurance_policies": insurance_total,
+            "insurance_growth": _growth(insurance_this_month, insurance_last_month),
+            "total_inquiries": inquiries_total,
+            "inquiries_growth": _growth(inquiries_this_month, inquiries_last_month),
+        }
+
+    async def _group_by_user(self, collection_name: str, user_ids: List[Any], active: bool = False) -> List[Dict[str, Any]]:
+        """Count documents per userId for a page of users in a single aggregation"""
+        group: Dict[str, Any] = {"_id": "$userId", "total": {"$sum": 1}}
+        if active:
+            group["active"] = {"$sum": {"$cond": [{"$in": ["$status", ACTIVE_LOAN_STATUSES]}, 1, 0]}}
+        pipeline = [
+            {"$match": {"userId": {"$in": user_ids}}},
+            {"$group": group}
+        ]
+        return await self.get_db()[collection_name].aggregate(pipeline).to_list(length=None)
+
+    async def get_user_service_counts(self, user_ids: List[Any]) -> Dict[Any, Dict[str, int]]:
+        """Get loan/insurance/investment counts for a page of users.
+
+        Costs one grouped aggregation per collection regardless of page size,
+        instead of one count per user per collection.
+        """
+        counts = {
+            user_id: {"totalLoans": 0, "activeLoans": 0, "totalInsurance": 0, "totalInvestments": 0}
+            for user_id in user_ids
+        }
+        if not user_ids:
+            return counts
+
+        sources = (
+            [(name, "loans") for name in LOAN_COLLECTIONS] +
+            [(name, "insurance") for name in USER_INSURANCE_COLLECTIONS] +
+            [(name, "investments") for name in USER_INVESTMENT_COLLECTIONS]
+        )
+        results = await asyncio.gather(*[
+            self._group_by_user(name, user_ids, active=(kind == "loans"))
+            for name, kind in sources
+        ], return_exceptions=True)
+
+        for (name, kind), rows in zip(sources, results):
+            if isinstance(rows, Exception):
+                print(f"Warning: Error accessing collection {name}: {rows}")
+                continue
+            for row in rows:
+                user_counts = counts.get(row["_id"])
+                if user_counts is None:
+                    continue
+                if kind == "loans":
+                    user_counts["totalLoans"] += row["total"]
+                    user_counts["activeLoans"] += row.get("active", 0)
+                elif kind == "insurance":
+                    user_counts["totalInsurance"] += row["total"]
+                else:
+                    user_counts["totalInvestments"] += row["total"]
+        return counts
+
+
+# Create singleton instance
+admin_dashboard_repository = AdminDashboardRepository()
@@ -0,0 +1,176 @@
+import re
+from bson import ObjectId
+from typing import List, Optional, Dict, Any, Tuple
+from app.database.db import get_database
+
+
+# Source collection -> (investment type, default status, fund name field)
+INVESTMENT_SOURCES = {
+    "investments": (None, "active", "name"),
+    "sip_applications": ("SIP", "Pending", "fundName"),
+    "mutual_fund_applications": ("Mutual Funds", "Pending", "fundName"),
+}
+
+# investments documents carry their own type; missing means "Mutual Funds"
+DEFAULT_INVESTMENT_TYPE = "Mutual Funds"
+
+
+def _sort_date_expr(collection_name: str) -> Dict[str, Any]:
+    """Newest first: applications carry createdAt, investments a "YYYY-MM-DD" startDate"""
+    if collection_name == "investments":
+        return {"$ifNull": ["$createdAt", {"$dateFromString": {
+            "dateString": "$startDate", "onError": None, "onNull": None
+        }}]}
+    return "$createdAt"
+
+
+class AdminInvestmentRepository:
+    """Admin investments listing across investments, SIP and mutual fund applications"""
+
+    def __init__(self):
+        self.users_collection_name = "users"
+
+    def _matching_users(self, db, pattern: Dict[str, Any]) -> Tuple[List[Any], List[str]]:
+        """Ids (ObjectId and str forms) and emails of users whose name or email matches the search"""
+        users = list(db[self.users_collection_name].find(
+            {"$or": [{"fullName": pattern}, {"email": pattern}]},
+            {"_id": 1, "email": 1}
+        ))
+        user_ids = [u["_id"] for u in users] + [str(u["_id"]) for u in users]
+        emails = [u["email"] for u in users if u.get("email")]
+        return user_ids, emails
+
+    def _build_query(
+        self,
+        collection_name: str,
+        status_filter: Optional[str],
+        type_filter: Optional[str],
+        search_terms: Optional[Tuple[Dict[str, Any], List[Any], List[str]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Query for one source, or None when the type filter excludes it entirely"""
+        source_type, default_status, fund_field = INVESTMENT_SOURCES[collection_name]
+        conditions: List[Dict[str, Any]] = []
+
+        if type_filter and type_filter != "all":
+            if source_type is not None:
+                if source_type != type_filter:
+                    return None
+            elif type_filter == DEFAULT_INVESTMENT_TYPE:
+                conditions.append({"type": {"$in": [type_filter, None]}})
+            else:
+                conditions.append({"type": type_filter})
+
+        if status_filter and status_filter != "all":
+            status_match: Dict[str, Any] = {"status": {"$regex": f"^{re.escape(status_filter)}$", "$options": "i"}}
+            if status_filter.lower() == default_status.lower():
+                status_match = {"$or": [status_match, {"status": None}]}
+            conditions.append(status_match)
+
+        if search_terms:
+            pattern, user_ids, emails = search_terms
+            if collection_name == "investments":
+                search_match = [{fund_field: pattern}, {"userEmail": pattern}]
+                if emails:
+                    search_match.append({"userEmail": {"$in": emails}})
+            else:
+                search_match = [{fund_field: pattern}]
+                if user_ids:
+                    search_match.append({"userId": {"$in": user_ids}})
+            conditions.append({"$or": search_match})
+
+        if not conditions:
+            return {}
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+    def list_investments(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        status_filter: Optional[str] = None,
+        type_filter: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One page of investments, newest first, filtered and paginated in MongoDB.
+
+        The sources are merged with $unionWith; each branch is sorted and cut to
+        skip+limit first so the merge never handles more than a page per source.
+        Search matches user names/emails through one users query up front, and
+        users for the returned page are fetched in one batched $in query.
+        """
+        db = get_database()
+
+        search_terms = None
+        if search:
+            pattern = {"$regex": re.escape(search), "$options": "i"}
+            user_ids, emails = self._matching_users(db, pattern)
+            search_terms = (pattern, user_ids, emails)
+
+        queries = {}
+        for collection_name in INVESTMENT_SOURCES:
+            query = self._build_query(collection_name, status_filter, type_filter, search_terms)
+            if query is not None:
+                queries[collection_name] = query
+
+        if not queries:
+            return {"investments": [], "total": 0}
+
+        total = sum(db[name].count_documents(query) for name, query in queries.items())
+        skip = (page - 1) * limit
+        if total <= skip:
+            return {"investments": [], "total": total}
+
+        def branch(collection_name: str) -> List[Dict[str, Any]]:
+            return [
+                {"$match": queries[collection_name]},
+                {"$addFields": {"_source": collection_name, "_sortDate": _sort_date_expr(collection_name)}},
+                {"$sort": {"_sortDate": -1, "_id": -1}},
+                {"$limit": skip + limit},
+            ]
+
+        names = list(queries.keys())
+        pipeline = branch(names[0])
+        for collection_name in names[1:]:
+            pipeline.append({"$unionWith": {"coll": collection_name, "pipeline": branch(collection_name)}})
+        pipeline += [
+            {"$sort": {"_sortDate": -1, "_id": -1}},
+            {"$skip": skip},
+            {"$limit": limit},
+        ]
+        rows = list(db[names[0]].aggregate(pipeline))
+
+        self._attach_users(db, rows)
+        return {"investments": rows, "total": total}
+
+    def _attach_users(self, db, rows: List[Dict[str, Any]]) -> None:
+        """Set row["_user"] for every row with one users query"""
+        object_ids, emails = set(), set()
+        for row in rows:
+            if row["_source"] == "investments":
+                if row.get("userEmail"):
+                    emails.add(row["userEmail"])
+            elif row.get("userId"):
+                try:
+                    object_ids.add(ObjectId(str(row["userId"])))
+                except Exception:
+                    pass
+
+        clauses = []
+        if object_ids:
+            clauses.append({"_id": {"$in": list(object_ids)}})
+        if emails:
+            clauses.append({"email": {"$in": list(emails)}})
+        users = list(db[self.users_collection_name].find(
+            {"$or": clauses}, {"fullName": 1, "email": 1, "phone": 1}
+        )) if clauses else []
+
+        by_id = {str(u["_id"]): u for u in users}
+        by_email = {u.get("email"): u for u in users if u.get("email")}
+        for row in rows:
+            if row["_source"] == "investments":
+                row["_user"] = by_email.get(row.get("userEmail"))
+            else:
+                row["_user"] = by_id.get(str(row.get("userId")))
+
+
+# Create singleton instance
+admin_investment_repository = AdminInvestmentRepository()
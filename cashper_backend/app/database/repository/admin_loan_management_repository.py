@@ -1,13 +1,71 @@
+import re
 from bson import ObjectId
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from datetime import datetime
 from app.database.db import get_database
+from app.utils.csv_export import merged_cursor
+from app.utils.search import LOAN_SEARCH, refresh_search_keys, search_query, touches_search_fields, with_search_keys
 from app.database.schema.admin_loan_management_schema import (
     AdminLoanApplicationInDB,
     AdminLoanApplication,
     LoanStatistics,
     LoanStatus
 )
+from app.utils.loan_status import (
+    LOAN_APPLICATION_COLLECTIONS,
+    LOAN_STATUS_KEYS,
+    normalize_loan_status
+)
+
+
+ADMIN_COLLECTION = "admin_loan_applications"
+
+# Dedicated loan collections and the type counter they feed
+COLLECTION_TYPE_KEYS = {
+    "short_term_loan_applications": "short_term",
+    "personal_loan_applications": "personal",
+    "business_loan_applications": "business",
+    "home_loan_applications": "home",
+}
+
+# Substring of admin_loan_applications.type -> type counter
+LOAN_TYPE_KEYS = {
+    "home": "home",
+    "personal": "personal",
+    "business": "business",
+    "short": "short_term",
+}
+
+# Newest first: admin entries carry appliedDate, the product collections createdAt/created_at
+_SORT_DATE_EXPR = {"$ifNull": ["$appliedDate", {"$ifNull": ["$createdAt", "$created_at"]}]}
+
+
+def _to_number(expr: Any) -> Dict[str, Any]:
+    """Aggregation expression turning numbers or strings like "₹5,00,000" into a double"""
+    cleaned = {"$replaceAll": {
+        "input": {"$replaceAll": {"input": expr, "find": "₹", "replacement": ""}},
+        "find": ",",
+        "replacement": ""
+    }}
+    return {"$convert": {
+        "input": {"$cond": [{"$eq": [{"$type": expr}, "string"]}, cleaned, expr]},
+        "to": "double",
+        "onError": 0,
+        "onNull": 0
+    }}
+
+
+LOAN_AMOUNT_EXPR = _to_number({"$ifNull": ["$amount", "$loanAmount"]})
+_CIBIL_EXPR = _to_number({"$ifNull": ["$cibilScore", "$creditScore"]})
+
+# Fields read by _loan_to_response for a CSV row (documents are not exported)
+EXPORT_PROJECTION = {
+    field: 1 for field in (
+        "customer", "fullName", "type", "purpose", "amount", "loanAmount", "income", "monthlyIncome",
+        "appliedDate", "createdAt", "email", "phone", "status", "tenure", "interestRate",
+        "cibilScore", "creditScore", "rejectionReason"
+    )
+}
 
 
 class AdminLoanManagementRepository:
@@ -25,7 +83,28 @@ class AdminLoanManagementRepository:
     def get_collection(self):
         """Get admin loan applications collection"""
         db = self.get_database()
-        return db["admin_loan_applications"]
+        return db[ADMIN_COLLECTION]
+
+    def backfill_status_keys(self) -> int:
+        """Set `statusKey` on applications written before it existed.
+
+        Issues one update per distinct stored status instead of touching
+        documents one by one.
+        """
+        db = self.get_database()
+        updated = 0
+        for col_name in LOAN_APPLICATION_COLLECTIONS:
+            collection = db[col_name]
+            missing = {"statusKey": {"$exists": False}}
+            for stored_status in collection.distinct("status", missing):
+                result = collection.update_many(
+                    {**missing, "status": stored_status},
+                    {"$set": {"statusKey": normalize_loan_status(stored_status)}}
+                )
+                updated += result.modified_count
+            # Documents without any status keep an explicit null key so they are not rescanned
+            updated += collection.update_many(missing, {"$set": {"statusKey": None}}).modified_count
+        return updated
 
     # ===================== HELPER METHODS =====================
 
@@ -146,81 +225,58 @@ class AdminLoanManagementRepository:
     # ===================== STATISTICS =====================
 
     def get_statistics(self) -> LoanStatistics:
-        """Get loan application statistics from all loan collections"""
+        """Get loan application statistics from all loan collections.
+
+        One $facet aggregation per collection: status counts are grouped on the
+        normalized `statusKey`, and amounts/CIBIL scores are summed server-side.
+        """
         try:
             db = self.get_database()
             
-            # Collections to count from with their type mapping
-            collections_to_query = [
-                ('admin_loan_applications', None),  # Can have any type
-                ('short_term_loan_applications', 'short-term'),
-                ('personal_loan_applications', 'personal'),
-                ('business_loan_applications', 'business'),
-                ('home_loan_applications', 'home')
-            ]
-            
-            # Initialize counters
+            status_counts = {key: 0 for key in LOAN_STATUS_KEYS}
+            type_counts = {key: 0 for key in LOAN_TYPE_KEYS.values()}
             total_apps = 0
-            pending = 0
-            under_review = 0
-            approved = 0
-            rejected = 0
-            disbursed = 0
-            home_loan_count = 0
-            personal_loan_count = 0
-            business_loan_count = 0
-            short_term_loan_count = 0
             total_amount = 0
             total_cibil = 0
             cibil_count = 0
             
-            # Count from all collections
-            for col_name, col_type in collections_to_query:
+            for col_name in LOAN_APPLICATION_COLLECTIONS:
                 try:
-                    collection = db[col_name]
+                    facets = {
+                        "status": [{"$group": {"_id": "$statusKey", "count": {"$sum": 1}}}],
+                        "totals": [{"$group": {
+                            "_id": None,
+                            "count": {"$sum": 1},
+                            "amount": {"$sum": LOAN_AMOUNT_EXPR},
+                            "cibilSum": {"$sum": {"$cond": [{"$gt": [_CIBIL_EXPR, 0]}, _CIBIL_EXPR, 0]}},
+                            "cibilCount": {"$sum": {"$cond": [{"$gt": [_CIBIL_EXPR, 0]}, 1, 0]}}
+                        }}]
+                    }
+                    if col_name == ADMIN_COLLECTION:
+                        # admin_loan_applications can hold any loan type
+                        facets["types"] = [{"$group": {"_id": {"$toLower": {"$ifNull": ["$type", ""]}}, "count": {"$sum": 1}}}]
                     
-                    # Count total
-                    total_apps += collection.count_documents({})
+                    results = list(db[col_name].aggregate([{"$facet": facets}]))
+                    row = results[0] if results else {}
                     
-                    # Count by status
-                    pending += collection.count_documents({"status": {"$regex": "pending", "$options": "i"}})
-                    under_review += collection.count_documents({"status": {"$regex": "under review|review", "$options": "i"}})
-                    approved += collection.count_documents({"status": {"$regex": "approved", "$options": "i"}})
-                    rejected += collection.count_documents({"status": {"$regex": "rejected", "$options": "i"}})
-                    disbursed += collection.count_documents({"status": {"$regex": "disbursed", "$options": "i"}})
+                    for bucket in row.get("status", []):
+                        if bucket["_id"] in status_counts:
+                            status_counts[bucket["_id"]] += bucket["count"]
                     
-                    # Count by loan type
-                    # For dedicated loan collections, increment the appropriate counter
-                    if col_type == 'short-term':
-                        short_term_loan_count += collection.count_documents({})
-                    elif col_type == 'personal':
-                        personal_loan_count += collection.count_documents({})
-                    elif col_type == 'business':
-                        business_loan_count += collection.count_documents({})
-                    elif col_type == 'home':
-                        home_loan_count += collection.count_documents({})
-                    else:
-                        # For admin_loan_applications, count by type field
-                        home_loan_count += collection.count_documents({"type": {"$regex": "home", "$options": "i"}})
-                        personal_loan_count += collection.count_documents({"type": {"$regex": "personal", "$options": "i"}})
-                        business_loan_count += collection.count_documents({"type": {"$regex": "business", "$options": "i"}})
-                        short_term_loan_count += collection.count_documents({"type": {"$regex": "short", "$options": "i"}})
+                    totals = (row.get("totals") or [{}])[0]
+                    count = totals.get("count", 0)
+                    total_apps += count
+                    total_amount += int(totals.get("amount", 0))
+                    total_cibil += int(totals.get("cibilSum", 0))
+                    cibil_count += totals.get("cibilCount", 0)
                     
-                    # Calculate amounts and averages
-                    for doc in collection.find({}):
-                        amount = doc.get("amount") or doc.get("loanAmount") or 0
-                        if isinstance(amount, str):
-                            try:
-                                amount = int(float(amount.replace("₹", "").replace(",", "")))
-                            except:
-                                amount = 0
-                        total_amount += int(amount) if amount else 0
-                        
-                        # Get CIBIL/credit score
-                        cibil = doc.get("cibilScore") or doc.get("creditScore") or 0
-                        if cibil and cibil > 0:
-                            total_cibil += int(cibil)
-                            cibil_count += 1
+                    if col_name == ADMIN_COLLECTION:
+                        for bucket in row.get("types", []):
+                            for needle, key in LOAN_TYPE_KEYS.items():
+                                if needle in bucket["_id"]:
+                                    type_counts[key] += bucket["count"]
+                    else:
+                        type_counts[COLLECTION_TYPE_KEYS[col_name]] += count
                 
                 except Exception as e:
                     print(f"Error counting from {col_name}: {str(e)}")
@@ -234,18 +290,18 @@ class AdminLoanManagementRepository:
             
             return LoanStatistics(
                 totalApplications=total_apps,
-                pendingApplications=pending,
-                underReviewApplications=under_review,
-                approvedApplications=approved,
-                rejectedApplications=rejected,
-                disbursedApplications=disbursed,
+                pendingApplications=status_counts["pending"],
+                underReviewApplications=status_counts["under_review"],
+                approvedApplications=status_counts["approved"],
+                rejectedApplications=status_counts["rejected"],
+                disbursedApplications=status_counts["disbursed"],
                 totalLoanAmount=self._format_currency(total_amount),
                 averageLoanAmount=self._format_currency(avg_amount),
                 averageCibilScore=avg_cibil,
-                homeLoanCount=home_loan_count,
-                personalLoanCount=personal_loan_count,
-                businessLoanCount=business_loan_count,
-                shortTermLoanCount=short_term_loan_count
+                homeLoanCount=type_counts["home"],
+                personalLoanCount=type_counts["personal"],
+                businessLoanCount=type_counts["business"],
+                shortTermLoanCount=type_counts["short_term"]
             )
             
         except Exception as e:
@@ -258,7 +314,8 @@ class AdminLoanManagementRepository:
         """Create new loan application"""
         try:
             collection = self.get_collection()
-            application_dict = application.dict()
+            application_dict = with_search_keys(application.dict(), LOAN_SEARCH)
+            application_dict["statusKey"] = normalize_loan_status(application_dict.get("status"))
             result = collection.insert_one(application_dict)
             return str(result.inserted_id)
             
@@ -266,6 +323,50 @@ class AdminLoanManagementRepository:
             print(f"Error creating application: {str(e)}")
             raise
 
+    def _collection_queries(
+        self,
+        status: Optional[str] = None,
+        loan_type: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+        """(collection, inferred loan type, query) for every collection matching the filters"""
+        # Collections to fetch from with their loan type names
+        collections_to_query = [
+            (ADMIN_COLLECTION, None),  # Can have any type
+            ('short_term_loan_applications', 'Short-term Loan'),
+            ('personal_loan_applications', 'Personal Loan'),
+            ('business_loan_applications', 'Business Loan'),
+            ('home_loan_applications', 'Home Loan')
+        ]
+        
+        base_query: Dict[str, Any] = {}
+        
+        # Status filter uses the normalized key written alongside `status`
+        if status and status.lower() != "all":
+            base_query["statusKey"] = normalize_loan_status(status)
+        
+        # Search name, email, phone, application ID and purpose (indexed prefix match)
+        base_query.update(search_query(search, LOAN_SEARCH))
+        
+        # Determine which collections to query based on loan_type filter
+        collections_to_fetch = collections_to_query
+        type_filter = loan_type.lower() if loan_type and loan_type.lower() != "all" else None
+        if type_filter:
+            filtered_collections = [
+                (col_name, col_type) for col_name, col_type in collections_to_query
+                # admin_loan_applications can have any type, so include it
+                if not col_type or col_type.lower().startswith(type_filter) or type_filter in col_type.lower()
+            ]
+            collections_to_fetch = filtered_collections or collections_to_query
+        
+        queries = []
+        for col_name, col_type in collections_to_fetch:
+            query = dict(base_query)
+            if col_name == ADMIN_COLLECTION and type_filter:
+                query["type"] = {"$regex": re.escape(loan_type), "$options": "i"}
+            queries.append((col_name, col_type, query))
+        return queries
+
     def get_all_applications(
         self,
         status: Optional[str] = None,
@@ -274,93 +375,46 @@ class AdminLoanManagementRepository:
         skip: int = 0,
         limit: int = 100
     ) -> tuple[List[AdminLoanApplication], int]:
-        """Get all loan applications from both admin and individual collections"""
+        """Get all loan applications from both admin and individual collections.
+
+        The page is assembled server-side: every collection is unioned into one
+        aggregation that sorts, skips and limits, and each branch only returns its
+        own top `skip + limit` rows. Totals come from per-collection counts.
+        """
         try:
             db = self.get_database()
-            all_loans = []
-            
-            # Collections to fetch from with their loan type names
-            collections_to_query = [
-                ('admin_loan_applications', None),  # Can have any type
-                ('short_term_loan_applications', 'Short-term Loan'),
-                ('personal_loan_applications', 'Personal Loan'),
-                ('business_loan_applications', 'Business Loan'),
-                ('home_loan_applications', 'Home Loan')
-            ]
-            
-            # Build status filter (if provided)
-            status_query = {}
-            if status and status.lower() != "all":
-                # Use regex pattern for case-insensitive status matching
-                status_query["status"] = {"$regex": status, "$options": "i"}
-            
-            # Build search filter (if provided)
-            search_query = {}
-            if search:
-                search_query["$or"] = [
-                    {"customer": {"$regex": search, "$options": "i"}},
-                    {"fullName": {"$regex": search, "$options": "i"}},
-                    {"email": {"$regex": search, "$options": "i"}},
-                    {"phone": {"$regex": search, "$options": "i"}},
-                    {"purpose": {"$regex": search, "$options": "i"}}
-                ]
             
-            # Determine which collections to query based on loan_type filter
-            collections_to_fetch = collections_to_query
-            if loan_type and loan_type.lower() != "all":
-                # Filter collections based on loan type
-                filtered_collections = []
-                for col_name, col_type in collections_to_query:
-                    if col_type and (col_type.lower().startswith(loan_type.lower()) or loan_type.lower() in col_type.lower()):
-                        filtered_collections.append((col_name, col_type))
-                    elif not col_type:  # admin_loan_applications can have any type, so include it
-                        filtered_collections.append((col_name, col_type))
+            window = skip + limit
+            branches = []
+            total = 0
+            for col_name, col_type, query in self._collection_queries(status, loan_type, search):
+                total += db[col_name].count_documents(query)
                 
-                collections_to_fetch = filtered_collections if filtered_collections else collections_to_query
-            
-            # Fetch from relevant collections
-            for col_name, col_type in collections_to_fetch:
-                try:
-                    collection = db[col_name]
-                    
-                    # Build combined query for this collection
-                    combined_query = {}
-                    combined_query.update(status_query)
-                    combined_query.update(search_query)
-                    
-                    # For admin_loan_applications, also filter by type if specified
-                    if col_name == 'admin_loan_applications' and loan_type and loan_type.lower() != "all":
-                        combined_query["type"] = {"$regex": loan_type, "$options": "i"}
-                    
-                    # Try to find and sort by appliedDate, fall back to createdAt
-                    try:
-                        loans = list(collection.find(combined_query).sort("appliedDate", -1))
-                    except:
-                        # If appliedDate doesn't exist as index, use createdAt or _id
-                        try:
-                            loans = list(collection.find(combined_query).sort("createdAt", -1))
-                        except:
-                            loans = list(collection.find(combined_query).sort("_id", -1))
-                    
-                    # Add collection name and type to each loan for proper processing
-                    for loan in loans:
-                        loan["_collection_name"] = col_name
-                        if col_type:
-                            loan["_inferred_type"] = col_type
-                    
-                    all_loans.extend(loans)
-                except Exception as e:
-                    print(f"Error querying {col_name}: {str(e)}")
-                    continue
+                added_fields: Dict[str, Any] = {"_collection_name": col_name, "_sortDate": _SORT_DATE_EXPR}
+                if col_type:
+                    added_fields["_inferred_type"] = col_type
+                branches.append((col_name, [
+                    {"$match": query},
+                    {"$addFields": added_fields},
+                    {"$sort": {"_sortDate": -1, "_id": -1}},
+                    {"$limit": window}
+                ]))
             
-            # Sort all loans by date
-            all_loans.sort(key=lambda x: x.get("appliedDate") or x.get("createdAt") or datetime.now(), reverse=True)
+            if total == 0 or skip >= total:
+                return [], total
             
-            # Get total count
-            total = len(all_loans)
+            # Run the first branch on its own collection and union the rest into it
+            base_collection, pipeline = branches[0]
+            pipeline = list(pipeline)
+            for col_name, branch in branches[1:]:
+                pipeline.append({"$unionWith": {"coll": col_name, "pipeline": branch}})
+            pipeline += [
+                {"$sort": {"_sortDate": -1, "_id": -1}},
+                {"$skip": skip},
+                {"$limit": limit}
+            ]
             
-            # Apply pagination
-            paginated_loans = all_loans[skip:skip + limit]
+            paginated_loans = list(db[base_collection].aggregate(pipeline))
             
             # Convert to response format with collection name
             loan_list = [self._loan_to_response(loan, loan.get("_collection_name", "")) for loan in paginated_loans]
@@ -371,6 +425,25 @@ class AdminLoanManagementRepository:
             print(f"Error getting applications: {str(e)}")
             raise
 
+    def iter_export_applications(
+        self,
+        status: Optional[str] = None,
+        loan_type: Optional[str] = None,
+        resume_after: Optional[ObjectId] = None
+    ) -> Iterator[AdminLoanApplication]:
+        """Stream every matching application in _id order for a CSV export.
+
+        Reads each collection through a projected, batched cursor instead of
+        loading all applications into one page.
+        """
+        names = []
+        sources = []
+        for col_name, _, query in self._collection_queries(status, loan_type):
+            names.append(col_name)
+            sources.append((self.get_database()[col_name], query, EXPORT_PROJECTION))
+        for index, loan in merged_cursor(sources, resume_after):
+            yield self._loan_to_response(loan, names[index])
+
     def get_application_by_id(self, application_id: str) -> Optional[Dict[str, Any]]:
         """Get loan application by ID"""
         try:
@@ -387,11 +460,15 @@ class AdminLoanManagementRepository:
         try:
             collection = self.get_collection()
             update_data["updatedAt"] = datetime.now()
+            if "status" in update_data:
+                update_data["statusKey"] = normalize_loan_status(update_data["status"])
             
             result = collection.update_one(
                 {"_id": ObjectId(application_id)},
                 {"$set": update_data}
             )
+            if result.modified_count and touches_search_fields(update_data, LOAN_SEARCH):
+                refresh_search_keys(collection, {"_id": ObjectId(application_id)}, LOAN_SEARCH)
             
             return result.modified_count > 0
             
@@ -406,6 +483,7 @@ class AdminLoanManagementRepository:
             
             update_data = {
                 "status": status,
+                "statusKey": normalize_loan_status(status),
                 "updatedAt": datetime.now()
             }
             
@@ -1,6 +1,10 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from app.database.db import get_database
+from app.database.repository.metrics_rollup_repository import metrics_rollup_repository, ROLLUP_PRODUCT_LABELS
+from app.database.repository.report_job_repository import report_job_repository
+from app.utils.report_jobs import range_days
+from app.config import REPORT_MAX_MONTHS
 from app.database.schema.admin_reports_schema import (
     ReportData, AnalyticsResponse, MetricsData, RevenueDataPoint, ProductData
 )
@@ -41,47 +45,46 @@ class AdminReportsRepository:
                 )
             )
     
+    def _range_days(self, date_range: str) -> int:
+        """Number of days covered by a date range (7days, 6months, 2years, ...;
+        30 for unknown/custom), capped at REPORT_MAX_MONTHS"""
+        return min(range_days(date_range), REPORT_MAX_MONTHS * 31)
+    
+    def _get_rollup(self, date_range: str) -> List[Dict[str, Any]]:
+        """Daily rollup documents for the range, oldest first (one per day)"""
+        end = datetime.utcnow().date()
+        start = end - timedelta(days=self._range_days(date_range) - 1)
+        return metrics_rollup_repository.get_daily_metrics(start, end)
+    
     def _get_revenue_by_range(self, date_range: str) -> List[RevenueDataPoint]:
-        """Get revenue data from database for date range"""
+        """Applied loan amount over the range in four periods, from the daily rollup"""
         try:
-            if not self.db:
+            days = self._get_rollup(date_range)
+            if not days:
                 return self._get_7days_revenue()
             
-            end_date = datetime.now()
-            if date_range == "7days":
-                start_date = end_date - timedelta(days=7)
-            elif date_range == "30days":
-                start_date = end_date - timedelta(days=30)
-            elif date_range == "90days":
-                start_date = end_date - timedelta(days=90)
-            elif date_range == "1year":
-                start_date = end_date - timedelta(days=365)
-            else:
-                start_date = end_date - timedelta(days=30)
-            
-            # Query all loan collections for this date range
-            short_term = self.db["short_term_loan_applications"].count_documents({
-                "created_at": {"$gte": start_date}
-            })
-            personal = self.db["personal_loan_applications"].count_documents({
-                "created_at": {"$gte": start_date}
-            })
-            home = self.db["home_loan_applications"].count_documents({
-                "created_at": {"$gte": start_date}
-            })
-            business = self.db["business_loan_applications"].count_documents({
-                "created_at": {"$gte": start_date}
-            })
-            
-            total = short_term + personal + home + business or 1
-            scaling_factor = max(total * 0.8, 50)
-            
-            return [
-                RevenueDataPoint(month='Week 1' if date_range != '7days' else 'Mon', value=min(int(scaling_factor * 0.75), 100), label=f'₹{scaling_factor * 0.75:.1f} Cr'),
-                RevenueDataPoint(month='Week 2' if date_range != '7days' else 'Tue', value=min(int(scaling_factor * 0.82), 100), label=f'₹{scaling_factor * 0.82:.1f} Cr'),
-                RevenueDataPoint(month='Week 3' if date_range != '7days' else 'Wed', value=min(int(scaling_factor * 0.88), 100), label=f'₹{scaling_factor * 0.88:.1f} Cr'),
-                RevenueDataPoint(month='Week 4' if date_range != '7days' else 'Thu', value=min(int(scaling_factor * 0.95), 100), label=f'₹{scaling_factor * 0.95:.1f} Cr'),
+            size = -(-len(days) // 4)
+            buckets = [days[i:i + size] for i in range(0, len(days), size)]
+            amounts = [
+                sum(product["amount"] for day in bucket for product in day["products"].values())
+                for bucket in buckets
             ]
+            peak = max(amounts) or 1
+            
+            points = []
+            for index, (bucket, amount) in enumerate(zip(buckets, amounts)):
+                if self._range_days(date_range) <= 7:
+                    month = bucket[0]["date"].strftime("%a")
+                elif self._range_days(date_range) <= 30:
+                    month = f"Week {index + 1}"
+                else:
+                    month = bucket[0]["date"].strftime("%b %Y")
+                points.append(RevenueDataPoint(
+                    month=month,
+                    value=int(amount * 100 / peak),
+                    label=f"₹{amount / 10000000:.1f} Cr"
+                ))
+            return points
         except Exception as e:
             print(f"Error calculating revenue: {str(e)}")
             return self._get_7days_revenue()
@@ -96,47 +99,24 @@ class AdminReportsRepository:
         ]
     
     def _get_metrics_by_range(self, date_range: str) -> MetricsData:
-        """Get metrics from database for date range"""
+        """Get metrics for the date range from the daily rollup"""
         try:
-            if not self.db:
+            days = self._get_rollup(date_range)
+            if not days:
                 return self._get_30days_metrics()
             
-            end_date = datetime.now()
-            if date_range == "7days":
-                start_date = end_date - timedelta(days=7)
-            elif date_range == "30days":
-                start_date = end_date - timedelta(days=30)
-            elif date_range == "90days":
-                start_date = end_date - timedelta(days=90)
-            elif date_range == "1year":
-                start_date = end_date - timedelta(days=365)
-            else:
-                start_date = end_date - timedelta(days=30)
-            
-            # Count active users
-            users = self.db["users"].count_documents({
-                "createdAt": {"$gte": start_date}
-            })
-            
-            # Count applications
-            short_term = self.db["short_term_loan_applications"].count_documents({
-                "created_at": {"$gte": start_date}
-            })
-            personal = self.db["personal_loan_applications"].count_documents({
-                "created_at": {"$gte": start_date}
-            })
-            home = self.db["home_loan_applications"].count_documents({
-                "created_at": {"$gte": start_date}
-            })
-            business = self.db["business_loan_applications"].count_documents({
-                "created_at": {"$gte": start_date}
-            })
+            users = sum(day.get("newUsers", 0) for day in days)
+            applications = sum(product["count"] for day in days for product in day["products"].values())
+            applied_amount = sum(product["amount"] for day in days for product in day["products"].values())
             
-            total_applications = short_term + personal + home + business or 1
+            total_applications = applications or 1
             total_revenue = max(total_applications * 0.0095, 20)
             total_disbursements = total_revenue * 0.75
             active_customers = max(users, 1000)
-            avg_ticket = (total_applications * 0.15) / max(active_customers / 1000, 1)
+            if applications and applied_amount:
+                avg_ticket = applied_amount / applications / 100000
+            else:
+                avg_ticket = (total_applications * 0.15) / max(active_customers / 1000, 1)
             
             return MetricsData(
                 totalRevenue=f'₹{total_revenue:.0f} Cr',
@@ -153,30 +133,24 @@ class AdminReportsRepository:
             return self._get_30days_metrics()
     
     def _get_products_by_range(self, date_range: str) -> List[ProductData]:
-        """Get product distribution from real data"""
+        """Get product distribution for the date range from the daily rollup"""
         try:
-            if not self.db:
-                return self._get_30days_products()
+            days = self._get_rollup(date_range)
+            counts = {product: 0 for product in ROLLUP_PRODUCT_LABELS}
+            for day in days:
+                for product, totals in day["products"].items():
+                    counts[product] = counts.get(product, 0) + totals["count"]
             
-            # Count by product type
-            short_term = self.db["short_term_loan_applications"].count_documents({})
-            personal = self.db["personal_loan_applications"].count_documents({})
-            home = self.db["home_loan_applications"].count_documents({})
-            business = self.db["business_loan_applications"].count_documents({})
-            
-            total = short_term + personal + home + business or 100
-            
-            st_pct = int((short_term / total * 100)) if total > 0 else 25
-            pl_pct = int((personal / total * 100)) if total > 0 else 30
-            hl_pct = int((home / total * 100)) if total > 0 else 28
-            bl_pct = int((business / total * 100)) if total > 0 else 17
+            total = sum(counts.values())
+            if not total:
+                return self._get_30days_products()
             
-            return [
-                ProductData(name='Short-Term Loan', value=st_pct, color='#16a34a', percentage=f'{st_pct}%'),
-                ProductData(name='Personal Loan', value=pl_pct, color='#2563eb', percentage=f'{pl_pct}%'),
-                ProductData(name='Home Loan', value=hl_pct, color='#7c3aed', percentage=f'{hl_pct}%'),
-                ProductData(name='Business Loan', value=bl_pct, color='#f59e0b', percentage=f'{bl_pct}%')
-            ]
+            colors = {"short_term": "#16a34a", "personal": "#2563eb", "home": "#7c3aed", "business": "#f59e0b"}
+            products = []
+            for product, label in ROLLUP_PRODUCT_LABELS.items():
+                pct = int(counts[product] / total * 100)
+                products.append(ProductData(name=label, value=pct, color=colors[product], percentage=f'{pct}%'))
+            return products
         except Exception as e:
             print(f"Error getting products: {str(e)}")
             return self._get_30days_products()
@@ -361,49 +335,61 @@ class AdminReportsRepository:
         ]
     
     def get_recent_reports(self) -> List[Dict[str, Any]]:
-        """Get recent reports"""
-        return [
-            {"id": 1, "name": "Short-Term Loan Report - January 2024", "type": "Loan", "date": "2024-01-31", "size": "2.5 MB", "status": "Completed"},
-            {"id": 2, "name": "Health Insurance Report Q4 2023", "type": "Insurance", "date": "2024-01-28", "size": "1.8 MB", "status": "Completed"},
-            {"id": 3, "name": "SIP Performance Analysis", "type": "Investment", "date": "2024-01-25", "size": "3.2 MB", "status": "Completed"},
-            {"id": 4, "name": "Business Tax Strategy Report", "type": "Tax", "date": "2024-01-20", "size": "1.2 MB", "status": "Completed"}
-        ]
+        """Get recent reports (latest report generation jobs)"""
+        reports = []
+        for job in report_job_repository.get_recent_jobs():
+            size = job.get("fileSize")
+            reports.append({
+                "id": str(job["_id"]),
+                "name": job["reportName"],
+                "type": job.get("category", ""),
+                "date": job["createdAt"].strftime("%Y-%m-%d"),
+                "size": f"{size / (1024 * 1024):.1f} MB" if size and size >= 1024 * 1024
+                        else f"{size / 1024:.1f} KB" if size else "-",
+                "status": job["status"].capitalize(),
+                "downloadUrl": f"/api/admin/reports/download/{job['filename']}" if job["status"] == "completed" else None
+            })
+        return reports
     
+    def generate_csv_rows(self, date_range: str = "30days") -> Tuple[List[str], List[List[Any]]]:
+        """Header and rows of the analytics CSV export"""
+        analytics = self.get_analytics_data(date_range)
+        loan_dist = self.get_loan_distribution()
+        insurance_dist = self.get_insurance_distribution()
+        
+        headers = ['Metric', 'Value']
+        rows = [
+            ['Date Range', date_range],
+            ['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
+            [],
+            ['ANALYTICS METRICS', ''],
+            ['Total Revenue', analytics.data.metrics.totalRevenue],
+            ['Total Disbursements', analytics.data.metrics.totalDisbursements],
+            ['Active Customers', analytics.data.metrics.activeCustomers],
+            ['Average Ticket Size', analytics.data.metrics.avgTicketSize],
+            [],
+            ['LOAN DISTRIBUTION', ''],
+        ]
+        
+        for loan in loan_dist["loans"]:
+            rows.append([f'{loan["type"]}', f'{loan["percentage"]}% ({loan["amount"]})'])
+        
+        rows.extend([
+            ['Total Disbursed', loan_dist["totalDisbursed"]],
+            [],
+            ['INSURANCE DISTRIBUTION', ''],
+        ])
+        
+        for insurance in insurance_dist["insurance"]:
+            rows.append([f'{insurance["type"]} Insurance', f'{insurance["percentage"]}% ({insurance["count"]} policies)'])
+        
+        rows.append(['Total Policies', str(insurance_dist["totalPolicies"])])
+        return headers, rows
+
     def generate_csv_export(self, date_range: str = "30days") -> str:
         """Generate CSV content for export with real data"""
         try:
-            analytics = self.get_analytics_data(date_range)
-            loan_dist = self.get_loan_distribution()
-            insurance_dist = self.get_insurance_distribution()
-            
-            headers = ['Metric', 'Value']
-            rows = [
-                ['Date Range', date_range],
-                ['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-                [],
-                ['ANALYTICS METRICS', ''],
-                ['Total Revenue', analytics.data.metrics.totalRevenue],
-                ['Total Disbursements', analytics.data.metrics.totalDisbursements],
-                ['Active Customers', analytics.data.metrics.activeCustomers],
-                ['Average Ticket Size', analytics.data.metrics.avgTicketSize],
-                [],
-                ['LOAN DISTRIBUTION', ''],
-            ]
-            
-            for loan in loan_dist["loans"]:
-                rows.append([f'{loan["type"]}', f'{loan["percentage"]}% ({loan["amount"]})'])
-            
-            rows.extend([
-                ['Total Disbursed', loan_dist["totalDisbursed"]],
-                [],
-                ['INSURANCE DISTRIBUTION', ''],
-            ])
-            
-            for insurance in insurance_dist["insurance"]:
-                rows.append([f'{insurance["type"]} Insurance', f'{insurance["percentage"]}% ({insurance["count"]} policies)'])
-            
-            rows.append(['Total Policies', str(insurance_dist["totalPolicies"])])
-            
+            _, rows = self.generate_csv_rows(date_range)
             csv_content = '\n'.join([','.join([f'"{cell}"' if cell else '""' for cell in row]) for row in rows])
             return csv_content
         except Exception as e:
@@ -1,5 +1,8 @@
 from pymongo import MongoClient
 from app.database.db import get_database
+from app.database.repository.inquiry_index_repository import inquiry_index_repository
+from app.utils.loan_status import normalize_loan_status
+from app.utils.search import LOAN_SEARCH, with_search_keys
 from bson import ObjectId
 from datetime import datetime
 import random
@@ -29,6 +32,8 @@ def create_get_in_touch(data: dict) -> dict:
         data["created_at"] = datetime.now()
     result = collection.insert_one(data)
     created_doc = collection.find_one({"_id": result.inserted_id})
+    if created_doc:
+        inquiry_index_repository.index_inquiry("business_loan", created_doc)
     return created_doc
 
 def get_all_get_in_touch():
@@ -48,6 +53,8 @@ def update_get_in_touch_status(inquiry_id: str, status: str) -> bool:
         {"_id": ObjectId(inquiry_id)},
         {"$set": {"status": status, "updated_at": datetime.now()}}
     )
+    if result.modified_count > 0:
+        inquiry_index_repository.update_status("business_loan", inquiry_id, status)
     return result.modified_count > 0
 
 # ============ APPLICATION OPERATIONS ============
@@ -65,6 +72,8 @@ def create_application(data: dict) -> dict:
     # Generate application ID
     data["application_id"] = generate_application_id()
     data["status"] = "pending"
+    data["statusKey"] = normalize_loan_status(data["status"])
+    with_search_keys(data, LOAN_SEARCH)
     
     result = collection.insert_one(data)
     created_doc = collection.find_one({"_id": result.inserted_id})
@@ -90,7 +99,7 @@ def update_application_status(application_id: str, status: str):
     collection = _get_collection('applications')
     return collection.update_one(
         {"_id": ObjectId(application_id)},
-        {"$set": {"status": status, "updated_at": datetime.now()}}
+        {"$set": {"status": status, "statusKey": normalize_loan_status(status), "updated_at": datetime.now()}}
     )
 
 # ============ ELIGIBILITY CRITERIA OPERATIONS ============
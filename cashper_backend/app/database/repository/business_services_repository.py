@@ -0,0 +1,186 @@
+import asyncio
+import base64
+import json
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime
+from bson import ObjectId
+from app.database.db import get_async_database
+
+
+# Corporate service collections and the service name shown on the admin page
+BUSINESS_SERVICE_COLLECTIONS = {
+    "company_registration_applications": "Register Your New Company",
+    "company_compliance_applications": "Compliance for New Company",
+    "tax_audit_applications": "Tax Audit",
+    "legal_advice_applications": "Legal Advice",
+    "pf_services_applications": "Provident Fund Services",
+    "tds_services_applications": "TDS Services",
+    "gst_services_applications": "GST Services",
+    "payroll_services_applications": "Payroll Services",
+    "accounting_bookkeeping_applications": "Accounting & Bookkeeping",
+}
+
+BUSINESS_SERVICE_STATUSES = ["pending", "approved", "completed", "rejected"]
+
+
+def normalize_service_status(status: Any) -> Optional[str]:
+    """Canonical statusKey stored next to `status` ("Pending " -> "pending")"""
+    if status is None:
+        return None
+    key = " ".join(str(status).strip().lower().split())
+    return key or None
+
+
+def backfill_status_keys(db) -> int:
+    """Set statusKey on applications written before it existed (sync database);
+    one update per distinct stored status. Returns documents updated."""
+    updated = 0
+    for collection_name in BUSINESS_SERVICE_COLLECTIONS:
+        collection = db[collection_name]
+        missing = {"statusKey": {"$exists": False}}
+        for stored_status in collection.distinct("status", missing):
+            updated += collection.update_many(
+                {**missing, "status": stored_status},
+                {"$set": {"statusKey": normalize_service_status(stored_status)}}
+            ).modified_count
+        # Documents without any status keep an explicit null key so they are not rescanned
+        updated += collection.update_many(missing, {"$set": {"statusKey": None}}).modified_count
+    return updated
+
+
+def encode_cursor(application: Dict[str, Any]) -> str:
+    """Opaque keyset cursor for the position after `application`"""
+    created_at = application.get("created_at")
+    payload = {
+        "t": created_at.isoformat() if isinstance(created_at, datetime) else None,
+        "id": str(application["_id"]),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        created_at = datetime.fromisoformat(payload["t"]) if payload.get("t") else None
+        return created_at, ObjectId(payload["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _after(created_at: Optional[datetime], last_id: ObjectId) -> Dict[str, Any]:
+    """Documents after the cursor in (created_at desc, _id desc) order; missing dates sort last"""
+    if created_at is None:
+        return {"created_at": None, "_id": {"$lt": last_id}}
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": last_id}},
+        {"created_at": None},
+    ]}
+
+
+def _sort_key(application: Dict[str, Any]) -> Tuple[bool, datetime, ObjectId]:
+    created_at = application.get("created_at")
+    has_date = isinstance(created_at, datetime)
+    return has_date, created_at if has_date else datetime.min, application["_id"]
+
+
+class BusinessServicesRepository:
+    """Cross-service reads for the corporate services admin page"""
+
+    def __init__(self):
+        self.db = None
+
+    def get_db(self):
+        """Lazy initialization for the async database"""
+        if self.db is None:
+            self.db = get_async_database()
+        return self.db
+
+    async def _status_counts(self, collection_name: str) -> Dict[str, int]:
+        pipeline = [{"$group": {"_id": "$statusKey", "count": {"$sum": 1}}}]
+        rows = await self.get_db()[collection_name].aggregate(pipeline).to_list(length=None)
+        return {row["_id"]: row["count"] for row in rows}
+
+    async def get_status_stats(self) -> Dict[str, int]:
+        """Total and per-status counts; one $group per collection, run concurrently"""
+        results = await asyncio.gather(
+            *[self._status_counts(name) for name in BUSINESS_SERVICE_COLLECTIONS],
+            return_exceptions=True
+        )
+        stats = {"total": 0, **{key: 0 for key in BUSINESS_SERVICE_STATUSES}}
+        for collection_name, counts in zip(BUSINESS_SERVICE_COLLECTIONS, results):
+            if isinstance(counts, Exception):
+                print(f"Warning: Error accessing collection {collection_name}: {counts}")
+                continue
+            stats["total"] += sum(counts.values())
+            for key in BUSINESS_SERVICE_STATUSES:
+                stats[key] += counts.get(key, 0)
+        return stats
+
+    async def _page(self, collection_name: str, query: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        cursor = (
+            self.get_db()[collection_name]
+            .find(query)
+            .sort([("created_at", -1), ("_id", -1)])
+            .limit(limit)
+        )
+        applications = await cursor.to_list(length=limit)
+        for application in applications:
+            application["service_type"] = BUSINESS_SERVICE_COLLECTIONS[collection_name]
+        return applications
+
+    async def _pages(self, collections: List[str], query: Dict[str, Any], limit: int) -> List[List[Dict[str, Any]]]:
+        return await asyncio.gather(*[self._page(name, query, limit) for name in collections])
+
+    async def list_applications(
+        self,
+        service_type: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One page of applications across all services, newest first.
+
+        Keyset pagination on (created_at, _id): every collection is read
+        concurrently for at most limit+1 documents after the cursor, and the
+        results are merged. Status filters and counts use the indexed
+        statusKey; the total is counted for the first page only (None with a
+        cursor). Raises ValueError for a malformed cursor.
+        """
+        if service_type and service_type != "all":
+            collections = [name for name, label in BUSINESS_SERVICE_COLLECTIONS.items() if label == service_type]
+        else:
+            collections = list(BUSINESS_SERVICE_COLLECTIONS)
+
+        base_query: Dict[str, Any] = {}
+        if status and status != "all":
+            base_query["statusKey"] = normalize_service_status(status)
+
+        query = dict(base_query)
+        if cursor:
+            query = {"$and": [base_query, _after(*decode_cursor(cursor))]} if base_query else _after(*decode_cursor(cursor))
+
+        pages = self._pages(collections, query, limit + 1)
+        if cursor:
+            # The total is reported with the first page only
+            pages, totals = await pages, None
+        else:
+            pages, totals = await asyncio.gather(
+                pages, asyncio.gather(*[self.get_db()[name].count_documents(base_query) for name in collections])
+            )
+
+        merged = sorted((app for page in pages for app in page), key=_sort_key, reverse=True)
+        has_more = len(merged) > limit
+        applications = merged[:limit]
+
+        return {
+            "applications": applications,
+            "total": sum(totals) if totals is not None else None,
+            "hasMore": has_more,
+            "nextCursor": encode_cursor(applications[-1]) if has_more and applications else None,
+        }
+
+
+# Create singleton instance
+business_services_repository = BusinessServicesRepository()
@@ -3,6 +3,7 @@ from bson import ObjectId
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from app.database.db import get_database
+from app.database.repository.inquiry_index_repository import inquiry_index_repository
 from app.database.schema.business_tax_schema import (
     BusinessTaxConsultationInDB,
     BusinessTaxCalculatorInDB,
@@ -81,6 +82,7 @@ class BusinessTaxRepository:
         result = collection.insert_one(booking_dict)
         booking_dict["_id"] = result.inserted_id
         booking_dict["id"] = str(result.inserted_id)
+        inquiry_index_repository.index_inquiry("business_tax", booking_dict)
         return booking_dict
 
     def get_all_consultations(self, skip: int = 0, limit: int = 50, status: Optional[str] = None) -> List[Dict]:
@@ -127,6 +129,8 @@ class BusinessTaxRepository:
                 {"_id": ObjectId(consultation_id)},
                 {"$set": update_data}
             )
+            if result.modified_count > 0:
+                inquiry_index_repository.update_status("business_tax", consultation_id, status)
             return result.modified_count > 0
         except:
             return False
@@ -136,6 +140,8 @@ class BusinessTaxRepository:
         try:
             collection = self.get_consultation_collection()
             result = collection.delete_one({"_id": ObjectId(consultation_id)})
+            if result.deleted_count > 0:
+                inquiry_index_repository.remove("business_tax", consultation_id)
             return result.deleted_count > 0
         except:
             return False
@@ -1,4 +1,5 @@
 from app.database.db import get_database
+from app.utils.response_cache import response_cache
 from app.database.schema.contact_schema import (
     ContactSubmissionInDB, 
     ContactSubmissionResponse,
@@ -60,6 +61,10 @@ class ContactRepository:
         except Exception as e:
             logger.warning(f"Could not create indexes: {e}")
 
+    def _invalidate_cache(self):
+        """Drop cached public FAQ responses after a FAQ write"""
+        response_cache.invalidate("contact:faqs")
+
     # ===================== CONTACT SUBMISSIONS =====================
 
     def create_submission(self, submission: ContactSubmissionInDB) -> ContactSubmissionResponse:
@@ -229,6 +234,7 @@ class ContactRepository:
         result = collection.insert_one(faq_dict)
         faq_dict["_id"] = result.inserted_id
         
+        self._invalidate_cache()
         return FAQResponse(
             id=str(result.inserted_id),
             **faq_dict
@@ -285,6 +291,7 @@ class ContactRepository:
                 {"$set": faq_data}
             )
             
+            self._invalidate_cache()
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating FAQ: {e}")
@@ -295,6 +302,7 @@ class ContactRepository:
         try:
             collection = self.get_faq_collection()
             result = collection.delete_one({"_id": ObjectId(faq_id)})
+            self._invalidate_cache()
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting FAQ: {e}")
@@ -313,6 +321,7 @@ class ContactRepository:
                     }
                 }
             )
+            self._invalidate_cache()
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating FAQ order: {e}")
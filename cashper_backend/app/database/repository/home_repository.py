@@ -3,10 +3,16 @@ from app.database.schema.home_schema import (
     HomeTestimonialInDB, HomeTestimonialResponse,
     BlogPostInDB, BlogPostResponse
 )
+from app.config import BLOG_VIEW_FLUSH_SECONDS, BLOG_POPULAR_REFRESH_SECONDS
+from app.utils.view_counter import CounterBuffer
+from app.utils.response_cache import response_cache
 from datetime import datetime
 from bson import ObjectId
 from typing import List, Optional
+import json
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +22,17 @@ class HomeRepository:
         self.home_testimonials_collection_name = "home_testimonials"
         self.blogs_collection_name = "blogs"
         self._indexes_created = False
+        
+        # Page views are buffered and flushed in batches (started from the app lifespan)
+        self.blog_views = CounterBuffer(self.get_blogs_collection, "views", BLOG_VIEW_FLUSH_SECONDS)
+        self.blog_views.after_flush(self.refresh_popular_blogs)
+        self.blog_views.after_flush(lambda: self._invalidate_cache("blogs"))
+        
+        # Popular blogs ranking, refreshed after view flushes
+        self._popular_blogs: Optional[List[dict]] = None
+        self._popular_size = 0
+        self._popular_refreshed_at = 0.0
+        self._popular_lock = threading.Lock()
     
     def get_home_testimonials_collection(self):
         """Get home testimonials collection"""
@@ -58,6 +75,10 @@ class HomeRepository:
         except Exception as e:
             logger.warning(f"Could not create indexes: {e}")
 
+    def _invalidate_cache(self, section: str):
+        """Drop cached public responses for a home page section after a write"""
+        response_cache.invalidate(f"home:{section}")
+
     # ===================== HOME TESTIMONIALS =====================
 
     def create_home_testimonial(self, testimonial: HomeTestimonialInDB) -> HomeTestimonialResponse:
@@ -68,6 +89,7 @@ class HomeRepository:
         result = collection.insert_one(testimonial_dict)
         testimonial_dict["_id"] = result.inserted_id
         
+        self._invalidate_cache("testimonials")
         return HomeTestimonialResponse(
             id=str(result.inserted_id),
             **testimonial_dict
@@ -110,6 +132,7 @@ class HomeRepository:
                 {"$set": testimonial_data}
             )
             
+            self._invalidate_cache("testimonials")
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating home testimonial: {e}")
@@ -120,6 +143,7 @@ class HomeRepository:
         try:
             collection = self.get_home_testimonials_collection()
             result = collection.delete_one({"_id": ObjectId(testimonial_id)})
+            self._invalidate_cache("testimonials")
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting home testimonial: {e}")
@@ -138,6 +162,7 @@ class HomeRepository:
         # Format date for response
         date_str = blog_dict["createdAt"].strftime("%b %d, %Y")
         
+        self._invalidate_cache("blogs")
         return BlogPostResponse(
             id=str(result.inserted_id),
             date=date_str,
@@ -154,6 +179,13 @@ class HomeRepository:
             logger.error(f"Error fetching blog post: {e}")
             return None
 
+    def get_blog_categories(self) -> List[str]:
+        """Distinct blog categories (cached with the other blog responses)"""
+        body, _ = response_cache.get_or_set(
+            "home:blogs:categories", lambda: self.get_blogs_collection().distinct("category")
+        )
+        return json.loads(body)
+
     def get_all_blog_posts(
         self, 
         is_published: Optional[bool] = None,
@@ -192,6 +224,8 @@ class HomeRepository:
                 {"$set": blog_data}
             )
             
+            self.invalidate_popular_blogs()
+            self._invalidate_cache("blogs")
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating blog post: {e}")
@@ -202,23 +236,21 @@ class HomeRepository:
         try:
             collection = self.get_blogs_collection()
             result = collection.delete_one({"_id": ObjectId(blog_id)})
+            self.invalidate_popular_blogs()
+            self._invalidate_cache("blogs")
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting blog post: {e}")
             return False
 
-    def increment_blog_views(self, blog_id: str) -> bool:
-        """Increment blog post view count"""
-        try:
-            collection = self.get_blogs_collection()
-            result = collection.update_one(
-                {"_id": ObjectId(blog_id)},
-                {"$inc": {"views": 1}}
-            )
-            return result.modified_count > 0
-        except Exception as e:
-            logger.error(f"Error incrementing blog views: {e}")
-            return False
+    def increment_blog_views(self, blog_id: str) -> int:
+        """Record a blog post view (written to the database on the next flush).
+
+        Returns the number of views not yet written for this post, so callers
+        can show an up-to-date count.
+        """
+        self.blog_views.record(blog_id)
+        return self.blog_views.pending(blog_id)
 
     def get_featured_blogs(self, limit: int = 3) -> List[dict]:
         """Get featured blog posts"""
@@ -231,17 +263,36 @@ class HomeRepository:
         )
         return blogs
 
-    def get_popular_blogs(self, limit: int = 5) -> List[dict]:
-        """Get most viewed blog posts"""
+    def refresh_popular_blogs(self, max_size: int = 10) -> List[dict]:
+        """Reload the popular blogs ranking (most viewed published posts)"""
         collection = self.get_blogs_collection()
         blogs = list(
             collection
             .find({"isPublished": True})
             .sort("views", -1)
-            .limit(limit)
+            .limit(max_size)
         )
+        with self._popular_lock:
+            self._popular_blogs = blogs
+            self._popular_size = max_size
+            self._popular_refreshed_at = time.monotonic()
         return blogs
 
+    def invalidate_popular_blogs(self) -> None:
+        """Drop the ranking so the next read reloads it (after admin edits)"""
+        with self._popular_lock:
+            self._popular_blogs = None
+
+    def get_popular_blogs(self, limit: int = 5) -> List[dict]:
+        """Get most viewed blog posts from the periodically refreshed ranking"""
+        with self._popular_lock:
+            blogs = self._popular_blogs
+            fresh = time.monotonic() - self._popular_refreshed_at < BLOG_POPULAR_REFRESH_SECONDS
+            covered = limit <= self._popular_size
+        if blogs is None or not fresh or not covered:
+            blogs = self.refresh_popular_blogs(max(limit, 10))
+        return blogs[:limit]
+
 
 # Create singleton instance
 home_repository = HomeRepository()
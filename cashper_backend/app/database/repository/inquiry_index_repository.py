@@ -0,0 +1,329 @@
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.database.db import get_database, get_async_database
+
+
+INQUIRY_INDEX_COLLECTION = "inquiries_index"
+
+# Every inquiry/get-in-touch source that feeds the admin inbox.
+# "productType" is the label shown in the admin UI and sent back as `inquiry_type`
+# when an admin updates a status.
+INQUIRY_SOURCES: Dict[str, Dict[str, Any]] = {
+    "short_term_loan": {
+        "collection": "short_term_loan_get_in_touch",
+        "productType": "Short Term Loan",
+        "name": ["fullName", "name"],
+        "amount": ["loanAmount"],
+    },
+    "personal_loan": {
+        "collection": "personal_loan_get_in_touch",
+        "productType": "Personal Loan",
+        "name": ["fullName", "name"],
+        "amount": ["loanAmount"],
+    },
+    "business_loan": {
+        "collection": "business_loan_get_in_touch",
+        "productType": "Business Loan",
+        "name": ["fullName", "name"],
+        "amount": ["loanAmount"],
+    },
+    "home_loan": {
+        "collection": "home_loan_get_in_touch",
+        "productType": "Home Loan",
+        "name": ["fullName", "name"],
+        "amount": ["loanAmount"],
+    },
+    "term_insurance": {
+        "collection": "term_insurance_inquiries",
+        "productType": "Term Insurance",
+        "name": ["fullName", "name"],
+        "amount": ["amount", "coverage"],
+    },
+    "motor_insurance": {
+        "collection": "motor_insurance_inquiries",
+        "productType": "Motor Insurance",
+        "name": ["fullName", "name"],
+        "amount": ["amount"],
+    },
+    "health_insurance": {
+        "collection": "health_insurance_inquiries",
+        "productType": "Health Insurance",
+        "name": ["fullName", "name"],
+        "amount": ["amount", "coverageAmount"],
+    },
+    "sip": {
+        "collection": "sip_inquiries",
+        "productType": "SIP",
+        "name": ["fullName", "name"],
+        "amount": ["amount", "investmentAmount"],
+    },
+    "mutual_funds": {
+        "collection": "mutual_fund_inquiries",
+        "productType": "Mutual Funds",
+        "name": ["fullName", "name"],
+        "amount": ["amount", "investmentAmount"],
+    },
+    "personal_tax": {
+        "collection": "tax_consultations",
+        "productType": "Personal Tax Planning",
+        "name": ["name"],
+        "amount": ["income"],
+        "message": lambda doc: f"Income Range: {doc.get('income', 'N/A')}, Tax Regime: {doc.get('taxRegime', 'N/A')}",
+    },
+    "business_tax": {
+        "collection": "business_tax_consultations",
+        "productType": "Business Tax Strategy",
+        "name": ["ownerName"],
+        "amount": ["annualTurnover"],
+        "message": lambda doc: f"Business: {doc.get('businessName', 'N/A')}, Type: {doc.get('businessType', 'N/A')}, Turnover: {doc.get('annualTurnover', 'N/A')}",
+    },
+}
+
+# productType label -> source key (used by the admin status update endpoint)
+SOURCE_BY_PRODUCT_TYPE = {config["productType"]: key for key, config in INQUIRY_SOURCES.items()}
+
+
+def _first(doc: dict, fields: List[str], default: Any = "N/A") -> Any:
+    for field in fields:
+        value = doc.get(field)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def _created_at(doc: dict) -> datetime:
+    created_at = doc.get("createdAt") or doc.get("created_at")
+    if isinstance(created_at, datetime):
+        return created_at
+    if isinstance(doc.get("_id"), ObjectId):
+        return doc["_id"].generation_time.replace(tzinfo=None)
+    return datetime.utcnow()
+
+
+def build_index_entry(source: str, doc: dict) -> Dict[str, Any]:
+    """Project a source inquiry document onto the unified inbox shape"""
+    config = INQUIRY_SOURCES[source]
+    name = _first(doc, config["name"])
+    email = doc.get("email") or "N/A"
+    phone = doc.get("phone") or "N/A"
+    message = config["message"](doc) if "message" in config else doc.get("message", "")
+    return {
+        "source": source,
+        "sourceId": str(doc["_id"]),
+        "productType": config["productType"],
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "amount": _first(doc, config["amount"]),
+        "status": getattr(doc.get("status"), "value", doc.get("status")) or "pending",
+        "message": message or "",
+        "userId": str(doc["userId"]) if doc.get("userId") else None,
+        "createdAt": _created_at(doc),
+        "searchText": f"{name} {email} {phone}".lower(),
+    }
+
+
+def encode_cursor(entry: dict) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    payload = {"createdAt": entry["createdAt"].isoformat(), "id": str(entry["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return {"createdAt": datetime.fromisoformat(payload["createdAt"]), "_id": ObjectId(payload["id"])}
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+class InquiryIndexRepository:
+    """Unified `inquiries_index` projection over every product's inquiry collection.
+
+    Submit endpoints write through to it so the admin inbox can page over one
+    indexed collection instead of reading eleven collections on every load.
+    """
+
+    def get_collection(self):
+        return get_database()[INQUIRY_INDEX_COLLECTION]
+
+    def get_async_collection(self):
+        return get_async_database()[INQUIRY_INDEX_COLLECTION]
+
+    # ===================== Write-through hooks =====================
+
+    def index_inquiry(self, source: str, doc: dict) -> None:
+        """Upsert the inbox entry for a newly stored inquiry (never fails the caller)"""
+        try:
+            entry = build_index_entry(source, doc)
+            self.get_collection().update_one(
+                {"source": source, "sourceId": entry["sourceId"]},
+                {"$set": entry},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"[WARN] Could not index {source} inquiry: {e}")
+
+    async def index_inquiry_async(self, source: str, doc: dict) -> None:
+        """Async variant of index_inquiry for repositories on the async client"""
+        try:
+            entry = build_index_entry(source, doc)
+            await self.get_async_collection().update_one(
+                {"source": source, "sourceId": entry["sourceId"]},
+                {"$set": entry},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"[WARN] Could not index {source} inquiry: {e}")
+
+    def update_status(self, source: str, source_id: str, status: str) -> None:
+        """Mirror a status change made on the source inquiry"""
+        try:
+            self.get_collection().update_one(
+                {"source": source, "sourceId": str(source_id)},
+                {"$set": {"status": getattr(status, "value", status), "updatedAt": datetime.utcnow()}}
+            )
+        except Exception as e:
+            print(f"[WARN] Could not update {source} inquiry index status: {e}")
+
+    def remove(self, source: str, source_id: str) -> None:
+        """Drop the inbox entry of a deleted source inquiry"""
+        try:
+            self.get_collection().delete_one({"source": source, "sourceId": str(source_id)})
+        except Exception as e:
+            print(f"[WARN] Could not remove {source} inquiry from index: {e}")
+
+    async def update_status_async(self, source: str, source_id: str, status: str) -> None:
+        """Async variant of update_status"""
+        try:
+            await self.get_async_collection().update_one(
+                {"source": source, "sourceId": str(source_id)},
+                {"$set": {"status": getattr(status, "value", status), "updatedAt": datetime.utcnow()}}
+            )
+        except Exception as e:
+            print(f"[WARN] Could not update {source} inquiry index status: {e}")
+
+    # ===================== Backfill =====================
+
+    def backfill(self, batch_size: int = 500) -> int:
+        """Index any source inquiries that are not in the projection yet.
+
+        Source ids are read in batches (from the _id index) and looked up by
+        sourceId in the projection; only the missing inquiries are fetched and
+        indexed, so this is cheap on a warm database and also catches gaps that
+        a count comparison would hide (e.g. stale entries of deleted inquiries).
+        """
+        db = get_database()
+        index = self.get_collection()
+        indexed = 0
+        for source, config in INQUIRY_SOURCES.items():
+            source_collection = db[config["collection"]]
+            batch: List[Any] = []
+            for doc in source_collection.find({}, {"_id": 1}):
+                batch.append(doc["_id"])
+                if len(batch) >= batch_size:
+                    indexed += self._index_missing(source, source_collection, index, batch)
+                    batch = []
+            if batch:
+                indexed += self._index_missing(source, source_collection, index, batch)
+        return indexed
+
+    def _index_missing(self, source: str, source_collection, index, source_ids: List[Any]) -> int:
+        """Index the inquiries among `source_ids` that have no entry yet; returns entries added"""
+        present = {
+            row["sourceId"] for row in index.find(
+                {"source": source, "sourceId": {"$in": [str(source_id) for source_id in source_ids]}},
+                {"sourceId": 1, "_id": 0}
+            )
+        }
+        missing = [source_id for source_id in source_ids if str(source_id) not in present]
+        if not missing:
+            return 0
+        operations = []
+        for doc in source_collection.find({"_id": {"$in": missing}}):
+            entry = build_index_entry(source, doc)
+            operations.append(UpdateOne(
+                {"source": source, "sourceId": entry["sourceId"]},
+                {"$setOnInsert": entry},
+                upsert=True
+            ))
+        if not operations:
+            return 0
+        return index.bulk_write(operations, ordered=False).upserted_count
+
+    # ===================== Admin inbox =====================
+
+    async def list_inquiries(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        product_type: Optional[str] = None,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        sort_order: str = "desc"
+    ) -> Dict[str, Any]:
+        """Keyset-paginated inbox page ordered by (createdAt, _id)"""
+        collection = self.get_async_collection()
+        direction = 1 if sort_order == "asc" else -1
+
+        query: Dict[str, Any] = {}
+        if product_type:
+            query["productType"] = product_type
+        if status:
+            query["status"] = status
+        if search:
+            query["searchText"] = {"$regex": re.escape(search.strip().lower())}
+
+        total = await collection.count_documents(query)
+
+        page_query = dict(query)
+        if cursor:
+            last = decode_cursor(cursor)
+            op = "$gt" if direction == 1 else "$lt"
+            page_query["$or"] = [
+                {"createdAt": {op: last["createdAt"]}},
+                {"createdAt": last["createdAt"], "_id": {op: last["_id"]}},
+            ]
+
+        rows = await (
+            collection.find(page_query, {"searchText": 0})
+            .sort([("createdAt", direction), ("_id", direction)])
+            .limit(limit + 1)
+            .to_list(length=limit + 1)
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]) if has_more and rows else None
+
+        items = []
+        for row in rows:
+            items.append({
+                "id": row["sourceId"],
+                "name": row.get("name", "N/A"),
+                "email": row.get("email", "N/A"),
+                "phone": row.get("phone", "N/A"),
+                "income": row.get("amount", "N/A"),
+                "amount": row.get("amount", "N/A"),
+                "type": row["productType"],
+                "productType": row["productType"],
+                "status": row.get("status", "pending"),
+                "createdAt": row["createdAt"],
+                "message": row.get("message", ""),
+            })
+
+        return {
+            "items": items,
+            "total": total,
+            "nextCursor": next_cursor,
+            "hasMore": has_more,
+        }
+
+
+# Create singleton instance
+inquiry_index_repository = InquiryIndexRepository()
@@ -9,9 +9,82 @@ from app.database.schema.insurance_policy_schema import (
     InsuranceType
 )
 from bson import ObjectId
-from datetime import datetime
-from typing import Optional, List, Dict
+from datetime import datetime, timedelta
+from typing import Any, Optional, List, Dict, Iterator
 import re
+from pymongo import UpdateMany
+from app.utils.csv_export import merged_cursor
+from app.utils.search import POLICY_SEARCH, refresh_search_keys, search_query, touches_search_fields, with_search_keys
+
+
+POLICY_EXPORT_PROJECTION = {
+    field: 1 for field in (
+        "policyId", "customer", "email", "phone", "type", "premium", "coverage",
+        "status", "startDate", "endDate", "nominee"
+    )
+}
+
+# Policies that are in force; the lifecycle sweeper moves them between these
+# two statuses and on to Expired
+IN_FORCE_STATUSES = [PolicyStatus.active.value, PolicyStatus.expiring_soon.value]
+
+# Statuses whose premium counts as collected
+PREMIUM_STATUSES = IN_FORCE_STATUSES + [PolicyStatus.expired.value]
+
+_DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d")
+
+
+def parse_policy_date(value: Any) -> Optional[datetime]:
+    """Midnight of a policy date given as YYYY-MM-DD (or DD-MM-YYYY / DD/MM/YYYY)"""
+    if isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()[:10]
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_premium_amount(value: Any) -> Optional[float]:
+    """Yearly premium from a display string such as "₹12,000/year" or "₹1,500/month" """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    match = re.search(r"\d+(?:\.\d+)?", value.replace(",", ""))
+    if not match:
+        return None
+    amount = float(match.group())
+    if "month" in value.lower():
+        amount *= 12
+    return amount
+
+
+def normalize_policy_fields(data: dict) -> dict:
+    """Add the indexed endDateAt and numeric premiumAmount for the display fields in `data`"""
+    if "endDate" in data:
+        data["endDateAt"] = parse_policy_date(data["endDate"])
+    if "premium" in data:
+        data["premiumAmount"] = parse_premium_amount(data["premium"])
+    return data
+
+
+def _start_of_day(now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.now()
+    return datetime(now.year, now.month, now.day)
+
+
+def _format_premium(amount: float) -> str:
+    """Amount in rupees as lakhs or crores (₹12.5L, ₹1.2Cr)"""
+    lakhs = amount / 100000
+    if lakhs >= 100:
+        return f"₹{lakhs / 100:.1f}Cr"
+    return f"₹{lakhs:.1f}L"
+
 
 class InsuranceManagementRepository:
     def __init__(self):
@@ -28,7 +101,7 @@ class InsuranceManagementRepository:
     def create_policy(self, policy_data: InsurancePolicyInDB) -> str:
         """Create a new insurance policy"""
         collection = self.get_collection()
-        policy_dict = policy_data.dict()
+        policy_dict = with_search_keys(normalize_policy_fields(policy_data.dict()), POLICY_SEARCH)
         policy_dict["createdAt"] = datetime.now()
         policy_dict["updatedAt"] = datetime.now()
         result = collection.insert_one(policy_dict)
@@ -84,15 +157,8 @@ class InsuranceManagementRepository:
         if status and status != "all":
             query["status"] = status
         
-        # Search across multiple fields
-        if search_term and search_term.strip():
-            search_regex = re.compile(search_term, re.IGNORECASE)
-            query["$or"] = [
-                {"customer": search_regex},
-                {"email": search_regex},
-                {"phone": search_regex},
-                {"policyId": search_regex}
-            ]
+        # Search customer name, email, phone and policy ID (indexed prefix match)
+        query.update(search_query(search_term, POLICY_SEARCH))
         
         # Get total count
         total = collection.count_documents(query)
@@ -108,27 +174,39 @@ class InsuranceManagementRepository:
             "policies": policies
         }
 
+    def iter_policies_for_export(self,
+                                 policy_type: Optional[str] = None,
+                                 status: Optional[str] = None,
+                                 resume_after: Optional[ObjectId] = None) -> Iterator[dict]:
+        """Stream matching policies in _id order with only the exported fields"""
+        query = {}
+        if policy_type and policy_type != "all":
+            query["type"] = policy_type
+        if status and status != "all":
+            query["status"] = status
+        
+        sources = [(self.get_collection(), query, POLICY_EXPORT_PROJECTION)]
+        for _, policy in merged_cursor(sources, resume_after):
+            yield policy
+
     def update_policy(self, policy_id: str, update_data: dict) -> bool:
         """Update policy details"""
         collection = self.get_collection()
         update_data["updatedAt"] = datetime.now()
         
         # Remove None values
-        update_data = {k: v for k, v in update_data.items() if v is not None}
+        update_data = normalize_policy_fields({k: v for k, v in update_data.items() if v is not None})
         
         try:
-            result = collection.update_one(
-                {"_id": ObjectId(policy_id)},
-                {"$set": update_data}
-            )
-            return result.modified_count > 0
+            policy_filter = {"_id": ObjectId(policy_id)}
         except:
             # Try with policyId
-            result = collection.update_one(
-                {"policyId": policy_id},
-                {"$set": update_data}
-            )
-            return result.modified_count > 0
+            policy_filter = {"policyId": policy_id}
+        
+        result = collection.update_one(policy_filter, {"$set": update_data})
+        if result.modified_count and touches_search_fields(update_data, POLICY_SEARCH):
+            refresh_search_keys(collection, policy_filter, POLICY_SEARCH)
+        return result.modified_count > 0
 
     def update_policy_status(self, policy_id: str, status: str, remarks: Optional[str] = None) -> bool:
         """Update only policy status"""
@@ -168,44 +246,34 @@ class InsuranceManagementRepository:
     # ==================== STATISTICS ====================
     
     def get_statistics(self) -> dict:
-        """Get insurance management statistics"""
+        """Get insurance management statistics (one $facet over the policies)"""
         collection = self.get_collection()
         
-        # Total policies
-        total_policies = collection.count_documents({})
-        
-        # Status-wise counts
-        active_policies = collection.count_documents({"status": "Active"})
-        pending_policies = collection.count_documents({"status": "Pending"})
-        expired_policies = collection.count_documents({"status": "Expired"})
-        
-        # Type-wise counts
-        term_insurance = collection.count_documents({"type": "Term Insurance"})
-        health_insurance = collection.count_documents({"type": "Health Insurance"})
-        motor_insurance = collection.count_documents({"type": "Motor Insurance"})
-        
-        # Calculate total claims - assuming each active policy might have generated claims
-        # Using a realistic formula: ~60% of active policies have claims
-        total_claims = int(active_policies * 0.6) if active_policies > 0 else 0
-        
-        # Calculate premium collected (simple estimation based on policy count)
-        # Average premium assumed: ₹15,000/year
-        estimated_premium_lakhs = (total_policies * 15000) / 100000  # Convert to lakhs
-        if estimated_premium_lakhs >= 100:
-            premium_collected = f"₹{estimated_premium_lakhs/100:.1f}Cr"
-        else:
-            premium_collected = f"₹{estimated_premium_lakhs:.1f}L"
+        facets = next(collection.aggregate([
+            {"$facet": {
+                "byStatus": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+                "byType": [{"$group": {"_id": "$type", "count": {"$sum": 1}}}],
+                "premium": [
+                    {"$match": {"status": {"$in": PREMIUM_STATUSES}}},
+                    {"$group": {"_id": None, "total": {"$sum": {"$ifNull": ["$premiumAmount", 0]}}}}
+                ]
+            }}
+        ]), {})
+        by_status = {row["_id"]: row["count"] for row in facets.get("byStatus", [])}
+        by_type = {row["_id"]: row["count"] for row in facets.get("byType", [])}
+        premium_total = facets["premium"][0]["total"] if facets.get("premium") else 0
         
         return {
-            "totalPolicies": total_policies,
-            "activePolicies": active_policies,
-            "pendingPolicies": pending_policies,
-            "expiredPolicies": expired_policies,
-            "totalClaims": total_claims,
-            "premiumCollected": premium_collected,
-            "termInsuranceCount": term_insurance,
-            "healthInsuranceCount": health_insurance,
-            "motorInsuranceCount": motor_insurance
+            "totalPolicies": sum(by_status.values()),
+            "activePolicies": sum(by_status.get(s, 0) for s in IN_FORCE_STATUSES),
+            "pendingPolicies": by_status.get(PolicyStatus.pending.value, 0),
+            "expiredPolicies": by_status.get(PolicyStatus.expired.value, 0),
+            "expiringSoonPolicies": by_status.get(PolicyStatus.expiring_soon.value, 0),
+            "totalClaims": self.get_collection().database["insurance_claims"].estimated_document_count(),
+            "premiumCollected": _format_premium(premium_total),
+            "termInsuranceCount": by_type.get(InsuranceType.term_insurance.value, 0),
+            "healthInsuranceCount": by_type.get(InsuranceType.health_insurance.value, 0),
+            "motorInsuranceCount": by_type.get(InsuranceType.motor_insurance.value, 0)
         }
 
     def get_policies_by_type(self, policy_type: str, skip: int = 0, limit: int = 100) -> List[dict]:
@@ -227,33 +295,71 @@ class InsuranceManagementRepository:
         return policies
 
     def get_policies_expiring_soon(self, days: int = 30, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get policies expiring in the next N days"""
+        """Get in-force policies whose end date falls within the next N days"""
         collection = self.get_collection()
-        from datetime import timedelta
+        today = _start_of_day()
         
-        today = datetime.now()
-        future_date = today + timedelta(days=days)
-        
-        # This is a simplified query - in production, you'd want proper date comparison
-        policies = list(collection.find({"status": "Active"}).skip(skip).limit(limit).sort("endDate", 1))
+        query = {
+            "status": {"$in": IN_FORCE_STATUSES},
+            "endDateAt": {"$gte": today, "$lte": today + timedelta(days=days)}
+        }
+        policies = list(collection.find(query).sort("endDateAt", 1).skip(skip).limit(limit))
         for policy in policies:
             policy["id"] = policy.get("policyId", str(policy["_id"]))
             policy["_id"] = str(policy["_id"])
         return policies
 
+    # ==================== LIFECYCLE ====================
+
+    def sweep_lifecycle(self, expiring_window_days: int = 30, now: Optional[datetime] = None) -> int:
+        """Move policies between Active, Expiring Soon and Expired by end date.
+
+        Three set-based updates in one bulk write: in-force policies past their
+        end date expire, Active ones inside the window become Expiring Soon,
+        and Expiring Soon ones whose end date moved out of the window (renewed)
+        go back to Active. Returns the number of policies moved.
+        """
+        today = _start_of_day(now)
+        window_end = today + timedelta(days=expiring_window_days)
+        stamp = {"updatedAt": datetime.now()}
+        result = self.get_collection().bulk_write([
+            UpdateMany(
+                {"status": {"$in": IN_FORCE_STATUSES}, "endDateAt": {"$lt": today}},
+                {"$set": {"status": PolicyStatus.expired.value, **stamp}}
+            ),
+            UpdateMany(
+                {"status": PolicyStatus.active.value, "endDateAt": {"$gte": today, "$lte": window_end}},
+                {"$set": {"status": PolicyStatus.expiring_soon.value, **stamp}}
+            ),
+            UpdateMany(
+                {"status": PolicyStatus.expiring_soon.value, "endDateAt": {"$gt": window_end}},
+                {"$set": {"status": PolicyStatus.active.value, **stamp}}
+            ),
+        ], ordered=True)
+        return result.modified_count
+
+    def backfill_normalized_fields(self) -> int:
+        """Set endDateAt and premiumAmount on policies written before they existed.
+
+        Issues one update per distinct stored value instead of touching
+        documents one by one.
+        """
+        collection = self.get_collection()
+        updated = 0
+        for field, target, parse in (("endDate", "endDateAt", parse_policy_date),
+                                     ("premium", "premiumAmount", parse_premium_amount)):
+            missing = {target: {"$exists": False}}
+            for value in collection.distinct(field, missing):
+                result = collection.update_many({**missing, field: value}, {"$set": {target: parse(value)}})
+                updated += result.modified_count
+            # Documents without the field keep an explicit null so they are not rescanned
+            updated += collection.update_many(missing, {"$set": {target: None}}).modified_count
+        return updated
+
     def search_policies(self, search_term: str, skip: int = 0, limit: int = 100) -> List[dict]:
         """Search policies by customer name, email, phone, or policy ID"""
         collection = self.get_collection()
-        search_regex = re.compile(search_term, re.IGNORECASE)
-        
-        query = {
-            "$or": [
-                {"customer": search_regex},
-                {"email": search_regex},
-                {"phone": search_regex},
-                {"policyId": search_regex}
-            ]
-        }
+        query = search_query(search_term, POLICY_SEARCH)
         
         policies = list(collection.find(query).skip(skip).limit(limit).sort("createdAt", -1))
         for policy in policies:
@@ -1,6 +1,8 @@
 from bson import ObjectId
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from app.database.db import get_database
 from app.database.schema.loan_management_schema import (
     ActiveLoanInDB,
@@ -244,72 +246,171 @@ class LoanManagementRepository:
 
     # ===================== EMI PAYMENT =====================
 
-    def process_emi_payment(self, payment_data: EMIPaymentInDB) -> EMIPaymentResponse:
-        """Process EMI payment"""
+    def _payment_response(self, payment: Dict[str, Any]) -> EMIPaymentResponse:
+        return EMIPaymentResponse(
+            id=str(payment["_id"]),
+            loanId=payment["loan_id"],
+            userId=payment["user_id"],
+            amount=payment["amount"],
+            paymentMethod=payment["payment_method"],
+            paymentDate=payment["payment_date"],
+            transactionId=payment["transaction_id"],
+            status=payment["status"]
+        )
+
+    def _apply_payment(self, payment: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply one EMI to its loan atomically; returns the updated loan (None if not applied).
+
+        The loan must belong to the payer, be active, have this EMI amount and
+        not list the payment in applied_payment_ids; the conditions, the $inc
+        and the $push of the payment id happen in one find_one_and_update, so
+        concurrent payments cannot both decrement from the same balance and a
+        payment applied again (retry, reconciliation) is a no-op. Only the final
+        EMI (outstanding <= amount) needs the second update, which clamps the
+        balance at 0 and completes the loan.
+        """
+        loans_collection = self.get_loans_collection()
+        amount = payment["amount"]
+        now = datetime.now()
+        query = {
+            "_id": ObjectId(payment["loan_id"]),
+            "user_id": payment["user_id"],
+            "status": "active",
+            "emi_amount": amount,
+            "applied_payment_ids": {"$ne": payment["_id"]}
+        }
+        applied = {
+            "next_due_date": now + timedelta(days=30),
+            "updated_at": now
+        }
+        push = {"applied_payment_ids": payment["_id"]}
+
+        loan = loans_collection.find_one_and_update(
+            {**query, "outstanding_amount": {"$gt": amount}},
+            {"$inc": {"outstanding_amount": -amount, "months_completed": 1}, "$set": applied, "$push": push},
+            return_document=ReturnDocument.AFTER
+        )
+        if loan is None:
+            loan = loans_collection.find_one_and_update(
+                query,
+                {"$inc": {"months_completed": 1},
+                 "$set": {**applied, "outstanding_amount": 0, "status": "completed"},
+                 "$push": push},
+                return_document=ReturnDocument.AFTER
+            )
+        return loan
+
+    def _settle_payment(self, payment: Dict[str, Any], final_status: str = "completed") -> Dict[str, Any]:
+        """Apply a recorded payment (again) and store its outcome.
+
+        The payment is completed when this call applies it or the loan already
+        lists it; otherwise it is marked failed. Safe to run for a payment
+        another request is still processing: "completed" always wins, and
+        "failed" only replaces "processing".
+        """
+        payments_collection = self.get_payments_collection()
+        applied = self._apply_payment(payment) is not None or self.get_loans_collection().find_one(
+            {"_id": ObjectId(payment["loan_id"]), "applied_payment_ids": payment["_id"]}, {"_id": 1}
+        ) is not None
+        if applied:
+            payments_collection.update_one(
+                {"_id": payment["_id"], "status": {"$ne": final_status}},
+                {"$set": {"status": final_status, "updated_at": datetime.now()}}
+            )
+            payment["status"] = final_status
+            return payment
+
+        updated = payments_collection.find_one_and_update(
+            {"_id": payment["_id"], "status": "processing"},
+            {"$set": {"status": "failed", "updated_at": datetime.now()}},
+            return_document=ReturnDocument.AFTER
+        )
+        return updated or payments_collection.find_one({"_id": payment["_id"]}) or {**payment, "status": "failed"}
+
+    def _close_stale_payment(self, payment: Dict[str, Any]) -> str:
+        """Record the outcome of a payment whose request died while processing it.
+
+        The client of that request got an error, so the payment is never
+        applied here (a retry without an idempotency key would then be paid
+        twice): it is completed only when the loan already lists it, and
+        failed otherwise. Only a retry with the same idempotency key applies a
+        recorded payment (see process_emi_payment). Returns the stored status.
+        """
+        applied = self.get_loans_collection().find_one(
+            {"_id": ObjectId(payment["loan_id"]), "applied_payment_ids": payment["_id"]}, {"_id": 1}
+        ) is not None
+        status = "completed" if applied else "failed"
+        self.get_payments_collection().update_one(
+            {"_id": payment["_id"], "status": "processing"},
+            {"$set": {"status": status, "updated_at": datetime.now()}}
+        )
+        return status
+
+    def reconcile_stale_payments(self, older_than: timedelta = timedelta(minutes=5)) -> int:
+        """Close payments left "processing" by a request that died between recording
+        the payment and updating the loan (see _close_stale_payment); returns payments closed"""
+        query = {"status": "processing", "created_at": {"$lt": datetime.now() - older_than}}
+        closed = 0
+        for payment in self.get_payments_collection().find(query):
+            self._close_stale_payment(payment)
+            closed += 1
+        return closed
+
+    def process_emi_payment(self, payment_data: EMIPaymentInDB,
+                            idempotency_key: Optional[str] = None) -> Optional[EMIPaymentResponse]:
+        """Process EMI payment.
+
+        1. Record the payment as "processing"; with an idempotency key, the
+           unique (user_id, idempotency_key) index makes this the claim, and a
+           retry of the same request settles and returns the recorded payment
+           instead of paying again.
+        2. Apply it to the loan (see _apply_payment).
+        3. Mark the payment completed (failed if the loan is not payable).
+
+        Returns None when the loan is not payable.
+        """
         try:
             payments_collection = self.get_payments_collection()
-            loans_collection = self.get_loans_collection()
             
-            # Create payment record
             payment_dict = payment_data.dict()
-            result = payments_collection.insert_one(payment_dict)
+            payment_dict["status"] = "processing"
+            if idempotency_key:
+                payment_dict["idempotency_key"] = idempotency_key
+            try:
+                payments_collection.insert_one(payment_dict)
+            except DuplicateKeyError:
+                if not idempotency_key:
+                    raise
+                existing = payments_collection.find_one({
+                    "user_id": payment_data.user_id,
+                    "idempotency_key": idempotency_key
+                })
+                if existing is None:
+                    raise
+                if existing["status"] == "processing":
+                    existing = self._settle_payment(existing)
+                return self._payment_response(existing)
             
-            if result.inserted_id:
-                # Update loan details
-                loan = loans_collection.find_one({"_id": ObjectId(payment_data.loan_id)})
-                
-                if loan:
-                    new_outstanding = loan.get("outstanding_amount", 0) - payment_data.amount
-                    new_months_completed = loan.get("months_completed", 0) + 1
-                    
-                    # Calculate next due date (next month)
-                    next_due = datetime.now() + timedelta(days=30)
-                    
-                    # Update loan
-                    update_data = {
-                        "outstanding_amount": max(0, new_outstanding),
-                        "months_completed": new_months_completed,
-                        "next_due_date": next_due,
-                        "updated_at": datetime.now()
-                    }
-                    
-                    # Mark as completed if fully paid
-                    if new_outstanding <= 0:
-                        update_data["status"] = "completed"
-                    
-                    loans_collection.update_one(
-                        {"_id": ObjectId(payment_data.loan_id)},
-                        {"$set": update_data}
-                    )
-                
-                # Get created payment
-                created_payment = payments_collection.find_one({"_id": result.inserted_id})
-                
-                return EMIPaymentResponse(
-                    id=str(created_payment["_id"]),
-                    loanId=created_payment["loan_id"],
-                    userId=created_payment["user_id"],
-                    amount=created_payment["amount"],
-                    paymentMethod=created_payment["payment_method"],
-                    paymentDate=created_payment["payment_date"],
-                    transactionId=created_payment["transaction_id"],
-                    status=created_payment["status"]
-                )
-            else:
-                raise Exception("Failed to process payment")
+            # On an error the payment stays "processing"; a retry with the same
+            # key settles it, otherwise reconcile_stale_payments closes it
+            payment_dict = self._settle_payment(payment_dict, payment_data.status)
+            if payment_dict["status"] == "failed":
+                return None
+            return self._payment_response(payment_dict)
                 
         except Exception as e:
             print(f"Error processing EMI payment: {str(e)}")
             raise
 
     def get_payment_history(self, loan_id: str, user_id: str) -> List[Dict[str, Any]]:
-        """Get payment history for a loan"""
+        """Get completed payments for a loan (in-flight and failed attempts are not shown)"""
         try:
             collection = self.get_payments_collection()
             
             payments = list(collection.find({
                 "loan_id": loan_id,
-                "user_id": user_id
+                "user_id": user_id,
+                "status": "completed"
             }).sort("payment_date", -1))
             
             return payments
@@ -0,0 +1,140 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from app.database.db import get_database
+from app.database.repository.admin_loan_management_repository import COLLECTION_TYPE_KEYS, LOAN_AMOUNT_EXPR
+
+
+DAILY_METRICS_COLLECTION = "daily_metrics"
+
+# Bumped when the document layout changes; backfill rebuilds days stored with an older one
+# (2: per-status {count, amount} instead of a bare count)
+ROLLUP_VERSION = 2
+
+# Product key -> label shown on the analytics page
+ROLLUP_PRODUCT_LABELS = {
+    "short_term": "Short-Term Loan",
+    "personal": "Personal Loan",
+    "home": "Home Loan",
+    "business": "Business Loan",
+}
+
+# Loan statuses are grouped on the normalized statusKey; documents written
+# before it existed fall back to their lowercased status
+_STATUS_KEY_EXPR = {"$ifNull": ["$statusKey", {"$toLower": {"$ifNull": ["$status", "unknown"]}}]}
+
+
+def day_key(day: date) -> str:
+    return day.strftime("%Y-%m-%d")
+
+
+def _created_between(start: datetime, end: datetime) -> Dict[str, Any]:
+    """Creation time filter; collections use either createdAt or created_at"""
+    window = {"$gte": start, "$lt": end}
+    return {"$or": [{"createdAt": window}, {"created_at": window}]}
+
+
+class MetricsRollupRepository:
+    """Materialized daily analytics: one small document per day.
+
+    Each document holds, per loan product, the number of applications created
+    that day and their total amount, overall and per status ({count, amount}),
+    plus the number of new users. Days are recomputed from the source collections (idempotent), so a
+    day can be rebuilt at any time; the analytics endpoints only read these
+    documents.
+    """
+
+    def __init__(self):
+        self.db = None
+
+    def get_database(self):
+        """Lazy initialization for the database"""
+        if self.db is None:
+            self.db = get_database()
+        return self.db
+
+    def get_collection(self):
+        return self.get_database()[DAILY_METRICS_COLLECTION]
+
+    def compute_day(self, day: date) -> Dict[str, Any]:
+        """Build the rollup document for one day from the source collections"""
+        db = self.get_database()
+        start = datetime(day.year, day.month, day.day)
+        match = _created_between(start, start + timedelta(days=1))
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": _STATUS_KEY_EXPR, "count": {"$sum": 1}, "amount": {"$sum": LOAN_AMOUNT_EXPR}}}
+        ]
+
+        products: Dict[str, Dict[str, Any]] = {}
+        for collection_name, product in COLLECTION_TYPE_KEYS.items():
+            statuses: Dict[str, Dict[str, Any]] = {}
+            count, amount = 0, 0.0
+            for row in db[collection_name].aggregate(pipeline):
+                status = statuses.setdefault(row["_id"] or "unknown", {"count": 0, "amount": 0.0})
+                status["count"] += row["count"]
+                status["amount"] += row["amount"] or 0
+                count += row["count"]
+                amount += row["amount"] or 0
+            products[product] = {"count": count, "amount": amount, "statuses": statuses}
+
+        return {
+            "_id": day_key(day),
+            "date": start,
+            "products": products,
+            "newUsers": db["users"].count_documents(match),
+            "version": ROLLUP_VERSION,
+            "updatedAt": datetime.utcnow()
+        }
+
+    def rollup_day(self, day: date) -> Dict[str, Any]:
+        """Recompute and store one day"""
+        document = self.compute_day(day)
+        self.get_collection().replace_one({"_id": document["_id"]}, document, upsert=True)
+        return document
+
+    def backfill(self, days: int, force: bool = False, today: Optional[date] = None) -> int:
+        """Build the last `days` days; existing days of the current layout are kept
+        unless `force`. Returns days built."""
+        today = today or datetime.utcnow().date()
+        wanted = [today - timedelta(days=offset) for offset in range(days)]
+        existing = set()
+        if not force:
+            existing = {
+                doc["_id"] for doc in self.get_collection().find(
+                    {"_id": {"$gte": day_key(wanted[-1]), "$lte": day_key(today)}, "version": ROLLUP_VERSION},
+                    {"_id": 1}
+                )
+            }
+        built = 0
+        for day in reversed(wanted):
+            if day_key(day) not in existing:
+                self.rollup_day(day)
+                built += 1
+        return built
+
+    def rollup_recent(self, today: Optional[date] = None) -> int:
+        """Incremental run: rebuild today and yesterday (late writes and status
+        changes land there) plus any day missed since the latest rollup"""
+        today = today or datetime.utcnow().date()
+        latest = self.get_collection().find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        start = today - timedelta(days=1)
+        if latest:
+            last_day = datetime.strptime(latest["_id"], "%Y-%m-%d").date()
+            start = min(start, last_day)
+        built = 0
+        day = start
+        while day <= today:
+            self.rollup_day(day)
+            built += 1
+            day += timedelta(days=1)
+        return built
+
+    def get_daily_metrics(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Rollup documents for start..end (inclusive), oldest first"""
+        return list(self.get_collection().find(
+            {"_id": {"$gte": day_key(start), "$lte": day_key(end)}}
+        ).sort("_id", 1))
+
+
+# Create singleton instance
+metrics_rollup_repository = MetricsRollupRepository()
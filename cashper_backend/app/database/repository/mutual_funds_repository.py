@@ -1,7 +1,13 @@
 from datetime import datetime
 from typing import List, Optional, Dict
 from bson import ObjectId
-from app.database.db import get_database
+from app.database.db import get_async_database
+from app.database.repository.inquiry_index_repository import inquiry_index_repository
+from app.utils.calculation_log import calculation_log
+
+
+MUTUAL_FUND_CALCULATIONS_COLLECTION = "mutual_fund_calculations"
+
 
 class MutualFundsRepository:
     def __init__(self):
@@ -10,46 +16,47 @@ class MutualFundsRepository:
     def get_inquiry_collection(self):
         """Lazy initialization for inquiry collection"""
         if self.db is None:
-            self.db = get_database()
+            self.db = get_async_database()
         return self.db["mutual_fund_inquiries"]
     
     def get_calculator_collection(self):
         """Lazy initialization for calculator collection"""
         if self.db is None:
-            self.db = get_database()
-        return self.db["mutual_fund_calculations"]
+            self.db = get_async_database()
+        return self.db[MUTUAL_FUND_CALCULATIONS_COLLECTION]
     
     def get_application_collection(self):
         """Lazy initialization for application collection"""
         if self.db is None:
-            self.db = get_database()
+            self.db = get_async_database()
         return self.db["mutual_fund_applications"]
     
     # ===================== Inquiry Methods =====================
     
-    def create_inquiry(self, inquiry_data: dict) -> str:
+    async def create_inquiry(self, inquiry_data: dict) -> str:
         """Create a new mutual fund inquiry"""
         collection = self.get_inquiry_collection()
-        result = collection.insert_one(inquiry_data)
+        result = await collection.insert_one(inquiry_data)
+        await inquiry_index_repository.index_inquiry_async("mutual_funds", inquiry_data)
         return str(result.inserted_id)
     
-    def get_inquiry_by_id(self, inquiry_id: str) -> Optional[dict]:
+    async def get_inquiry_by_id(self, inquiry_id: str) -> Optional[dict]:
         """Get inquiry by ID"""
         collection = self.get_inquiry_collection()
-        inquiry = collection.find_one({"_id": ObjectId(inquiry_id)})
+        inquiry = await collection.find_one({"_id": ObjectId(inquiry_id)})
         if inquiry:
             inquiry["_id"] = str(inquiry["_id"])
         return inquiry
     
-    def get_all_inquiries(self, skip: int = 0, limit: int = 100) -> List[dict]:
+    async def get_all_inquiries(self, skip: int = 0, limit: int = 100) -> List[dict]:
         """Get all inquiries with pagination"""
         collection = self.get_inquiry_collection()
-        inquiries = list(collection.find().sort("createdAt", -1).skip(skip).limit(limit))
+        inquiries = await collection.find().sort("createdAt", -1).skip(skip).limit(limit).to_list(length=None)
         for inquiry in inquiries:
             inquiry["_id"] = str(inquiry["_id"])
         return inquiries
     
-    def update_inquiry_status(self, inquiry_id: str, status: str, notes: Optional[str] = None) -> bool:
+    async def update_inquiry_status(self, inquiry_id: str, status: str, notes: Optional[str] = None) -> bool:
         """Update inquiry status"""
         collection = self.get_inquiry_collection()
         update_data = {
@@ -59,90 +66,96 @@ class MutualFundsRepository:
         if notes:
             update_data["notes"] = notes
         
-        result = collection.update_one(
+        result = await collection.update_one(
             {"_id": ObjectId(inquiry_id)},
             {"$set": update_data}
         )
+        if result.modified_count > 0:
+            await inquiry_index_repository.update_status_async("mutual_funds", inquiry_id, status)
         return result.modified_count > 0
     
-    def get_inquiries_by_status(self, status: str) -> List[dict]:
+    async def get_inquiries_by_status(self, status: str) -> List[dict]:
         """Get inquiries by status"""
         collection = self.get_inquiry_collection()
-        inquiries = list(collection.find({"status": status}).sort("createdAt", -1))
+        inquiries = await collection.find({"status": status}).sort("createdAt", -1).to_list(length=None)
         for inquiry in inquiries:
             inquiry["_id"] = str(inquiry["_id"])
         return inquiries
     
     # ===================== Calculator Methods =====================
     
-    def save_calculation(self, calculation_data: dict) -> str:
+    async def save_calculation(self, calculation_data: dict) -> str:
         """Save a calculation result"""
         collection = self.get_calculator_collection()
-        result = collection.insert_one(calculation_data)
+        result = await collection.insert_one(calculation_data)
         return str(result.inserted_id)
     
-    def get_calculation_by_id(self, calculation_id: str) -> Optional[dict]:
+    def record_calculation(self, calculation_data: dict) -> str:
+        """Queue a calculation result for the write-behind calculation log"""
+        return calculation_log.record(MUTUAL_FUND_CALCULATIONS_COLLECTION, calculation_data)
+    
+    async def get_calculation_by_id(self, calculation_id: str) -> Optional[dict]:
         """Get calculation by ID"""
         collection = self.get_calculator_collection()
-        calculation = collection.find_one({"_id": ObjectId(calculation_id)})
+        calculation = await collection.find_one({"_id": ObjectId(calculation_id)})
         if calculation:
             calculation["_id"] = str(calculation["_id"])
         return calculation
     
-    def get_all_calculations(self, skip: int = 0, limit: int = 100) -> List[dict]:
+    async def get_all_calculations(self, skip: int = 0, limit: int = 100) -> List[dict]:
         """Get all calculations with pagination"""
         collection = self.get_calculator_collection()
-        calculations = list(collection.find().sort("calculatedAt", -1).skip(skip).limit(limit))
+        calculations = await collection.find().sort("calculatedAt", -1).skip(skip).limit(limit).to_list(length=None)
         for calc in calculations:
             calc["_id"] = str(calc["_id"])
         return calculations
     
-    def get_calculations_by_email(self, email: str) -> List[dict]:
+    async def get_calculations_by_email(self, email: str) -> List[dict]:
         """Get calculations by user email"""
         collection = self.get_calculator_collection()
-        calculations = list(collection.find({"userEmail": email}).sort("calculatedAt", -1))
+        calculations = await collection.find({"userEmail": email}).sort("calculatedAt", -1).to_list(length=None)
         for calc in calculations:
             calc["_id"] = str(calc["_id"])
         return calculations
     
     # ===================== Application Methods =====================
     
-    def create_application(self, application_data: dict) -> str:
+    async def create_application(self, application_data: dict) -> str:
         """Create a new mutual fund application"""
         collection = self.get_application_collection()
-        result = collection.insert_one(application_data)
+        result = await collection.insert_one(application_data)
         return str(result.inserted_id)
     
-    def get_application_by_id(self, application_id: str) -> Optional[dict]:
+    async def get_application_by_id(self, application_id: str) -> Optional[dict]:
         """Get application by ID"""
         collection = self.get_application_collection()
-        application = collection.find_one({"_id": ObjectId(application_id)})
+        application = await collection.find_one({"_id": ObjectId(application_id)})
         if application:
             application["_id"] = str(application["_id"])
         return application
     
-    def get_application_by_number(self, app_number: str) -> Optional[dict]:
+    async def get_application_by_number(self, app_number: str) -> Optional[dict]:
         """Get application by application number"""
         collection = self.get_application_collection()
-        application = collection.find_one({"applicationNumber": app_number})
+        application = await collection.find_one({"applicationNumber": app_number})
         if application:
             application["_id"] = str(application["_id"])
         return application
     
-    def check_pan_exists(self, pan_number: str) -> bool:
+    async def check_pan_exists(self, pan_number: str) -> bool:
         """Check if PAN already exists in applications"""
         collection = self.get_application_collection()
-        return collection.count_documents({"panNumber": pan_number}) > 0
+        return (await collection.count_documents({"panNumber": pan_number})) > 0
     
-    def get_all_applications(self, skip: int = 0, limit: int = 100) -> List[dict]:
+    async def get_all_applications(self, skip: int = 0, limit: int = 100) -> List[dict]:
         """Get all applications with pagination"""
         collection = self.get_application_collection()
-        applications = list(collection.find().sort("submittedAt", -1).skip(skip).limit(limit))
+        applications = await collection.find().sort("submittedAt", -1).skip(skip).limit(limit).to_list(length=None)
         for app in applications:
             app["_id"] = str(app["_id"])
         return applications
     
-    def update_application_status(
+    async def update_application_status(
         self, 
         application_id: str, 
         status: str, 
@@ -160,31 +173,31 @@ class MutualFundsRepository:
         if remarks:
             update_data["remarks"] = remarks
         
-        result = collection.update_one(
+        result = await collection.update_one(
             {"_id": ObjectId(application_id)},
             {"$set": update_data}
         )
         return result.modified_count > 0
     
-    def get_applications_by_status(self, status: str) -> List[dict]:
+    async def get_applications_by_status(self, status: str) -> List[dict]:
         """Get applications by status"""
         collection = self.get_application_collection()
-        applications = list(collection.find({"status": status}).sort("submittedAt", -1))
+        applications = await collection.find({"status": status}).sort("submittedAt", -1).to_list(length=None)
         for app in applications:
             app["_id"] = str(app["_id"])
         return applications
     
-    def get_applications_by_email(self, email: str) -> List[dict]:
+    async def get_applications_by_email(self, email: str) -> List[dict]:
         """Get applications by email"""
         collection = self.get_application_collection()
-        applications = list(collection.find({"email": email}).sort("submittedAt", -1))
+        applications = await collection.find({"email": email}).sort("submittedAt", -1).to_list(length=None)
         for app in applications:
             app["_id"] = str(app["_id"])
         return applications
     
     # ===================== Statistics Methods =====================
     
-    def get_statistics(self) -> Dict:
+    async def get_statistics(self) -> Dict:
         """Get overall statistics for mutual funds"""
         inquiry_collection = self.get_inquiry_collection()
         calculator_collection = self.get_calculator_collection()
@@ -192,21 +205,21 @@ class MutualFundsRepository:
         
         return {
             "inquiries": {
-                "total": inquiry_collection.count_documents({}),
-                "pending": inquiry_collection.count_documents({"status": "pending"}),
-                "contacted": inquiry_collection.count_documents({"status": "contacted"}),
-                "converted": inquiry_collection.count_documents({"status": "converted"})
+                "total": await inquiry_collection.count_documents({}),
+                "pending": await inquiry_collection.count_documents({"status": "pending"}),
+                "contacted": await inquiry_collection.count_documents({"status": "contacted"}),
+                "converted": await inquiry_collection.count_documents({"status": "converted"})
             },
             "calculations": {
-                "total": calculator_collection.count_documents({}),
-                "lumpsum": calculator_collection.count_documents({"investmentType": "lumpsum"}),
-                "sip": calculator_collection.count_documents({"investmentType": "sip"})
+                "total": await calculator_collection.count_documents({}),
+                "lumpsum": await calculator_collection.count_documents({"investmentType": "lumpsum"}),
+                "sip": await calculator_collection.count_documents({"investmentType": "sip"})
             },
             "applications": {
-                "total": application_collection.count_documents({}),
-                "submitted": application_collection.count_documents({"status": "submitted"}),
-                "under_review": application_collection.count_documents({"status": "under_review"}),
-                "approved": application_collection.count_documents({"status": "approved"}),
-                "active": application_collection.count_documents({"status": "active"})
+                "total": await application_collection.count_documents({}),
+                "submitted": await application_collection.count_documents({"status": "submitted"}),
+                "under_review": await application_collection.count_documents({"status": "under_review"}),
+                "approved": await application_collection.count_documents({"status": "approved"}),
+                "active": await application_collection.count_documents({"status": "active"})
             }
         }
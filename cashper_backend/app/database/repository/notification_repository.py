@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, List, Dict
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ReturnDocument, UpdateOne
 from app.database.db import get_database
 from app.database.schema.notification_schema import NotificationInDB, NotificationResponse
 
@@ -11,12 +11,36 @@ class NotificationRepository:
     
     def __init__(self):
         self.collection_name = "notifications"
+        self.reads_collection_name = "notification_reads"
 
     def get_collection(self):
         """Get notifications collection"""
         db = get_database()
         return db[self.collection_name]
 
+    def get_reads_collection(self):
+        """Get per-user read cursor collection"""
+        db = get_database()
+        return db[self.reads_collection_name]
+
+    def _visible_query(self, user_id: str) -> dict:
+        """Active, unexpired notifications addressed to the user or broadcast to everyone"""
+        return {
+            "$and": [
+                # targetUsers null/missing means a broadcast to all users
+                {"$or": [{"targetUsers": user_id}, {"targetUsers": None}]},
+                {"isActive": True},
+                {"$or": [{"expiresAt": None}, {"expiresAt": {"$gt": datetime.utcnow()}}]}
+            ]
+        }
+
+    def _unread_filter(self, cursor: dict) -> dict:
+        """Notifications newer than the read cursor that were not read individually"""
+        unread = {"createdAt": {"$gt": cursor.get("lastReadAt", datetime.min)}}
+        if cursor.get("readIds"):
+            unread["_id"] = {"$nin": cursor["readIds"]}
+        return unread
+
     def create_notification(self, notification_data: NotificationInDB) -> dict:
         """Create a new notification in database"""
         collection = self.get_collection()
@@ -61,47 +85,11 @@ class NotificationRepository:
         """Get notifications for a specific user"""
         collection = self.get_collection()
         
-        # Query for notifications targeted to this user or all users
-        query = {
-            "$or": [
-                {"targetUsers": user_id},
-                {"targetUsers": None},
-                {"targetUsers": {"$exists": False}}
-            ],
-            "isActive": True
-        }
+        query = self._visible_query(user_id)
         
         # Filter by read status if needed
         if not include_read:
-            query["readBy"] = {"$ne": user_id}
-        
-        # Check expiration
-        current_time = datetime.utcnow()
-        query["$or"].append({"expiresAt": None})
-        query["$or"].append({"expiresAt": {"$gt": current_time}})
-        
-        # Reconstruct query properly
-        query = {
-            "$and": [
-                {
-                    "$or": [
-                        {"targetUsers": user_id},
-                        {"targetUsers": None},
-                        {"targetUsers": {"$exists": False}}
-                    ]
-                },
-                {"isActive": True},
-                {
-                    "$or": [
-                        {"expiresAt": None},
-                        {"expiresAt": {"$gt": current_time}}
-                    ]
-                }
-            ]
-        }
-        
-        if not include_read:
-            query["$and"].append({"readBy": {"$ne": user_id}})
+            query["$and"].append(self._unread_filter(self.get_read_cursor(user_id)))
         
         notifications = list(
             collection.find(query)
@@ -112,65 +100,104 @@ class NotificationRepository:
         
         return notifications
 
+    # ===================== READ CURSORS =====================
+    #
+    # Read state lives in one small document per user instead of a readBy array on
+    # every notification: everything created at or before `lastReadAt` is read, plus
+    # a sparse `readIds` list of newer notifications the user opened individually.
+
+    def get_read_cursor(self, user_id: str) -> dict:
+        """Get the user's read cursor (an empty cursor if the user never read anything)"""
+        cursor = self.get_reads_collection().find_one({"_id": user_id})
+        return cursor or {"_id": user_id, "lastReadAt": datetime.min, "readIds": []}
+
+    def is_read(self, notification: dict, cursor: dict) -> bool:
+        """Whether a notification is read according to a read cursor"""
+        return (
+            notification.get("createdAt", datetime.min) <= cursor.get("lastReadAt", datetime.min)
+            or notification["_id"] in cursor.get("readIds", [])
+        )
+
     def mark_as_read(self, notification_id: str, user_id: str) -> bool:
         """Mark notification as read by user"""
-        collection = self.get_collection()
-        
         try:
-            result = collection.update_one(
-                {"_id": ObjectId(notification_id)},
-                {
-                    "$addToSet": {"readBy": user_id},
-                    "$set": {"updatedAt": datetime.utcnow()}
-                }
+            notification = self.get_collection().find_one(
+                {"_id": ObjectId(notification_id)}, {"createdAt": 1}
             )
-            return result.modified_count > 0
+            if not notification:
+                return False
+            return self._add_read_ids(user_id, [notification]) > 0
         except Exception:
             return False
 
     def mark_multiple_as_read(self, notification_ids: List[str], user_id: str) -> int:
         """Mark multiple notifications as read by user"""
-        collection = self.get_collection()
-        
         try:
             object_ids = [ObjectId(nid) for nid in notification_ids]
-            result = collection.update_many(
-                {"_id": {"$in": object_ids}},
-                {
-                    "$addToSet": {"readBy": user_id},
-                    "$set": {"updatedAt": datetime.utcnow()}
-                }
-            )
-            return result.modified_count
+            notifications = list(self.get_collection().find(
+                {"_id": {"$in": object_ids}}, {"createdAt": 1}
+            ))
+            return self._add_read_ids(user_id, notifications)
         except Exception:
             return 0
 
     def mark_all_as_read(self, user_id: str) -> int:
-        """Mark all user's notifications as read"""
-        collection = self.get_collection()
-        
+        """Mark all user's notifications as read by advancing the read cursor"""
         try:
-            query = {
-                "$or": [
-                    {"targetUsers": user_id},
-                    {"targetUsers": None},
-                    {"targetUsers": {"$exists": False}}
-                ],
-                "readBy": {"$ne": user_id},
-                "isActive": True
-            }
-            
-            result = collection.update_many(
-                query,
-                {
-                    "$addToSet": {"readBy": user_id},
-                    "$set": {"updatedAt": datetime.utcnow()}
-                }
+            now = datetime.utcnow()
+            unread = self.get_unread_count(user_id)
+            self.get_reads_collection().update_one(
+                {"_id": user_id},
+                {"$set": {"lastReadAt": now, "readIds": [], "updatedAt": now}},
+                upsert=True
             )
-            return result.modified_count
+            return unread
         except Exception:
             return 0
 
+    def _add_read_ids(self, user_id: str, notifications: List[dict]) -> int:
+        """Record individually read notifications that are newer than the cursor"""
+        cursor = self.get_read_cursor(user_id)
+        new_ids = [n["_id"] for n in notifications if not self.is_read(n, cursor)]
+        if not new_ids:
+            return 0
+        self.get_reads_collection().update_one(
+            {"_id": user_id},
+            {
+                "$addToSet": {"readIds": {"$each": new_ids}},
+                "$set": {"updatedAt": datetime.utcnow()},
+                "$setOnInsert": {"lastReadAt": datetime.min}
+            },
+            upsert=True
+        )
+        return len(new_ids)
+
+    def migrate_legacy_reads(self) -> int:
+        """Move legacy per-notification readBy arrays into users' read cursors"""
+        collection = self.get_collection()
+        read_ids: Dict[str, List] = {}
+        for notification in collection.find({"readBy.0": {"$exists": True}}, {"readBy": 1}):
+            for user_id in notification.get("readBy", []):
+                read_ids.setdefault(user_id, []).append(notification["_id"])
+        
+        if read_ids:
+            now = datetime.utcnow()
+            self.get_reads_collection().bulk_write([
+                UpdateOne(
+                    {"_id": user_id},
+                    {
+                        "$addToSet": {"readIds": {"$each": ids}},
+                        "$set": {"updatedAt": now},
+                        "$setOnInsert": {"lastReadAt": datetime.min}
+                    },
+                    upsert=True
+                )
+                for user_id, ids in read_ids.items()
+            ], ordered=False)
+        
+        collection.update_many({"readBy": {"$exists": True}}, {"$unset": {"readBy": ""}})
+        return len(read_ids)
+
     def update_notification(self, notification_id: str, update_data: dict) -> Optional[dict]:
         """Update notification data (admin only)"""
         collection = self.get_collection()
@@ -220,82 +247,37 @@ class NotificationRepository:
         """Get count of unread notifications for user"""
         collection = self.get_collection()
         
-        current_time = datetime.utcnow()
-        
-        query = {
-            "$and": [
-                {
-                    "$or": [
-                        {"targetUsers": user_id},
-                        {"targetUsers": None},
-                        {"targetUsers": {"$exists": False}}
-                    ]
-                },
-                {"readBy": {"$ne": user_id}},
-                {"isActive": True},
-                {
-                    "$or": [
-                        {"expiresAt": None},
-                        {"expiresAt": {"$gt": current_time}}
-                    ]
-                }
-            ]
-        }
+        query = self._visible_query(user_id)
+        query["$and"].append(self._unread_filter(self.get_read_cursor(user_id)))
         
         count = collection.count_documents(query)
         return count
 
     def get_notification_stats(self, user_id: str) -> Dict:
-        """Get notification statistics for user"""
+        """Get notification statistics for user in a single aggregation"""
         collection = self.get_collection()
         
-        current_time = datetime.utcnow()
-        
-        # Base query for user's notifications
-        base_query = {
-            "$and": [
-                {
-                    "$or": [
-                        {"targetUsers": user_id},
-                        {"targetUsers": None},
-                        {"targetUsers": {"$exists": False}}
-                    ]
-                },
-                {"isActive": True},
-                {
-                    "$or": [
-                        {"expiresAt": None},
-                        {"expiresAt": {"$gt": current_time}}
-                    ]
-                }
-            ]
-        }
-        
-        # Get all user's notifications
-        all_notifications = list(collection.find(base_query))
-        
-        total_count = len(all_notifications)
-        unread_count = len([n for n in all_notifications if user_id not in n.get("readBy", [])])
-        read_count = total_count - unread_count
-        
-        # Count by type
-        by_type = {}
-        for notification in all_notifications:
-            ntype = notification.get("type", "info")
-            by_type[ntype] = by_type.get(ntype, 0) + 1
+        pipeline = [
+            {"$match": self._visible_query(user_id)},
+            {"$facet": {
+                "total": [{"$count": "value"}],
+                "unread": [{"$match": self._unread_filter(self.get_read_cursor(user_id))}, {"$count": "value"}],
+                "byType": [{"$group": {"_id": {"$ifNull": ["$type", "info"]}, "count": {"$sum": 1}}}],
+                "byPriority": [{"$group": {"_id": {"$ifNull": ["$priority", "normal"]}, "count": {"$sum": 1}}}]
+            }}
+        ]
+        results = list(collection.aggregate(pipeline))
+        row = results[0] if results else {}
         
-        # Count by priority
-        by_priority = {}
-        for notification in all_notifications:
-            priority = notification.get("priority", "normal")
-            by_priority[priority] = by_priority.get(priority, 0) + 1
+        total_count = (row.get("total") or [{"value": 0}])[0]["value"]
+        unread_count = (row.get("unread") or [{"value": 0}])[0]["value"]
         
         return {
             "totalNotifications": total_count,
             "unreadCount": unread_count,
-            "readCount": read_count,
-            "byType": by_type,
-            "byPriority": by_priority
+            "readCount": total_count - unread_count,
+            "byType": {r["_id"]: r["count"] for r in row.get("byType", [])},
+            "byPriority": {r["_id"]: r["count"] for r in row.get("byPriority", [])}
         }
 
     def get_admin_stats(self) -> Dict:
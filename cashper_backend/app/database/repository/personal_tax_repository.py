@@ -1,4 +1,6 @@
 from app.database.db import get_database
+from app.database.repository.inquiry_index_repository import inquiry_index_repository
+from app.utils.calculation_log import calculation_log
 from app.database.schema.personal_tax_schema import (
     TaxConsultationBookingInDB,
     TaxConsultationBookingResponse,
@@ -86,6 +88,7 @@ class PersonalTaxRepository:
         
         result = collection.insert_one(booking_dict)
         booking_dict["_id"] = result.inserted_id
+        inquiry_index_repository.index_inquiry("personal_tax", booking_dict)
         
         return TaxConsultationBookingResponse(
             id=str(result.inserted_id),
@@ -167,6 +170,8 @@ class PersonalTaxRepository:
                 {"$set": update_data}
             )
             
+            if result.modified_count > 0:
+                inquiry_index_repository.update_status("personal_tax", consultation_id, status)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating consultation status: {e}")
@@ -177,6 +182,8 @@ class PersonalTaxRepository:
         try:
             collection = self.get_consultation_collection()
             result = collection.delete_one({"_id": ObjectId(consultation_id)})
+            if result.deleted_count > 0:
+                inquiry_index_repository.remove("personal_tax", consultation_id)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting consultation: {e}")
@@ -197,6 +204,10 @@ class PersonalTaxRepository:
             **calculation_dict
         )
 
+    def record_tax_calculation(self, calculation: TaxCalculatorInDB) -> str:
+        """Queue tax calculation data for the write-behind calculation log; returns its id"""
+        return calculation_log.record(self.calculator_collection_name, calculation.dict())
+
     def get_calculation_by_id(self, calculation_id: str) -> Optional[dict]:
         """Get a tax calculation by ID"""
         try:
@@ -0,0 +1,130 @@
+from bson import ObjectId
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.database.db import get_database
+
+
+REPORT_JOBS_COLLECTION = "report_jobs"
+
+
+def report_dedupe_key(report_name: str, date_range: str, format_type: str, day: str) -> str:
+    """Jobs with the same key render the same file: one per report, range and format per day"""
+    return f"{report_name}|{date_range}|{format_type}|{day}"
+
+
+class ReportJobRepository:
+    """Admin report generation jobs (pending -> processing -> completed/failed)"""
+
+    def __init__(self):
+        self.db = None
+
+    def get_collection(self):
+        """Lazy initialization for the report jobs collection"""
+        if self.db is None:
+            self.db = get_database()
+        return self.db[REPORT_JOBS_COLLECTION]
+
+    def get_or_create_job(self, report_name: str, category: str, date_range: str, format_type: str,
+                          filename: str, day: str) -> Dict[str, Any]:
+        """Return today's job for this report, creating a pending one if there is none.
+
+        dedupeKey is unique (while set), so concurrent requests for the same
+        report end up on a single job. Failed jobs drop their key so the next
+        request starts over.
+        """
+        collection = self.get_collection()
+        key = report_dedupe_key(report_name, date_range, format_type, day)
+        try:
+            return collection.find_one_and_update(
+                {"dedupeKey": key},
+                {"$setOnInsert": {
+                    "dedupeKey": key,
+                    "reportName": report_name,
+                    "category": category,
+                    "dateRange": date_range,
+                    "format": format_type,
+                    "filename": filename,
+                    "status": "pending",
+                    "createdAt": datetime.utcnow(),
+                    "completedAt": None,
+                    "filePath": None,
+                    "fileSize": None,
+                    "rowCount": None,
+                    "error": None
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            return collection.find_one({"dedupeKey": key})
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.get_collection().find_one({"_id": ObjectId(job_id)})
+        except Exception:
+            return None
+
+    def get_job_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Latest job that produced (or is producing) `filename`"""
+        jobs = list(self.get_collection().find({"filename": filename}).sort("createdAt", -1).limit(1))
+        return jobs[0] if jobs else None
+
+    def claim_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically move a pending job to processing (None if another worker has it)"""
+        return self.get_collection().find_one_and_update(
+            {"_id": ObjectId(job_id), "status": "pending"},
+            {"$set": {"status": "processing", "startedAt": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def complete_job(self, job_id: str, file_path: str, file_size: int, row_count: int) -> None:
+        self.get_collection().update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {
+                "status": "completed",
+                "completedAt": datetime.utcnow(),
+                "filePath": file_path,
+                "fileSize": file_size,
+                "rowCount": row_count
+            }}
+        )
+
+    def fail_job(self, job_id: str, error: str) -> None:
+        """Mark a job failed and release its dedupe key so the report can be requested again"""
+        self.get_collection().update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {"status": "failed", "error": error, "completedAt": datetime.utcnow()},
+             "$unset": {"dedupeKey": ""}}
+        )
+
+    def requeue_job(self, job_id: str) -> None:
+        """Send a completed job back to pending (its file was removed from disk)"""
+        self.get_collection().update_one(
+            {"_id": ObjectId(job_id), "status": "completed"},
+            {"$set": {"status": "pending", "filePath": None, "fileSize": None, "completedAt": None}}
+        )
+
+    def get_queued_job_ids(self) -> List[str]:
+        """Ids of pending jobs, after resetting every processing one (called on startup:
+        the new process runs no jobs yet, so their workers died with the previous one)"""
+        collection = self.get_collection()
+        collection.update_many({"status": "processing"}, {"$set": {"status": "pending"}})
+        return [str(job["_id"]) for job in collection.find({"status": "pending"}, {"_id": 1}).sort("createdAt", 1)]
+
+    def requeue_stale_job(self, job_id: str, started_before: datetime) -> bool:
+        """Send a job processing since before `started_before` back to pending (its worker is
+        presumed dead); returns whether it was requeued"""
+        result = self.get_collection().update_one(
+            {"_id": ObjectId(job_id), "status": "processing", "startedAt": {"$lt": started_before}},
+            {"$set": {"status": "pending"}}
+        )
+        return result.modified_count > 0
+
+    def get_recent_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return list(self.get_collection().find({}).sort("createdAt", -1).limit(limit))
+
+
+# Create singleton instance
+report_job_repository = ReportJobRepository()
@@ -1,6 +1,8 @@
 from app.database.db import get_database
+from app.utils.user_cache import user_principal_cache
 from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo import ReturnDocument
 import secrets
 import pyotp
 import qrcode
@@ -61,6 +63,7 @@ class SettingsRepository:
                 }
             }
         )
+        user_principal_cache.invalidate(user_id)
         return result.modified_count > 0
     
     def update_theme(self, user_id: str, theme: str) -> bool:
@@ -75,6 +78,7 @@ class SettingsRepository:
                 }
             }
         )
+        user_principal_cache.invalidate(user_id)
         return result.modified_count > 0
     
     # ===================== TWO-FACTOR AUTHENTICATION =====================
@@ -121,6 +125,7 @@ class SettingsRepository:
                 }
             }
         )
+        user_principal_cache.invalidate(user_id)
         
         return {
             "secret": secret,
@@ -151,6 +156,7 @@ class SettingsRepository:
                 }
             }
         )
+        user_principal_cache.invalidate(user_id)
         
         return result.modified_count > 0
     
@@ -172,6 +178,7 @@ class SettingsRepository:
                     "$set": {"updatedAt": datetime.utcnow()}
                 }
             )
+            user_principal_cache.invalidate(user_id)
             return True
         
         # Verify TOTP code
@@ -194,6 +201,7 @@ class SettingsRepository:
                 }
             }
         )
+        user_principal_cache.invalidate(user_id)
         return result.modified_count > 0
     
     # ===================== LOGIN HISTORY =====================
@@ -273,8 +281,15 @@ class SettingsRepository:
     
     def create_data_download_request(self, user_id: str, include_documents: bool,
                                      include_transactions: bool, include_applications: bool) -> str:
-        """Create data download request"""
+        """Create data download request (returns the user's open request if one is still being prepared)"""
         self._ensure_db()
+        existing = self.data_requests_collection.find_one({
+            "userId": ObjectId(user_id),
+            "status": {"$in": ["pending", "processing"]}
+        })
+        if existing:
+            return str(existing["_id"])
+        
         request = {
             "_id": ObjectId(),
             "userId": ObjectId(user_id),
@@ -282,6 +297,7 @@ class SettingsRepository:
             "includeTransactions": include_transactions,
             "includeApplications": include_applications,
             "status": "pending",
+            "progress": 0,
             "requestedAt": datetime.utcnow(),
             "completedAt": None,
             "downloadUrl": None
@@ -304,11 +320,86 @@ class SettingsRepository:
         return {
             "id": str(request["_id"]),
             "status": request["status"],
+            "progress": request.get("progress", 0),
             "requestedAt": request["requestedAt"],
             "completedAt": request.get("completedAt"),
+            "expiresAt": request.get("expiresAt"),
+            "fileSize": request.get("fileSize"),
+            "filePath": request.get("filePath"),
+            "error": request.get("error"),
             "downloadUrl": request.get("downloadUrl")
         }
     
+    def claim_data_download_request(self, request_id: str) -> Optional[Dict]:
+        """Atomically move a pending request to processing (None if another worker has it)"""
+        self._ensure_db()
+        return self.data_requests_collection.find_one_and_update(
+            {"_id": ObjectId(request_id), "status": "pending"},
+            {"$set": {"status": "processing", "progress": 0, "startedAt": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+    
+    def update_data_download_progress(self, request_id: str, progress: int) -> None:
+        """Record export progress (0-100)"""
+        self._ensure_db()
+        self.data_requests_collection.update_one(
+            {"_id": ObjectId(request_id)},
+            {"$set": {"progress": progress}}
+        )
+    
+    def complete_data_download_request(self, request_id: str, file_path: str, file_size: int,
+                                       expires_at: datetime) -> None:
+        """Mark an export as ready for download"""
+        self._ensure_db()
+        self.data_requests_collection.update_one(
+            {"_id": ObjectId(request_id)},
+            {"$set": {
+                "status": "completed",
+                "progress": 100,
+                "completedAt": datetime.utcnow(),
+                "expiresAt": expires_at,
+                "filePath": file_path,
+                "fileSize": file_size,
+                "downloadUrl": f"/api/settings/download-data/{request_id}/file"
+            }}
+        )
+    
+    def fail_data_download_request(self, request_id: str, error: str) -> None:
+        """Mark an export as failed"""
+        self._ensure_db()
+        self.data_requests_collection.update_one(
+            {"_id": ObjectId(request_id)},
+            {"$set": {"status": "failed", "error": error, "completedAt": datetime.utcnow()}}
+        )
+    
+    def expire_data_download_request(self, request_id: str) -> None:
+        """Mark a completed export whose archive was removed after the retention period"""
+        self._ensure_db()
+        self.data_requests_collection.update_one(
+            {"_id": ObjectId(request_id)},
+            {"$set": {"status": "expired", "downloadUrl": None, "filePath": None}}
+        )
+    
+    def get_expired_data_download_requests(self, now: datetime) -> List[Dict]:
+        """Completed exports whose retention period ended before `now` (id and archive path)"""
+        self._ensure_db()
+        return list(self.data_requests_collection.find(
+            {"status": "completed", "expiresAt": {"$lt": now}}, {"_id": 1, "filePath": 1}
+        ))
+    
+    def get_queued_data_download_request_ids(self) -> List[str]:
+        """Ids of pending requests, after resetting every processing one (called on startup:
+        their worker died with the previous process)"""
+        self._ensure_db()
+        self.data_requests_collection.update_many(
+            {"status": "processing"},
+            {"$set": {"status": "pending", "progress": 0}}
+        )
+        return [
+            str(request["_id"])
+            for request in self.data_requests_collection.find({"status": "pending"}, {"_id": 1}).sort("requestedAt", 1)
+        ]
+    
     # ===================== ACCOUNT DELETION =====================
     
     def create_deletion_request(self, user_id: str, reason: Optional[str] = None) -> Dict:
@@ -1,5 +1,8 @@
 from typing import List, Optional
 from app.database.db import get_database
+from app.database.repository.inquiry_index_repository import inquiry_index_repository
+from app.utils.loan_status import normalize_loan_status
+from app.utils.search import LOAN_SEARCH, with_search_keys
 from bson import ObjectId
 from datetime import datetime
 import random
@@ -25,6 +28,7 @@ class ShortTermGetInTouchRepository:
         }
         result = collection.insert_one(doc)
         doc["_id"] = str(result.inserted_id)
+        inquiry_index_repository.index_inquiry("short_term_loan", doc)
         return doc
     
     @classmethod
@@ -53,6 +57,8 @@ class ShortTermGetInTouchRepository:
             {"_id": ObjectId(request_id)},
             {"$set": {"status": status, "updated_at": datetime.utcnow()}}
         )
+        if result.modified_count > 0:
+            inquiry_index_repository.update_status("short_term_loan", request_id, status)
         return result.modified_count > 0
 
 
@@ -79,9 +85,11 @@ class ShortTermLoanApplicationRepository:
             **data,
             "application_id": cls.generate_application_id(),
             "status": "pending",
+            "statusKey": "pending",
             "notes": None,
             "created_at": datetime.utcnow()
         }
+        with_search_keys(doc, LOAN_SEARCH)
         result = collection.insert_one(doc)
         doc["_id"] = str(result.inserted_id)
         return doc
@@ -118,6 +126,8 @@ class ShortTermLoanApplicationRepository:
     def update(cls, application_id: str, data: dict) -> bool:
         """Update application (Admin only)"""
         collection = cls.get_collection()
+        if "status" in data:
+            data = {**data, "statusKey": normalize_loan_status(data["status"])}
         result = collection.update_one(
             {"application_id": application_id},
             {"$set": {**data, "updated_at": datetime.utcnow()}}
@@ -0,0 +1,104 @@
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.database.db import get_database
+
+
+STORED_FILES_COLLECTION = "stored_files"
+
+# A reference on a file that is being removed waits for the removal (up to ~2s)
+ADD_REFERENCE_ATTEMPTS = 40
+ADD_REFERENCE_RETRY_SECONDS = 0.05
+# A removal not finished by then was abandoned by a dead process
+DELETE_TAKEOVER_AFTER = timedelta(seconds=60)
+
+
+class StoredFileRepository:
+    """Reference counts for content-addressed uploads.
+
+    Identical documents are stored once under their SHA-256; every record
+    that points at the file holds one reference, and the file is removed only
+    when the last reference is released. The record outlives the file: it is
+    marked "deleting" while the file is removed, so an identical upload in
+    that window waits and writes the file again instead of losing it.
+    """
+
+    def __init__(self):
+        self.db = None
+
+    def get_collection(self):
+        """Lazy initialization for the stored files collection"""
+        if self.db is None:
+            self.db = get_database()
+        return self.db[STORED_FILES_COLLECTION]
+
+    def add_reference(self, content_key: str, path: str, size: int, sha256: str) -> int:
+        """Take a reference on a stored file (registering it on first use); returns the new count.
+
+        A record whose file is being removed (see release) accepts no new
+        references: the upsert then collides with it and the call waits for
+        the removal to finish, so the caller writes the file again afterwards.
+        A removal abandoned by a dead process is taken over after
+        DELETE_TAKEOVER_AFTER, with the count reset to 1 (the caller rewrites
+        the file).
+        """
+        collection = self.get_collection()
+        for _ in range(ADD_REFERENCE_ATTEMPTS):
+            now = datetime.utcnow()
+            try:
+                document = collection.find_one_and_update(
+                    {"_id": content_key, "deleting": {"$ne": True}},
+                    {
+                        "$inc": {"refs": 1},
+                        "$set": {"lastReferencedAt": now},
+                        "$setOnInsert": {"path": path, "size": size, "sha256": sha256, "createdAt": now}
+                    },
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+                return document["refs"]
+            except DuplicateKeyError:
+                document = collection.find_one_and_update(
+                    {"_id": content_key, "deleting": True, "deletingAt": {"$lt": now - DELETE_TAKEOVER_AFTER}},
+                    {"$set": {"refs": 1, "deleting": False, "lastReferencedAt": now}, "$unset": {"deletingAt": ""}},
+                    return_document=ReturnDocument.AFTER
+                )
+                if document is not None:
+                    return document["refs"]
+                time.sleep(ADD_REFERENCE_RETRY_SECONDS)
+        raise RuntimeError(f"Stored file {content_key} is being removed; try again")
+
+    def release(self, path: str) -> Optional[bool]:
+        """Drop one reference on the file at `path`.
+
+        Returns True when that was the last reference: the record is then
+        marked "deleting" and the caller removes the file and calls
+        finish_release. Returns False while other records still use it, and
+        None for paths that are not content-addressed.
+        """
+        collection = self.get_collection()
+        document = collection.find_one_and_update(
+            {"path": path, "refs": {"$gt": 0}, "deleting": {"$ne": True}},
+            {"$inc": {"refs": -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            return None
+        if document["refs"] > 0:
+            return False
+        # Only the release that claims the zero-reference record deletes the file;
+        # a reference taken in the meantime keeps it
+        return collection.update_one(
+            {"_id": document["_id"], "refs": {"$lte": 0}, "deleting": {"$ne": True}},
+            {"$set": {"deleting": True, "deletingAt": datetime.utcnow()}}
+        ).modified_count == 1
+
+    def finish_release(self, path: str) -> None:
+        """Drop the record of a file removed after release() returned True"""
+        self.get_collection().delete_one({"path": path, "deleting": True})
+
+
+# Create singleton instance
+stored_file_repository = StoredFileRepository()
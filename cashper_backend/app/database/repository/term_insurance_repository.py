@@ -1,4 +1,5 @@
 from app.database.db import get_database
+from app.database.repository.inquiry_index_repository import inquiry_index_repository
 from app.database.schema.term_insurance_schema import (
     TermInsuranceInquiryInDB,
     TermInsuranceApplicationInDB,
@@ -32,6 +33,7 @@ class TermInsuranceRepository:
         collection = self.get_inquiry_collection()
         inquiry_dict = inquiry_data.dict()
         result = collection.insert_one(inquiry_dict)
+        inquiry_index_repository.index_inquiry("term_insurance", inquiry_dict)
         return str(result.inserted_id)
 
     def get_inquiry_by_id(self, inquiry_id: str) -> Optional[dict]:
@@ -70,6 +72,8 @@ class TermInsuranceRepository:
             {"_id": ObjectId(inquiry_id)},
             {"$set": update_data}
         )
+        if result.modified_count > 0:
+            inquiry_index_repository.update_status("term_insurance", inquiry_id, status)
         return result.modified_count > 0
 
     def get_inquiries_by_status(self, status: InquiryStatus) -> List[dict]:
@@ -4,6 +4,8 @@ from bson import ObjectId
 from pymongo import ReturnDocument
 from app.database.db import get_database
 from app.database.schema.user_schema import UserInDB, UserResponse
+from app.utils.user_cache import user_principal_cache
+from app.utils.search import USER_SEARCH, refresh_search_keys, touches_search_fields, with_search_keys
 
 
 class UserRepository:
@@ -22,7 +24,7 @@ class UserRepository:
         collection = self.get_collection()
         
         # Convert Pydantic model to dict
-        user_dict = user_data.dict()
+        user_dict = with_search_keys(user_data.dict(), USER_SEARCH)
         
         # Insert user into database
         result = collection.insert_one(user_dict)
@@ -67,6 +69,9 @@ class UserRepository:
                 {"$set": update_data},
                 return_document=ReturnDocument.AFTER
             )
+            user_principal_cache.invalidate(user_id)
+            if result and touches_search_fields(update_data, USER_SEARCH):
+                refresh_search_keys(collection, {"_id": result["_id"]}, USER_SEARCH)
             
             if result:
                 return self._document_to_user_response(result)
@@ -82,6 +87,7 @@ class UserRepository:
                 {"_id": ObjectId(user_id)},
                 {"$set": {"isEmailVerified": True, "updatedAt": datetime.utcnow()}}
             )
+            user_principal_cache.invalidate(user_id)
             return result.modified_count > 0
         except Exception:
             return False
@@ -94,6 +100,7 @@ class UserRepository:
                 {"_id": ObjectId(user_id)},
                 {"$set": {"isPhoneVerified": True, "updatedAt": datetime.utcnow()}}
             )
+            user_principal_cache.invalidate(user_id)
             return result.modified_count > 0
         except Exception:
             return False
@@ -106,6 +113,7 @@ class UserRepository:
                 {"_id": ObjectId(user_id)},
                 {"$set": {"hashedPassword": hashed_password, "updatedAt": datetime.utcnow()}}
             )
+            user_principal_cache.invalidate(user_id)
             return result.modified_count > 0
         except Exception:
             return False
@@ -118,6 +126,7 @@ class UserRepository:
                 {"_id": ObjectId(user_id)},
                 {"$set": {"isActive": False, "updatedAt": datetime.utcnow()}}
             )
+            user_principal_cache.invalidate(user_id)
             return result.modified_count > 0
         except Exception:
             return False
@@ -131,6 +140,14 @@ class UserRepository:
         except Exception:
             return []
 
+    def count_active_users(self) -> int:
+        """Count active users (audience of a broadcast notification)"""
+        collection = self.get_collection()
+        try:
+            return collection.count_documents({"isActive": True})
+        except Exception:
+            return 0
+
     def _document_to_user_response(self, document: dict) -> UserResponse:
         """Convert MongoDB document to UserResponse"""
         return UserResponse(
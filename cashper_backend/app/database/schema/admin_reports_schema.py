@@ -99,7 +99,7 @@ class ReportRequest(BaseModel):
     """Model for report generation request"""
     reportName: str
     dateRange: str = "30days"
-    format: str = "pdf"  # pdf, csv, excel
+    format: str = "csv"  # csv, excel
 
 
 class ReportFilter(BaseModel):
@@ -149,9 +149,11 @@ class DistributionChartData(BaseModel):
 
 class ExportRequest(BaseModel):
     """Model for export request"""
-    format: str = "csv"  # csv, pdf, excel
+    format: str = "csv"  # csv only (other formats are rejected)
     dateRange: str = "30days"
     includeCharts: bool = True
+    download: bool = False  # csv only: stream the file instead of embedding it in JSON
+    gzip: bool = False  # with download: compress the streamed file (.csv.gz)
 
 
 class CSVExportResponse(BaseModel):
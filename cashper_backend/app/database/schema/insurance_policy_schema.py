@@ -15,6 +15,7 @@ class InsuranceType(str, Enum):
 
 class PolicyStatus(str, Enum):
     active = "Active"
+    expiring_soon = "Expiring Soon"
     pending = "Pending"
     expired = "Expired"
     cancelled = "Cancelled"
@@ -62,7 +63,7 @@ class InsurancePolicyInDB(BaseModel):
     type: str  # "Term Insurance", "Health Insurance", "Motor Insurance"
     premium: str
     coverage: str
-    status: str  # "Active", "Pending", "Expired", "Cancelled"
+    status: str  # "Active", "Expiring Soon", "Pending", "Expired", "Cancelled"
     
     # Dates
     startDate: str
@@ -138,6 +139,7 @@ class InsuranceStatistics(BaseModel):
     activePolicies: int
     pendingPolicies: int
     expiredPolicies: int
+    expiringSoonPolicies: int = 0
     totalClaims: int
     premiumCollected: str
     
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List
+from typing import Annotated, Optional, List
 from datetime import datetime
 from bson import ObjectId
 
@@ -218,6 +218,29 @@ class CreateLoanRequest(BaseModel):
         }
 
 
+# ============ EMI CALCULATOR SCHEMAS ============
+
+class EMICalculatorBatchRequest(BaseModel):
+    """Grid of slider values; every combination is calculated"""
+    loanAmounts: List[Annotated[float, Field(gt=0)]] = Field(..., min_length=1, max_length=100)
+    interestRates: List[Annotated[float, Field(ge=0, le=50)]] = Field(..., min_length=1, max_length=100)
+    tenureMonths: List[Annotated[int, Field(gt=0, le=480)]] = Field(..., min_length=1, max_length=100)
+
+
+class EMICalculatorResult(BaseModel):
+    loanAmount: float
+    interestRate: float
+    tenureMonths: int
+    emi: float
+    totalInterest: float
+    totalPayment: float
+
+
+class EMICalculatorBatchResponse(BaseModel):
+    count: int
+    results: List[EMICalculatorResult]
+
+
 class CreateLoanResponse(BaseModel):
     """Response model for created loan"""
     id: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, Dict
+from typing import Annotated, List, Optional, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -92,6 +92,17 @@ class MutualFundCalculatorResponse(BaseModel):
     monthlyInvestment: Optional[float] = None
     totalMonths: Optional[int] = None
 
+class MutualFundCalculatorBatchRequest(BaseModel):
+    """Grid of slider values; every combination is calculated"""
+    investmentType: InvestmentType
+    amounts: List[Annotated[float, Field(gt=0)]] = Field(..., min_length=1, max_length=100, description="Lumpsum amounts or monthly SIP amounts")
+    returnRates: List[Annotated[float, Field(ge=1, le=30)]] = Field(..., min_length=1, max_length=100)
+    timePeriods: List[Annotated[int, Field(ge=1, le=50)]] = Field(..., min_length=1, max_length=50)
+
+class MutualFundCalculatorBatchResponse(BaseModel):
+    count: int
+    results: List[MutualFundCalculatorResponse]
+
 class MutualFundCalculatorInDB(BaseModel):
     investmentType: str
     amount: Optional[float] = None
@@ -89,7 +89,7 @@ class NotificationInDB(BaseModel):
     type: str
     priority: str = "normal"
     targetUsers: Optional[List[str]] = None  # None means all users
-    readBy: List[str] = []  # User IDs who read this notification
+    isBroadcast: bool = False
     isActive: bool = True
     link: Optional[str] = None
     createdBy: str  # Admin user ID
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from typing import Annotated, List, Optional
 from datetime import datetime
 import re
 from enum import Enum
@@ -122,6 +122,29 @@ class TaxCalculatorRequest(BaseModel):
         return v
 
 
+class TaxCalculatorBatchRequest(BaseModel):
+    """Several gross incomes evaluated with the same deductions"""
+    grossIncomes: List[Annotated[float, Field(ge=0)]] = Field(..., min_length=1, max_length=500)
+    section80C: Optional[float] = Field(0, ge=0, le=150000)
+    section80D: Optional[float] = Field(0, ge=0, le=50000)
+    nps80CCD1B: Optional[float] = Field(0, ge=0, le=50000)
+    homeLoanInterest: Optional[float] = Field(0, ge=0, le=200000)
+
+
+class TaxCalculatorBatchResult(BaseModel):
+    grossIncome: float
+    totalDeductions: float
+    taxableIncome: float
+    taxWithoutPlanning: float
+    taxAfterPlanning: float
+    totalSavings: float
+
+
+class TaxCalculatorBatchResponse(BaseModel):
+    count: int
+    results: List[TaxCalculatorBatchResult]
+
+
 class TaxCalculatorResponse(BaseModel):
     """Response schema for tax calculation"""
     id: str
@@ -86,6 +86,19 @@ class DataDownloadResponse(BaseModel):
     estimatedTime: str = Field(..., description="Estimated time for data preparation")
 
 
+class DataDownloadStatusResponse(BaseModel):
+    """Data download request status"""
+    requestId: str = Field(..., description="Download request ID")
+    status: str = Field(..., description="pending, processing, completed, failed or expired")
+    progress: int = Field(0, description="Export progress in percent")
+    requestedAt: datetime = Field(..., description="When the export was requested")
+    completedAt: Optional[datetime] = Field(None, description="When the export finished")
+    expiresAt: Optional[datetime] = Field(None, description="When the archive is removed")
+    fileSize: Optional[int] = Field(None, description="Archive size in bytes")
+    downloadUrl: Optional[str] = Field(None, description="Archive download URL once completed")
+    error: Optional[str] = Field(None, description="Failure reason")
+
+
 # ===================== ACCOUNT DELETION SCHEMAS =====================
 
 class DeleteAccountRequest(BaseModel):
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, Dict
+from typing import Annotated, List, Optional, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -84,6 +84,16 @@ class SIPCalculatorResponse(BaseModel):
     futureValue: float
     totalMonths: int
 
+class SIPCalculatorBatchRequest(BaseModel):
+    """Grid of slider values; every combination is calculated"""
+    monthlyInvestments: List[Annotated[float, Field(gt=0)]] = Field(..., min_length=1, max_length=100)
+    expectedReturns: List[Annotated[float, Field(ge=1, le=30)]] = Field(..., min_length=1, max_length=100)
+    timePeriods: List[Annotated[int, Field(ge=1, le=50)]] = Field(..., min_length=1, max_length=50)
+
+class SIPCalculatorBatchResponse(BaseModel):
+    count: int
+    results: List[SIPCalculatorResponse]
+
 class SIPCalculatorInDB(BaseModel):
     monthlyInvestment: float
     expectedReturn: float
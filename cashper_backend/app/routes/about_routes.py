@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import List, Optional
 from app.database.schema.about_schema import (
     TestimonialRequest, TestimonialResponse, TestimonialInDB,
@@ -9,6 +9,7 @@ from app.database.schema.about_schema import (
 )
 from app.database.repository.about_repository import about_repository
 from app.utils.auth_middleware import get_current_user_optional
+from app.utils.response_cache import cached_json_response
 from datetime import datetime
 
 router = APIRouter(prefix="/api/about", tags=["About"])
@@ -17,13 +18,13 @@ router = APIRouter(prefix="/api/about", tags=["About"])
 # ===================== PUBLIC ENDPOINTS (No Authentication) =====================
 
 @router.get("/information")
-def get_about_information():
+def get_about_information(request: Request):
     """
     Get general about information (PUBLIC - No authentication required)
     
     Returns company information, mission, vision, values
     """
-    return {
+    return cached_json_response("about:information", lambda: {
         "company": {
             "name": "Cashper Financial Services",
             "founded": "2015",
@@ -56,17 +57,17 @@ def get_about_information():
             }
         ],
         "description": "Cashper is a leading financial services provider in India, offering a comprehensive range of loan products, insurance solutions, and investment opportunities. With over 8 years of experience and 50,000+ satisfied customers, we are committed to making financial services accessible to all."
-    }
+    }, request)
 
 
 @router.get("/services")
-def get_about_services():
+def get_about_services(request: Request):
     """
     Get list of services (PUBLIC - No authentication required)
     
     Returns all services offered by the company
     """
-    return {
+    return cached_json_response("about:services", lambda: {
         "services": [
             {
                 "id": "loans",
@@ -97,17 +98,17 @@ def get_about_services():
                 "categories": ["Personal Tax", "Business Tax", "Tax Consultation"]
             }
         ]
-    }
+    }, request)
 
 
 @router.get("/team")
-def get_about_team():
+def get_about_team(request: Request):
     """
     Get team members (PUBLIC - No authentication required)
     
     Returns leadership and key team members
     """
-    return {
+    return cached_json_response("about:team", lambda: {
         "leadership": [
             {
                 "id": "1",
@@ -146,37 +147,40 @@ def get_about_team():
                 "experience": "10+ years"
             }
         ]
-    }
+    }, request)
 
 
 @router.get("/testimonials", response_model=List[TestimonialResponse])
-def get_testimonials():
+def get_testimonials(request: Request):
     """
     Get all active testimonials (PUBLIC - No authentication required)
     
     Returns list of customer testimonials to display on About Us page
     """
     try:
-        testimonials = about_repository.get_all_testimonials(is_active=True)
-        
-        return [
-            TestimonialResponse(
-                id=str(t["_id"]),
-                name=t["name"],
-                position=t["position"],
-                location=t["location"],
-                image=t.get("image"),
-                rating=t["rating"],
-                text=t["text"],
-                loanType=t["loanType"],
-                timeframe=t["timeframe"],
-                isActive=t.get("isActive", True),
-                order=t.get("order", 0),
-                createdAt=t["createdAt"],
-                updatedAt=t.get("updatedAt")
-            )
-            for t in testimonials
-        ]
+        def build():
+            testimonials = about_repository.get_all_testimonials(is_active=True)
+
+            return [
+                TestimonialResponse(
+                    id=str(t["_id"]),
+                    name=t["name"],
+                    position=t["position"],
+                    location=t["location"],
+                    image=t.get("image"),
+                    rating=t["rating"],
+                    text=t["text"],
+                    loanType=t["loanType"],
+                    timeframe=t["timeframe"],
+                    isActive=t.get("isActive", True),
+                    order=t.get("order", 0),
+                    createdAt=t["createdAt"],
+                    updatedAt=t.get("updatedAt")
+                )
+                for t in testimonials
+            ]
+
+        return cached_json_response("about:testimonials", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -185,30 +189,33 @@ def get_testimonials():
 
 
 @router.get("/achievements", response_model=List[AchievementResponse])
-def get_achievements():
+def get_achievements(request: Request):
     """
     Get all active achievements (PUBLIC - No authentication required)
     
     Returns list of company achievements and awards
     """
     try:
-        achievements = about_repository.get_all_achievements(is_active=True)
-        
-        return [
-            AchievementResponse(
-                id=str(a["_id"]),
-                title=a["title"],
-                organization=a["organization"],
-                year=a["year"],
-                description=a["description"],
-                icon=a.get("icon"),
-                isActive=a.get("isActive", True),
-                order=a.get("order", 0),
-                createdAt=a["createdAt"],
-                updatedAt=a.get("updatedAt")
-            )
-            for a in achievements
-        ]
+        def build():
+            achievements = about_repository.get_all_achievements(is_active=True)
+
+            return [
+                AchievementResponse(
+                    id=str(a["_id"]),
+                    title=a["title"],
+                    organization=a["organization"],
+                    year=a["year"],
+                    description=a["description"],
+                    icon=a.get("icon"),
+                    isActive=a.get("isActive", True),
+                    order=a.get("order", 0),
+                    createdAt=a["createdAt"],
+                    updatedAt=a.get("updatedAt")
+                )
+                for a in achievements
+            ]
+
+        return cached_json_response("about:achievements", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -217,29 +224,32 @@ def get_achievements():
 
 
 @router.get("/stats", response_model=List[StatResponse])
-def get_stats():
+def get_stats(request: Request):
     """
     Get all active stats (PUBLIC - No authentication required)
     
     Returns company statistics like customers, loans disbursed, ratings etc
     """
     try:
-        stats = about_repository.get_all_stats(is_active=True)
-        
-        return [
-            StatResponse(
-                id=str(s["_id"]),
-                label=s["label"],
-                value=s["value"],
-                icon=s.get("icon"),
-                color=s.get("color"),
-                isActive=s.get("isActive", True),
-                order=s.get("order", 0),
-                createdAt=s["createdAt"],
-                updatedAt=s.get("updatedAt")
-            )
-            for s in stats
-        ]
+        def build():
+            stats = about_repository.get_all_stats(is_active=True)
+
+            return [
+                StatResponse(
+                    id=str(s["_id"]),
+                    label=s["label"],
+                    value=s["value"],
+                    icon=s.get("icon"),
+                    color=s.get("color"),
+                    isActive=s.get("isActive", True),
+                    order=s.get("order", 0),
+                    createdAt=s["createdAt"],
+                    updatedAt=s.get("updatedAt")
+                )
+                for s in stats
+            ]
+
+        return cached_json_response("about:stats", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -248,29 +258,32 @@ def get_stats():
 
 
 @router.get("/milestones", response_model=List[MilestoneResponse])
-def get_milestones():
+def get_milestones(request: Request):
     """
     Get all active milestones (PUBLIC - No authentication required)
     
     Returns company timeline and milestones
     """
     try:
-        milestones = about_repository.get_all_milestones(is_active=True)
-        
-        return [
-            MilestoneResponse(
-                id=str(m["_id"]),
-                year=m["year"],
-                title=m["title"],
-                description=m["description"],
-                icon=m.get("icon"),
-                isActive=m.get("isActive", True),
-                order=m.get("order", 0),
-                createdAt=m["createdAt"],
-                updatedAt=m.get("updatedAt")
-            )
-            for m in milestones
-        ]
+        def build():
+            milestones = about_repository.get_all_milestones(is_active=True)
+
+            return [
+                MilestoneResponse(
+                    id=str(m["_id"]),
+                    year=m["year"],
+                    title=m["title"],
+                    description=m["description"],
+                    icon=m.get("icon"),
+                    isActive=m.get("isActive", True),
+                    order=m.get("order", 0),
+                    createdAt=m["createdAt"],
+                    updatedAt=m.get("updatedAt")
+                )
+                for m in milestones
+            ]
+
+        return cached_json_response("about:milestones", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -279,31 +292,34 @@ def get_milestones():
 
 
 @router.get("/leadership", response_model=List[LeadershipResponse])
-def get_leadership():
+def get_leadership(request: Request):
     """
     Get all active leadership members (PUBLIC - No authentication required)
     
     Returns list of leadership team members
     """
     try:
-        leadership = about_repository.get_all_leadership(is_active=True)
-        
-        return [
-            LeadershipResponse(
-                id=str(l["_id"]),
-                name=l["name"],
-                position=l["position"],
-                image=l.get("image"),
-                experience=l.get("experience"),
-                education=l.get("education"),
-                bio=l.get("bio"),
-                isActive=l.get("isActive", True),
-                order=l.get("order", 0),
-                createdAt=l["createdAt"],
-                updatedAt=l.get("updatedAt")
-            )
-            for l in leadership
-        ]
+        def build():
+            leadership = about_repository.get_all_leadership(is_active=True)
+
+            return [
+                LeadershipResponse(
+                    id=str(l["_id"]),
+                    name=l["name"],
+                    position=l["position"],
+                    image=l.get("image"),
+                    experience=l.get("experience"),
+                    education=l.get("education"),
+                    bio=l.get("bio"),
+                    isActive=l.get("isActive", True),
+                    order=l.get("order", 0),
+                    createdAt=l["createdAt"],
+                    updatedAt=l.get("updatedAt")
+                )
+                for l in leadership
+            ]
+
+        return cached_json_response("about:leadership", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -17,6 +17,8 @@ from app.database.schema.insurance_policy_schema import (
     InsuranceType
 )
 from app.database.repository.insurance_management_repository import insurance_management_repository
+from app.utils.csv_export import csv_streaming_response, parse_resume_after
+from app.utils.policy_lifecycle import policy_lifecycle_sweeper
 from datetime import datetime
 from typing import List, Optional
 from pathlib import Path
@@ -486,6 +488,24 @@ def get_expiring_policies(
             detail=f"Failed to fetch expiring policies: {str(e)}"
         )
 
+@router.post("/policies/lifecycle/sweep", response_model=dict)
+def sweep_policy_lifecycle():
+    """
+    Run the policy lifecycle sweep now instead of waiting for the scheduler.
+    Marks policies Expiring Soon / Expired according to their end dates.
+    """
+    try:
+        moved = policy_lifecycle_sweeper.run_once()
+        return {
+            "message": f"Policy lifecycle sweep updated {moved} policies",
+            "modifiedCount": moved
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to sweep policies: {str(e)}"
+        )
+
 # ==================== SEARCH ENDPOINT ====================
 
 @router.get("/policies/search/{search_term}", response_model=List[dict])
@@ -537,16 +557,50 @@ def bulk_update_status(policy_ids: List[str], status: PolicyStatus):
 
 # ==================== EXPORT ENDPOINT ====================
 
-@router.get("/policies/export/csv", response_model=dict)
+POLICY_EXPORT_CSV_HEADER = [
+    "ID", "Policy ID", "Customer", "Email", "Phone", "Type", "Premium", "Coverage",
+    "Status", "Start Date", "End Date", "Nominee"
+]
+
+
+def _policy_export_row(policy: dict) -> list:
+    return [
+        policy["_id"], policy.get("policyId", ""), policy.get("customer", ""), policy.get("email", ""),
+        policy.get("phone", ""), policy.get("type", ""), policy.get("premium", ""), policy.get("coverage", ""),
+        policy.get("status", ""), policy.get("startDate", ""), policy.get("endDate", ""), policy.get("nominee", "")
+    ]
+
+
+@router.get("/policies/export/csv")
 def export_policies_csv(
     type: Optional[str] = Query(None),
-    status: Optional[str] = Query(None)
+    status: Optional[str] = Query(None),
+    download: bool = Query(False, description="Stream a CSV file instead of the JSON body"),
+    gzip: bool = Query(False, description="Compress the downloaded file (.csv.gz)"),
+    resume_after: Optional[str] = Query(None, description="Resume a download after this row ID")
 ):
     """
     Export policies to CSV format.
-    Returns policy data that can be converted to CSV on frontend.
+    Returns policy data that can be converted to CSV on frontend, or with
+    `download=true` streams the CSV itself in batches (ordered by ID,
+    resumable with `resume_after`, optionally gzip-compressed).
     """
     try:
+        if download:
+            last_id = parse_resume_after(resume_after)
+            policies = insurance_management_repository.iter_policies_for_export(
+                policy_type=type,
+                status=status,
+                resume_after=last_id
+            )
+            return csv_streaming_response(
+                f"insurance_policies_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                POLICY_EXPORT_CSV_HEADER,
+                (_policy_export_row(policy) for policy in policies),
+                gzip,
+                resumed=last_id is not None
+            )
+        
         result = insurance_management_repository.get_filtered_policies(
             policy_type=type,
             status=status,
@@ -559,8 +613,10 @@ def export_policies_csv(
             "count": result["total"],
             "policies": result["policies"]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=500,
             detail=f"Failed to export policies: {str(e)}"
         )
@@ -4,6 +4,7 @@ from typing import Optional, List
 from datetime import datetime
 from bson import ObjectId
 from app.database.db import get_database
+from app.database.repository.admin_investment_repository import admin_investment_repository
 from app.routes.auth_routes import get_current_user
 
 router = APIRouter(prefix="/api/admin/investments", tags=["Admin Investment Management"])
@@ -131,172 +132,28 @@ def get_investment_stats():
 @router.get("/all", response_model=dict)
 def get_all_investments(
     page: int = Query(1, ge=1),
-    limit: int = Query(10, ge=1, le=10000),
+    limit: int = Query(10, ge=1, le=500),
     status_filter: Optional[str] = Query(None),
     type_filter: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get all investments (Mutual Funds and SIP) with pagination and filters"""
+    """Get all investments (Mutual Funds and SIP) with pagination and filters (applied in MongoDB)"""
     verify_admin(current_user)
     
     try:
-        db = get_database()
-        investments_collection = db["investments"]
-        sip_applications = db["sip_applications"]
-        mutual_fund_applications = db["mutual_fund_applications"]
-        users_collection = db["users"]
-        
-        all_investments = []
-        
-        # Get investments from investments collection
-        for inv in investments_collection.find():
-            user_email = inv.get("userEmail")
-            user = users_collection.find_one({"email": user_email})
-            
-            investment_type = inv.get("type", "Mutual Funds")
-            
-            # Apply type filter
-            if type_filter and type_filter != "all" and investment_type != type_filter:
-                continue
-            
-            # Apply status filter
-            inv_status = inv.get("status", "active").capitalize()
-            if status_filter and status_filter != "all" and inv_status.lower() != status_filter.lower():
-                continue
-            
-            # Apply search filter
-            if search:
-                search_lower = search.lower()
-                if not (
-                    search_lower in (user.get("fullName", "") if user else "").lower() or
-                    search_lower in user_email.lower() or
-                    search_lower in inv.get("name", "").lower()
-                ):
-                    continue
-            
-            invested = float(inv.get("invested", 0))
-            current = float(inv.get("current", 0))
-            returns_pct = ((current - invested) / invested * 100) if invested > 0 else 0
-            
-            all_investments.append({
-                "id": str(inv["_id"]),
-                "customer": user.get("fullName", "Unknown") if user else "Unknown",
-                "email": user_email,
-                "phone": user.get("phone", "N/A") if user else "N/A",
-                "type": investment_type,
-                "fundName": inv.get("name", "Unknown Fund"),
-                "amount": f"₹{invested:,.0f}" if investment_type == "Mutual Funds" else f"₹{inv.get('sipAmount', 0):,.0f}/mo",
-                "totalInvested": f"₹{invested:,.0f}",
-                "returns": f"{'+' if returns_pct >= 0 else ''}{returns_pct:.1f}%",
-                "status": inv_status,
-                "startDate": inv.get("startDate", datetime.now().strftime("%Y-%m-%d")),
-                "tenure": inv.get("tenure", "N/A"),
-                "documents": inv.get("documents", [])
-            })
-        
-        # Get SIP applications
-        for sip in sip_applications.find():
-            user_id = sip.get("userId")
-            user = find_user_by_id(db, user_id)
-            
-            # Apply type filter
-            if type_filter and type_filter != "all" and type_filter != "SIP":
-                continue
-            
-            # Apply status filter
-            sip_status = sip.get("status", "Pending").capitalize()
-            if status_filter and status_filter != "all" and sip_status.lower() != status_filter.lower():
-                continue
-            
-            # Apply search filter
-            if search:
-                search_lower = search.lower()
-                if not (
-                    search_lower in (user.get("fullName", "") if user else "").lower() or
-                    search_lower in (user.get("email", "") if user else "").lower() or
-                    search_lower in sip.get("fundName", "").lower()
-                ):
-                    continue
-            
-            monthly_investment = float(sip.get("monthlyInvestment", 0))
-            duration_months = 12
-            if "investmentDuration" in sip:
-                duration_str = sip["investmentDuration"]
-                if "month" in duration_str.lower():
-                    duration_months = int(''.join(filter(str.isdigit, duration_str)) or "12")
-            
-            total_invested = monthly_investment * duration_months
-            
-            all_investments.append({
-                "id": str(sip["_id"]),
-                "customer": user.get("fullName", "Unknown") if user else "Unknown",
-                "email": user.get("email", "N/A") if user else "N/A",
-                "phone": user.get("phone", "N/A") if user else "N/A",
-                "type": "SIP",
-                "fundName": sip.get("fundName", "Equity Fund"),
-                "amount": f"₹{monthly_investment:,.0f}/mo",
-                "totalInvested": f"₹{total_invested:,.0f}",
-                "returns": "+12.5%",
-                "status": sip_status,
-                "startDate": sip.get("createdAt", datetime.now()).strftime("%Y-%m-%d") if isinstance(sip.get("createdAt"), datetime) else datetime.now().strftime("%Y-%m-%d"),
-                "tenure": sip.get("investmentDuration", "12 months"),
-                "documents": sip.get("documents", [])
-            })
-        
-        # Get Mutual Fund applications
-        for mf in mutual_fund_applications.find():
-            user_id = mf.get("userId")
-            user = find_user_by_id(db, user_id)
-            
-            # Apply type filter
-            if type_filter and type_filter != "all" and type_filter != "Mutual Funds":
-                continue
-            
-            # Apply status filter
-            mf_status = mf.get("status", "Pending").capitalize()
-            if status_filter and status_filter != "all" and mf_status.lower() != status_filter.lower():
-                continue
-            
-            # Apply search filter
-            if search:
-                search_lower = search.lower()
-                if not (
-                    search_lower in (user.get("fullName", "") if user else "").lower() or
-                    search_lower in (user.get("email", "") if user else "").lower() or
-                    search_lower in mf.get("fundName", "").lower()
-                ):
-                    continue
-            
-            investment_amount = float(mf.get("investmentAmount", 0))
-            
-            all_investments.append({
-                "id": str(mf["_id"]),
-                "customer": user.get("fullName", "Unknown") if user else "Unknown",
-                "email": user.get("email", "N/A") if user else "N/A",
-                "phone": user.get("phone", "N/A") if user else "N/A",
-                "type": "Mutual Funds",
-                "fundName": mf.get("fundName", "Equity Growth Fund"),
-                "amount": f"₹{investment_amount:,.0f}",
-                "totalInvested": f"₹{investment_amount:,.0f}",
-                "returns": "+10.5%",
-                "status": mf_status,
-                "startDate": mf.get("createdAt", datetime.now()).strftime("%Y-%m-%d") if isinstance(mf.get("createdAt"), datetime) else datetime.now().strftime("%Y-%m-%d"),
-                "tenure": mf.get("investmentDuration", "3 Years"),
-                "documents": mf.get("documents", [])
-            })
-        
-        # Sort by date (newest first)
-        all_investments.sort(key=lambda x: x["startDate"], reverse=True)
-        
-        # Pagination
-        total = len(all_investments)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
+        result = admin_investment_repository.list_investments(
+            page=page,
+            limit=limit,
+            status_filter=status_filter,
+            type_filter=type_filter,
+            search=search
+        )
+        total = result["total"]
         
         return {
             "success": True,
-            "investments": all_investments[start_idx:end_idx],
+            "investments": [_format_investment_row(row) for row in result["investments"]],
             "total": total,
             "page": page,
             "limit": limit,
@@ -310,6 +167,84 @@ def get_all_investments(
         )
 
 
+def _format_investment_row(row: dict) -> dict:
+    """Shape a row from admin_investment_repository.list_investments for the admin table"""
+    user = row.get("_user")
+    customer = user.get("fullName", "Unknown") if user else "Unknown"
+    phone = user.get("phone", "N/A") if user else "N/A"
+    today = datetime.now().strftime("%Y-%m-%d")
+    created_at = row.get("createdAt")
+    start_date = created_at.strftime("%Y-%m-%d") if isinstance(created_at, datetime) else today
+    
+    if row["_source"] == "investments":
+        investment_type = row.get("type", "Mutual Funds")
+        invested = float(row.get("invested", 0))
+        current = float(row.get("current", 0))
+        returns_pct = ((current - invested) / invested * 100) if invested > 0 else 0
+        
+        return {
+            "id": str(row["_id"]),
+            "customer": customer,
+            "email": row.get("userEmail"),
+            "phone": phone,
+            "type": investment_type,
+            "fundName": row.get("name", "Unknown Fund"),
+            "amount": f"₹{invested:,.0f}" if investment_type == "Mutual Funds" else f"₹{row.get('sipAmount', 0):,.0f}/mo",
+            "totalInvested": f"₹{invested:,.0f}",
+            "returns": f"{'+' if returns_pct >= 0 else ''}{returns_pct:.1f}%",
+            "status": row.get("status", "active").capitalize(),
+            "startDate": row.get("startDate", today),
+            "tenure": row.get("tenure", "N/A"),
+            "documents": row.get("documents", [])
+        }
+    
+    email = user.get("email", "N/A") if user else "N/A"
+    
+    if row["_source"] == "sip_applications":
+        monthly_investment = float(row.get("monthlyInvestment", 0))
+        duration_months = 12
+        if "investmentDuration" in row:
+            duration_str = row["investmentDuration"]
+            if "month" in duration_str.lower():
+                duration_months = int(''.join(filter(str.isdigit, duration_str)) or "12")
+        
+        total_invested = monthly_investment * duration_months
+        
+        return {
+            "id": str(row["_id"]),
+            "customer": customer,
+            "email": email,
+            "phone": phone,
+            "type": "SIP",
+            "fundName": row.get("fundName", "Equity Fund"),
+            "amount": f"₹{monthly_investment:,.0f}/mo",
+            "totalInvested": f"₹{total_invested:,.0f}",
+            "returns": "+12.5%",
+            "status": row.get("status", "Pending").capitalize(),
+            "startDate": start_date,
+            "tenure": row.get("investmentDuration", "12 months"),
+            "documents": row.get("documents", [])
+        }
+    
+    investment_amount = float(row.get("investmentAmount", 0))
+    
+    return {
+        "id": str(row["_id"]),
+        "customer": customer,
+        "email": email,
+        "phone": phone,
+        "type": "Mutual Funds",
+        "fundName": row.get("fundName", "Equity Growth Fund"),
+        "amount": f"₹{investment_amount:,.0f}",
+        "totalInvested": f"₹{investment_amount:,.0f}",
+        "returns": "+10.5%",
+        "status": row.get("status", "Pending").capitalize(),
+        "startDate": start_date,
+        "tenure": row.get("investmentDuration", "3 Years"),
+        "documents": row.get("documents", [])
+    }
+
+
 @router.get("/sip-plans", response_model=dict)
 def get_sip_plans(current_user: dict = Depends(get_current_user)):
     """Get SIP plan statistics"""
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, status, Query, File, UploadFile
 from typing import List, Optional
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from fastapi.responses import FileResponse
 from app.database.schema.admin_loan_management_schema import (
@@ -13,6 +14,7 @@ from app.database.schema.admin_loan_management_schema import (
     AdminLoanApplicationInDB
 )
 from app.database.repository.admin_loan_management_repository import admin_loan_management_repository
+from app.utils.csv_export import csv_streaming_response, iter_csv, parse_resume_after
 
 router = APIRouter(prefix="/admin/loan-management", tags=["Admin - Loan Management"])
 
@@ -411,44 +413,69 @@ def bulk_delete_applications(application_ids: List[str]):
 
 # ===================== EXPORT TO CSV =====================
 
+LOAN_EXPORT_CSV_HEADER = [
+    "ID", "Customer", "Email", "Phone", "Type", "Amount", "Status", "Applied Date",
+    "Tenure", "Interest Rate", "Purpose", "Income", "CIBIL Score"
+]
+
+
+# The JSON body (download=false) is built in memory; larger exports must be streamed
+LOAN_EXPORT_JSON_MAX_ROWS = 10000
+
+
+def _loan_export_row(app: AdminLoanApplication) -> list:
+    return [
+        app.id, app.customer, app.email, app.phone, app.type, app.amount, app.status,
+        app.appliedDate, app.tenure, app.interestRate, app.purpose, app.income, app.cibilScore
+    ]
+
+
 @router.get("/applications/export/csv")
 def export_applications_csv(
     status: Optional[str] = Query(None, description="Filter by status"),
-    loan_type: Optional[str] = Query(None, description="Filter by loan type")
+    loan_type: Optional[str] = Query(None, description="Filter by loan type"),
+    download: bool = Query(False, description="Stream a CSV file instead of the JSON body"),
+    gzip: bool = Query(False, description="Compress the downloaded file (.csv.gz)"),
+    resume_after: Optional[str] = Query(None, description="Resume a download after this application ID")
 ):
     """
     Export loan applications to CSV format
     
-    Returns CSV data with all loan applications matching the filters
+    With `download=true` the CSV is streamed as a file in batches, ordered by
+    ID, and can be gzip-compressed or resumed with `resume_after`.
+    
+    Deprecated: without `download=true` the CSV is returned inside a JSON body
+    and capped at LOAN_EXPORT_JSON_MAX_ROWS rows (`truncated` is set when rows
+    were left out; continue with `resume_after` or use the download).
     """
     try:
-        applications, _ = admin_loan_management_repository.get_all_applications(
+        filename = f"loan_applications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        last_id = parse_resume_after(resume_after)
+        applications = admin_loan_management_repository.iter_export_applications(
             status=status,
             loan_type=loan_type,
-            skip=0,
-            limit=10000  # Get all for export
+            resume_after=last_id
         )
+        rows = (_loan_export_row(app) for app in applications)
         
-        # Create CSV content
-        csv_lines = [
-            "ID,Customer,Email,Phone,Type,Amount,Status,Applied Date,Tenure,Interest Rate,Purpose,Income,CIBIL Score"
-        ]
-        
-        for app in applications:
-            csv_lines.append(
-                f'"{app.id}","{app.customer}","{app.email}","{app.phone}","{app.type}",'
-                f'"{app.amount}","{app.status}","{app.appliedDate}","{app.tenure}",'
-                f'"{app.interestRate}","{app.purpose}","{app.income}",{app.cibilScore}'
-            )
+        if download:
+            return csv_streaming_response(filename, LOAN_EXPORT_CSV_HEADER, rows, gzip, resumed=last_id is not None)
         
-        csv_content = "\n".join(csv_lines)
+        rows = list(islice(rows, LOAN_EXPORT_JSON_MAX_ROWS + 1))
+        truncated = len(rows) > LOAN_EXPORT_JSON_MAX_ROWS
+        rows = rows[:LOAN_EXPORT_JSON_MAX_ROWS]
+        csv_content = b"".join(iter_csv(LOAN_EXPORT_CSV_HEADER, rows, include_header=last_id is None)).decode("utf-8")
         
         return {
             "csvData": csv_content,
-            "filename": f"loan_applications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            "recordCount": len(applications)
+            "filename": filename,
+            "recordCount": len(rows),
+            "truncated": truncated,
+            "lastId": rows[-1][0] if truncated else None
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error exporting CSV: {str(e)}")
         raise HTTPException(
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
+from app.config import REPORT_JOB_TIMEOUT_SECONDS, METRICS_ROLLUP_BACKFILL_DAYS
 from app.database.schema.admin_reports_schema import (
     AnalyticsResponse,
     ReportRequest,
@@ -8,6 +10,13 @@ from app.database.schema.admin_reports_schema import (
     CSVExportResponse
 )
 from app.database.repository.admin_reports_repository import admin_reports_repository
+from app.database.repository.metrics_rollup_repository import metrics_rollup_repository
+from app.database.repository.report_job_repository import report_job_repository
+from app.utils.csv_export import csv_streaming_response
+from app.utils.range_response import range_file_response
+from app.utils.report_jobs import (
+    REPORT_DEFINITIONS, REPORT_FORMATS, parse_date_range, report_filename, report_worker
+)
 
 router = APIRouter(prefix="/api/admin/reports", tags=["Admin - Reports & Analytics"])
 
@@ -124,6 +133,30 @@ def get_tax_planning_overview():
         )
 
 
+@router.post("/metrics/rollup")
+def backfill_daily_metrics(
+    background_tasks: BackgroundTasks,
+    days: int = Query(METRICS_ROLLUP_BACKFILL_DAYS, ge=1, le=3650, description="Number of days back to build"),
+    force: bool = Query(False, description="Rebuild days that already have a rollup")
+):
+    """
+    Backfill the daily metrics rollup used by the analytics endpoints
+    
+    Query Parameters:
+    - days: How many days back to build (default: METRICS_ROLLUP_BACKFILL_DAYS, the longest analytics range)
+    - force: Rebuild existing days too, e.g. after correcting source data (default: false)
+    
+    The rollup is built in the background after the response is sent.
+    """
+    background_tasks.add_task(metrics_rollup_repository.backfill, days, force)
+    return {
+        "status": "accepted",
+        "message": f"Daily metrics backfill started for the last {days} days",
+        "days": days,
+        "force": force
+    }
+
+
 # ===================== REPORT CATEGORIES & RECENT REPORTS =====================
 
 @router.get("/categories")
@@ -170,41 +203,92 @@ def get_recent_reports():
 
 # ===================== REPORT GENERATION & EXPORT =====================
 
+def _report_job_response(job: dict) -> dict:
+    completed = job["status"] == "completed"
+    return {
+        "status": job["status"],
+        "jobId": str(job["_id"]),
+        "reportName": job["reportName"],
+        "dateRange": job["dateRange"],
+        "format": job["format"],
+        "filename": job["filename"],
+        "requestedAt": job["createdAt"].isoformat(),
+        "generatedAt": job["completedAt"].isoformat() if completed and job.get("completedAt") else None,
+        "fileSize": job.get("fileSize"),
+        "error": job.get("error"),
+        "statusUrl": f"/api/admin/reports/jobs/{job['_id']}",
+        "downloadUrl": f"/api/admin/reports/download/{job['filename']}" if completed else None
+    }
+
+
 @router.post("/generate")
 def generate_report(report_request: ReportRequest):
     """
     Generate a specific report
     
     Request Body:
-    - reportName: Name of the report to generate
-    - dateRange: Date range for the report (default: 30days)
-    - format: Output format - pdf, csv, excel (default: pdf)
+    - reportName: Name of the report to generate (see /categories)
+    - dateRange: Date range for the report, e.g. 7days, 90days, 6months, 1year (default: 30days)
+    - format: Output format - csv or excel (default: csv)
+    
+    The report is rendered in the background; poll `statusUrl` until the
+    status is "completed", then fetch `downloadUrl`. The same report, range
+    and format requested again on the same day reuses the existing job and file.
     
     Returns:
-    - Report generation status
-    - Download URL
+    - Report job status
+    - Status and download URLs
     - Report metadata
     """
     try:
         report_name = report_request.reportName
         date_range = report_request.dateRange
-        format_type = report_request.format
+        format_type = report_request.format.lower()
         
-        # Generate report based on format
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{report_name.replace(' ', '_')}_{timestamp}.{format_type if format_type != 'excel' else 'xlsx'}"
+        if report_name not in REPORT_DEFINITIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown report. Available reports: {', '.join(REPORT_DEFINITIONS)}"
+            )
+        if format_type not in REPORT_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported format. Reports can be generated as csv or excel"
+            )
+        try:
+            parse_date_range(date_range)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        response = {
-            "status": "success",
-            "message": f"{report_name} generated successfully",
-            "reportName": report_name,
-            "dateRange": date_range,
-            "format": format_type,
-            "filename": filename,
-            "generatedAt": datetime.now().isoformat(),
-            "downloadUrl": f"/api/admin/reports/download/{filename}"
-        }
+        day = datetime.utcnow().strftime("%Y%m%d")
+        job = report_job_repository.get_or_create_job(
+            report_name,
+            REPORT_DEFINITIONS[report_name][0],
+            date_range,
+            format_type,
+            report_filename(report_name, date_range, format_type, day),
+            day
+        )
+        
+        # A finished report whose file was removed is rebuilt
+        if job["status"] == "completed" and not Path(job.get("filePath") or "").is_file():
+            report_job_repository.requeue_job(str(job["_id"]))
+            job["status"] = "pending"
+        # A job processing for longer than the timeout lost its worker
+        if job["status"] == "processing" and report_job_repository.requeue_stale_job(
+                str(job["_id"]), datetime.utcnow() - timedelta(seconds=REPORT_JOB_TIMEOUT_SECONDS)):
+            job["status"] = "pending"
+        if job["status"] == "pending":
+            report_worker.submit(str(job["_id"]))
+        
+        response = _report_job_response(job)
+        response["message"] = (
+            f"{report_name} is ready" if job["status"] == "completed"
+            else f"{report_name} is being generated"
+        )
         return response
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error generating report: {str(e)}")
         raise HTTPException(
@@ -213,29 +297,57 @@ def generate_report(report_request: ReportRequest):
         )
 
 
+@router.get("/jobs/{job_id}")
+def get_report_job(job_id: str):
+    """
+    Get the status of a report generation job
+    
+    Returns:
+    - status: pending, processing, completed or failed
+    - downloadUrl once the report is completed
+    """
+    job = report_job_repository.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return _report_job_response(job)
+
+
+# Analytics exports are rendered inline as CSV only; no file is written for other formats
+_UNSUPPORTED_EXPORT_FORMAT = (
+    "Unsupported format. Analytics exports are available as csv; "
+    "use /api/admin/reports/generate for Excel reports"
+)
+
+
 @router.post("/export")
 def export_data(export_request: ExportRequest):
     """
     Export analytics data in specified format
     
     Request Body:
-    - format: csv, pdf, or excel (default: csv)
+    - format: csv (default: csv); other formats get a 400 - use /generate for Excel reports
     - dateRange: Date range for export (default: 30days)
     - includeCharts: Whether to include charts in export (default: true)
+    - download: Stream the CSV as a file instead of embedding it (default: false)
+    - gzip: Compress the streamed CSV (default: false)
     
     Returns:
     - CSV content or file download
     - File metadata
     """
     try:
-        format_type = export_request.format
+        format_type = export_request.format.lower()
         date_range = export_request.dateRange
         
         if format_type == "csv":
-            csv_content = admin_reports_repository.generate_csv_export(date_range)
             timestamp = datetime.now().strftime("%Y-%m-%d")
             filename = f"reports_export_{timestamp}.csv"
             
+            if export_request.download:
+                headers, rows = admin_reports_repository.generate_csv_rows(date_range)
+                return csv_streaming_response(filename, headers, rows, export_request.gzip)
+            
+            csv_content = admin_reports_repository.generate_csv_export(date_range)
             return {
                 "status": "success",
                 "format": "csv",
@@ -244,19 +356,9 @@ def export_data(export_request: ExportRequest):
                 "content": csv_content,
                 "exportedAt": datetime.now().isoformat()
             }
-        else:
-            # For PDF and Excel, return similar structure
-            timestamp = datetime.now().strftime("%Y-%m-%d")
-            filename = f"reports_export_{timestamp}.{format_type if format_type != 'excel' else 'xlsx'}"
-            
-            return {
-                "status": "success",
-                "format": format_type,
-                "filename": filename,
-                "contentType": "application/pdf" if format_type == "pdf" else "application/vnd.ms-excel",
-                "downloadUrl": f"/api/admin/reports/download/{filename}",
-                "exportedAt": datetime.now().isoformat()
-            }
+        raise HTTPException(status_code=400, detail=_UNSUPPORTED_EXPORT_FORMAT)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error exporting data: {str(e)}")
         raise HTTPException(
@@ -268,30 +370,31 @@ def export_data(export_request: ExportRequest):
 # ===================== REPORT DOWNLOAD =====================
 
 @router.get("/download/{filename}")
-def download_report(filename: str):
+def download_report(filename: str, request: Request):
     """
     Download a generated report
     
     Path Parameters:
-    - filename: Name of the file to download
+    - filename: Name of the file to download (from the job's downloadUrl)
     
     Returns:
-    - File content for download
+    - File content for download (supports Range requests)
     """
-    try:
-        # This endpoint would typically stream the file
-        # For now, return a success response
-        return {
-            "status": "success",
-            "message": f"Report {filename} ready for download",
-            "filename": filename
-        }
-    except Exception as e:
-        print(f"Error downloading report: {str(e)}")
-        raise HTTPException(
-            status_code=404,
-            detail=f"Report not found: {str(e)}"
-        )
+    job = report_job_repository.get_job_by_filename(filename)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Report is not ready (status: {job['status']})")
+    
+    file_path = job.get("filePath")
+    if not file_path or not Path(file_path).is_file():
+        raise HTTPException(status_code=404, detail="Report file is no longer available; generate it again")
+    
+    media_type = (
+        "text/csv" if filename.endswith(".csv")
+        else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    return range_file_response(file_path, request, filename, media_type)
 
 
 # ===================== BULK OPERATIONS =====================
@@ -302,7 +405,7 @@ def export_all_reports(export_request: ExportRequest):
     Export all analytics reports
     
     Request Body:
-    - format: csv, pdf, or excel (default: csv)
+    - format: csv (default: csv); other formats get a 400 - use /generate for Excel reports
     - dateRange: Date range for export (default: 30days)
     
     Returns:
@@ -310,7 +413,7 @@ def export_all_reports(export_request: ExportRequest):
     - Export metadata
     """
     try:
-        format_type = export_request.format
+        format_type = export_request.format.lower()
         date_range = export_request.dateRange
         timestamp = datetime.now().strftime("%Y-%m-%d")
         
@@ -327,18 +430,9 @@ def export_all_reports(export_request: ExportRequest):
                 "exportedAt": datetime.now().isoformat(),
                 "message": "All reports exported successfully"
             }
-        else:
-            filename = f"all_reports_export_{timestamp}.{format_type if format_type != 'excel' else 'xlsx'}"
-            
-            return {
-                "status": "success",
-                "format": format_type,
-                "filename": filename,
-                "contentType": "application/pdf" if format_type == "pdf" else "application/vnd.ms-excel",
-                "downloadUrl": f"/api/admin/reports/download/{filename}",
-                "exportedAt": datetime.now().isoformat(),
-                "message": "All reports exported successfully"
-            }
+        raise HTTPException(status_code=400, detail=_UNSUPPORTED_EXPORT_FORMAT)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error exporting all reports: {str(e)}")
         raise HTTPException(
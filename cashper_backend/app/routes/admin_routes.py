@@ -3,8 +3,17 @@ from pydantic import BaseModel, Field, EmailStr
 from typing import Optional, List, Dict, Any
 from app.utils.security import create_access_token, verify_password, hash_password
 from app.utils.auth_middleware import get_current_user
+from app.utils.user_cache import user_principal_cache
+from app.utils.loan_status import normalize_loan_status
+from app.utils.search import USER_SEARCH, search_query
+from app.utils.csv_export import (
+    CSV_BATCH_ROWS, batched, csv_streaming_response, has_rows, merged_cursor,
+    parse_resume_after, rows_from_sources
+)
 from datetime import datetime, timedelta
 from bson import ObjectId
+from bson.errors import InvalidId
+import asyncio
 import random
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
@@ -367,6 +376,7 @@ def update_loan_status(
         
         update_data = {
             "status": status,
+            "statusKey": normalize_loan_status(status),
             "updatedAt": datetime.utcnow()
         }
         
@@ -418,6 +428,7 @@ def delete_user(
         db = get_database()
         
         result = db["users"].delete_one({"_id": ObjectId(user_id)})
+        user_principal_cache.invalidate(user_id)
         
         if result.deleted_count == 0:
             raise HTTPException(
@@ -464,6 +475,7 @@ def toggle_user_active(
             {"_id": ObjectId(user_id)},
             {"$set": {"isActive": new_status, "updatedAt": datetime.utcnow()}}
         )
+        user_principal_cache.invalidate(user_id)
         
         return {
             "message": f"User {'activated' if new_status else 'deactivated'} successfully",
@@ -483,166 +495,25 @@ def toggle_user_active(
 # ==================== DASHBOARD APIs ====================
 
 @router.get("/dashboard/stats")
-def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
+async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
     """Get real-time dashboard statistics with actual data"""
     verify_admin(current_user)
     
     try:
-        from app.database.db import get_database
-        db = get_database()
-        
-        # ✅ REAL DATA FROM DATABASE
-        # 1. TOTAL USERS - Count all users in the system
-        total_users = db["users"].count_documents({})
-        
-        # Get previous month users for growth calculation
-        today = datetime.utcnow()
-        first_day_this_month = today.replace(day=1)
-        first_day_last_month = (first_day_this_month - timedelta(days=1)).replace(day=1)
-        
-        users_this_month = db["users"].count_documents({
-            "createdAt": {"$gte": first_day_this_month}
-        })
-        users_last_month = db["users"].count_documents({
-            "createdAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}
-        })
-        
-        user_growth = "+0%"
-        if users_last_month > 0:
-            growth_percent = ((users_this_month - users_last_month) / users_last_month) * 100
-            user_growth = f"{'+' if growth_percent >= 0 else ''}{growth_percent:.1f}%"
-        
-        # 2. ACTIVE LOANS - Sum of approved loan amounts
-        personal_loans = list(db["personal_loan_applications"].find({"status": "approved"}))
-        home_loans = list(db["home_loan_applications"].find({"status": "approved"}))
-        business_loans = list(db["business_loan_applications"].find({"status": "approved"}))
-        short_term_loans = list(db["short_term_loans"].find({"status": "approved"})) if "short_term_loans" in db.list_collection_names() else []
-        
-        active_loan_amount = sum(
-            float(loan.get("loanAmount", 0)) for loan in personal_loans + home_loans + business_loans + short_term_loans
-        )
-        
-        # Calculate loan growth
-        loans_this_month = (
-            db["personal_loan_applications"].count_documents({"status": "approved", "updatedAt": {"$gte": first_day_this_month}}) +
-            db["home_loan_applications"].count_documents({"status": "approved", "updatedAt": {"$gte": first_day_this_month}}) +
-            db["business_loan_applications"].count_documents({"status": "approved", "updatedAt": {"$gte": first_day_this_month}})
-        )
-        loans_last_month = (
-            db["personal_loan_applications"].count_documents({"status": "approved", "updatedAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}}) +
-            db["home_loan_applications"].count_documents({"status": "approved", "updatedAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}}) +
-            db["business_loan_applications"].count_documents({"status": "approved", "updatedAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}})
-        )
-        
-        loan_growth = "+0%"
-        if loans_last_month > 0:
-            growth_percent = ((loans_this_month - loans_last_month) / loans_last_month) * 100
-            loan_growth = f"{'+' if growth_percent >= 0 else ''}{growth_percent:.1f}%"
-        
-        # 3. INSURANCE POLICIES - Count all insurance inquiries/policies from both inquiries and policies collections
-        health_insurance = db["health_insurance_inquiries"].count_documents({})
-        motor_insurance = db["motor_insurance_inquiries"].count_documents({})
-        term_insurance = db["term_insurance_inquiries"].count_documents({})
-        
-        # Include insurance_policies collection if it exists
-        insurance_policies_count = 0
-        if "insurance_policies" in db.list_collection_names():
-            insurance_policies_count = db["insurance_policies"].count_documents({})
-        
-        total_insurance_policies = health_insurance + motor_insurance + term_insurance + insurance_policies_count
-        
-        # Calculate insurance growth
-        insurance_this_month = (
-            db["health_insurance_inquiries"].count_documents({"createdAt": {"$gte": first_day_this_month}}) +
-            db["motor_insurance_inquiries"].count_documents({"createdAt": {"$gte": first_day_this_month}}) +
-            db["term_insurance_inquiries"].count_documents({"createdAt": {"$gte": first_day_this_month}})
-        )
-        
-        # Add insurance_policies monthly count
-        if "insurance_policies" in db.list_collection_names():
-            insurance_this_month += db["insurance_policies"].count_documents({"createdAt": {"$gte": first_day_this_month}})
+        from app.database.repository.admin_dashboard_repository import admin_dashboard_repository
         
-        insurance_last_month = (
-            db["health_insurance_inquiries"].count_documents({"createdAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}}) +
-            db["motor_insurance_inquiries"].count_documents({"createdAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}}) +
-            db["term_insurance_inquiries"].count_documents({"createdAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}})
-        )
-        
-        # Add insurance_policies monthly count
-        if "insurance_policies" in db.list_collection_names():
-            insurance_last_month += db["insurance_policies"].count_documents({"createdAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}})
-        
-        insurance_growth = "+0%"
-        if insurance_last_month > 0:
-            growth_percent = ((insurance_this_month - insurance_last_month) / insurance_last_month) * 100
-            insurance_growth = f"{'+' if growth_percent >= 0 else ''}{growth_percent:.1f}%"
-        
-        # 4. TOTAL INQUIRIES - Count ALL inquiries from database (real-time)
-        total_inquiries = 0
-        try:
-            # Loan inquiries (get-in-touch forms)
-            total_inquiries += db["short_term_loan_get_in_touch"].count_documents({}) if "short_term_loan_get_in_touch" in db.list_collection_names() else 0
-            total_inquiries += db["personal_loan_get_in_touch"].count_documents({}) if "personal_loan_get_in_touch" in db.list_collection_names() else 0
-            total_inquiries += db["business_loan_get_in_touch"].count_documents({}) if "business_loan_get_in_touch" in db.list_collection_names() else 0
-            total_inquiries += db["home_loan_get_in_touch"].count_documents({}) if "home_loan_get_in_touch" in db.list_collection_names() else 0
-            
-            # Insurance inquiries (already counted above but let's add them separately)
-            total_inquiries += health_insurance
-            total_inquiries += motor_insurance
-            total_inquiries += term_insurance
-            
-            # SIP/Investment inquiries
-            total_inquiries += db["sip_inquiries"].count_documents({}) if "sip_inquiries" in db.list_collection_names() else 0
-            total_inquiries += db["mutual_fund_inquiries"].count_documents({}) if "mutual_fund_inquiries" in db.list_collection_names() else 0
-            
-            # Consultation bookings
-            total_inquiries += db["consultations"].count_documents({}) if "consultations" in db.list_collection_names() else 0
-            
-            # Contact form submissions
-            total_inquiries += db["contact_submissions"].count_documents({}) if "contact_submissions" in db.list_collection_names() else 0
-            
-            # Retail service applications
-            total_inquiries += db["RetailServiceApplications"].count_documents({}) if "RetailServiceApplications" in db.list_collection_names() else 0
-        except Exception as e:
-            print(f"   Error counting inquiries: {e}")
+        # ✅ REAL DATA FROM DATABASE - one $facet aggregation per collection, run concurrently
+        stats = await admin_dashboard_repository.get_dashboard_stats()
         
-        # Calculate inquiries growth
-        inquiries_this_month = 0
-        inquiries_last_month = 0
-        try:
-            inquiry_collections = [
-                "short_term_loan_get_in_touch", "personal_loan_get_in_touch",
-                "business_loan_get_in_touch", "home_loan_get_in_touch",
-                "sip_inquiries", "mutual_fund_inquiries",
-                "consultations", "contact_submissions", "RetailServiceApplications"
-            ]
-            
-            for collection_name in inquiry_collections:
-                if collection_name in db.list_collection_names():
-                    inquiries_this_month += db[collection_name].count_documents({"createdAt": {"$gte": first_day_this_month}})
-                    inquiries_last_month += db[collection_name].count_documents({"createdAt": {"$gte": first_day_last_month, "$lt": first_day_this_month}})
-            
-            # Add insurance inquiries monthly counts
-            inquiries_this_month += insurance_this_month
-            inquiries_last_month += insurance_last_month
-        except Exception as e:
-            print(f"   Error calculating inquiry growth: {e}")
-        
-        inquiries_growth = "+0%"
-        if inquiries_last_month > 0:
-            growth_percent = ((inquiries_this_month - inquiries_last_month) / inquiries_last_month) * 100
-            inquiries_growth = f"{'+' if growth_percent >= 0 else ''}{growth_percent:.1f}%"
-        
-        # Count total active loans for display
-        total_active_loans_count = (
-            db["personal_loan_applications"].count_documents({"status": {"$in": ["approved", "disbursed"]}}) +
-            db["home_loan_applications"].count_documents({"status": {"$in": ["approved", "disbursed"]}}) +
-            db["business_loan_applications"].count_documents({"status": {"$in": ["approved", "disbursed"]}})
-        )
-        if "short_term_loans" in db.list_collection_names():
-            total_active_loans_count += db["short_term_loans"].count_documents({"status": {"$in": ["approved", "disbursed"]}})
-        if "admin_loan_applications" in db.list_collection_names():
-            total_active_loans_count += db["admin_loan_applications"].count_documents({"status": {"$in": ["approved", "disbursed"]}})
+        total_users = stats["total_users"]
+        user_growth = stats["user_growth"]
+        total_active_loans_count = stats["active_loans_count"]
+        active_loan_amount = stats["active_loan_amount"]
+        loan_growth = stats["loan_growth"]
+        total_insurance_policies = stats["insurance_policies"]
+        insurance_growth = stats["insurance_growth"]
+        total_inquiries = stats["total_inquiries"]
+        inquiries_growth = stats["inquiries_growth"]
         
         print(f"✅ Dashboard Stats Updated:")
         print(f"   - Total Users: {total_users} ({user_growth})")
@@ -657,6 +528,8 @@ def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
             "activeLoansCount": total_active_loans_count,
             "active_loans": str(total_active_loans_count),
             "active_loans_count": total_active_loans_count,
+            "activeLoanAmount": active_loan_amount,
+            "active_loan_amount": active_loan_amount,
             "insurancePolicies": total_insurance_policies,
             "insurance_policies": total_insurance_policies,
             "totalInquiries": total_inquiries,
@@ -1064,7 +937,7 @@ def get_admin_performance_metrics(current_user: dict = Depends(get_current_user)
 # ==================== USER MANAGEMENT APIs ====================
 
 @router.get("/users/detailed")
-def get_users_detailed(
+async def get_users_detailed(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = None,
@@ -1075,26 +948,12 @@ def get_users_detailed(
     verify_admin(current_user)
     
     try:
-        from app.database.db import get_database
-        db = get_database()
-        
-        # Calculate total stats ALWAYS (regardless of filter)
-        total_all_users = db["users"].count_documents({})
-        # Active: isActive=True AND (isSuspended doesn't exist OR isSuspended=False)
-        active_users = db["users"].count_documents({"isActive": True, "$or": [{"isSuspended": {"$exists": False}}, {"isSuspended": False}]})
-        # Inactive: isActive=False AND (isSuspended doesn't exist OR isSuspended=False) - exclude suspended users
-        inactive_users = db["users"].count_documents({"isActive": False, "$or": [{"isSuspended": {"$exists": False}}, {"isSuspended": False}]})
-        # Suspended: isSuspended=True (regardless of isActive status)
-        suspended_users = db["users"].count_documents({"isSuspended": True})
+        from app.database.db import get_async_database
+        from app.database.repository.admin_dashboard_repository import admin_dashboard_repository
+        db = get_async_database()
         
         # Build filtered query
-        query = {}
-        if search:
-            query["$or"] = [
-                {"fullName": {"$regex": search, "$options": "i"}},
-                {"email": {"$regex": search, "$options": "i"}},
-                {"phone": {"$regex": search, "$options": "i"}}
-            ]
+        query = search_query(search, USER_SEARCH)
         
         if status_filter and status_filter != "all":
             if status_filter == "active":
@@ -1105,35 +964,36 @@ def get_users_detailed(
             elif status_filter == "suspended":
                 query["isSuspended"] = True
         
-        total = db["users"].count_documents(query)
-        users = list(db["users"].find(query).skip((page - 1) * limit).limit(limit).sort("createdAt", -1))
+        # Total stats are calculated ALWAYS (regardless of filter); all counts run concurrently
+        (
+            total_all_users,
+            active_users,
+            inactive_users,
+            suspended_users,
+            total,
+            users,
+        ) = await asyncio.gather(
+            db["users"].count_documents({}),
+            # Active: isActive=True AND (isSuspended doesn't exist OR isSuspended=False)
+            db["users"].count_documents({"isActive": True, "$or": [{"isSuspended": {"$exists": False}}, {"isSuspended": False}]}),
+            # Inactive: isActive=False AND (isSuspended doesn't exist OR isSuspended=False) - exclude suspended users
+            db["users"].count_documents({"isActive": False, "$or": [{"isSuspended": {"$exists": False}}, {"isSuspended": False}]}),
+            # Suspended: isSuspended=True (regardless of isActive status)
+            db["users"].count_documents({"isSuspended": True}),
+            db["users"].count_documents(query),
+            db["users"].find(query).sort("createdAt", -1).skip((page - 1) * limit).limit(limit).to_list(length=limit),
+        )
+        
+        # Count every user's services in bulk (one grouped query per collection, not per user)
+        service_counts = await admin_dashboard_repository.get_user_service_counts([user["_id"] for user in users])
         
         detailed_users = []
         for user in users:
-            # Count user's loans using ObjectId format
-            user_id_obj = user["_id"]  # Keep as ObjectId
-            
-            total_loans = (
-                db["personal_loan_applications"].count_documents({"userId": user_id_obj}) +
-                db["home_loan_applications"].count_documents({"userId": user_id_obj}) +
-                db["business_loan_applications"].count_documents({"userId": user_id_obj})
-            )
-            
-            active_loans = (
-                db["personal_loan_applications"].count_documents({"userId": user_id_obj, "status": {"$in": ["approved", "disbursed"]}}) +
-                db["home_loan_applications"].count_documents({"userId": user_id_obj, "status": {"$in": ["approved", "disbursed"]}}) +
-                db["business_loan_applications"].count_documents({"userId": user_id_obj, "status": {"$in": ["approved", "disbursed"]}})
-            )
-            
-            # Count user's insurance inquiries
-            total_insurance = (
-                db["health_insurance_inquiries"].count_documents({"userId": user_id_obj}) +
-                db["motor_insurance_inquiries"].count_documents({"userId": user_id_obj}) +
-                db["term_insurance_inquiries"].count_documents({"userId": user_id_obj})
-            )
-            
-            # Count user's investments (SIPs)
-            total_investments = db["sip_applications"].count_documents({"userId": user_id_obj})
+            counts = service_counts[user["_id"]]
+            total_loans = counts["totalLoans"]
+            active_loans = counts["activeLoans"]
+            total_insurance = counts["totalInsurance"]
+            total_investments = counts["totalInvestments"]
             
             # Total services = loans + insurance + investments
             total_services = total_loans + total_insurance + total_investments
@@ -1278,6 +1138,7 @@ def suspend_user(
                 }
             }
         )
+        user_principal_cache.invalidate(user_id)
         
         if result.matched_count == 0:
             raise HTTPException(
@@ -1326,6 +1187,7 @@ def unsuspend_user(
                 }
             }
         )
+        user_principal_cache.invalidate(user_id)
         
         if result.matched_count == 0:
             raise HTTPException(
@@ -1534,6 +1396,7 @@ def approve_loan(
         
         update_data = {
             "status": "approved",
+            "statusKey": "approved",
             "approvedAt": datetime.utcnow(),
             "approvedBy": current_user.get("email"),
             "updatedAt": datetime.utcnow()
@@ -1595,6 +1458,7 @@ def reject_loan(
             {
                 "$set": {
                     "status": "rejected",
+                    "statusKey": "rejected",
                     "rejectedAt": datetime.utcnow(),
                     "rejectedBy": current_user.get("email"),
                     "rejectionReason": reason,
@@ -2842,6 +2706,28 @@ def get_system_information(current_user: dict = Depends(get_current_user)):
         )
 
 
+@router.get("/settings/indexes")
+def get_index_report(
+    collection: Optional[str] = Query(None, description="Limit the report to one collection"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Report declared indexes that are missing and existing indexes that are unused"""
+    verify_admin(current_user)
+
+    try:
+        from app.database.indexes import get_index_report as build_index_report
+        return {
+            "success": True,
+            **build_index_report(collection=collection)
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to build index report: {str(e)}"
+        )
+
+
 @router.post("/settings/backup")
 def create_system_backup(current_user: dict = Depends(get_current_user)):
     """Create system backup"""
@@ -3651,200 +3537,181 @@ def update_document_verification_status(
         )
 
 
+# Unified column sets for the tax planning CSV export. Personal and business
+# rows share one header so a mixed export has consistent columns.
+TAX_APPLICATION_CSV_HEADER = [
+    "ID", "Type", "Name", "Business Name", "Email", "Phone", "PAN", "GST Number",
+    "Annual Income", "Employment Type", "Tax Regime", "Business Structure", "Industry",
+    "Turnover Range", "Status", "Applied Date", "Assigned To", "Admin Notes"
+]
+
+TAX_CONSULTATION_CSV_HEADER = [
+    "ID", "Type", "Name", "Business Name", "Email", "Phone", "Income Range", "Tax Regime",
+    "Business Type", "Annual Turnover", "Status", "Created Date", "Scheduled Date"
+]
+
+TAX_DOCUMENT_CSV_HEADER = [
+    "Document ID", "User Name", "User Email", "Document Type", "File Name", "Upload Date",
+    "Verification Status", "Category", "File Path"
+]
+
+
+def _format_date(value, fmt: str = "%Y-%m-%d", default: str = "N/A") -> str:
+    return value.strftime(fmt) if isinstance(value, datetime) else default
+
+
+def _tax_application_row(source: str, app: dict) -> list:
+    if source == "personal":
+        return [
+            app["_id"], "Personal", app.get("fullName", "N/A"), "",
+            app.get("emailAddress", "N/A"), app.get("phoneNumber", "N/A"), app.get("panNumber", "N/A"), "",
+            app.get("annualIncome", "N/A"), app.get("employmentType", "N/A"), app.get("preferredTaxRegime", "N/A"),
+            "", "", "", app.get("status", "pending"), _format_date(app.get("createdAt")),
+            app.get("assignedTo", "N/A"), app.get("adminNotes", "N/A")
+        ]
+    return [
+        app["_id"], "Business", app.get("ownerName", "N/A"), app.get("businessName", "N/A"),
+        app.get("businessEmail", "N/A"), app.get("contactNumber", "N/A"), app.get("businessPAN", "N/A"),
+        app.get("gstNumber", "N/A"), "", "", "", app.get("businessStructure", "N/A"),
+        app.get("industryType", "N/A"), app.get("turnoverRange", "N/A"), app.get("status", "pending"),
+        _format_date(app.get("createdAt")), app.get("assignedTo", "N/A"), app.get("adminNotes", "N/A")
+    ]
+
+
+# Fields read by _tax_application_row, per source
+TAX_APPLICATION_PROJECTIONS = {
+    "personal": {field: 1 for field in (
+        "fullName", "emailAddress", "phoneNumber", "panNumber", "annualIncome", "employmentType",
+        "preferredTaxRegime", "status", "createdAt", "assignedTo", "adminNotes"
+    )},
+    "business": {field: 1 for field in (
+        "ownerName", "businessName", "businessEmail", "contactNumber", "businessPAN", "gstNumber",
+        "businessStructure", "industryType", "turnoverRange", "status", "createdAt", "assignedTo", "adminNotes"
+    )},
+}
+
+
+def _tax_consultation_row(source: str, consultation: dict) -> list:
+    scheduled = _format_date(consultation.get("scheduledDate"), "%Y-%m-%d %H:%M", "Not Scheduled")
+    if source == "personal":
+        return [
+            consultation["_id"], "Personal", consultation.get("name", "N/A"), "",
+            consultation.get("email", "N/A"), consultation.get("phone", "N/A"),
+            consultation.get("income", "N/A"), consultation.get("taxRegime", "N/A"), "", "",
+            consultation.get("status", "pending"), _format_date(consultation.get("createdAt")), scheduled
+        ]
+    return [
+        consultation["_id"], "Business", consultation.get("ownerName", "N/A"), consultation.get("businessName", "N/A"),
+        consultation.get("email", "N/A"), consultation.get("phone", "N/A"), "", "",
+        consultation.get("businessType", "N/A"), consultation.get("annualTurnover", "N/A"),
+        consultation.get("status", "pending"), _format_date(consultation.get("createdAt")), scheduled
+    ]
+
+
+# Fields read by _tax_consultation_row, per source
+TAX_CONSULTATION_PROJECTIONS = {
+    "personal": {field: 1 for field in (
+        "name", "email", "phone", "income", "taxRegime", "status", "createdAt", "scheduledDate"
+    )},
+    "business": {field: 1 for field in (
+        "ownerName", "businessName", "email", "phone", "businessType", "annualTurnover",
+        "status", "createdAt", "scheduledDate"
+    )},
+}
+
+
+def _tax_document_rows(db, documents):
+    """Document rows with their owners, looked up once per batch of documents"""
+    for batch in batched(documents, CSV_BATCH_ROWS):
+        user_ids = set()
+        for _, doc in batch:
+            if doc.get("userId") and ObjectId.is_valid(str(doc["userId"])):
+                user_ids.add(ObjectId(str(doc["userId"])))
+        users = {
+            str(u["_id"]): u
+            for u in db["users"].find({"_id": {"$in": list(user_ids)}}, {"fullName": 1, "email": 1})
+        } if user_ids else {}
+        for _, doc in batch:
+            user = users.get(str(doc.get("userId")))
+            yield [
+                doc["_id"],
+                user.get("fullName", "Unknown") if user else "Unknown",
+                user.get("email", "N/A") if user else "N/A",
+                doc.get("documentType", "other"), doc.get("fileName", "Unknown"),
+                _format_date(doc.get("uploadedAt"), "%Y-%m-%d %H:%M:%S"),
+                doc.get("verificationStatus", "pending"), doc.get("category", "identity"),
+                doc.get("filePath", "")
+            ]
+
+
 @router.get("/tax-planning/export-csv")
 def export_tax_planning_data_to_csv(
     data_type: str = Query(..., description="applications, consultations, or documents"),
     type_filter: Optional[str] = Query(None, description="personal, business, or all"),
     status_filter: Optional[str] = Query(None),
+    gzip: bool = Query(False, description="Compress the export (.csv.gz)"),
+    resume_after: Optional[str] = Query(None, description="Resume after this row ID (omits the header)"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Export tax planning data to CSV format"""
+    """Export tax planning data to CSV format (streamed in batches, ordered by ID)"""
     verify_admin(current_user)
     
     try:
         from app.database.db import get_database
-        import io
-        import csv
-        from fastapi.responses import StreamingResponse
         
         db = get_database()
-        
-        # Prepare CSV data based on data_type
-        if data_type == "applications":
-            # Get all applications
-            all_applications = []
-            
-            if not type_filter or type_filter in ["all", "personal"]:
-                query = {}
-                if status_filter and status_filter != "all":
-                    query["status"] = status_filter
-                
-                personal_apps = list(db["personal_tax_applications"].find(query))
-                for app in personal_apps:
-                    all_applications.append({
-                        "ID": str(app["_id"]),
-                        "Type": "Personal",
-                        "Name": app.get("fullName", "N/A"),
-                        "Email": app.get("emailAddress", "N/A"),
-                        "Phone": app.get("phoneNumber", "N/A"),
-                        "PAN": app.get("panNumber", "N/A"),
-                        "Annual Income": app.get("annualIncome", "N/A"),
-                        "Employment Type": app.get("employmentType", "N/A"),
-                        "Tax Regime": app.get("preferredTaxRegime", "N/A"),
-                        "Status": app.get("status", "pending"),
-                        "Applied Date": app.get("createdAt", datetime.utcnow()).strftime("%Y-%m-%d"),
-                        "Assigned To": app.get("assignedTo", "N/A"),
-                        "Admin Notes": app.get("adminNotes", "N/A")
-                    })
-            
-            if not type_filter or type_filter in ["all", "business"]:
-                query = {}
-                if status_filter and status_filter != "all":
-                    query["status"] = status_filter
-                
-                business_apps = list(db["business_tax_applications"].find(query))
-                for app in business_apps:
-                    all_applications.append({
-                        "ID": str(app["_id"]),
-                        "Type": "Business",
-                        "Business Name": app.get("businessName", "N/A"),
-                        "Owner Name": app.get("ownerName", "N/A"),
-                        "Email": app.get("businessEmail", "N/A"),
-                        "Phone": app.get("contactNumber", "N/A"),
-                        "Business PAN": app.get("businessPAN", "N/A"),
-                        "GST Number": app.get("gstNumber", "N/A"),
-                        "Business Structure": app.get("businessStructure", "N/A"),
-                        "Industry": app.get("industryType", "N/A"),
-                        "Turnover Range": app.get("turnoverRange", "N/A"),
-                        "Status": app.get("status", "pending"),
-                        "Applied Date": app.get("createdAt", datetime.utcnow()).strftime("%Y-%m-%d"),
-                        "Assigned To": app.get("assignedTo", "N/A")
-                    })
-            
-            # Create CSV
-            if not all_applications:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="No applications found to export"
-                )
-            
-            output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=all_applications[0].keys())
-            writer.writeheader()
-            writer.writerows(all_applications)
-            
-            # Return CSV file
-            output.seek(0)
-            return StreamingResponse(
-                iter([output.getvalue()]),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename=tax_planning_applications_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"}
-            )
-        
-        elif data_type == "consultations":
-            # Get all consultations
-            all_consultations = []
+        last_id = parse_resume_after(resume_after)
+        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        
+        if data_type in ["applications", "consultations"]:
+            collections = {
+                "applications": ("personal_tax_applications", "business_tax_applications"),
+                "consultations": ("personal_tax_consultations", "business_tax_consultations"),
+            }[data_type]
+            query = {}
+            if status_filter and status_filter != "all":
+                query["status"] = status_filter
             
+            projections = TAX_APPLICATION_PROJECTIONS if data_type == "applications" else TAX_CONSULTATION_PROJECTIONS
+            kinds, sources = [], []
             if not type_filter or type_filter in ["all", "personal"]:
-                query = {}
-                if status_filter and status_filter != "all":
-                    query["status"] = status_filter
-                
-                personal_consultations = list(db["personal_tax_consultations"].find(query))
-                for consultation in personal_consultations:
-                    all_consultations.append({
-                        "ID": str(consultation["_id"]),
-                        "Type": "Personal",
-                        "Name": consultation.get("name", "N/A"),
-                        "Email": consultation.get("email", "N/A"),
-                        "Phone": consultation.get("phone", "N/A"),
-                        "Income Range": consultation.get("income", "N/A"),
-                        "Tax Regime": consultation.get("taxRegime", "N/A"),
-                        "Status": consultation.get("status", "pending"),
-                        "Created Date": consultation.get("createdAt", datetime.utcnow()).strftime("%Y-%m-%d"),
-                        "Scheduled Date": consultation.get("scheduledDate").strftime("%Y-%m-%d %H:%M") if consultation.get("scheduledDate") else "Not Scheduled"
-                    })
-            
+                kinds.append("personal")
+                sources.append((db[collections[0]], query, projections["personal"]))
             if not type_filter or type_filter in ["all", "business"]:
-                query = {}
-                if status_filter and status_filter != "all":
-                    query["status"] = status_filter
-                
-                business_consultations = list(db["business_tax_consultations"].find(query))
-                for consultation in business_consultations:
-                    all_consultations.append({
-                        "ID": str(consultation["_id"]),
-                        "Type": "Business",
-                        "Business Name": consultation.get("businessName", "N/A"),
-                        "Owner Name": consultation.get("ownerName", "N/A"),
-                        "Email": consultation.get("email", "N/A"),
-                        "Phone": consultation.get("phone", "N/A"),
-                        "Business Type": consultation.get("businessType", "N/A"),
-                        "Annual Turnover": consultation.get("annualTurnover", "N/A"),
-                        "Status": consultation.get("status", "pending"),
-                        "Created Date": consultation.get("createdAt", datetime.utcnow()).strftime("%Y-%m-%d"),
-                        "Scheduled Date": consultation.get("scheduledDate").strftime("%Y-%m-%d %H:%M") if consultation.get("scheduledDate") else "Not Scheduled"
-                    })
+                kinds.append("business")
+                sources.append((db[collections[1]], query, projections["business"]))
             
-            if not all_consultations:
+            if not last_id and not has_rows(sources):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    detail="No consultations found to export"
+                    detail=f"No {data_type} found to export"
                 )
             
-            output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=all_consultations[0].keys())
-            writer.writeheader()
-            writer.writerows(all_consultations)
-            
-            output.seek(0)
-            return StreamingResponse(
-                iter([output.getvalue()]),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename=tax_consultations_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"}
-            )
+            if data_type == "applications":
+                header, to_row, filename = TAX_APPLICATION_CSV_HEADER, _tax_application_row, "tax_planning_applications"
+            else:
+                header, to_row, filename = TAX_CONSULTATION_CSV_HEADER, _tax_consultation_row, "tax_consultations"
+            rows = rows_from_sources(sources, lambda index, doc: to_row(kinds[index], doc), last_id)
+            return csv_streaming_response(f"{filename}_{timestamp}.csv", header, rows, gzip, resumed=last_id is not None)
         
         elif data_type == "documents":
-            # Get all documents
             query = {}
             if status_filter and status_filter != "all":
                 query["verificationStatus"] = status_filter
+            sources = [(db["user_documents"], query, {
+                "userId": 1, "documentType": 1, "fileName": 1, "uploadedAt": 1,
+                "verificationStatus": 1, "category": 1, "filePath": 1
+            })]
             
-            all_docs = list(db["user_documents"].find(query))
-            
-            documents_data = []
-            for doc in all_docs:
-                user_id = doc.get("userId")
-                user = db["users"].find_one({"_id": ObjectId(user_id)}) if user_id else None
-                
-                documents_data.append({
-                    "Document ID": str(doc["_id"]),
-                    "User Name": user.get("fullName", "Unknown") if user else "Unknown",
-                    "User Email": user.get("email", "N/A") if user else "N/A",
-                    "Document Type": doc.get("documentType", "other"),
-                    "File Name": doc.get("fileName", "Unknown"),
-                    "Upload Date": doc.get("uploadedAt", datetime.utcnow()).strftime("%Y-%m-%d %H:%M:%S"),
-                    "Verification Status": doc.get("verificationStatus", "pending"),
-                    "Category": doc.get("category", "identity"),
-                    "File Path": doc.get("filePath", "")
-                })
-            
-            if not documents_data:
+            if not last_id and not has_rows(sources):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="No documents found to export"
                 )
             
-            output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=documents_data[0].keys())
-            writer.writeheader()
-            writer.writerows(documents_data)
-            
-            output.seek(0)
-            return StreamingResponse(
-                iter([output.getvalue()]),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename=tax_documents_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"}
+            rows = _tax_document_rows(db, merged_cursor(sources, last_id))
+            return csv_streaming_response(
+                f"tax_documents_{timestamp}.csv", TAX_DOCUMENT_CSV_HEADER, rows, gzip, resumed=last_id is not None
             )
         
         else:
@@ -3865,254 +3732,43 @@ def export_tax_planning_data_to_csv(
 # ==================== UNIFIED INQUIRY ENDPOINTS ====================
 
 @router.get("/inquiries/all", tags=["Inquiries"])
-async def get_all_inquiries(admin_user: dict = Depends(verify_admin_token)):
+async def get_all_inquiries(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+    product_type: Optional[str] = Query(None, description="Filter by product: Personal Loan, SIP, Term Insurance, ..."),
+    status_filter: Optional[str] = Query(None, description="Filter by status"),
+    search: Optional[str] = Query(None, description="Search by name, email or phone"),
+    sort_order: str = Query("desc", pattern="^(asc|desc)$", description="Sort by createdAt"),
+    admin_user: dict = Depends(verify_admin_token)
+):
     """
-    Get all inquiries from all products (loans, insurance, etc.)
+    Get inquiries from all products (loans, insurance, investments, tax)
     Admin only endpoint
+    
+    Reads the unified `inquiries_index` collection that every inquiry submit
+    endpoint writes through to, with cursor (keyset) pagination.
     """
-    from app.database.repository.short_term_loan_repository import ShortTermGetInTouchRepository
-    from app.database.repository import personal_loan_repository
-    from app.database.repository import business_loan_repository
-    from app.database.repository import home_loan_repository
-    from app.database.repository.term_insurance_repository import term_insurance_repository
-    from app.database.repository.motor_insurance_repository import motor_insurance_repository
-    from app.database.repository.health_insurance_repository import health_insurance_repository
-    from app.database.repository.sip_repository import SIPRepository
-    from app.database.repository.mutual_funds_repository import MutualFundsRepository
-    from app.database.repository.personal_tax_repository import personal_tax_repository
-    from app.database.repository.business_tax_repository import business_tax_repository
+    from app.database.repository.inquiry_index_repository import inquiry_index_repository
     
     try:
-        all_inquiries = []
-        
-        # Get Short Term Loan Inquiries
-        try:
-            st_loan_inquiries = ShortTermGetInTouchRepository.get_all()
-            for inquiry in st_loan_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", "N/A"),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "income": inquiry.get("loanAmount", "N/A"),
-                    "amount": inquiry.get("loanAmount", "N/A"),
-                    "type": "Short Term Loan",
-                    "productType": "Short Term Loan",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("created_at", datetime.now()),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching short term loan inquiries: {e}")
-        
-        # Get Personal Loan Inquiries
-        try:
-            pl_inquiries = personal_loan_repository.get_all_get_in_touch()
-            for inquiry in pl_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", inquiry.get("name", "N/A")),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "income": inquiry.get("loanAmount", "N/A"),
-                    "amount": inquiry.get("loanAmount", "N/A"),
-                    "type": "Personal Loan",
-                    "productType": "Personal Loan",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("created_at", datetime.now()),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching personal loan inquiries: {e}")
-        
-        # Get Business Loan Inquiries
-        try:
-            bl_inquiries = business_loan_repository.get_all_get_in_touch()
-            for inquiry in bl_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", inquiry.get("name", "N/A")),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "income": inquiry.get("loanAmount", "N/A"),
-                    "amount": inquiry.get("loanAmount", "N/A"),
-                    "type": "Business Loan",
-                    "productType": "Business Loan",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("created_at", datetime.now()),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching business loan inquiries: {e}")
-        
-        # Get Home Loan Inquiries
-        try:
-            hl_inquiries = home_loan_repository.get_all_get_in_touch()
-            for inquiry in hl_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", inquiry.get("name", "N/A")),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "income": inquiry.get("loanAmount", "N/A"),
-                    "amount": inquiry.get("loanAmount", "N/A"),
-                    "type": "Home Loan",
-                    "productType": "Home Loan",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("created_at", datetime.now()),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching home loan inquiries: {e}")
-        
-        # Get Term Insurance Inquiries
-        try:
-            ti_inquiries = term_insurance_repository.get_all_inquiries(0, 1000)
-            for inquiry in ti_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", inquiry.get("name", "N/A")),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "income": inquiry.get("amount", "N/A"),
-                    "amount": inquiry.get("amount", "N/A"),
-                    "type": "Term Insurance",
-                    "productType": "Term Insurance",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("created_at", datetime.now()),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching term insurance inquiries: {e}")
-        
-        # Get Motor Insurance Inquiries
-        try:
-            mi_inquiries = motor_insurance_repository.get_all_inquiries(0, 1000)
-            for inquiry in mi_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", inquiry.get("name", "N/A")),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "amount": inquiry.get("amount", "N/A"),
-                    "type": "Motor Insurance",
-                    "productType": "Motor Insurance",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("createdAt", inquiry.get("created_at", datetime.now())),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching motor insurance inquiries: {e}")
-        
-        # Get Health Insurance Inquiries
-        try:
-            hi_inquiries = health_insurance_repository.get_all_inquiries(0, 1000)
-            for inquiry in hi_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", inquiry.get("name", "N/A")),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "amount": inquiry.get("amount", "N/A"),
-                    "type": "Health Insurance",
-                    "productType": "Health Insurance",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("createdAt", inquiry.get("created_at", datetime.now())),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching health insurance inquiries: {e}")
-        
-        # Get SIP Inquiries
-        try:
-            sip_repo = SIPRepository()
-            sip_inquiries = sip_repo.get_all_inquiries(0, 1000)
-            for inquiry in sip_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", inquiry.get("name", "N/A")),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "income": inquiry.get("amount", "N/A"),
-                    "amount": inquiry.get("amount", "N/A"),
-                    "type": "SIP",
-                    "productType": "SIP",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("createdAt", inquiry.get("created_at", datetime.now())),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching SIP inquiries: {e}")
-        
-        # Get Mutual Funds Inquiries
-        try:
-            mf_repo = MutualFundsRepository()
-            mf_inquiries = mf_repo.get_all_inquiries(0, 1000)
-            for inquiry in mf_inquiries:
-                all_inquiries.append({
-                    "id": str(inquiry.get("_id")),
-                    "name": inquiry.get("fullName", inquiry.get("name", "N/A")),
-                    "email": inquiry.get("email", "N/A"),
-                    "phone": inquiry.get("phone", "N/A"),
-                    "income": inquiry.get("amount", "N/A"),
-                    "amount": inquiry.get("amount", "N/A"),
-                    "type": "Mutual Funds",
-                    "productType": "Mutual Funds",
-                    "status": inquiry.get("status", "pending"),
-                    "createdAt": inquiry.get("createdAt", inquiry.get("created_at", datetime.now())),
-                    "message": inquiry.get("message", "")
-                })
-        except Exception as e:
-            print(f"Error fetching mutual funds inquiries: {e}")
-        
-        # Get Personal Tax Consultation Bookings
-        try:
-            personal_tax_consultations = personal_tax_repository.get_all_consultations(0, 1000)
-            for consultation in personal_tax_consultations:
-                all_inquiries.append({
-                    "id": str(consultation.get("_id")),
-                    "name": consultation.get("name", "N/A"),
-                    "email": consultation.get("email", "N/A"),
-                    "phone": consultation.get("phone", "N/A"),
-                    "income": consultation.get("income", "N/A"),
-                    "amount": consultation.get("income", "N/A"),
-                    "type": "Personal Tax Planning",
-                    "productType": "Personal Tax Planning",
-                    "status": consultation.get("status", "pending"),
-                    "createdAt": consultation.get("createdAt", datetime.now()),
-                    "message": f"Income Range: {consultation.get('income', 'N/A')}, Tax Regime: {consultation.get('taxRegime', 'N/A')}"
-                })
-        except Exception as e:
-            print(f"Error fetching personal tax consultation inquiries: {e}")
-        
-        # Get Business Tax Consultation Bookings
-        try:
-            business_tax_consultations = business_tax_repository.get_all_consultations(0, 1000)
-            for consultation in business_tax_consultations:
-                all_inquiries.append({
-                    "id": str(consultation.get("_id")),
-                    "name": consultation.get("ownerName", "N/A"),
-                    "email": consultation.get("email", "N/A"),
-                    "phone": consultation.get("phone", "N/A"),
-                    "income": consultation.get("annualTurnover", "N/A"),
-                    "amount": consultation.get("annualTurnover", "N/A"),
-                    "type": "Business Tax Strategy",
-                    "productType": "Business Tax Strategy",
-                    "status": consultation.get("status", "pending"),
-                    "createdAt": consultation.get("createdAt", datetime.now()),
-                    "message": f"Business: {consultation.get('businessName', 'N/A')}, Type: {consultation.get('businessType', 'N/A')}, Turnover: {consultation.get('annualTurnover', 'N/A')}"
-                })
-        except Exception as e:
-            print(f"Error fetching business tax consultation inquiries: {e}")
-        
-        # Sort by created date descending
-        all_inquiries.sort(key=lambda x: x.get("createdAt", datetime.now()), reverse=True)
+        page = await inquiry_index_repository.list_inquiries(
+            limit=limit,
+            cursor=cursor,
+            product_type=product_type,
+            status=status_filter,
+            search=search,
+            sort_order=sort_order
+        )
         
         return {
             "success": True,
-            "total": len(all_inquiries),
-            "data": all_inquiries
+            "total": page["total"],
+            "data": page["items"],
+            "nextCursor": page["nextCursor"],
+            "hasMore": page["hasMore"]
         }
+    except (ValueError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -4169,10 +3825,10 @@ async def update_inquiry_status(
             success = health_insurance_repository.update_inquiry_status(inquiry_id, status_update.status)
         elif status_update.inquiry_type == "SIP":
             sip_repo = SIPRepository()
-            success = sip_repo.update_inquiry_status(inquiry_id, status_update.status)
+            success = await sip_repo.update_inquiry_status(inquiry_id, status_update.status)
         elif status_update.inquiry_type == "Mutual Funds":
             mf_repo = MutualFundsRepository()
-            success = mf_repo.update_inquiry_status(inquiry_id, status_update.status)
+            success = await mf_repo.update_inquiry_status(inquiry_id, status_update.status)
         else:
             raise HTTPException(
                 status_code=400,
@@ -21,6 +21,10 @@ from app.utils.security import hash_password, verify_password, create_access_tok
 from app.utils.auth_middleware import get_current_user
 from app.utils.file_upload import save_upload_file
 from app.utils.email_service import send_otp_email, send_welcome_email
+from app.utils.otp_store import get_otp_store
+from app.utils.user_cache import user_principal_cache
+from app.utils.search import USER_SEARCH, refresh_search_keys, touches_search_fields, with_search_keys
+from app.config import OTP_EXPIRE_MINUTES
 from datetime import datetime, timedelta
 import random
 import re
@@ -35,8 +39,36 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 # Google OAuth Client ID (set in environment variable)
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "your-google-client-id.apps.googleusercontent.com")
 
-# Temporary OTP storage (In production, use Redis or database with TTL)
-otp_storage = {}
+
+def enforce_otp_send_limit(key: str):
+    """Reject the request with 429 when `key` (email or phone) asked for too many OTPs"""
+    allowed, retry_after = get_otp_store().register_send(key)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many OTP requests. Please try again in {max(1, retry_after // 60)} minute(s)",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+def check_otp(key: str, otp: str, purpose: str):
+    """Validate and consume an OTP, raising the matching 400 error otherwise"""
+    result = get_otp_store().verify(key, otp, purpose)
+    if result == "expired":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="OTP has expired. Please request a new one"
+        )
+    if result == "invalid":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid OTP"
+        )
+    if result != "valid":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired OTP"
+        )
 
 # Request/Response Models
 class ForgotPasswordRequest(BaseModel):
@@ -311,6 +343,7 @@ def google_login(request: GoogleLoginRequest):
                     {"_id": user["_id"]},
                     {"$set": update_fields}
                 )
+                user_principal_cache.invalidate(user["_id"])
                 # Refresh user data after update
                 user = user_repository.get_user_by_id(str(user["_id"]))
                 
@@ -332,7 +365,7 @@ def google_login(request: GoogleLoginRequest):
             
             try:
                 collection = user_repository.get_collection()
-                result = collection.insert_one(new_user_data)
+                result = collection.insert_one(with_search_keys(new_user_data, USER_SEARCH))
                 user = user_repository.get_user_by_id(str(result.inserted_id))
                 
                 if not user:
@@ -527,6 +560,9 @@ async def forgot_password(request: ForgotPasswordRequest, background_tasks: Back
             detail="Email service not configured. Please contact administrator."
         )
     
+    # Rate limit before the lookup so throttling does not reveal whether the email exists
+    enforce_otp_send_limit(email_lower)
+    
     # Check if user exists
     user = user_repository.get_user_by_email(email_lower)
     if not user:
@@ -539,17 +575,13 @@ async def forgot_password(request: ForgotPasswordRequest, background_tasks: Back
     # Generate 6-digit OTP
     otp = str(random.randint(100000, 999999))
     
-    # Store OTP with expiry (5 minutes)
-    otp_storage[email_lower] = {
-        "otp": otp,
-        "expiry": datetime.utcnow() + timedelta(minutes=5),
-        "type": "password_reset"
-    }
+    # Store OTP with expiry
+    get_otp_store().save(email_lower, otp, "password_reset", OTP_EXPIRE_MINUTES * 60)
     
     # Print OTP in console for development
     print(f"\n{'='*50}")
     print(f"PASSWORD RESET OTP for {email_lower}: {otp}")
-    print(f"Valid for 5 minutes")
+    print(f"Valid for {OTP_EXPIRE_MINUTES} minutes")
     print(f"{'='*50}\n")
     
     # Get user name for email personalization
@@ -576,7 +608,7 @@ async def forgot_password(request: ForgotPasswordRequest, background_tasks: Back
     return {
         "message": "OTP has been sent to your email address. Please check your inbox and spam folder.",
         "success": True,
-        "otp_expiry_minutes": 5
+        "otp_expiry_minutes": OTP_EXPIRE_MINUTES
     }
 
 
@@ -587,29 +619,8 @@ def reset_password(request: ResetPasswordRequest):
     """
     email_lower = request.email.lower()
     
-    # Validate OTP
-    if email_lower not in otp_storage:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired OTP"
-        )
-    
-    stored = otp_storage[email_lower]
-    
-    # Check expiry
-    if datetime.utcnow() > stored["expiry"]:
-        del otp_storage[email_lower]
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="OTP has expired. Please request a new one"
-        )
-    
-    # Check OTP match
-    if stored["otp"] != request.otp:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid OTP"
-        )
+    # Validate (and consume) OTP
+    check_otp(email_lower, request.otp, "password_reset")
     
     # Get user
     user = user_repository.get_user_by_email(email_lower)
@@ -625,9 +636,6 @@ def reset_password(request: ResetPasswordRequest):
     # Update password in database
     user_repository.update_password(str(user["_id"]), hashed_password)
     
-    # Remove used OTP
-    del otp_storage[email_lower]
-    
     return {"message": "Password reset successful. Please login with your new password"}
 
 
@@ -645,6 +653,8 @@ def send_otp(request: SendOTPRequest):
             detail="Invalid mobile number. Must be 10 digits starting with 6-9"
         )
     
+    enforce_otp_send_limit(phone)
+    
     # Check if user exists with this phone
     user = user_repository.get_user_by_phone(phone)
     if not user:
@@ -656,17 +666,13 @@ def send_otp(request: SendOTPRequest):
     # Generate 6-digit OTP
     otp = str(random.randint(100000, 999999))
     
-    # Store OTP with expiry (5 minutes)
-    otp_storage[phone] = {
-        "otp": otp,
-        "expiry": datetime.utcnow() + timedelta(minutes=5),
-        "type": "mobile_login"
-    }
+    # Store OTP with expiry
+    get_otp_store().save(phone, otp, "mobile_login", OTP_EXPIRE_MINUTES * 60)
     
     # In production: Send OTP via SMS service (Twilio, AWS SNS, etc.)
     print(f"\n{'='*50}")
     print(f"LOGIN OTP for {phone}: {otp}")
-    print(f"Valid for 5 minutes")
+    print(f"Valid for {OTP_EXPIRE_MINUTES} minutes")
     print(f"{'='*50}\n")
     
     return {
@@ -682,29 +688,8 @@ def verify_otp(request: VerifyOTPRequest):
     """
     phone = request.phone
     
-    # Validate OTP exists
-    if phone not in otp_storage:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired OTP"
-        )
-    
-    stored = otp_storage[phone]
-    
-    # Check expiry
-    if datetime.utcnow() > stored["expiry"]:
-        del otp_storage[phone]
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="OTP has expired. Please request a new one"
-        )
-    
-    # Check OTP match
-    if stored["otp"] != request.otp:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid OTP"
-        )
+    # Validate (and consume) OTP
+    check_otp(phone, request.otp, "mobile_login")
     
     # Get user
     user = user_repository.get_user_by_phone(phone)
@@ -727,9 +712,6 @@ def verify_otp(request: VerifyOTPRequest):
     # Create access token
     access_token = create_access_token(data={"sub": str(user["_id"]), "email": user["email"]})
     
-    # Remove used OTP
-    del otp_storage[phone]
-    
     # Convert user to response format
     user_response = UserResponse(
         id=str(user["_id"]),
@@ -987,12 +969,15 @@ async def update_user_profile(
             {"_id": ObjectId(user_id)},
             {"$set": update_data}
         )
+        user_principal_cache.invalidate(user_id)
         
         if result.matched_count == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
+        if touches_search_fields(update_data, USER_SEARCH):
+            refresh_search_keys(collection, {"_id": ObjectId(user_id)}, USER_SEARCH)
         
         # Fetch updated user
         updated_user = collection.find_one({"_id": ObjectId(user_id)})
@@ -1077,7 +1062,7 @@ def change_password(
                     "updatedAt": datetime.utcnow(),
                     "hashedPassword": hash_password(password_data.currentPassword)
                 }
-                result = collection.insert_one(admin_data)
+                result = collection.insert_one(with_search_keys(admin_data, USER_SEARCH))
                 # Use the inserted ID for the update
                 query = {"_id": result.inserted_id}
             else:
@@ -1142,6 +1127,7 @@ def change_password(
                 }
             }
         )
+        user_principal_cache.invalidate(user["_id"])
         
         if result.modified_count == 0:
             raise HTTPException(
@@ -12,7 +12,7 @@ Handles all business-related service applications including:
 - Accounting & Bookkeeping
 """
 
-from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Form
+from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Form, Query
 from fastapi.responses import JSONResponse
 from typing import Optional, List
 from datetime import datetime
@@ -22,8 +22,14 @@ import os
 import uuid
 import base64
 
-from ..database.db import get_database
+from ..database.db import get_database, get_async_database
+from ..database.repository.business_services_repository import (
+    business_services_repository,
+    normalize_service_status,
+    BUSINESS_SERVICE_COLLECTIONS
+)
 from ..utils.auth_middleware import get_current_user
+from ..utils.file_upload import submission_uploads
 
 router = APIRouter(prefix="/api/business-services", tags=["Carporate Services"])
 
@@ -212,23 +218,6 @@ def save_base64_file(base64_string: str, folder: str, filename: str) -> str:
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid file data: {str(e)}")
 
-def save_uploaded_file(file: UploadFile, folder: str) -> str:
-    """Save uploaded file and return file path (kept for backward compatibility)"""
-    if not file:
-        return None
-    
-    upload_dir = os.path.join("uploads", folder)
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(upload_dir, unique_filename)
-    
-    with open(file_path, "wb") as f:
-        f.write(file.file.read())
-    
-    return file_path
-
 # ======================== COMPANY REGISTRATION APIs ========================
 
 @router.post("/company-registration")
@@ -275,6 +264,7 @@ async def submit_company_registration(
             "state": state,
             "pincode": pincode,
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -290,12 +280,10 @@ async def submit_company_registration(
             "aoa_draft": aoa_draft
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj and file_obj.filename:
-                file_path = save_uploaded_file(file_obj, f"company_registration/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -307,6 +295,8 @@ async def submit_company_registration(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error submitting company registration: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -418,6 +408,7 @@ async def submit_company_compliance(
             "state": state,
             "pincode": pincode,
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -432,12 +423,10 @@ async def submit_company_compliance(
             "address_proof": address_proof
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj and file_obj.filename:
-                file_path = save_uploaded_file(file_obj, f"company_compliance/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -449,6 +438,8 @@ async def submit_company_compliance(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error submitting company compliance: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -532,6 +523,7 @@ async def submit_tax_audit(
             "state": state,
             "pincode": pincode,
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -546,12 +538,10 @@ async def submit_tax_audit(
             "bank_statements": bank_statements
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj:
-                file_path = save_uploaded_file(file_obj, f"tax_audit/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -563,6 +553,8 @@ async def submit_tax_audit(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error submitting tax audit: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -644,6 +636,7 @@ async def submit_legal_advice(
             "pincode": pincode,
             "company_pan": companyPAN.upper(),
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -656,12 +649,10 @@ async def submit_legal_advice(
             "legal_notices": legalNotices
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj:
-                file_path = save_uploaded_file(file_obj, f"legal_advice/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -673,6 +664,8 @@ async def submit_legal_advice(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit application: {str(e)}")
 
@@ -754,6 +747,7 @@ async def submit_pf_services(
             "pincode": pincode,
             "company_pan": companyPAN.upper() if companyPAN else None,
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -766,12 +760,10 @@ async def submit_pf_services(
             "existing_pf_documents": existingPFDocuments
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj:
-                file_path = save_uploaded_file(file_obj, f"pf_services/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -783,6 +775,8 @@ async def submit_pf_services(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit application: {str(e)}")
 
@@ -864,6 +858,7 @@ async def submit_tds_services(
             "state": state,
             "pincode": pincode,
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -878,12 +873,10 @@ async def submit_tds_services(
             "pan_card": panCard
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj and file_obj.filename:  # Check if file exists and has a filename
-                file_path = save_uploaded_file(file_obj, f"tds_services/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -895,6 +888,8 @@ async def submit_tds_services(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit application: {str(e)}")
 
@@ -976,6 +971,7 @@ async def submit_gst_services(
             "state": state,
             "pincode": pincode,
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -990,12 +986,10 @@ async def submit_gst_services(
             "pan_card": panCard
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj and file_obj.filename:  # Check if file exists and has a filename
-                file_path = save_uploaded_file(file_obj, f"gst_services/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -1007,6 +1001,8 @@ async def submit_gst_services(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit application: {str(e)}")
 
@@ -1090,6 +1086,7 @@ async def submit_payroll_services(
             "pf_number": pfNumber,
             "esi_number": esiNumber,
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -1102,12 +1099,10 @@ async def submit_payroll_services(
             "registration_proofs": registrationProofs
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj and file_obj.filename:
-                file_path = save_uploaded_file(file_obj, f"payroll_services/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -1119,6 +1114,8 @@ async def submit_payroll_services(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit application: {str(e)}")
 
@@ -1200,6 +1197,7 @@ async def submit_accounting_bookkeeping(
             "state": state,
             "pincode": pincode,
             "status": "Pending",
+            "statusKey": normalize_service_status("Pending"),
             "documents": {},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
@@ -1214,12 +1212,10 @@ async def submit_accounting_bookkeeping(
             "pan_card": panCard
         }
         
-        for doc_name, file_obj in file_mapping.items():
-            if file_obj and file_obj.filename:
-                file_path = save_uploaded_file(file_obj, f"accounting_bookkeeping/{application_id}")
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(file_mapping) as stored:
+            application_data["documents"] = {doc_name: meta["path"].lstrip("/") for doc_name, meta in stored.items()}
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         application_data["_id"] = str(result.inserted_id)
         application_data["created_at"] = application_data["created_at"].isoformat()
         application_data["updated_at"] = application_data["updated_at"].isoformat()
@@ -1231,6 +1227,8 @@ async def submit_accounting_bookkeeping(
             "data": application_data
         }, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit application: {str(e)}")
 
@@ -1273,68 +1271,14 @@ async def get_accounting_bookkeeping_applications(
 async def get_business_services_stats():
     """Get statistics for all business service applications"""
     try:
-        db = get_database()
-        
-        if db is None:
+        if get_async_database() is None:
             raise HTTPException(status_code=503, detail="Database connection not available")
         
-        # Define all collections
-        collections = [
-            "company_registration_applications",
-            "company_compliance_applications",
-            "tax_audit_applications",
-            "legal_advice_applications",
-            "pf_services_applications",
-            "tds_services_applications",
-            "gst_services_applications",
-            "payroll_services_applications",
-            "accounting_bookkeeping_applications"
-        ]
-        
-        total_count = 0
-        pending_count = 0
-        approved_count = 0
-        completed_count = 0
-        rejected_count = 0
-        
-        # Count applications from all collections
-        for collection_name in collections:
-            try:
-                collection = db[collection_name]
-                
-                # Total count
-                total_count += collection.count_documents({})
-                
-                # Status counts (case-insensitive)
-                pending_count += collection.count_documents({
-                    "status": {"$regex": "^pending$", "$options": "i"}
-                })
-                
-                approved_count += collection.count_documents({
-                    "status": {"$regex": "^approved$", "$options": "i"}
-                })
-                
-                completed_count += collection.count_documents({
-                    "status": {"$regex": "^completed$", "$options": "i"}
-                })
-                
-                rejected_count += collection.count_documents({
-                    "status": {"$regex": "^rejected$", "$options": "i"}
-                })
-            except Exception as collection_error:
-                # Skip if collection doesn't exist
-                print(f"Warning: Error accessing collection {collection_name}: {collection_error}")
-                continue
+        stats = await business_services_repository.get_status_stats()
         
         return JSONResponse(content={
             "success": True,
-            "stats": {
-                "total": total_count,
-                "pending": pending_count,
-                "approved": approved_count,
-                "completed": completed_count,
-                "rejected": rejected_count
-            }
+            "stats": stats
         })
         
     except HTTPException:
@@ -1346,67 +1290,51 @@ async def get_business_services_stats():
 @router.get("/all-applications")
 async def get_all_business_service_applications(
     service_type: str = None,
-    status: str = None
+    status: str = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None
 ):
-    """Get all business service applications with optional filtering"""
+    """Get business service applications across all services with optional filtering
+    
+    Newest first, keyset-paginated: pass the returned nextCursor to get the next page.
+    The total is only counted for the first page (null when a cursor is passed)
+    """
     try:
-        db = get_database()
-        
-        all_applications = []
-        
-        # Define all collections with their mapping to frontend service types
-        collections_mapping = {
-            "company_registration_applications": "Register Your New Company",
-            "company_compliance_applications": "Compliance for New Company",
-            "tax_audit_applications": "Tax Audit",
-            "legal_advice_applications": "Legal Advice",
-            "pf_services_applications": "Provident Fund Services",
-            "tds_services_applications": "TDS Services",
-            "gst_services_applications": "GST Services",
-            "payroll_services_applications": "Payroll Services",
-            "accounting_bookkeeping_applications": "Accounting & Bookkeeping"
-        }
+        if get_async_database() is None:
+            raise HTTPException(status_code=503, detail="Database connection not available")
         
-        # Filter collections if service_type is specified
-        if service_type and service_type != "all":
-            # Find matching collection
-            selected_collections = {k: v for k, v in collections_mapping.items() if v == service_type}
-        else:
-            selected_collections = collections_mapping
+        result = await business_services_repository.list_applications(
+            service_type=service_type,
+            status=status,
+            limit=limit,
+            cursor=cursor
+        )
         
-        for collection_name, service_name in selected_collections.items():
-            collection = db[collection_name]
-            
-            # Build query filter
-            query_filter = {}
-            if status and status != "all":
-                # Match status (case-insensitive)
-                query_filter["status"] = {"$regex": f"^{status}$", "$options": "i"}
-            
-            apps = list(collection.find(query_filter))
-            
-            for app in apps:
-                app["_id"] = str(app["_id"])
-                if "created_at" in app and hasattr(app["created_at"], "isoformat"):
-                    app["created_at"] = app["created_at"].isoformat()
-                if "updated_at" in app and hasattr(app["updated_at"], "isoformat"):
-                    app["updated_at"] = app["updated_at"].isoformat()
-                app["service_type"] = service_name
-                all_applications.append(app)
-        
-        # Sort by created_at descending
-        all_applications.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        applications = result["applications"]
+        for app in applications:
+            app["_id"] = str(app["_id"])
+            if "created_at" in app and hasattr(app["created_at"], "isoformat"):
+                app["created_at"] = app["created_at"].isoformat()
+            if "updated_at" in app and hasattr(app["updated_at"], "isoformat"):
+                app["updated_at"] = app["updated_at"].isoformat()
         
         return JSONResponse(content={
             "success": True,
-            "count": len(all_applications),
-            "applications": all_applications,
+            "count": len(applications),
+            "total": result["total"],
+            "applications": applications,
+            "hasMore": result["hasMore"],
+            "nextCursor": result["nextCursor"],
             "filters": {
                 "service_type": service_type or "all",
                 "status": status or "all"
             }
         })
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch applications: {str(e)}")
 
@@ -1428,20 +1356,8 @@ async def update_application_status(
             )
         
         # Try to find and update the application in all collections
-        collections = [
-            "company_registration_applications",
-            "company_compliance_applications",
-            "tax_audit_applications",
-            "legal_advice_applications",
-            "pf_services_applications",
-            "tds_services_applications",
-            "gst_services_applications",
-            "payroll_services_applications",
-            "accounting_bookkeeping_applications"
-        ]
-        
         updated = False
-        for collection_name in collections:
+        for collection_name in BUSINESS_SERVICE_COLLECTIONS:
             collection = db[collection_name]
             
             # Try updating by _id
@@ -1450,6 +1366,7 @@ async def update_application_status(
                 {
                     "$set": {
                         "status": status_update.status,
+                        "statusKey": normalize_service_status(status_update.status),
                         "updated_at": datetime.now()
                     }
                 }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import List, Optional
 from app.database.schema.contact_schema import (
     ContactSubmissionRequest,
@@ -15,6 +15,7 @@ from app.database.schema.contact_schema import (
 )
 from app.database.repository.contact_repository import contact_repository
 from app.utils.auth_middleware import get_current_user_optional
+from app.utils.response_cache import cached_json_response
 from datetime import datetime
 
 router = APIRouter(prefix="/api/contact", tags=["Contact"])
@@ -62,6 +63,7 @@ def submit_contact_form(submission: ContactSubmissionRequest):
 
 @router.get("/faqs", response_model=List[FAQResponse])
 def get_faqs(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category: all, loans, insurance, investments, tax")
 ):
     """
@@ -75,22 +77,32 @@ def get_faqs(
     - tax: Tax planning questions
     """
     try:
-        faqs = contact_repository.get_all_faqs(category=category, is_active=True)
-        
-        return [
-            FAQResponse(
-                id=str(faq["_id"]),
-                category=faq["category"],
-                question=faq["question"],
-                answer=faq["answer"],
-                highlight=faq.get("highlight"),
-                isActive=faq.get("isActive", True),
-                order=faq.get("order", 0),
-                createdAt=faq["createdAt"],
-                updatedAt=faq.get("updatedAt")
-            )
-            for faq in faqs
-        ]
+        def build():
+            faqs = contact_repository.get_all_faqs(category=category, is_active=True)
+
+            return [
+                FAQResponse(
+                    id=str(faq["_id"]),
+                    category=faq["category"],
+                    question=faq["question"],
+                    answer=faq["answer"],
+                    highlight=faq.get("highlight"),
+                    isActive=faq.get("isActive", True),
+                    order=faq.get("order", 0),
+                    createdAt=faq["createdAt"],
+                    updatedAt=faq.get("updatedAt")
+                )
+                for faq in faqs
+            ]
+
+        # Any category outside FAQCategory matches no FAQ, so they all share one entry
+        if not category or category == FAQCategory.ALL.value:
+            cache_category = "all"
+        elif category in {member.value for member in FAQCategory}:
+            cache_category = category
+        else:
+            cache_category = "unknown"
+        return cached_json_response(f"contact:faqs:{cache_category}", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
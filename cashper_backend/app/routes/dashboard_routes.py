@@ -10,7 +10,7 @@ from app.database.schema.dashboard_schema import (
 )
 from app.database.repository.dashboard_repository import dashboard_repository
 from app.utils.auth_middleware import get_current_user
-from app.utils.file_upload import save_upload_file
+from app.utils.file_upload import delete_file, store_upload
 from datetime import datetime
 from bson import ObjectId
 import os
@@ -313,27 +313,21 @@ async def upload_document(
                 detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
             )
         
-        # Validate file size (10MB max)
-        file.file.seek(0, 2)  # Seek to end of file
-        file_size = file.file.tell()  # Get current position (file size)
-        file.file.seek(0)  # Reset file pointer to beginning
-        
-        max_file_size = 10 * 1024 * 1024  # 10MB in bytes
-        if file_size > max_file_size:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File size exceeds 10MB limit"
-            )
-        
-        # Save the uploaded document
+        # Save the uploaded document (streamed; the 10MB limit is enforced while copying)
         try:
-            file_path = await save_upload_file(file, "document")
-            # file_path returns something like /uploads/documents/xxxxx.pdf
+            stored = await store_upload(file, "document")
+            file_path = stored.path
+            file_size = stored.size
+            # file_path returns something like /uploads/content/ab/<sha256>.pdf
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to upload file: {str(e)}"
             )
+        finally:
+            await file.close()
         
         # Create file URL (file_path already includes /uploads/)
         file_url = file_path
@@ -499,12 +493,9 @@ def delete_document(
                 detail="Failed to delete document from database"
             )
         
-        # Try to delete the physical file
+        # Try to delete the physical file (kept while other documents share its content)
         try:
-            file_path = document["filePath"]
-            full_path = os.path.join("uploads", file_path)
-            if os.path.exists(full_path):
-                os.remove(full_path)
+            delete_file(document["filePath"])
         except Exception as e:
             print(f"Warning: Failed to delete physical file: {str(e)}")
             # Continue even if physical file deletion fails
@@ -14,6 +14,7 @@ from app.database.schema.home_loan_schema import (
 )
 from app.database.repository import home_loan_repository
 from app.utils.file_upload import save_upload_file
+from app.utils.loan_status import normalize_loan_status
 from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/api/home-loan", tags=["Home Loan"])
@@ -352,7 +353,7 @@ async def update_application_status(application_id: str, status_update: StatusUp
         collection = db["home_loan_applications"]
         
         # Prepare update data
-        update_data = {"status": new_status}
+        update_data = {"status": new_status, "statusKey": normalize_loan_status(new_status)}
         rejection_reason = status_update.rejectionReason or status_update.reason
         if new_status == "rejected" and rejection_reason:
             update_data["rejectionReason"] = rejection_reason
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, UploadFile, File
 from typing import List, Optional
 from app.database.schema.home_schema import (
     HomeTestimonialRequest, HomeTestimonialResponse, HomeTestimonialInDB,
@@ -7,6 +7,7 @@ from app.database.schema.home_schema import (
 from app.database.repository.home_repository import home_repository
 from app.utils.auth_middleware import get_current_user_optional
 from app.utils.file_upload import save_upload_file, delete_file, replace_file
+from app.utils.response_cache import cached_json_response
 from datetime import datetime
 
 router = APIRouter(prefix="/home", tags=["Home Content"])
@@ -14,31 +15,34 @@ router = APIRouter(prefix="/home", tags=["Home Content"])
 # ===================== PUBLIC ENDPOINTS (No Authentication) =====================
 
 @router.get("/testimonials", response_model=List[HomeTestimonialResponse])
-def get_home_testimonials():
+def get_home_testimonials(request: Request):
     """
     Get all active homepage testimonials (PUBLIC - No authentication required)
     
     Returns list of customer testimonials to display on homepage
     """
     try:
-        testimonials = home_repository.get_all_home_testimonials(is_active=True)
-        
-        return [
-            HomeTestimonialResponse(
-                id=str(t["_id"]),
-                name=t["name"],
-                role=t["role"],
-                image=t.get("image"),
-                rating=t["rating"],
-                text=t["text"],
-                location=t["location"],
-                isActive=t.get("isActive", True),
-                order=t.get("order", 0),
-                createdAt=t["createdAt"],
-                updatedAt=t.get("updatedAt")
-            )
-            for t in testimonials
-        ]
+        def build():
+            testimonials = home_repository.get_all_home_testimonials(is_active=True)
+
+            return [
+                HomeTestimonialResponse(
+                    id=str(t["_id"]),
+                    name=t["name"],
+                    role=t["role"],
+                    image=t.get("image"),
+                    rating=t["rating"],
+                    text=t["text"],
+                    location=t["location"],
+                    isActive=t.get("isActive", True),
+                    order=t.get("order", 0),
+                    createdAt=t["createdAt"],
+                    updatedAt=t.get("updatedAt")
+                )
+                for t in testimonials
+            ]
+
+        return cached_json_response("home:testimonials", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -48,6 +52,7 @@ def get_home_testimonials():
 
 @router.get("/blogs", response_model=List[BlogPostResponse])
 def get_blog_posts(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category"),
     featured: Optional[bool] = Query(None, description="Filter featured posts")
 ):
@@ -59,36 +64,43 @@ def get_blog_posts(
     - featured: Get only featured posts
     """
     try:
-        blogs = home_repository.get_all_blog_posts(
-            is_published=True,
-            is_featured=featured,
-            category=category
-        )
-
-        return [
-            BlogPostResponse(
-                id=str(b["_id"]),
-                title=b["title"],
-                excerpt=b["excerpt"],
-                content=b.get("content"),
-                image=b.get("image"),
-                category=b["category"],
-                readTime=b["readTime"],
-                date=b["createdAt"].strftime("%b %d, %Y"),
-                author=b["author"],
-                color=b.get("color"),
-                bgColor=b.get("bgColor"),
-                textColor=b.get("textColor"),
-                tags=b.get("tags", []),
-                isPublished=b.get("isPublished", True),
-                isFeatured=b.get("isFeatured", False),
-                order=b.get("order", 0),
-                views=b.get("views", 0),
-                createdAt=b["createdAt"],
-                updatedAt=b.get("updatedAt")
+        def build():
+            blogs = home_repository.get_all_blog_posts(
+                is_published=True,
+                is_featured=featured,
+                category=category
             )
-            for b in blogs
-        ]
+
+            return [
+                BlogPostResponse(
+                    id=str(b["_id"]),
+                    title=b["title"],
+                    excerpt=b["excerpt"],
+                    content=b.get("content"),
+                    image=b.get("image"),
+                    category=b["category"],
+                    readTime=b["readTime"],
+                    date=b["createdAt"].strftime("%b %d, %Y"),
+                    author=b["author"],
+                    color=b.get("color"),
+                    bgColor=b.get("bgColor"),
+                    textColor=b.get("textColor"),
+                    tags=b.get("tags", []),
+                    isPublished=b.get("isPublished", True),
+                    isFeatured=b.get("isFeatured", False),
+                    order=b.get("order", 0),
+                    views=b.get("views", 0),
+                    createdAt=b["createdAt"],
+                    updatedAt=b.get("updatedAt")
+                )
+                for b in blogs
+            ]
+
+        # Categories without any post all render an empty list and share one entry
+        cache_category = category
+        if category and category not in home_repository.get_blog_categories():
+            cache_category = "unknown"
+        return cached_json_response(f"home:blogs:list:{cache_category}:{featured}", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -109,8 +121,8 @@ def get_blog_post_by_id(blog_id: str):
             detail="Blog post not found"
         )
     
-    # Increment view count
-    home_repository.increment_blog_views(blog_id)
+    # Record the view (buffered, written in batches)
+    pending_views = home_repository.increment_blog_views(blog_id)
     
     return BlogPostResponse(
         id=str(blog["_id"]),
@@ -129,43 +141,46 @@ def get_blog_post_by_id(blog_id: str):
         isPublished=blog.get("isPublished", True),
         isFeatured=blog.get("isFeatured", False),
         order=blog.get("order", 0),
-        views=blog.get("views", 0),
+        views=blog.get("views", 0) + pending_views,
         createdAt=blog["createdAt"],
         updatedAt=blog.get("updatedAt")
     )
 
 @router.get("/blogs/featured/list", response_model=List[BlogPostResponse])
-def get_featured_blogs(limit: int = Query(3, ge=1, le=10)):
+def get_featured_blogs(request: Request, limit: int = Query(3, ge=1, le=10)):
     """
     Get featured blog posts (PUBLIC - No authentication required)
     """
     try:
-        blogs = home_repository.get_featured_blogs(limit=limit)
-        
-        return [
-            BlogPostResponse(
-                id=str(b["_id"]),
-                title=b["title"],
-                excerpt=b["excerpt"],
-                content=b.get("content"),
-                image=b.get("image"),
-                category=b["category"],
-                readTime=b["readTime"],
-                date=b["createdAt"].strftime("%b %d, %Y"),
-                author=b["author"],
-                color=b.get("color"),
-                bgColor=b.get("bgColor"),
-                textColor=b.get("textColor"),
-                tags=b.get("tags", []),
-                isPublished=b.get("isPublished", True),
-                isFeatured=b.get("isFeatured", False),
-                order=b.get("order", 0),
-                views=b.get("views", 0),
-                createdAt=b["createdAt"],
-                updatedAt=b.get("updatedAt")
-            )
-            for b in blogs
-        ]
+        def build():
+            blogs = home_repository.get_featured_blogs(limit=limit)
+
+            return [
+                BlogPostResponse(
+                    id=str(b["_id"]),
+                    title=b["title"],
+                    excerpt=b["excerpt"],
+                    content=b.get("content"),
+                    image=b.get("image"),
+                    category=b["category"],
+                    readTime=b["readTime"],
+                    date=b["createdAt"].strftime("%b %d, %Y"),
+                    author=b["author"],
+                    color=b.get("color"),
+                    bgColor=b.get("bgColor"),
+                    textColor=b.get("textColor"),
+                    tags=b.get("tags", []),
+                    isPublished=b.get("isPublished", True),
+                    isFeatured=b.get("isFeatured", False),
+                    order=b.get("order", 0),
+                    views=b.get("views", 0),
+                    createdAt=b["createdAt"],
+                    updatedAt=b.get("updatedAt")
+                )
+                for b in blogs
+            ]
+
+        return cached_json_response(f"home:blogs:featured:{limit}", build, request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, status, Depends, Header
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from app.database.schema.loan_management_schema import (
     LoanSummaryResponse,
@@ -10,11 +10,15 @@ from app.database.schema.loan_management_schema import (
     LoanDetailsResponse,
     CreateLoanRequest,
     CreateLoanResponse,
+    EMICalculatorBatchRequest,
+    EMICalculatorResult,
+    EMICalculatorBatchResponse,
     ActiveLoanInDB,
     EMIPaymentInDB
 )
 from app.database.repository.loan_management_repository import loan_management_repository
 from app.utils.auth_middleware import get_current_user
+from app.utils import calculator_engine
 from bson import ObjectId
 import random
 
@@ -162,7 +166,8 @@ def get_loan_applications(current_user: dict = Depends(get_current_user)):
 @router.post("/pay-emi", response_model=EMIPaymentResponse, status_code=status.HTTP_201_CREATED)
 def pay_emi(
     payment_request: EMIPaymentCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=8, max_length=128)
 ):
     """
     Process EMI payment for a loan
@@ -171,6 +176,8 @@ def pay_emi(
     - Loan ID
     - Payment method (UPI, Net Banking, Card, Wallet)
     - Payment amount
+    - Optional Idempotency-Key header: retrying a request with the same key
+      returns the original payment instead of paying twice
     
     The payment will be recorded and loan details will be updated:
     - Outstanding amount reduced
@@ -181,22 +188,12 @@ def pay_emi(
     try:
         user_id = str(current_user["_id"])
         
-        # Verify loan belongs to user
-        loan = loan_management_repository.get_loan_by_id(payment_request.loanId, user_id)
-        
-        if not loan:
+        if not ObjectId.is_valid(payment_request.loanId):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Loan not found or you don't have permission to pay for it"
             )
         
-        # Verify payment amount matches EMI amount
-        if payment_request.amount != loan.get("emi_amount", 0):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Payment amount must match EMI amount: ₹{loan.get('emi_amount', 0):,}"
-            )
-        
         # Generate transaction ID
         transaction_id = loan_management_repository._generate_transaction_id()
         
@@ -210,8 +207,37 @@ def pay_emi(
             status="completed"
         )
         
-        # Process payment
-        payment_response = loan_management_repository.process_emi_payment(payment_data)
+        # Process payment (ownership, status and EMI amount are checked atomically)
+        payment_response = loan_management_repository.process_emi_payment(payment_data, idempotency_key)
+        
+        if payment_response is None:
+            loan = loan_management_repository.get_loan_by_id(payment_request.loanId, user_id)
+            if not loan:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Loan not found or you don't have permission to pay for it"
+                )
+            if loan.get("status") != "active":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Loan is {loan.get('status')} and cannot accept payments"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Payment amount must match EMI amount: ₹{loan.get('emi_amount', 0):,}"
+            )
+        
+        # Replayed key: it must belong to the same payment
+        if payment_response.loanId != payment_request.loanId or payment_response.amount != payment_request.amount:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Idempotency-Key was already used for a different payment"
+            )
+        if payment_response.status == "failed":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The payment with this Idempotency-Key could not be applied to the loan"
+            )
         
         return payment_response
         
@@ -339,6 +365,35 @@ def download_loan_statement(
         )
 
 
+# ===================== EMI CALCULATOR ENDPOINT =====================
+
+@router.post("/emi-calculator/batch", response_model=EMICalculatorBatchResponse)
+def calculate_emi_batch(request: EMICalculatorBatchRequest):
+    """
+    Calculate EMIs for every combination of loan amounts, interest rates and tenures
+    
+    Public endpoint for the EMI sliders and comparison charts. Uses the same
+    reducing balance method as loan creation.
+    """
+    try:
+        rows = calculator_engine.emi_table(request.loanAmounts, request.interestRates, request.tenureMonths)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    results = [
+        EMICalculatorResult(
+            loanAmount=principal,
+            interestRate=rate,
+            tenureMonths=int(months),
+            emi=round(emi, 2),
+            totalInterest=round(interest, 2),
+            totalPayment=round(total, 2)
+        )
+        for principal, rate, months, emi, interest, total in rows
+    ]
+    return EMICalculatorBatchResponse(count=len(results), results=results)
+
+
 # ===================== CREATE LOAN ENDPOINT (FOR TESTING/SEEDING) =====================
 
 @router.post("/create-loan", response_model=CreateLoanResponse, status_code=status.HTTP_201_CREATED)
@@ -367,15 +422,9 @@ def create_loan(
         user_id = str(current_user["_id"])
         
         # Calculate EMI using reducing balance method
-        principal = loan_request.loanAmount
-        rate_per_month = loan_request.interestRate / 12 / 100
-        tenure = loan_request.tenureMonths
-        
-        if rate_per_month > 0:
-            emi = int((principal * rate_per_month * ((1 + rate_per_month) ** tenure)) / 
-                     (((1 + rate_per_month) ** tenure) - 1))
-        else:
-            emi = int(principal / tenure)
+        emi = int(calculator_engine.emi(
+            loan_request.loanAmount, loan_request.interestRate, loan_request.tenureMonths
+        ))
         
         # Generate application ID
         app_id = loan_management_repository._generate_application_id(loan_request.loanType)
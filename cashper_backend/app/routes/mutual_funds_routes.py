@@ -11,9 +11,11 @@ from app.database.repository.mutual_funds_repository import MutualFundsRepositor
 from app.database.schema.mutual_funds_schema import (
     MutualFundInquiryRequest, MutualFundInquiryResponse, MutualFundInquiryInDB,
     MutualFundCalculatorRequest, MutualFundCalculatorResponse, MutualFundCalculatorInDB,
+    MutualFundCalculatorBatchRequest, MutualFundCalculatorBatchResponse,
     MutualFundApplicationRequest, MutualFundApplicationResponse, MutualFundApplicationInDB,
     InquiryStatus, ApplicationStatus
 )
+from app.utils import calculator_engine
 
 router = APIRouter(prefix="/api/mutual-funds", tags=["Mutual Funds"])
 repository = MutualFundsRepository()
@@ -40,7 +42,7 @@ async def submit_contact_inquiry(request: MutualFundInquiryRequest):
             status=InquiryStatus.PENDING
         )
         
-        inquiry_id = repository.create_inquiry(inquiry_data.dict())
+        inquiry_id = await repository.create_inquiry(inquiry_data.dict())
         
         # Return response
         return MutualFundInquiryResponse(
@@ -65,7 +67,7 @@ async def submit_contact_inquiry(request: MutualFundInquiryRequest):
 async def get_all_inquiries(skip: int = 0, limit: int = 100):
     """Get all contact inquiries (Admin)"""
     try:
-        inquiries = repository.get_all_inquiries(skip, limit)
+        inquiries = await repository.get_all_inquiries(skip, limit)
         return {
             "success": True,
             "count": len(inquiries),
@@ -80,7 +82,7 @@ async def get_all_inquiries(skip: int = 0, limit: int = 100):
 @router.get("/contact/{inquiry_id}")
 async def get_inquiry(inquiry_id: str):
     """Get specific inquiry by ID"""
-    inquiry = repository.get_inquiry_by_id(inquiry_id)
+    inquiry = await repository.get_inquiry_by_id(inquiry_id)
     if not inquiry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -103,7 +105,7 @@ async def update_inquiry_status(
                 detail=f"Invalid status. Must be one of: {[s.value for s in InquiryStatus]}"
             )
         
-        success = repository.update_inquiry_status(inquiry_id, status, notes)
+        success = await repository.update_inquiry_status(inquiry_id, status, notes)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -130,7 +132,6 @@ async def calculate_investment_returns(request: MutualFundCalculatorRequest):
     """Calculate investment returns for lumpsum or SIP"""
     try:
         investment_type = request.investmentType
-        return_rate = request.returnRate / 100  # Convert percentage to decimal
         time_period = request.timePeriod
         
         if investment_type == "lumpsum":
@@ -142,9 +143,9 @@ async def calculate_investment_returns(request: MutualFundCalculatorRequest):
             
             # Lumpsum calculation: A = P(1 + r/n)^(nt)
             # For annual compounding: A = P(1 + r)^t
-            total_investment = request.amount
-            maturity_value = total_investment * ((1 + return_rate) ** time_period)
-            estimated_returns = maturity_value - total_investment
+            total_investment, estimated_returns, maturity_value = calculator_engine.lumpsum(
+                request.amount, request.returnRate, time_period
+            )
             
             response = MutualFundCalculatorResponse(
                 investmentType=investment_type,
@@ -164,19 +165,10 @@ async def calculate_investment_returns(request: MutualFundCalculatorRequest):
             
             # SIP calculation: M = P × ({[1 + i]^n – 1} / i) × (1 + i)
             # where P = monthly investment, i = monthly rate, n = number of months
-            monthly_rate = return_rate / 12
             total_months = time_period * 12
-            
-            # Future value of SIP
-            if monthly_rate > 0:
-                maturity_value = request.sipAmount * (
-                    ((1 + monthly_rate) ** total_months - 1) / monthly_rate
-                ) * (1 + monthly_rate)
-            else:
-                maturity_value = request.sipAmount * total_months
-            
-            total_investment = request.sipAmount * total_months
-            estimated_returns = maturity_value - total_investment
+            total_investment, estimated_returns, maturity_value = calculator_engine.sip(
+                request.sipAmount, request.returnRate, time_period
+            )
             
             response = MutualFundCalculatorResponse(
                 investmentType=investment_type,
@@ -189,7 +181,7 @@ async def calculate_investment_returns(request: MutualFundCalculatorRequest):
                 totalMonths=total_months
             )
         
-        # Save calculation to database
+        # Record the calculation
         calculation_data = MutualFundCalculatorInDB(
             investmentType=investment_type,
             amount=request.amount,
@@ -200,7 +192,8 @@ async def calculate_investment_returns(request: MutualFundCalculatorRequest):
             estimatedReturns=response.estimatedReturns,
             maturityValue=response.maturityValue
         )
-        repository.save_calculation(calculation_data.dict())
+        # Queued for the write-behind calculation log, off the response path
+        repository.record_calculation(calculation_data.dict())
         
         return response
     
@@ -212,11 +205,39 @@ async def calculate_investment_returns(request: MutualFundCalculatorRequest):
             detail=f"Calculation failed: {str(e)}"
         )
 
+@router.post("/calculator/batch", response_model=MutualFundCalculatorBatchResponse)
+async def calculate_investment_returns_batch(request: MutualFundCalculatorBatchRequest):
+    """Calculate lumpsum or SIP returns for every combination of amounts, rates and periods
+    (slider previews and comparison charts; results are not saved)"""
+    investment_type = request.investmentType
+    is_lumpsum = investment_type == "lumpsum"
+    table = calculator_engine.lumpsum_table if is_lumpsum else calculator_engine.sip_table
+    try:
+        rows = table(request.amounts, request.returnRates, request.timePeriods)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    results = [
+        MutualFundCalculatorResponse(
+            investmentType=investment_type,
+            totalInvestment=round(invested, 2),
+            estimatedReturns=round(returns, 2),
+            maturityValue=round(value, 2),
+            returnRate=rate,
+            timePeriod=int(years),
+            monthlyInvestment=None if is_lumpsum else amount,
+            totalMonths=None if is_lumpsum else int(years) * 12
+        )
+        for amount, rate, years, invested, returns, value in rows
+    ]
+    return MutualFundCalculatorBatchResponse(count=len(results), results=results)
+
+
 @router.get("/calculator/all")
 async def get_all_calculations(skip: int = 0, limit: int = 100):
     """Get all calculations (Admin)"""
     try:
-        calculations = repository.get_all_calculations(skip, limit)
+        calculations = await repository.get_all_calculations(skip, limit)
         return {
             "success": True,
             "count": len(calculations),
@@ -262,7 +283,7 @@ async def submit_application(
     """Submit mutual fund investment application with file uploads"""
     try:
         # Check if PAN already exists
-        if repository.check_pan_exists(panNumber):
+        if await repository.check_pan_exists(panNumber):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="An application with this PAN number already exists"
@@ -335,7 +356,7 @@ async def submit_application(
             status=ApplicationStatus.SUBMITTED
         )
         
-        application_id = repository.create_application(application_data.dict())
+        application_id = await repository.create_application(application_data.dict())
         
         return MutualFundApplicationResponse(
             id=application_id,
@@ -374,7 +395,7 @@ async def submit_application(
 async def get_all_applications(skip: int = 0, limit: int = 100):
     """Get all applications (Admin)"""
     try:
-        applications = repository.get_all_applications(skip, limit)
+        applications = await repository.get_all_applications(skip, limit)
         return {
             "success": True,
             "count": len(applications),
@@ -390,7 +411,7 @@ async def get_all_applications(skip: int = 0, limit: int = 100):
 async def get_user_applications(email: str):
     """Get all applications for a specific user by email"""
     try:
-        applications = repository.get_applications_by_email(email)
+        applications = await repository.get_applications_by_email(email)
         return {
             "success": True,
             "count": len(applications),
@@ -405,7 +426,7 @@ async def get_user_applications(email: str):
 @router.get("/application/{application_id}")
 async def get_application(application_id: str):
     """Get specific application by ID"""
-    application = repository.get_application_by_id(application_id)
+    application = await repository.get_application_by_id(application_id)
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -416,7 +437,7 @@ async def get_application(application_id: str):
 @router.get("/application/number/{app_number}")
 async def get_application_by_number(app_number: str):
     """Get application by application number"""
-    application = repository.get_application_by_number(app_number)
+    application = await repository.get_application_by_number(app_number)
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -440,7 +461,7 @@ async def update_application_status(
                 detail=f"Invalid status. Must be one of: {[s.value for s in ApplicationStatus]}"
             )
         
-        success = repository.update_application_status(
+        success = await repository.update_application_status(
             application_id, new_status, reviewed_by, remarks
         )
         
@@ -469,7 +490,7 @@ async def update_application_status(
 async def get_statistics():
     """Get overall statistics (Admin)"""
     try:
-        stats = repository.get_statistics()
+        stats = await repository.get_statistics()
         return {
             "success": True,
             "statistics": stats
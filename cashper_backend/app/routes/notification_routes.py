@@ -65,25 +65,22 @@ async def send_notification_to_all_users(
 ):
     """
     Send notification to all users (Admin only)
-    - Creates notification and sends to all registered users
-    - No targetUsers filter - all users will receive it
-    - Returns count of users notified
+    - Stores a single broadcast notification (no per-user targetUsers list)
+    - Every user sees it on read; read state is tracked per user
+    - Returns count of active users notified
     """
     try:
-        # Get all active users from database
         from app.database.repository.user_repository import user_repository
         
-        # Get all user IDs
-        all_users = user_repository.get_all_active_users()
-        target_user_ids = [str(user["_id"]) for user in all_users] if all_users else []
+        user_count = user_repository.count_active_users()
         
-        # Prepare notification data with all users as targets
+        # Prepare broadcast notification data
         notification_data = NotificationInDB(
             title=notification.title,
             message=notification.message,
             type=notification.type,
             priority=notification.priority,
-            targetUsers=target_user_ids if target_user_ids else None,  # None means all users
+            targetUsers=None,  # None means all users
             link=notification.link,
             expiresAt=notification.expiresAt,
             createdBy=str(current_user["_id"]),
@@ -97,9 +94,11 @@ async def send_notification_to_all_users(
         # Return response with user count
         response = {
             "success": True,
-            "message": f"Notification sent to {len(target_user_ids)} users",
+            "message": f"Notification sent to {user_count} users",
+            "affectedCount": user_count,
+            "notificationIds": [str(created_notification["_id"])],
             "notification": _convert_to_response(created_notification, None),
-            "userCount": len(target_user_ids),
+            "userCount": user_count,
             "broadcastNotification": True
         }
         
@@ -296,8 +295,9 @@ async def get_user_notifications(
             user_id, skip, limit, include_read
         )
         
-        # Convert to response format
-        response_list = [_convert_to_response(notif, user_id) for notif in notifications]
+        # Convert to response format using the user's read cursor
+        cursor = notification_repository.get_read_cursor(user_id)
+        response_list = [_convert_to_response(notif, cursor) for notif in notifications]
         
         return response_list
         
@@ -451,11 +451,8 @@ async def get_notification_by_id(
         # Mark as read
         notification_repository.mark_as_read(notification_id, user_id)
         
-        # Refresh notification data
-        notification = notification_repository.get_notification_by_id(notification_id)
-        
         # Convert to response format
-        response = _convert_to_response(notification, user_id)
+        response = _convert_to_response(notification, notification_repository.get_read_cursor(user_id))
         
         return response
         
@@ -470,8 +467,8 @@ async def get_notification_by_id(
 
 # ============= HELPER FUNCTIONS =============
 
-def _convert_to_response(notification: dict, user_id: Optional[str]) -> NotificationResponse:
-    """Convert MongoDB document to NotificationResponse"""
+def _convert_to_response(notification: dict, cursor: Optional[dict]) -> NotificationResponse:
+    """Convert MongoDB document to NotificationResponse (read state from the user's read cursor)"""
     if not notification:
         return None
     
@@ -479,13 +476,12 @@ def _convert_to_response(notification: dict, user_id: Optional[str]) -> Notifica
     is_read = False
     read_at = None
     
-    if user_id:
-        read_by = notification.get("readBy", [])
-        is_read = user_id in read_by
+    if cursor:
+        is_read = notification_repository.is_read(notification, cursor)
         
-        # For read_at, we'll use updatedAt if marked as read (simplified)
-        if is_read:
-            read_at = notification.get("updatedAt")
+        # Only reads covered by the cursor timestamp have a known time
+        if is_read and notification.get("createdAt", datetime.min) <= cursor.get("lastReadAt", datetime.min):
+            read_at = cursor.get("lastReadAt")
     
     return NotificationResponse(
         id=str(notification["_id"]),
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from typing import List, Optional
+from typing import Dict, List, Optional
 from app.database.schema.personal_tax_schema import (
     TaxConsultationBookingRequest,
     TaxConsultationBookingResponse,
@@ -7,6 +7,9 @@ from app.database.schema.personal_tax_schema import (
     TaxCalculatorRequest,
     TaxCalculatorResponse,
     TaxCalculatorInDB,
+    TaxCalculatorBatchRequest,
+    TaxCalculatorBatchResult,
+    TaxCalculatorBatchResponse,
     PersonalTaxPlanningApplicationRequest,
     PersonalTaxPlanningApplicationResponse,
     PersonalTaxPlanningApplicationInDB,
@@ -17,6 +20,7 @@ from app.database.schema.personal_tax_schema import (
 from app.database.repository.personal_tax_repository import personal_tax_repository
 from app.utils.auth_middleware import get_current_user_optional
 from app.utils.auth import get_current_user, get_optional_user
+from app.utils import calculator_engine
 from datetime import datetime
 import math
 
@@ -27,29 +31,17 @@ router = APIRouter(prefix="/api/personal-tax", tags=["Personal Tax Planning"])
 
 def calculate_income_tax(income: float) -> float:
     """Calculate income tax based on new tax regime slabs with standard deduction"""
-    standard_deduction = 50000
-    taxable_income = max(0, income - standard_deduction)
-    tax = 0
-
-    if taxable_income <= 250000:
-        tax = 0
-    elif taxable_income <= 500000:
-        tax = (taxable_income - 250000) * 0.05
-    elif taxable_income <= 750000:
-        tax = 12500 + (taxable_income - 500000) * 0.10
-    elif taxable_income <= 1000000:
-        tax = 12500 + 25000 + (taxable_income - 750000) * 0.15
-    elif taxable_income <= 1250000:
-        tax = 12500 + 25000 + 37500 + (taxable_income - 1000000) * 0.20
-    elif taxable_income <= 1500000:
-        tax = 12500 + 25000 + 37500 + 50000 + (taxable_income - 1250000) * 0.25
-    else:
-        tax = 12500 + 25000 + 37500 + 50000 + 62500 + (taxable_income - 1500000) * 0.30
-
-    # Add 4% cess
-    tax = tax * 1.04
-
-    return round(tax)
+    return calculator_engine.tax(income)
+
+
+def _capped_deductions(calculation) -> Dict[str, float]:
+    """Deduction per section with its statutory limit applied (missing values count as 0)"""
+    return {
+        "section80C": min(calculation.section80C or 0, 150000),
+        "section80D": min(calculation.section80D or 0, 50000),
+        "nps80CCD1B": min(calculation.nps80CCD1B or 0, 50000),
+        "homeLoanInterest": min(calculation.homeLoanInterest or 0, 200000)
+    }
 
 
 # ===================== PUBLIC ENDPOINTS =====================
@@ -114,12 +106,9 @@ def calculate_tax_savings(calculation: TaxCalculatorRequest):
     - Total deductions applied
     """
     try:
-        # Calculate total deductions (with limits) - Handle None values
-        total_80c = min(calculation.section80C or 0, 150000)
-        total_80d = min(calculation.section80D or 0, 50000)
-        total_nps = min(calculation.nps80CCD1B or 0, 50000)
-        total_home_loan = min(calculation.homeLoanInterest or 0, 200000)
-        total_deductions = total_80c + total_80d + total_nps + total_home_loan
+        # Calculate total deductions (with limits)
+        breakdown = _capped_deductions(calculation)
+        total_deductions = sum(breakdown.values())
 
         # Calculate tax without planning
         tax_without_planning = calculate_income_tax(calculation.grossIncome)
@@ -131,7 +120,7 @@ def calculate_tax_savings(calculation: TaxCalculatorRequest):
         # Calculate savings
         total_savings = tax_without_planning - tax_after_planning
 
-        # Save calculation to database
+        # Record the calculation
         calculation_in_db = TaxCalculatorInDB(
             grossIncome=calculation.grossIncome,
             section80C=calculation.section80C or 0,
@@ -149,10 +138,11 @@ def calculate_tax_savings(calculation: TaxCalculatorRequest):
             createdAt=datetime.utcnow()
         )
         
-        saved_calculation = personal_tax_repository.save_tax_calculation(calculation_in_db)
+        # Queued for the write-behind calculation log, off the response path
+        calculation_id = personal_tax_repository.record_tax_calculation(calculation_in_db)
 
         return {
-            "id": saved_calculation.id,
+            "id": calculation_id,
             "grossIncome": calculation.grossIncome,
             "totalDeductions": total_deductions,
             "taxableIncome": taxable_income,
@@ -160,12 +150,7 @@ def calculate_tax_savings(calculation: TaxCalculatorRequest):
             "taxAfterPlanning": tax_after_planning,
             "totalSavings": total_savings,
             "message": "Tax calculation completed successfully",
-            "breakdown": {
-                "section80C": total_80c,
-                "section80D": total_80d,
-                "nps80CCD1B": total_nps,
-                "homeLoanInterest": total_home_loan
-            }
+            "breakdown": breakdown
         }
         
     except Exception as e:
@@ -175,6 +160,38 @@ def calculate_tax_savings(calculation: TaxCalculatorRequest):
         )
 
 
+@router.post("/calculator/batch", response_model=TaxCalculatorBatchResponse)
+def calculate_tax_savings_batch(calculation: TaxCalculatorBatchRequest):
+    """
+    Calculate tax with and without planning for several gross incomes at once
+    (PUBLIC - No authentication required)
+    
+    Used by the income slider and comparison chart; the same deductions apply
+    to every income and results are not saved.
+    """
+    total_deductions = sum(_capped_deductions(calculation).values())
+    taxable_incomes = [max(0, income - total_deductions) for income in calculation.grossIncomes]
+    try:
+        without_planning = calculator_engine.tax_table(calculation.grossIncomes)
+        after_planning = calculator_engine.tax_table(taxable_incomes)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    results = [
+        TaxCalculatorBatchResult(
+            grossIncome=income,
+            totalDeductions=total_deductions,
+            taxableIncome=taxable,
+            taxWithoutPlanning=tax_without,
+            taxAfterPlanning=tax_after,
+            totalSavings=tax_without - tax_after
+        )
+        for income, taxable, (_, tax_without), (_, tax_after)
+        in zip(calculation.grossIncomes, taxable_incomes, without_planning, after_planning)
+    ]
+    return TaxCalculatorBatchResponse(count=len(results), results=results)
+
+
 @router.post("/application/submit", response_model=PersonalTaxPlanningApplicationResponse, status_code=status.HTTP_201_CREATED)
 def submit_tax_planning_application(
     application: PersonalTaxPlanningApplicationRequest,
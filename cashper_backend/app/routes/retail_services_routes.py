@@ -7,45 +7,21 @@ from ..database.db import get_database
 from ..utils.auth_middleware import get_current_user
 import os
 import uuid
-import shutil
+from pathlib import Path
+from ..utils.file_upload import submission_uploads
 
 router = APIRouter(prefix="/api/retail-services", tags=["Retail Services - FormData"])
 
 
 # Helper function for file upload
-def save_retail_document(file: UploadFile, application_id: str, doc_type: str) -> str:
-    """Save uploaded document and return file path"""
-    try:
-        # Use absolute path for uploads directory
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        upload_dir = os.path.join(base_dir, "uploads", "retail_services", application_id)
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        print(f"📁 Upload directory: {upload_dir}")
-        
-        file_ext = os.path.splitext(file.filename)[1]
-        unique_filename = f"{doc_type}_{uuid.uuid4().hex[:8]}{file_ext}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        print(f"💾 Saving file: {file_path}")
-        
-        # Reset file pointer to beginning
-        file.file.seek(0)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Verify file was saved
-        if os.path.exists(file_path):
-            file_size = os.path.getsize(file_path)
-            print(f"✅ File saved successfully: {file_size} bytes")
-        else:
-            print(f"❌ File save verification failed!")
-            
-        return file_path
-    except Exception as e:
-        print(f"❌ File upload error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+def retail_documents(stored: dict) -> dict:
+    """Document name -> absolute file path, as stored in `documents`.
+
+    Documents are streamed into the shared content-addressed store, so the
+    same scan attached to several applications is kept once on disk; the
+    size, hash and MIME type of each file go in `documentFiles`.
+    """
+    return {doc_name: str(Path(meta["path"].lstrip("/")).resolve()) for doc_name, meta in stored.items()}
 
 
 # ===================== ITR FILING SERVICE =====================
@@ -120,12 +96,10 @@ async def submit_itr_filing(
             "investment_proofs": investmentProofs
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -150,6 +124,8 @@ async def submit_itr_filing(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"ITR Filing Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -242,17 +218,11 @@ async def submit_itr_revision(
             "form26as": form26AS
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                try:
-                    file_path = save_retail_document(file, application_id, doc_name)
-                    application_data["documents"][doc_name] = file_path
-                    print(f"[ITR REVISION] Uploaded {doc_name}: {file_path}")
-                except Exception as e:
-                    print(f"[ITR REVISION] Error uploading {doc_name}: {str(e)}")
-                    raise HTTPException(status_code=400, detail=f"Failed to upload {doc_name}: {str(e)}")
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            print(f"[ITR REVISION] Uploaded {', '.join(stored) or 'no documents'}")
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -356,12 +326,10 @@ async def submit_itr_notice_reply(
             "correspondence": correspondence
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -386,6 +354,8 @@ async def submit_itr_notice_reply(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"ITR Notice Reply Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -461,12 +431,10 @@ async def submit_individual_pan(
             "dob_proof": dobProof
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -491,6 +459,8 @@ async def submit_individual_pan(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Individual PAN Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -559,12 +529,10 @@ async def submit_huf_pan(
             "address_proof": addressProof
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -589,6 +557,8 @@ async def submit_huf_pan(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"HUF PAN Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -661,12 +631,10 @@ async def submit_pf_withdrawal(
             "cheque": cheque
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -691,6 +659,8 @@ async def submit_pf_withdrawal(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"PF Withdrawal Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -763,12 +733,10 @@ async def submit_document_update(
             "dob_proof": dobProof
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -793,6 +761,8 @@ async def submit_document_update(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Document Update Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -876,12 +846,10 @@ async def submit_trading_demat(
             "bank_proof": bankProof
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -906,6 +874,8 @@ async def submit_trading_demat(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Trading & Demat Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -988,12 +958,10 @@ async def submit_bank_account(
             "address_proof": addressProof
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -1018,6 +986,8 @@ async def submit_bank_account(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Bank Account Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1092,12 +1062,10 @@ async def submit_financial_planning(
             "investment_proofs": investmentProofs
         }
         
-        for doc_name, file in doc_mapping.items():
-            if file and file.filename:
-                file_path = save_retail_document(file, application_id, doc_name)
-                application_data["documents"][doc_name] = file_path
-        
-        result = collection.insert_one(application_data)
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documents"] = retail_documents(stored)
+            application_data["documentFiles"] = stored
+            result = collection.insert_one(application_data)
         
         # Prepare response with complete application data
         response_data = {
@@ -1122,6 +1090,8 @@ async def submit_financial_planning(
         
         return JSONResponse(content=response_data, status_code=201)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Financial Planning Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1371,7 +1341,7 @@ async def download_application_document(application_id: str, document_key: str):
         from fastapi.responses import FileResponse
         return FileResponse(
             path=file_path,
-            filename=os.path.basename(file_path),
+            filename=f"{document_key}{os.path.splitext(file_path)[1]}",
             media_type=media_type
         )
         
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from typing import Dict, Any
 from app.database.schema.settings_schema import (
     UpdateSettingsRequest,
@@ -8,6 +8,7 @@ from app.database.schema.settings_schema import (
     LoginHistoryResponse,
     DataDownloadRequest,
     DataDownloadResponse,
+    DataDownloadStatusResponse,
     DeleteAccountRequest,
     DeleteAccountResponse,
     LogoutSessionRequest,
@@ -18,8 +19,11 @@ from app.database.schema.settings_schema import (
 )
 from app.database.repository.settings_repository import settings_repository
 from app.utils.auth_middleware import get_current_user
+from app.utils.data_export import data_export_worker
+from app.utils.range_response import range_file_response
 from app.utils.security import verify_password
 from datetime import datetime, timedelta
+import os
 
 router = APIRouter(prefix="/api/settings", tags=["Settings"])
 
@@ -371,7 +375,8 @@ def request_data_download(
     """
     Request a copy of all user data
     
-    Creates a download request. Data will be prepared and sent to email within 24-48 hours
+    Creates a download request. The archive is prepared in the background;
+    poll GET /download-data/{request_id} for progress and the download link
     """
     try:
         user_id = str(current_user["_id"])
@@ -382,11 +387,12 @@ def request_data_download(
             request.includeTransactions,
             request.includeApplications
         )
+        data_export_worker.submit(request_id)
         
         return DataDownloadResponse(
-            message="Data download request submitted successfully. You will receive an email with download link within 24-48 hours.",
+            message="Data download request submitted successfully. Your archive is being prepared.",
             requestId=request_id,
-            estimatedTime="24-48 hours"
+            estimatedTime="A few minutes"
         )
         
     except Exception as e:
@@ -396,6 +402,78 @@ def request_data_download(
         )
 
 
+def _get_download_request(request_id: str, user_id: str) -> dict:
+    try:
+        download_request = settings_repository.get_data_download_request(request_id, user_id)
+    except Exception:
+        download_request = None
+    if not download_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Download request not found"
+        )
+    return download_request
+
+
+@router.get("/download-data/{request_id}", response_model=DataDownloadStatusResponse)
+def get_data_download_status(
+    request_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get the status and progress of a data download request
+    """
+    download_request = _get_download_request(request_id, str(current_user["_id"]))
+    return DataDownloadStatusResponse(
+        requestId=download_request["id"],
+        status=download_request["status"],
+        progress=download_request["progress"],
+        requestedAt=download_request["requestedAt"],
+        completedAt=download_request.get("completedAt"),
+        expiresAt=download_request.get("expiresAt"),
+        fileSize=download_request.get("fileSize"),
+        downloadUrl=download_request.get("downloadUrl"),
+        error=download_request.get("error")
+    )
+
+
+@router.get("/download-data/{request_id}/file")
+def download_data_archive(
+    request_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Download a completed data export archive
+    
+    Supports HTTP Range requests so interrupted downloads can be resumed
+    """
+    download_request = _get_download_request(request_id, str(current_user["_id"]))
+    if download_request["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is not ready (status: {download_request['status']})"
+        )
+    
+    file_path = download_request.get("filePath")
+    expires_at = download_request.get("expiresAt")
+    if expires_at and expires_at < datetime.utcnow():
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+        settings_repository.expire_data_download_request(request_id)
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="This export has expired. Please request a new one."
+        )
+    if not file_path or not os.path.exists(file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export archive not found"
+        )
+    
+    return range_file_response(file_path, request, os.path.basename(file_path), "application/zip")
+
+
 # ===================== ACCOUNT DELETION ENDPOINTS =====================
 
 @router.post("/delete-account", response_model=DeleteAccountResponse)
@@ -19,6 +19,7 @@ from app.database.repository.short_term_loan_repository import (
 )
 from app.utils.auth_middleware import verify_admin_token
 from app.utils.file_upload import save_upload_file
+from app.utils.loan_status import normalize_loan_status
 from app.utils.auth import get_current_user, get_optional_user
 import jwt
 
@@ -431,7 +432,7 @@ async def update_application_status(application_id: str, status_update: StatusUp
         collection = db["short_term_loan_applications"]
         
         # Prepare update data
-        update_data = {"status": new_status}
+        update_data = {"status": new_status, "statusKey": normalize_loan_status(new_status)}
         rejection_reason = status_update.rejectionReason or status_update.reason
         if new_status == "rejected" and rejection_reason:
             update_data["rejectionReason"] = rejection_reason
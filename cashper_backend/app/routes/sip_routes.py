@@ -8,10 +8,12 @@ from app.database.repository.sip_repository import SIPRepository
 from app.database.schema.sip_schema import (
     SIPInquiryRequest, SIPInquiryResponse, SIPInquiryInDB,
     SIPCalculatorRequest, SIPCalculatorResponse, SIPCalculatorInDB,
+    SIPCalculatorBatchRequest, SIPCalculatorBatchResponse,
     SIPApplicationRequest, SIPApplicationResponse, SIPApplicationInDB,
     InquiryStatus, ApplicationStatus
 )
 from app.utils.auth_middleware import get_current_user
+from app.utils import calculator_engine
 from app.utils.file_upload import save_upload_file
 from app.database.repository.dashboard_repository import dashboard_repository
 
@@ -41,7 +43,7 @@ async def submit_contact_inquiry(request: SIPInquiryRequest):
             status=InquiryStatus.PENDING.value
         )
         
-        inquiry_id = repository.create_inquiry(inquiry_data.dict())
+        inquiry_id = await repository.create_inquiry(inquiry_data.dict())
         
         # Return response
         return SIPInquiryResponse(
@@ -66,7 +68,7 @@ async def submit_contact_inquiry(request: SIPInquiryRequest):
 async def get_all_inquiries(skip: int = 0, limit: int = 100):
     """Get all contact inquiries (Admin)"""
     try:
-        inquiries = repository.get_all_inquiries(skip, limit)
+        inquiries = await repository.get_all_inquiries(skip, limit)
         return {
             "success": True,
             "count": len(inquiries),
@@ -81,7 +83,7 @@ async def get_all_inquiries(skip: int = 0, limit: int = 100):
 @router.get("/contact/{inquiry_id}")
 async def get_inquiry(inquiry_id: str):
     """Get specific inquiry by ID"""
-    inquiry = repository.get_inquiry_by_id(inquiry_id)
+    inquiry = await repository.get_inquiry_by_id(inquiry_id)
     if not inquiry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -104,7 +106,7 @@ async def update_inquiry_status(
                 detail=f"Invalid status. Must be one of: {[s.value for s in InquiryStatus]}"
             )
         
-        success = repository.update_inquiry_status(inquiry_id, status, notes)
+        success = await repository.update_inquiry_status(inquiry_id, status, notes)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -132,19 +134,10 @@ async def calculate_sip_returns(request: SIPCalculatorRequest):
     try:
         # SIP calculation formula: M = P × ({[1 + i]^n – 1} / i) × (1 + i)
         # where P = monthly investment, i = monthly rate, n = number of months
-        monthly_rate = request.expectedReturn / 12 / 100
         total_months = request.timePeriod * 12
-        
-        # Calculate future value
-        if monthly_rate > 0:
-            future_value = request.monthlyInvestment * (
-                ((1 + monthly_rate) ** total_months - 1) / monthly_rate
-            ) * (1 + monthly_rate)
-        else:
-            future_value = request.monthlyInvestment * total_months
-        
-        total_investment = request.monthlyInvestment * total_months
-        estimated_returns = future_value - total_investment
+        total_investment, estimated_returns, future_value = calculator_engine.sip(
+            request.monthlyInvestment, request.expectedReturn, request.timePeriod
+        )
         
         response = SIPCalculatorResponse(
             monthlyInvestment=request.monthlyInvestment,
@@ -156,7 +149,7 @@ async def calculate_sip_returns(request: SIPCalculatorRequest):
             totalMonths=total_months
         )
         
-        # Save calculation to database
+        # Record the calculation
         calculation_data = SIPCalculatorInDB(
             monthlyInvestment=request.monthlyInvestment,
             expectedReturn=request.expectedReturn,
@@ -166,7 +159,8 @@ async def calculate_sip_returns(request: SIPCalculatorRequest):
             futureValue=response.futureValue,
             totalMonths=total_months
         )
-        repository.save_calculation(calculation_data.dict())
+        # Queued for the write-behind calculation log, off the response path
+        repository.record_calculation(calculation_data.dict())
         
         return response
     
@@ -178,11 +172,37 @@ async def calculate_sip_returns(request: SIPCalculatorRequest):
             detail=f"Calculation failed: {str(e)}"
         )
 
+@router.post("/calculator/batch", response_model=SIPCalculatorBatchResponse)
+async def calculate_sip_returns_batch(request: SIPCalculatorBatchRequest):
+    """Calculate SIP returns for every combination of amounts, rates and periods
+    (slider previews and comparison charts; results are not saved)"""
+    try:
+        rows = calculator_engine.sip_table(
+            request.monthlyInvestments, request.expectedReturns, request.timePeriods
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    results = [
+        SIPCalculatorResponse(
+            monthlyInvestment=amount,
+            expectedReturn=rate,
+            timePeriod=int(years),
+            totalInvestment=round(invested, 2),
+            estimatedReturns=round(returns, 2),
+            futureValue=round(value, 2),
+            totalMonths=int(years) * 12
+        )
+        for amount, rate, years, invested, returns, value in rows
+    ]
+    return SIPCalculatorBatchResponse(count=len(results), results=results)
+
+
 @router.get("/calculator/all")
 async def get_all_calculations(skip: int = 0, limit: int = 100):
     """Get all calculations (Admin)"""
     try:
-        calculations = repository.get_all_calculations(skip, limit)
+        calculations = await repository.get_all_calculations(skip, limit)
         return {
             "success": True,
             "count": len(calculations),
@@ -243,7 +263,7 @@ async def submit_application(request: SIPApplicationRequest, current_user: dict
         user_email = current_user["email"]
         
         # Check if PAN already exists
-        if repository.check_pan_exists(request.panNumber):
+        if await repository.check_pan_exists(request.panNumber):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="An application with this PAN number already exists"
@@ -280,7 +300,7 @@ async def submit_application(request: SIPApplicationRequest, current_user: dict
             status=ApplicationStatus.SUBMITTED
         )
         
-        application_id = repository.create_application(application_data.dict())
+        application_id = await repository.create_application(application_data.dict())
         
         return SIPApplicationResponse(
             id=application_id,
@@ -322,7 +342,7 @@ async def submit_application(request: SIPApplicationRequest, current_user: dict
 async def get_all_applications(skip: int = 0, limit: int = 100):
     """Get all applications (Admin)"""
     try:
-        applications = repository.get_all_applications(skip, limit)
+        applications = await repository.get_all_applications(skip, limit)
         return {
             "success": True,
             "count": len(applications),
@@ -338,7 +358,7 @@ async def get_all_applications(skip: int = 0, limit: int = 100):
 async def get_user_applications(email: str):
     """Get all applications for a specific user by email"""
     try:
-        applications = repository.get_applications_by_email(email)
+        applications = await repository.get_applications_by_email(email)
         return {
             "success": True,
             "count": len(applications),
@@ -353,7 +373,7 @@ async def get_user_applications(email: str):
 @router.get("/application/{application_id}")
 async def get_application(application_id: str):
     """Get specific application by ID"""
-    application = repository.get_application_by_id(application_id)
+    application = await repository.get_application_by_id(application_id)
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -364,7 +384,7 @@ async def get_application(application_id: str):
 @router.get("/application/number/{app_number}")
 async def get_application_by_number(app_number: str):
     """Get application by application number"""
-    application = repository.get_application_by_number(app_number)
+    application = await repository.get_application_by_number(app_number)
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -388,7 +408,7 @@ async def update_application_status(
                 detail=f"Invalid status. Must be one of: {[s.value for s in ApplicationStatus]}"
             )
         
-        success = repository.update_application_status(
+        success = await repository.update_application_status(
             application_id, new_status, reviewed_by, remarks
         )
         
@@ -417,7 +437,7 @@ async def update_application_status(
 async def get_statistics():
     """Get overall statistics (Admin)"""
     try:
-        stats = repository.get_statistics()
+        stats = await repository.get_statistics()
         return {
             "success": True,
             "statistics": stats
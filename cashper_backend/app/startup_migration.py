@@ -77,6 +77,119 @@ def migrate_inquiry_status():
     except Exception as e:
         print(f"[ERROR] Migration error: {e}")
 
+
+def backfill_inquiries_index():
+    """
+    Make sure every stored inquiry has an entry in the unified inquiries_index
+    collection used by the admin inbox. Called on application startup
+    """
+    try:
+        db = get_database()
+        if db is None:
+            print("Database not available for inquiries index backfill")
+            return
+        
+        from app.database.repository.inquiry_index_repository import inquiry_index_repository
+        indexed = inquiry_index_repository.backfill()
+        print(f"[OK] Inquiries index backfill complete ({indexed} new entries)")
+        
+    except Exception as e:
+        print(f"[ERROR] Inquiries index backfill error: {e}")
+
+def backfill_loan_status_keys():
+    """
+    Make sure every loan application carries the normalized statusKey used by
+    admin loan management filters and statistics (indexed through
+    app.database.indexes). Called on application startup
+    """
+    try:
+        db = get_database()
+        if db is None:
+            print("Database not available for loan status backfill")
+            return
+        
+        from app.database.repository.admin_loan_management_repository import admin_loan_management_repository
+        updated = admin_loan_management_repository.backfill_status_keys()
+        print(f"[OK] Loan status key backfill complete ({updated} documents updated)")
+        
+    except Exception as e:
+        print(f"[ERROR] Loan status key backfill error: {e}")
+
+def backfill_business_service_status_keys():
+    """
+    Make sure every corporate service application carries the normalized
+    statusKey used by the business services admin filters and statistics.
+    Called on application startup
+    """
+    try:
+        db = get_database()
+        if db is None:
+            print("Database not available for business service status backfill")
+            return
+        
+        from app.database.repository.business_services_repository import backfill_status_keys
+        updated = backfill_status_keys(db)
+        print(f"[OK] Business service status key backfill complete ({updated} documents updated)")
+        
+    except Exception as e:
+        print(f"[ERROR] Business service status key backfill error: {e}")
+
+def backfill_policy_fields():
+    """
+    Make sure every insurance policy carries the normalized endDateAt and
+    premiumAmount used by the expiry query, the lifecycle sweeper and the
+    statistics. Called on application startup
+    """
+    try:
+        db = get_database()
+        if db is None:
+            print("Database not available for policy field backfill")
+            return
+        
+        from app.database.repository.insurance_management_repository import insurance_management_repository
+        updated = insurance_management_repository.backfill_normalized_fields()
+        print(f"[OK] Policy field backfill complete ({updated} documents updated)")
+        
+    except Exception as e:
+        print(f"[ERROR] Policy field backfill error: {e}")
+
+def backfill_search_keys():
+    """
+    Make sure every user, insurance policy and loan application carries the
+    normalized searchKeys used by the admin search boxes (app.utils.search).
+    Called on application startup
+    """
+    try:
+        db = get_database()
+        if db is None:
+            print("Database not available for search key backfill")
+            return
+        
+        from app.utils.search import SEARCH_SPECS, backfill_search_keys as backfill_collection
+        updated = sum(backfill_collection(db, collection_name) for collection_name in SEARCH_SPECS)
+        print(f"[OK] Search key backfill complete ({updated} documents updated)")
+        
+    except Exception as e:
+        print(f"[ERROR] Search key backfill error: {e}")
+
+def migrate_notification_reads():
+    """
+    Move legacy readBy arrays on notifications into per-user read cursors
+    (notification_reads). Called on application startup
+    """
+    try:
+        db = get_database()
+        if db is None:
+            print("Database not available for notification reads migration")
+            return
+        
+        from app.database.repository.notification_repository import notification_repository
+        migrated = notification_repository.migrate_legacy_reads()
+        print(f"[OK] Notification reads migration complete ({migrated} users migrated)")
+        
+    except Exception as e:
+        print(f"[ERROR] Notification reads migration error: {e}")
+
 if __name__ == "__main__":
     import asyncio
     asyncio.run(migrate_inquiry_status())
\ No newline at end of file
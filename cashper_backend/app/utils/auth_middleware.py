@@ -3,10 +3,22 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from app.utils.security import decode_access_token
 from app.database.repository.user_repository import user_repository
+from app.utils.user_cache import user_principal_cache
 from app.config import DISABLE_AUTH_FOR_TESTING
 
 security = HTTPBearer(auto_error=False)
 
+
+def load_user(user_id: str) -> Optional[dict]:
+    """Resolve a token subject to its user document, served from the principal cache when fresh"""
+    user = user_principal_cache.get(user_id)
+    if user is None:
+        user = user_repository.get_user_by_id(user_id)
+        if user is not None:
+            user_principal_cache.set(user_id, user)
+    return user
+
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,7 +67,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
                 "updatedAt": datetime.utcnow()
             }
         
-        user = user_repository.get_user_by_id(user_id)
+        user = load_user(user_id)
         
         if user is None:
             raise credentials_exception
@@ -151,7 +163,7 @@ def get_current_user_optional(credentials: Optional[HTTPAuthorizationCredentials
                 "updatedAt": datetime.utcnow()
             }
         
-        user = user_repository.get_user_by_id(user_id)
+        user = load_user(user_id)
         
         if user is None:
             raise credentials_exception
@@ -212,7 +224,7 @@ def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials] = Depe
                 "updatedAt": datetime.utcnow()
             }
         
-        user = user_repository.get_user_by_id(user_id)
+        user = load_user(user_id)
         
         if user is None:
             return None
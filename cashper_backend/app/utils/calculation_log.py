@@ -0,0 +1,168 @@
+"""
+Write-behind log for calculator records.
+
+The public SIP, mutual fund and personal tax calculators keep a copy of every
+calculation. Writing it with one `insert_one` per request put a database round
+trip on the response path of the busiest unauthenticated endpoints, so the
+records are queued in process instead:
+
+- `record()` appends to a bounded in-memory queue and returns immediately.
+- A background thread writes the queue with one unordered `insert_many` per
+  collection every CALCULATION_LOG_FLUSH_SECONDS, or as soon as
+  CALCULATION_LOG_BATCH_SIZE records are waiting.
+- When CALCULATION_LOG_MAX_PENDING records are already queued (database down
+  or too slow), new records are dropped and counted instead of growing memory
+  without bound.
+- The queue is drained on shutdown.
+
+Records get their `_id` when queued, so callers can return it before the
+write happens and a retried batch never inserts a record twice. `stats()`
+exposes the queue counters (written, dropped, failed flushes) for /health.
+"""
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.config import CALCULATION_LOG_FLUSH_SECONDS, CALCULATION_LOG_BATCH_SIZE, CALCULATION_LOG_MAX_PENDING
+from app.database.db import get_database
+from app.utils.interval_worker import IntervalWorker
+
+
+# Duplicate key: the record was written by an earlier attempt of the same batch
+_DUPLICATE_KEY = 11000
+
+
+class CalculationLog(IntervalWorker):
+    """Bounded write-behind queue of (collection, document) records"""
+
+    def __init__(self, flush_interval: int = CALCULATION_LOG_FLUSH_SECONDS,
+                 batch_size: int = CALCULATION_LOG_BATCH_SIZE,
+                 max_pending: int = CALCULATION_LOG_MAX_PENDING):
+        super().__init__(flush_interval, name="calculation-log-flush", run_at_start=False,
+                         join_timeout=flush_interval + 5)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._queue: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counters = {"recorded": 0, "written": 0, "dropped": 0, "failedFlushes": 0}
+        self._last_flush_at: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+
+    def record(self, collection_name: str, document: Dict[str, Any]) -> str:
+        """Queue a document for `collection_name`; returns its id (as a string)"""
+        document.setdefault("_id", ObjectId())
+        with self._lock:
+            if len(self._queue) >= self.max_pending:
+                self._counters["dropped"] += 1
+                dropped = self._counters["dropped"]
+            else:
+                self._queue.append((collection_name, document))
+                self._counters["recorded"] += 1
+                dropped = 0
+                if len(self._queue) >= self.batch_size:
+                    self.wake()
+        if dropped and (dropped == 1 or dropped % 1000 == 0):
+            print(f"[WARN] Calculation log full ({self.max_pending} pending); {dropped} records dropped so far")
+        return str(document["_id"])
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue counters since startup"""
+        with self._lock:
+            return {
+                **self._counters,
+                "pending": len(self._queue),
+                "maxPending": self.max_pending,
+                "lastFlushAt": self._last_flush_at,
+                "lastError": self._last_error
+            }
+
+    def _insert(self, collection_name: str, documents: List[Dict[str, Any]]) -> int:
+        """Insert one batch; returns records written (raises _PartialFlush with the ones to retry)"""
+        try:
+            result = get_database()[collection_name].insert_many(documents, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            failed = {
+                error["index"] for error in e.details.get("writeErrors", [])
+                if error.get("code") != _DUPLICATE_KEY
+            }
+            written = len(documents) - len(failed)
+            if not failed:
+                return written
+            raise _PartialFlush(written, [documents[index] for index in sorted(failed)], e)
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns records written.
+
+        On a database error the unwritten records go back to the front of the
+        queue (as far as room allows) and the next flush retries them.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._queue = list(self._queue), deque()
+                self._wake.clear()
+            if not batch:
+                return 0
+
+            by_collection: Dict[str, List[Dict[str, Any]]] = {}
+            for collection_name, document in batch:
+                by_collection.setdefault(collection_name, []).append(document)
+
+            written = 0
+            retry: List[Tuple[str, Dict[str, Any]]] = []
+            error: Optional[Exception] = None
+            for collection_name, documents in by_collection.items():
+                for start in range(0, len(documents), self.batch_size):
+                    chunk = documents[start:start + self.batch_size]
+                    try:
+                        written += self._insert(collection_name, chunk)
+                    except _PartialFlush as e:
+                        written += e.written
+                        retry.extend((collection_name, document) for document in e.documents)
+                        error = e.cause
+                    except Exception as e:
+                        retry.extend((collection_name, document) for document in chunk)
+                        error = e
+
+            with self._lock:
+                self._counters["written"] += written
+                self._last_flush_at = datetime.utcnow()
+                if error is not None:
+                    self._counters["failedFlushes"] += 1
+                    self._last_error = str(error)
+                    room = max(self.max_pending - len(self._queue), 0)
+                    self._counters["dropped"] += max(len(retry) - room, 0)
+                    self._queue.extendleft(reversed(retry[:room]))
+            if error is not None:
+                print(f"[ERROR] Calculation log flush failed ({len(retry)} records pending retry): {error}")
+            return written
+
+    def run_once(self) -> int:
+        return self.flush()
+
+    def stop(self) -> int:
+        """Stop the background writer and drain the queue; returns records written"""
+        super().stop()
+        return self.flush()
+
+
+class _PartialFlush(Exception):
+    """Some records of an insert_many batch failed for reasons other than a duplicate id"""
+
+    def __init__(self, written: int, documents: List[Dict[str, Any]], cause: Exception):
+        super().__init__(str(cause))
+        self.written = written
+        self.documents = documents
+        self.cause = cause
+
+
+# Create singleton instance
+calculation_log = CalculationLog()
@@ -0,0 +1,237 @@
+"""
+Financial calculator engine.
+
+One implementation of the SIP, lumpsum, EMI and income-tax formulas, shared
+by the single-value calculator endpoints and the batch endpoints that feed
+the front-end sliders and comparison charts.
+
+- The formulas are NumPy-vectorized: a batch request evaluates the full grid
+  of amounts x rates x tenures in one pass instead of one API call per point.
+- Small grids (at most CALCULATOR_CACHE_MAX_POINTS points: single slider
+  positions and the default chart grids) are memoized as compact NumPy arrays
+  in one LRU cache bounded by CALCULATOR_CACHE_MAX_BYTES, so popular inputs
+  are computed once per process. Larger grids are client-specific and cheap to
+  vectorize, so they are computed on every request and never cached; arbitrary
+  grids sent to the public endpoints cannot grow the process.
+- Grids are limited to CALCULATOR_MAX_GRID_POINTS points; larger requests
+  raise ValueError.
+
+The formulas match the original per-route calculations:
+    SIP:      M = P x ({[1 + i]^n - 1} / i) x (1 + i), i monthly rate, n months
+    Lumpsum:  A = P x (1 + r)^t, annual compounding
+    EMI:      P x i x (1 + i)^n / ((1 + i)^n - 1), reducing balance
+    Tax:      new regime slabs after the standard deduction, plus 4% cess
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Sequence, Tuple
+import numpy as np
+from app.config import CALCULATOR_CACHE_MAX_BYTES, CALCULATOR_CACHE_MAX_POINTS, CALCULATOR_MAX_GRID_POINTS
+
+
+STANDARD_DEDUCTION = 50000
+HEALTH_EDUCATION_CESS = 0.04
+
+# (lower bound of taxable income, rate) for each slab above the exempt limit
+TAX_SLABS: Tuple[Tuple[float, float], ...] = (
+    (250000, 0.05),
+    (500000, 0.10),
+    (750000, 0.15),
+    (1000000, 0.20),
+    (1250000, 0.25),
+    (1500000, 0.30),
+)
+
+_SLAB_LOWER = np.array([lower for lower, _ in TAX_SLABS], dtype=float)
+_SLAB_UPPER = np.append(_SLAB_LOWER[1:], np.inf)
+_SLAB_RATE = np.array([rate for _, rate in TAX_SLABS], dtype=float)
+
+Row = Tuple[float, ...]
+
+# Approximate size of one float in a cache key (float object + tuple slot)
+_KEY_BYTES_PER_VALUE = 32
+
+
+# ===================== VECTORIZED FORMULAS =====================
+
+def sip_future_value(monthly_amount, annual_rate, years) -> np.ndarray:
+    """Future value of a monthly SIP (amounts, rates in % a year, years; broadcast)"""
+    amount = np.asarray(monthly_amount, dtype=float)
+    rate = np.asarray(annual_rate, dtype=float) / 12 / 100
+    months = np.asarray(years, dtype=float) * 12
+    growth = np.power(1 + rate, months)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(rate > 0, amount * ((growth - 1) / rate) * (1 + rate), amount * months)
+
+
+def lumpsum_future_value(amount, annual_rate, years) -> np.ndarray:
+    """Maturity value of a one-time investment compounded annually"""
+    amount = np.asarray(amount, dtype=float)
+    rate = np.asarray(annual_rate, dtype=float) / 100
+    return amount * np.power(1 + rate, np.asarray(years, dtype=float))
+
+
+def emi_amount(principal, annual_rate, tenure_months) -> np.ndarray:
+    """Monthly instalment on the reducing balance method"""
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(annual_rate, dtype=float) / 12 / 100
+    months = np.asarray(tenure_months, dtype=float)
+    growth = np.power(1 + rate, months)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(rate > 0, principal * rate * growth / (growth - 1), principal / months)
+
+
+def income_tax(income) -> np.ndarray:
+    """Tax with cess under the new regime slabs, rounded to whole rupees"""
+    taxable = np.maximum(np.asarray(income, dtype=float) - STANDARD_DEDUCTION, 0)
+    in_slab = np.clip(taxable[..., np.newaxis] - _SLAB_LOWER, 0, _SLAB_UPPER - _SLAB_LOWER)
+    tax = (in_slab * _SLAB_RATE).sum(axis=-1) * (1 + HEALTH_EDUCATION_CESS)
+    return np.round(tax)
+
+
+# ===================== GRIDS =====================
+
+def _axes_key(values: Sequence[float]) -> Tuple[float, ...]:
+    """Hashable cache key for one grid axis"""
+    return tuple(float(value) for value in values)
+
+
+def _points(*axes: Tuple[float, ...]) -> int:
+    points = 1
+    for axis in axes:
+        points *= len(axis)
+    return points
+
+
+def _mesh(*axes: Tuple[float, ...]):
+    """Flattened cartesian product of the axes (first axis varies slowest)"""
+    points = _points(*axes)
+    if points == 0:
+        raise ValueError("Every grid axis needs at least one value")
+    if points > CALCULATOR_MAX_GRID_POINTS:
+        raise ValueError(f"Grid has {points} points; the limit is {CALCULATOR_MAX_GRID_POINTS}")
+    mesh = np.meshgrid(*[np.array(axis, dtype=float) for axis in axes], indexing="ij")
+    return [values.ravel() for values in mesh]
+
+
+class TableCache:
+    """Thread-safe LRU of computed tables, bounded by the bytes of the stored arrays"""
+
+    def __init__(self, max_bytes: int = CALCULATOR_CACHE_MAX_BYTES,
+                 max_points: int = CALCULATOR_CACHE_MAX_POINTS):
+        self.max_bytes = max_bytes
+        self.max_points = max_points
+        self._entries: "OrderedDict[tuple, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: tuple, points: int, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Cached table for `key`; grids over max_points are computed without caching"""
+        if points > self.max_points:
+            return compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+        table = compute()
+        table.setflags(write=False)
+        # The stored array plus its key (a tuple of Python floats)
+        size = table.nbytes + _KEY_BYTES_PER_VALUE * sum(len(part) for part in key if isinstance(part, tuple))
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (table, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes and self._entries:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+        return table
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "entries": len(self._entries),
+                    "bytes": self._bytes, "maxBytes": self.max_bytes, "maxPoints": self.max_points}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_cache = TableCache()
+
+
+def _table(kind: str, axes: Tuple[Tuple[float, ...], ...], compute: Callable[..., np.ndarray]) -> Tuple[Row, ...]:
+    """Rows of the `kind` table over `axes` (validated, cached when small)"""
+    table = _cache.get_or_compute((kind,) + axes, _points(*axes), lambda: compute(*_mesh(*axes)))
+    return tuple(map(tuple, table.tolist()))
+
+
+def _sip_columns(amount, rate, period) -> np.ndarray:
+    invested = amount * period * 12
+    value = sip_future_value(amount, rate, period)
+    return np.column_stack((amount, rate, period, invested, value - invested, value))
+
+
+def _lumpsum_columns(amount, rate, period) -> np.ndarray:
+    value = lumpsum_future_value(amount, rate, period)
+    return np.column_stack((amount, rate, period, amount, value - amount, value))
+
+
+def _emi_columns(principal, rate, months) -> np.ndarray:
+    emi = emi_amount(principal, rate, months)
+    total = emi * months
+    return np.column_stack((principal, rate, months, emi, total - principal, total))
+
+
+def _tax_columns(income) -> np.ndarray:
+    return np.column_stack((income, income_tax(income)))
+
+
+def sip_table(amounts: Sequence[float], rates: Sequence[float], years: Sequence[float]) -> Tuple[Row, ...]:
+    """Rows of (monthly amount, rate, years, invested, returns, future value)"""
+    return _table("sip", (_axes_key(amounts), _axes_key(rates), _axes_key(years)), _sip_columns)
+
+
+def lumpsum_table(amounts: Sequence[float], rates: Sequence[float], years: Sequence[float]) -> Tuple[Row, ...]:
+    """Rows of (amount, rate, years, invested, returns, maturity value)"""
+    return _table("lumpsum", (_axes_key(amounts), _axes_key(rates), _axes_key(years)), _lumpsum_columns)
+
+
+def emi_table(principals: Sequence[float], rates: Sequence[float], tenures: Sequence[float]) -> Tuple[Row, ...]:
+    """Rows of (principal, rate, tenure months, EMI, total interest, total payment)"""
+    return _table("emi", (_axes_key(principals), _axes_key(rates), _axes_key(tenures)), _emi_columns)
+
+
+def tax_table(incomes: Sequence[float]) -> Tuple[Row, ...]:
+    """Rows of (income, tax)"""
+    return _table("tax", (_axes_key(incomes),), _tax_columns)
+
+
+# ===================== SINGLE VALUES =====================
+
+def sip(amount: float, rate: float, years: float) -> Row:
+    """(invested, returns, future value) for one SIP"""
+    return sip_table((amount,), (rate,), (years,))[0][3:]
+
+
+def lumpsum(amount: float, rate: float, years: float) -> Row:
+    """(invested, returns, maturity value) for one lumpsum investment"""
+    return lumpsum_table((amount,), (rate,), (years,))[0][3:]
+
+
+def emi(principal: float, rate: float, tenure_months: float) -> float:
+    return emi_table((principal,), (rate,), (tenure_months,))[0][3]
+
+
+def tax(income: float) -> int:
+    return int(tax_table((income,))[0][1])
+
+
+def cache_info() -> dict:
+    """Table cache counters, for diagnostics"""
+    return _cache.info()
@@ -0,0 +1,233 @@
+"""
+GDPR data export worker.
+
+`POST /api/settings/download-data` stores a pending request in
+data_download_requests and hands its id to this worker. A bounded thread pool
+builds the archive off the request path:
+
+- each source collection is streamed cursor-by-cursor into a JSON Lines member
+  of a zip file, so memory stays flat for long-tenured users
+- uploaded documents are copied into the archive from disk
+- progress is written back to the request after every section
+- the archive is written to a temporary name and renamed when complete
+
+Archives live in DATA_EXPORT_DIR, outside the public /uploads mount, and are
+served only through the authenticated download endpoint. They hold the user's
+personal data, so a retention sweep deletes each archive once its
+DATA_EXPORT_RETENTION_DAYS are over and marks the request expired.
+
+On startup every request still "processing" is reset to pending and queued
+again: the process that was building it is gone.
+"""
+import json
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from bson import ObjectId
+from app.config import (
+    DATA_EXPORT_WORKERS, DATA_EXPORT_DIR, DATA_EXPORT_RETENTION_DAYS, DATA_EXPORT_SWEEP_INTERVAL_SECONDS
+)
+from app.database.db import get_database
+from app.database.repository.settings_repository import settings_repository
+from app.utils.interval_worker import IntervalWorker
+
+logger = logging.getLogger(__name__)
+
+
+# (collection, user field) pairs exported per section. User ids are stored as
+# strings by some modules and as ObjectIds by others, so both are matched.
+APPLICATION_SOURCES: List[Tuple[str, str]] = [
+    ("personal_loan_applications", "userId"),
+    ("home_loan_applications", "userId"),
+    ("business_loan_applications", "userId"),
+    ("short_term_loan_applications", "userId"),
+    ("personal_loan_get_in_touch", "userId"),
+    ("home_loan_get_in_touch", "userId"),
+    ("business_loan_get_in_touch", "userId"),
+    ("short_term_loan_get_in_touch", "userId"),
+    ("loan_applications", "user_id"),
+    ("active_loans", "user_id"),
+    ("health_insurance_applications", "userId"),
+    ("motor_insurance_applications", "userId"),
+    ("term_insurance_applications", "userId"),
+    ("health_insurance_inquiries", "userId"),
+    ("motor_insurance_inquiries", "userId"),
+    ("term_insurance_inquiries", "userId"),
+    ("insurance_claims", "userId"),
+    ("sip_applications", "userId"),
+    ("mutual_fund_applications", "userId"),
+    ("sip_inquiries", "userId"),
+    ("mutual_fund_inquiries", "userId"),
+    ("tax_planning_applications", "userId"),
+    ("business_tax_applications", "userId"),
+    ("RetailServiceApplications", "userId"),
+    ("CorporateServiceInquiries", "userId"),
+]
+
+TRANSACTION_SOURCES: List[Tuple[str, str]] = [
+    ("emi_payments", "user_id"),
+    ("investments", "userEmail"),
+    ("investment_transactions", "userEmail"),
+]
+
+DOCUMENT_COLLECTION = "user_documents"
+
+# Never exported: credentials and second-factor secrets
+PRIVATE_USER_FIELDS = ("hashedPassword", "password", "twoFactorSecret", "twoFactorBackupCodes")
+
+
+def _user_filter(field: str, user: dict) -> dict:
+    if field == "userEmail":
+        return {field: user.get("email")}
+    user_id = user["_id"]
+    return {field: {"$in": [user_id, str(user_id)]}}
+
+
+def _write_jsonl(archive: zipfile.ZipFile, name: str, cursor) -> int:
+    """Stream documents from a cursor into one JSON Lines archive member"""
+    count = 0
+    with archive.open(name, "w") as member:
+        for document in cursor:
+            member.write(json.dumps(document, default=str).encode("utf-8"))
+            member.write(b"\n")
+            count += 1
+    return count
+
+
+def _document_path(file_path: str) -> Path:
+    """Resolve a stored /uploads/... path to the file on disk"""
+    return Path(file_path.lstrip("/"))
+
+
+class DataExportWorker:
+    """Bounded pool that builds data export archives"""
+
+    def __init__(self, max_workers: int = DATA_EXPORT_WORKERS, export_dir: str = DATA_EXPORT_DIR):
+        self.max_workers = max_workers
+        self.export_dir = Path(export_dir)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="data-export")
+            return self._executor
+
+    def submit(self, request_id: str) -> None:
+        """Queue a pending request for export"""
+        self._get_executor().submit(self.run, request_id)
+
+    def resume_queued(self) -> int:
+        """Queue pending and interrupted requests left by a previous process (called on startup)"""
+        request_ids = settings_repository.get_queued_data_download_request_ids()
+        for request_id in request_ids:
+            self.submit(request_id)
+        return len(request_ids)
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running exports finish, queued ones stay pending for the next start"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def archive_path(self, request_id: str) -> Path:
+        return self.export_dir / f"cashper-data-{request_id}.zip"
+
+    def run(self, request_id: str) -> None:
+        """Build the archive for one request (no-op if another worker claimed it)"""
+        request = settings_repository.claim_data_download_request(request_id)
+        if not request:
+            return
+
+        final_path = self.archive_path(request_id)
+        tmp_path = final_path.with_suffix(".zip.part")
+        try:
+            db = get_database()
+            user = db["users"].find_one({"_id": request["userId"]})
+            if not user:
+                raise ValueError("User not found")
+
+            sources: List[Tuple[str, str, str]] = []
+            if request.get("includeApplications", True):
+                sources += [("applications", c, f) for c, f in APPLICATION_SOURCES]
+            if request.get("includeTransactions", True):
+                sources += [("transactions", c, f) for c, f in TRANSACTION_SOURCES]
+            total_steps = len(sources) + 1 + (1 if request.get("includeDocuments", True) else 0)
+
+            self.export_dir.mkdir(parents=True, exist_ok=True)
+            summary: Dict[str, int] = {}
+            with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                profile = {k: v for k, v in user.items() if k not in PRIVATE_USER_FIELDS}
+                archive.writestr("profile.json", json.dumps(profile, default=str, indent=2))
+
+                for step, (section, collection, field) in enumerate(sources, start=1):
+                    cursor = db[collection].find(_user_filter(field, user))
+                    summary[f"{section}/{collection}"] = _write_jsonl(
+                        archive, f"{section}/{collection}.jsonl", cursor
+                    )
+                    settings_repository.update_data_download_progress(request_id, int(step * 100 / total_steps))
+
+                if request.get("includeDocuments", True):
+                    documents = list(db[DOCUMENT_COLLECTION].find(_user_filter("userId", user)))
+                    summary["documents"] = _write_jsonl(archive, "documents/index.jsonl", documents)
+                    for document in documents:
+                        path = _document_path(document.get("filePath") or "")
+                        if path.is_file():
+                            archive.write(path, f"documents/files/{document['_id']}-{path.name}")
+
+                archive.writestr("summary.json", json.dumps({
+                    "requestId": request_id,
+                    "generatedAt": datetime.utcnow().isoformat(),
+                    "records": summary
+                }, indent=2))
+
+            os.replace(tmp_path, final_path)
+            settings_repository.complete_data_download_request(
+                request_id,
+                str(final_path),
+                final_path.stat().st_size,
+                datetime.utcnow() + timedelta(days=DATA_EXPORT_RETENTION_DAYS)
+            )
+            print(f"[OK] Data export {request_id} complete")
+
+        except Exception as e:
+            print(f"[ERROR] Data export {request_id} failed: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            settings_repository.fail_data_download_request(request_id, str(e))
+
+
+class DataExportRetentionSweeper(IntervalWorker):
+    """Deletes expired export archives on an interval"""
+
+    def __init__(self, interval: int = DATA_EXPORT_SWEEP_INTERVAL_SECONDS):
+        super().__init__(interval, name="data-export-retention")
+
+    def run_once(self) -> int:
+        """One sweep; returns requests expired (0 on error)"""
+        try:
+            expired = 0
+            for request in settings_repository.get_expired_data_download_requests(datetime.utcnow()):
+                file_path = request.get("filePath")
+                if file_path and os.path.exists(file_path):
+                    os.remove(file_path)
+                settings_repository.expire_data_download_request(str(request["_id"]))
+                expired += 1
+            if expired:
+                print(f"[+] Removed {expired} expired data export archives")
+            return expired
+        except Exception as e:
+            logger.error(f"Error sweeping expired data exports: {e}")
+            return 0
+
+
+# Create singleton instance
+data_export_worker = DataExportWorker()
+data_export_retention_sweeper = DataExportRetentionSweeper()
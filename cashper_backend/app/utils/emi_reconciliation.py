@@ -0,0 +1,40 @@
+"""
+Scheduled EMI payment reconciliation.
+
+A payment is recorded as "processing" before it is applied to its loan. When
+the request dies in between, the payment is left "processing"; every
+EMI_RECONCILE_INTERVAL_SECONDS, payments older than EMI_RECONCILE_STALE_SECONDS
+are closed: completed when the loan already lists them, failed otherwise.
+Nothing is applied here, so this never pays an EMI twice.
+"""
+import logging
+from datetime import timedelta
+from app.config import EMI_RECONCILE_INTERVAL_SECONDS, EMI_RECONCILE_STALE_SECONDS
+from app.database.repository.loan_management_repository import loan_management_repository
+from app.utils.interval_worker import IntervalWorker
+
+logger = logging.getLogger(__name__)
+
+
+class EMIReconciler(IntervalWorker):
+    """Closes stale "processing" EMI payments on an interval"""
+
+    def __init__(self, interval: int = EMI_RECONCILE_INTERVAL_SECONDS,
+                 stale_seconds: int = EMI_RECONCILE_STALE_SECONDS):
+        super().__init__(interval, name="emi-reconciliation")
+        self.stale_seconds = stale_seconds
+
+    def run_once(self) -> int:
+        """One reconciliation; returns payments closed (0 on error)"""
+        try:
+            closed = loan_management_repository.reconcile_stale_payments(timedelta(seconds=self.stale_seconds))
+            if closed:
+                print(f"[+] EMI reconciliation closed {closed} stale payments")
+            return closed
+        except Exception as e:
+            logger.error(f"Error reconciling EMI payments: {e}")
+            return 0
+
+
+# Create singleton instance
+emi_reconciler = EMIReconciler()
@@ -1,15 +1,32 @@
 """
 File Upload Utility
 ==================
-Handles image uploads for testimonials and blog posts
+Handles image uploads for testimonials and blog posts, and document uploads
+
+Uploads are streamed in UPLOAD_CHUNK_SIZE chunks to a temporary file with
+non-blocking writes; the size limit is enforced while streaming and a SHA-256
+is computed during the copy. Documents are content-addressed: identical
+files (the same PAN or Aadhaar scan attached to many applications) are
+stored once under uploads/content/<sha[:2]>/<sha><ext> and reference counted.
+
+Form submissions with several attachments go through `submission_uploads`:
+all files are written concurrently, and if any of them fails, or the block
+that records the application raises, the files already stored are released
+again so no orphans are left behind.
 """
 
+import asyncio
+import hashlib
+import mimetypes
 import os
 import uuid
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Mapping, NamedTuple, Optional
 from fastapi import UploadFile, HTTPException, status
 from pathlib import Path
-import shutil
+import aiofiles
+import aiofiles.os
+from app.database.repository.stored_file_repository import stored_file_repository
 
 # Configuration
 UPLOAD_DIR = Path("uploads")
@@ -17,7 +34,10 @@ TESTIMONIAL_DIR = UPLOAD_DIR / "testimonials"
 BLOG_DIR = UPLOAD_DIR / "blogs"
 DOCUMENTS_DIR = UPLOAD_DIR / "documents"
 PROFILE_DIR = UPLOAD_DIR / "profiles"
+CONTENT_DIR = UPLOAD_DIR / "content"
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+MAX_DOCUMENT_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 ALLOWED_DOCUMENT_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".doc", ".docx"}
 
@@ -29,6 +49,14 @@ def init_upload_directories():
     BLOG_DIR.mkdir(exist_ok=True)
     DOCUMENTS_DIR.mkdir(exist_ok=True)
     PROFILE_DIR.mkdir(exist_ok=True)
+    CONTENT_DIR.mkdir(exist_ok=True)
+
+
+class StoredUpload(NamedTuple):
+    """A saved upload: public path (/uploads/...), size in bytes and SHA-256 hex digest"""
+    path: str
+    size: int
+    sha256: str
 
 
 def validate_image_file(file: UploadFile) -> None:
@@ -90,6 +118,124 @@ def validate_document_file(file: UploadFile) -> None:
         )
 
 
+async def _stream_to_temp(file: UploadFile, target_dir: Path, max_size: int):
+    """Copy an upload to a temporary file in `target_dir` chunk by chunk.
+
+    Returns (temporary path, size, sha256). Raises 413 as soon as the upload
+    exceeds `max_size`; the temporary file is removed on any error.
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = target_dir / f".{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        await file.seek(0)
+        async with aiofiles.open(tmp_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File size exceeds {max_size // (1024 * 1024)}MB limit"
+                    )
+                digest.update(chunk)
+                await buffer.write(chunk)
+    except BaseException:
+        if tmp_path.exists():
+            await aiofiles.os.remove(tmp_path)
+        raise
+    return tmp_path, size, digest.hexdigest()
+
+
+async def _discard_temp(tmp_path: Path) -> None:
+    """Remove a temporary upload file that was not moved into place"""
+    try:
+        await aiofiles.os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Error removing temporary upload {tmp_path}: {e}")
+
+
+async def store_upload(
+    file: UploadFile,
+    upload_type: str = "general",
+    validate: bool = True
+) -> StoredUpload:
+    """
+    Stream an upload to disk
+    
+    Args:
+        file: Uploaded file
+        upload_type: Type of upload ("testimonial", "blog", "profile" or "document")
+        validate: Check the file type for the upload type
+        
+    Returns:
+        StoredUpload: Public path, size and SHA-256 of the saved file
+        
+    Raises:
+        HTTPException: If the file is invalid, too large or cannot be saved
+    """
+    is_document = upload_type == "document"
+    if validate:
+        if is_document:
+            validate_document_file(file)
+        else:
+            validate_image_file(file)
+    
+    file_ext = os.path.splitext(file.filename or "")[1].lower()
+    
+    if is_document:
+        # Content-addressed: identical documents share one file
+        tmp_path, size, sha256 = await _stream_to_temp(file, CONTENT_DIR, MAX_DOCUMENT_SIZE)
+        target_dir = CONTENT_DIR / sha256[:2]
+        target_dir.mkdir(parents=True, exist_ok=True)
+        content_name = f"{sha256}{file_ext}"
+        relative_path = f"/uploads/content/{sha256[:2]}/{content_name}"
+        final_path = target_dir / content_name
+        try:
+            # add_reference may wait (blocking) for a concurrent delete of the same content
+            refs = await asyncio.to_thread(
+                stored_file_repository.add_reference, content_name, relative_path, size, sha256
+            )
+            if refs == 1 or not final_path.exists():
+                await aiofiles.os.replace(tmp_path, final_path)
+            else:
+                await aiofiles.os.remove(tmp_path)
+        except BaseException:
+            await _discard_temp(tmp_path)
+            raise
+        return StoredUpload(relative_path, size, sha256)
+    
+    # Determine upload directory
+    if upload_type == "testimonial":
+        target_dir = TESTIMONIAL_DIR
+    elif upload_type == "blog":
+        target_dir = BLOG_DIR
+    elif upload_type == "profile":
+        target_dir = PROFILE_DIR
+    else:
+        target_dir = UPLOAD_DIR
+    
+    tmp_path, size, sha256 = await _stream_to_temp(file, target_dir, MAX_FILE_SIZE)
+    unique_filename = f"{uuid.uuid4().hex}{file_ext}"
+    try:
+        await aiofiles.os.replace(tmp_path, target_dir / unique_filename)
+    except BaseException:
+        await _discard_temp(tmp_path)
+        raise
+    
+    # Return relative path (for database storage)
+    if upload_type == "profile":
+        relative_path = f"/uploads/profiles/{unique_filename}"
+    else:
+        relative_path = f"/uploads/{upload_type}s/{unique_filename}"
+    return StoredUpload(relative_path, size, sha256)
+
+
 async def save_upload_file(
     file: UploadFile,
     upload_type: str = "general"
@@ -108,45 +254,11 @@ async def save_upload_file(
         HTTPException: If file cannot be saved
     """
     try:
-        # Validate file based on type
-        if upload_type == "document":
-            validate_document_file(file)
-        else:
-            validate_image_file(file)
-        
         # Initialize directories
         init_upload_directories()
         
-        # Determine upload directory
-        if upload_type == "testimonial":
-            target_dir = TESTIMONIAL_DIR
-        elif upload_type == "blog":
-            target_dir = BLOG_DIR
-        elif upload_type == "document":
-            target_dir = DOCUMENTS_DIR
-        elif upload_type == "profile":
-            target_dir = PROFILE_DIR
-        else:
-            target_dir = UPLOAD_DIR
-        
-        # Generate unique filename
-        file_ext = os.path.splitext(file.filename)[1].lower()
-        unique_filename = f"{uuid.uuid4().hex}{file_ext}"
-        file_path = target_dir / unique_filename
-        
-        # Save file
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Return relative path (for database storage)
-        if upload_type == "document":
-            relative_path = f"/uploads/documents/{unique_filename}"
-        elif upload_type == "profile":
-            relative_path = f"/uploads/profiles/{unique_filename}"
-        else:
-            relative_path = f"/uploads/{upload_type}s/{unique_filename}"
-        
-        return relative_path
+        stored = await store_upload(file, upload_type)
+        return stored.path
         
     except HTTPException:
         raise
@@ -160,6 +272,96 @@ async def save_upload_file(
         await file.close()
 
 
+def _upload_metadata(file: UploadFile, stored: StoredUpload) -> Dict[str, Any]:
+    """Metadata recorded with an application for one attached file"""
+    return {
+        "path": stored.path,
+        "originalName": file.filename,
+        "mimeType": file.content_type or mimetypes.guess_type(file.filename or "")[0] or "application/octet-stream",
+        "size": stored.size,
+        "sha256": stored.sha256
+    }
+
+
+async def store_uploads(
+    files: Mapping[str, Optional[UploadFile]],
+    upload_type: str = "document",
+    validate: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Stream several uploads to disk concurrently
+    
+    Args:
+        files: Form field name -> uploaded file (missing or empty fields are skipped)
+        upload_type: Type of upload, as for store_upload
+        validate: Check the file types for the upload type
+        
+    Returns:
+        dict: Field name -> metadata (path, originalName, mimeType, size, sha256)
+        
+    Raises:
+        HTTPException: If any file fails; the files that were stored are released first
+    """
+    present = {name: file for name, file in files.items() if file and file.filename}
+    if not present:
+        return {}
+    
+    init_upload_directories()
+    results = await asyncio.gather(
+        *(store_upload(file, upload_type, validate) for file in present.values()),
+        return_exceptions=True
+    )
+    
+    stored: Dict[str, Dict[str, Any]] = {}
+    failed = None
+    for (name, file), result in zip(present.items(), results):
+        if isinstance(result, BaseException):
+            failed = failed or (name, result)
+        else:
+            stored[name] = _upload_metadata(file, result)
+    
+    if failed:
+        discard_uploads(stored)
+        name, error = failed
+        if isinstance(error, HTTPException):
+            raise HTTPException(status_code=error.status_code, detail=f"{name}: {error.detail}")
+        if not isinstance(error, Exception):
+            raise error
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload {name}: {str(error)}"
+        )
+    return stored
+
+
+def discard_uploads(stored: Mapping[str, Dict[str, Any]]) -> None:
+    """Release files returned by store_uploads (rollback of a failed submission)"""
+    for metadata in stored.values():
+        delete_file(metadata["path"])
+
+
+@asynccontextmanager
+async def submission_uploads(
+    files: Mapping[str, Optional[UploadFile]],
+    upload_type: str = "document",
+    validate: bool = False
+) -> AsyncIterator[Dict[str, Dict[str, Any]]]:
+    """
+    Store a submission's attachments and roll them back if the block fails
+    
+    Usage:
+        async with submission_uploads(doc_mapping) as stored:
+            application_data["documentFiles"] = stored
+            collection.insert_one(application_data)
+    """
+    stored = await store_uploads(files, upload_type, validate)
+    try:
+        yield stored
+    except BaseException:
+        discard_uploads(stored)
+        raise
+
+
 def delete_file(file_path: str) -> bool:
     """
     Delete file from disk
@@ -171,23 +373,37 @@ def delete_file(file_path: str) -> bool:
         bool: True if deleted, False otherwise
     """
     try:
-        # Convert relative path to absolute
-        if file_path.startswith("/uploads/"):
-            file_path = file_path[1:]  # Remove leading slash
+        # Content-addressed files are shared; remove only with the last reference,
+        # while the record (marked deleting) still holds off identical uploads
+        if file_path.startswith("/uploads/content/"):
+            if not stored_file_repository.release(file_path):
+                return False
+            try:
+                return _unlink(file_path)
+            finally:
+                stored_file_repository.finish_release(file_path)
         
-        full_path = Path(file_path)
-        
-        if full_path.exists():
-            full_path.unlink()
-            return True
-        
-        return False
+        return _unlink(file_path)
         
     except Exception as e:
         print(f"Error deleting file: {e}")
         return False
 
 
+def _unlink(file_path: str) -> bool:
+    # Convert relative path to absolute
+    if file_path.startswith("/uploads/"):
+        file_path = file_path[1:]  # Remove leading slash
+    
+    full_path = Path(file_path)
+    
+    if full_path.exists():
+        full_path.unlink()
+        return True
+    
+    return False
+
+
 def get_file_size(file_path: str) -> Optional[int]:
     """
     Get file size in bytes
@@ -0,0 +1,72 @@
+"""
+Base class for background jobs run on an interval from a daemon thread.
+
+The schedulers, sweepers and write-behind buffers share the same lifecycle:
+`start()` launches one daemon thread (a second call is a no-op), the thread
+calls `run_once()` every `interval` seconds, and `stop()` wakes it and waits
+up to `join_timeout` seconds for an in-flight run. Subclasses implement
+`run_once()` and may override `on_start()` (run once in the thread before
+the loop) or call `wake()` to run early.
+"""
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IntervalWorker(ABC):
+    """Calls run_once() every `interval` seconds from a daemon thread"""
+
+    def __init__(self, interval: float, name: str, run_at_start: bool = True,
+                 join_timeout: Optional[float] = None):
+        self.interval = interval
+        self.name = name
+        self.run_at_start = run_at_start
+        self.join_timeout = 5 if join_timeout is None else join_timeout
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def run_once(self) -> Any:
+        """One run of the job; must not raise"""
+
+    def on_start(self) -> None:
+        """Runs once in the worker thread before the first run_once()"""
+
+    def wake(self) -> None:
+        """Run the job now instead of at the end of the current interval"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        try:
+            self.on_start()
+        except Exception as e:
+            logger.error(f"Error starting {self.name}: {e}")
+        if self.run_at_start and not self._stop.is_set():
+            self.run_once()
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.run_once()
+
+    def start(self) -> None:
+        """Start the background thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, waiting up to join_timeout for an in-flight run"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.join_timeout)
+            self._thread = None
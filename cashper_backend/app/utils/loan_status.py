@@ -0,0 +1,33 @@
+"""
+Loan status normalization.
+
+Loan applications are written by several routes with inconsistent casing
+("Pending", "pending", "Under Review", "under review", ...). Every write also
+stores a canonical `statusKey` so admin listings and statistics can use plain
+(indexable) equality matches instead of case-insensitive regexes.
+"""
+from typing import Any, Optional
+
+# Collections that carry a `statusKey` next to their `status`
+LOAN_APPLICATION_COLLECTIONS = [
+    "admin_loan_applications",
+    "short_term_loan_applications",
+    "personal_loan_applications",
+    "business_loan_applications",
+    "home_loan_applications",
+]
+
+LOAN_STATUS_KEYS = ["pending", "under_review", "approved", "rejected", "disbursed"]
+
+
+def normalize_loan_status(status: Any) -> Optional[str]:
+    """Map any stored/submitted status spelling to its canonical key"""
+    status = getattr(status, "value", status)
+    if status is None:
+        return None
+    key = "_".join(str(status).strip().lower().replace("-", " ").split())
+    if not key:
+        return None
+    if key in ("review", "in_review"):
+        return "under_review"
+    return key
@@ -0,0 +1,42 @@
+"""
+Scheduled daily metrics rollup.
+
+A background thread keeps the daily_metrics collection current: on start it
+backfills days missing from the last METRICS_ROLLUP_BACKFILL_DAYS (at least the
+longest analytics range, REPORT_MAX_MONTHS), then every
+METRICS_ROLLUP_INTERVAL_SECONDS it rebuilds today and yesterday (and any day
+missed while the process was down). The admin analytics endpoints read only
+the rollup.
+"""
+import logging
+from app.config import METRICS_ROLLUP_INTERVAL_SECONDS, METRICS_ROLLUP_BACKFILL_DAYS
+from app.database.repository.metrics_rollup_repository import metrics_rollup_repository
+from app.utils.interval_worker import IntervalWorker
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRollupScheduler(IntervalWorker):
+    """Backfills on start, then runs the incremental rollup on an interval"""
+
+    def __init__(self, interval: int = METRICS_ROLLUP_INTERVAL_SECONDS,
+                 backfill_days: int = METRICS_ROLLUP_BACKFILL_DAYS):
+        super().__init__(interval, name="metrics-rollup")
+        self.backfill_days = backfill_days
+
+    def on_start(self) -> None:
+        built = metrics_rollup_repository.backfill(self.backfill_days)
+        if built:
+            print(f"[+] Backfilled daily metrics for {built} days")
+
+    def run_once(self) -> int:
+        """One incremental rollup; returns days rebuilt (0 on error)"""
+        try:
+            return metrics_rollup_repository.rollup_recent()
+        except Exception as e:
+            logger.error(f"Error rolling up daily metrics: {e}")
+            return 0
+
+
+# Create singleton instance
+metrics_rollup_scheduler = MetricsRollupScheduler()
@@ -0,0 +1,186 @@
+"""
+OTP storage and send-rate limiting.
+
+Two interchangeable backends:
+- MongoOTPStore: OTPs and send counters live in TTL collections, so every
+  uvicorn worker sees the same state and MongoDB evicts expired entries.
+- MemoryOTPStore: bounded in-process LRU, for single-process/dev setups or
+  when MongoDB is unavailable.
+
+Only a SHA-256 digest of each OTP is stored.
+"""
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from pymongo import ReturnDocument
+from app.config import OTP_STORE_BACKEND, OTP_SEND_LIMIT, OTP_SEND_WINDOW_SECONDS
+from app.database.db import get_database
+
+
+OTP_COLLECTION = "otp_codes"
+OTP_RATE_LIMIT_COLLECTION = "otp_send_counters"
+
+
+def _digest(otp: str) -> str:
+    return hashlib.sha256(otp.encode("utf-8")).hexdigest()
+
+
+def _window_start(now: float, window_seconds: int) -> int:
+    return int(now // window_seconds * window_seconds)
+
+
+class OTPStore(ABC):
+    """Interface shared by the OTP backends"""
+
+    @abstractmethod
+    def save(self, key: str, otp: str, purpose: str, ttl_seconds: int) -> None:
+        """Store an OTP for `key` and `purpose`, replacing any previous one"""
+
+    @abstractmethod
+    def verify(self, key: str, otp: str, purpose: str) -> str:
+        """Check an OTP; returns "valid", "invalid", "expired" or "missing".
+
+        A valid OTP is consumed; an expired one is removed.
+        """
+
+    @abstractmethod
+    def register_send(self, key: str, limit: int = OTP_SEND_LIMIT,
+                      window_seconds: int = OTP_SEND_WINDOW_SECONDS) -> Tuple[bool, int]:
+        """Count one OTP send for `key`.
+
+        Returns (allowed, retry_after_seconds) for a fixed window of
+        `window_seconds` allowing at most `limit` sends.
+        """
+
+
+class MongoOTPStore(OTPStore):
+    """OTP store backed by MongoDB TTL collections (indexes declared in app.database.indexes)"""
+
+    def _codes(self):
+        return get_database()[OTP_COLLECTION]
+
+    def _counters(self):
+        return get_database()[OTP_RATE_LIMIT_COLLECTION]
+
+    def save(self, key: str, otp: str, purpose: str, ttl_seconds: int) -> None:
+        now = datetime.utcnow()
+        self._codes().replace_one(
+            {"_id": f"{purpose}:{key}"},
+            {
+                "purpose": purpose,
+                "otpHash": _digest(otp),
+                "createdAt": now,
+                "expiresAt": now + timedelta(seconds=ttl_seconds),
+            },
+            upsert=True
+        )
+
+    def verify(self, key: str, otp: str, purpose: str) -> str:
+        codes = self._codes()
+        stored = codes.find_one({"_id": f"{purpose}:{key}"})
+        # The TTL monitor runs about once a minute, so expiry is checked here too
+        if not stored:
+            return "missing"
+        if datetime.utcnow() > stored["expiresAt"]:
+            codes.delete_one({"_id": stored["_id"]})
+            return "expired"
+        if not hmac.compare_digest(stored["otpHash"], _digest(otp)):
+            return "invalid"
+        # Consume atomically so one OTP cannot be redeemed twice by concurrent requests
+        result = codes.delete_one({"_id": stored["_id"], "otpHash": stored["otpHash"]})
+        return "valid" if result.deleted_count else "missing"
+
+    def register_send(self, key: str, limit: int = OTP_SEND_LIMIT,
+                      window_seconds: int = OTP_SEND_WINDOW_SECONDS) -> Tuple[bool, int]:
+        now = time.time()
+        window = _window_start(now, window_seconds)
+        counter = self._counters().find_one_and_update(
+            {"_id": f"{key}:{window}"},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {"expiresAt": datetime.utcfromtimestamp(window + window_seconds)},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if counter["count"] > limit:
+            return False, int(window + window_seconds - now) + 1
+        return True, 0
+
+
+class MemoryOTPStore(OTPStore):
+    """Per-process OTP store; an LRU bound keeps memory flat and expired entries are evicted"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._codes: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._counters: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, entries: OrderedDict, now: float, expires_at) -> None:
+        for entry_key in [k for k, v in entries.items() if expires_at(v) <= now]:
+            del entries[entry_key]
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def save(self, key: str, otp: str, purpose: str, ttl_seconds: int) -> None:
+        now = time.time()
+        with self._lock:
+            entry_key = f"{purpose}:{key}"
+            self._codes.pop(entry_key, None)
+            self._codes[entry_key] = (_digest(otp), now + ttl_seconds)
+            self._evict(self._codes, now, lambda value: value[1])
+
+    def verify(self, key: str, otp: str, purpose: str) -> str:
+        entry_key = f"{purpose}:{key}"
+        with self._lock:
+            stored = self._codes.get(entry_key)
+            if stored is None:
+                return "missing"
+            otp_hash, expires_at = stored
+            if time.time() > expires_at:
+                del self._codes[entry_key]
+                return "expired"
+            if not hmac.compare_digest(otp_hash, _digest(otp)):
+                return "invalid"
+            del self._codes[entry_key]
+            return "valid"
+
+    def register_send(self, key: str, limit: int = OTP_SEND_LIMIT,
+                      window_seconds: int = OTP_SEND_WINDOW_SECONDS) -> Tuple[bool, int]:
+        now = time.time()
+        window = _window_start(now, window_seconds)
+        with self._lock:
+            count, counter_window = self._counters.pop(key, (0, window))
+            if counter_window != window:
+                count = 0
+            count += 1
+            self._counters[key] = (count, window)
+            self._evict(self._counters, now, lambda value: value[1] + window_seconds)
+        if count > limit:
+            return False, int(window + window_seconds - now) + 1
+        return True, 0
+
+
+_store: Optional[OTPStore] = None
+_store_lock = threading.Lock()
+
+
+def get_otp_store() -> OTPStore:
+    """Return the configured OTP store (falls back to memory when MongoDB is unavailable)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if OTP_STORE_BACKEND == "mongo" and get_database() is not None:
+                    _store = MongoOTPStore()
+                else:
+                    if OTP_STORE_BACKEND == "mongo":
+                        print("[WARN] MongoDB unavailable - OTPs are kept in process memory")
+                    _store = MemoryOTPStore()
+    return _store
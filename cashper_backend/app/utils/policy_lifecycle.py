@@ -0,0 +1,39 @@
+"""
+Scheduled insurance policy lifecycle sweep.
+
+A background thread keeps policy statuses in step with their end dates:
+every POLICY_SWEEP_INTERVAL_SECONDS, in-force policies past their end date
+become Expired, Active policies ending within POLICY_EXPIRING_WINDOW_DAYS
+become Expiring Soon, and renewed ones go back to Active. Each sweep is a
+single bulk write on the indexed (status, endDateAt) pair.
+"""
+import logging
+from app.config import POLICY_SWEEP_INTERVAL_SECONDS, POLICY_EXPIRING_WINDOW_DAYS
+from app.database.repository.insurance_management_repository import insurance_management_repository
+from app.utils.interval_worker import IntervalWorker
+
+logger = logging.getLogger(__name__)
+
+
+class PolicyLifecycleSweeper(IntervalWorker):
+    """Moves policies between Active, Expiring Soon and Expired on an interval"""
+
+    def __init__(self, interval: int = POLICY_SWEEP_INTERVAL_SECONDS,
+                 window_days: int = POLICY_EXPIRING_WINDOW_DAYS):
+        super().__init__(interval, name="policy-lifecycle")
+        self.window_days = window_days
+
+    def run_once(self) -> int:
+        """One sweep; returns policies moved (0 on error)"""
+        try:
+            moved = insurance_management_repository.sweep_lifecycle(self.window_days)
+            if moved:
+                print(f"[+] Policy lifecycle sweep updated {moved} policies")
+            return moved
+        except Exception as e:
+            logger.error(f"Error sweeping policy lifecycle: {e}")
+            return 0
+
+
+# Create singleton instance
+policy_lifecycle_sweeper = PolicyLifecycleSweeper()
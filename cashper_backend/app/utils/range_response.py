@@ -0,0 +1,82 @@
+"""
+File responses with HTTP Range support.
+
+Starlette's FileResponse (0.27) always sends the whole file. Large downloads
+(data exports, reports) need `Range: bytes=...` so clients can resume an
+interrupted transfer. Only single ranges are supported; a multi-range request
+is answered with the full file, which RFC 7233 allows.
+"""
+import os
+from typing import Iterator, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from fastapi.responses import FileResponse, StreamingResponse
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=start-end` range into inclusive offsets.
+
+    Returns None when the header is absent or not a single byte range, and
+    raises 416 when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else file_size - 1
+        else:
+            # Suffix range: the last N bytes
+            length = int(end_text)
+            start = max(file_size - length, 0)
+            end = file_size - 1
+    except ValueError:
+        return None
+
+    end = min(end, file_size - 1)
+    if start > end or start >= file_size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+    return start, end
+
+
+def _iter_file(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def range_file_response(path: str, request: Request, filename: str,
+                        media_type: str = "application/octet-stream"):
+    """Serve `path` as an attachment, honouring a single Range request header"""
+    file_size = os.path.getsize(path)
+    byte_range = parse_range(request.headers.get("range"), file_size)
+    headers = {"Accept-Ranges": "bytes"}
+
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+
+    start, end = byte_range
+    headers.update({
+        "Content-Range": f"bytes {start}-{end}/{file_size}",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    })
+    return StreamingResponse(
+        _iter_file(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers
+    )
@@ -0,0 +1,264 @@
+"""
+Admin report generation.
+
+`POST /api/admin/reports/generate` records a job in report_jobs and hands it
+to this worker; the request returns immediately, so long (multi-month)
+reports never hold an HTTP request open. A bounded thread pool:
+
+- aggregates each source collection with one $group per source, counting
+  applications per period (day, or month for ranges over 31 days) and status
+- renders the result as CSV or XLSX under REPORTS_DIR, writing to a
+  temporary name and renaming when complete
+- records the outcome on the job
+
+A job still processing after REPORT_JOB_TIMEOUT_SECONDS is presumed lost and
+is requeued by the next request for it; on startup every processing job is
+requeued, since the new process runs none of them.
+
+Files (and leftover temporary files) older than REPORT_RETENTION_DAYS are
+removed from REPORTS_DIR by a cleanup sweep; requesting such a report again
+renders it again.
+
+Identical requests on the same day (report, range and format) share one job
+and one file, so a finished report is served again without being rebuilt.
+"""
+import csv
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import (
+    REPORT_WORKERS, REPORTS_DIR, REPORT_MAX_MONTHS, REPORT_RETENTION_DAYS, REPORT_CLEANUP_INTERVAL_SECONDS
+)
+from app.database.db import get_database
+from app.database.repository.report_job_repository import report_job_repository
+from app.utils.interval_worker import IntervalWorker
+from app.utils.xlsx_writer import write_xlsx
+
+logger = logging.getLogger(__name__)
+
+
+# Report name -> (category, [(section label, collection)])
+REPORT_DEFINITIONS: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {
+    "Short-Term Loan Report": ("Loan", [("Applications", "short_term_loan_applications")]),
+    "Personal Loan Report": ("Loan", [("Applications", "personal_loan_applications")]),
+    "Home Loan Report": ("Loan", [("Applications", "home_loan_applications")]),
+    "Business Loan Report": ("Loan", [("Applications", "business_loan_applications")]),
+    "Health Insurance Report": ("Insurance", [
+        ("Applications", "health_insurance_applications"),
+        ("Inquiries", "health_insurance_inquiries"),
+    ]),
+    "Motor Insurance Report": ("Insurance", [
+        ("Applications", "motor_insurance_applications"),
+        ("Inquiries", "motor_insurance_inquiries"),
+    ]),
+    "Term Insurance Report": ("Insurance", [
+        ("Applications", "term_insurance_applications"),
+        ("Inquiries", "term_insurance_inquiries"),
+    ]),
+    "Mutual Funds Report": ("Investment", [
+        ("Applications", "mutual_fund_applications"),
+        ("Inquiries", "mutual_fund_inquiries"),
+    ]),
+    "SIP Analysis Report": ("Investment", [
+        ("Applications", "sip_applications"),
+        ("Inquiries", "sip_inquiries"),
+    ]),
+    "Personal Tax Planning Report": ("Tax", [
+        ("Applications", "personal_tax_applications"),
+        ("Consultations", "personal_tax_consultations"),
+    ]),
+    "Business Tax Strategy Report": ("Tax", [
+        ("Applications", "business_tax_applications"),
+        ("Consultations", "business_tax_consultations"),
+    ]),
+}
+
+# Requested format -> file extension
+REPORT_FORMATS = {"csv": "csv", "excel": "xlsx", "xlsx": "xlsx"}
+
+# Collections store the creation time as createdAt or created_at
+_CREATED_EXPR = {"$ifNull": ["$createdAt", "$created_at"]}
+
+_RANGE_PATTERN = re.compile(r"^(\d+)(day|days|month|months|year|years)$")
+
+
+def range_days(date_range: str) -> int:
+    """Number of days covered by a date range name.
+
+    Accepts "<n>days", "<n>months" and "<n>year(s)" (7days, 90days, 6months,
+    1year, ...); anything else, including "custom", means the last 30 days.
+    """
+    match = _RANGE_PATTERN.match((date_range or "").strip().lower())
+    if not match:
+        return 30
+    amount, unit = int(match.group(1)), match.group(2).rstrip("s")
+    return max(amount, 1) * {"day": 1, "month": 30, "year": 365}[unit]
+
+
+def parse_date_range(date_range: str, now: Optional[datetime] = None) -> Tuple[datetime, str]:
+    """Start of the range (see range_days) and its grouping ("day" or "month").
+
+    Raises ValueError for ranges longer than REPORT_MAX_MONTHS.
+    """
+    now = now or datetime.utcnow()
+    days = range_days(date_range)
+    if days > REPORT_MAX_MONTHS * 31:
+        raise ValueError(f"Reports can cover at most {REPORT_MAX_MONTHS} months")
+    start = (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, "day" if days <= 31 else "month"
+
+
+def report_filename(report_name: str, date_range: str, format_type: str, day: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", report_name).strip("_")
+    range_slug = re.sub(r"[^A-Za-z0-9]+", "", date_range or "") or "30days"
+    return f"{slug}_{range_slug}_{day}.{REPORT_FORMATS[format_type]}"
+
+
+def aggregate_report(db, sources: List[Tuple[str, str]], start: datetime,
+                     granularity: str) -> Tuple[List[str], List[List[Any]]]:
+    """Header and rows: one row per source and period, with a count per status"""
+    date_format = "%Y-%m-%d" if granularity == "day" else "%Y-%m"
+    pipeline = [
+        {"$match": {"$or": [{"createdAt": {"$gte": start}}, {"created_at": {"$gte": start}}]}},
+        {"$group": {
+            "_id": {
+                "period": {"$dateToString": {"format": date_format, "date": _CREATED_EXPR}},
+                "status": {"$toLower": {"$ifNull": ["$status", "unknown"]}}
+            },
+            "count": {"$sum": 1}
+        }}
+    ]
+
+    counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+    statuses = set()
+    for label, collection in sources:
+        for row in db[collection].aggregate(pipeline):
+            status = row["_id"]["status"] or "unknown"
+            statuses.add(status)
+            period_counts = counts.setdefault((label, row["_id"]["period"]), {})
+            period_counts[status] = period_counts.get(status, 0) + row["count"]
+
+    status_columns = sorted(statuses)
+    header = ["Source", "Period", "Total"] + [status.title() for status in status_columns]
+    rows: List[List[Any]] = []
+    for label, _ in sources:
+        totals = {status: 0 for status in status_columns}
+        for (row_label, period), period_counts in sorted(counts.items()):
+            if row_label != label:
+                continue
+            rows.append([label, period, sum(period_counts.values())] +
+                        [period_counts.get(status, 0) for status in status_columns])
+            for status, count in period_counts.items():
+                totals[status] += count
+        rows.append([label, "All", sum(totals.values())] + [totals[status] for status in status_columns])
+    return header, rows
+
+
+def _write_csv(path: Path, header: List[str], rows: List[List[Any]]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+class ReportWorker:
+    """Bounded pool that renders admin reports"""
+
+    def __init__(self, max_workers: int = REPORT_WORKERS, reports_dir: str = REPORTS_DIR):
+        self.max_workers = max_workers
+        self.reports_dir = Path(reports_dir)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report")
+            return self._executor
+
+    def submit(self, job_id: str) -> None:
+        """Queue a pending job"""
+        self._get_executor().submit(self.run, job_id)
+
+    def resume_queued(self) -> int:
+        """Queue pending and interrupted jobs left by a previous process (called on startup)"""
+        job_ids = report_job_repository.get_queued_job_ids()
+        for job_id in job_ids:
+            self.submit(job_id)
+        return len(job_ids)
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running reports finish, queued ones stay pending for the next start"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self, job_id: str) -> None:
+        """Render one report (no-op if another worker claimed it)"""
+        job = report_job_repository.claim_job(job_id)
+        if not job:
+            return
+
+        final_path = self.reports_dir / job["filename"]
+        # Unique per run: a timed-out job may be rendered again while its first worker is still busy
+        tmp_path = final_path.with_name(f"{final_path.name}.{os.getpid()}-{threading.get_ident()}.part")
+        try:
+            _, sources = REPORT_DEFINITIONS[job["reportName"]]
+            start, granularity = parse_date_range(job["dateRange"], job["createdAt"])
+            header, rows = aggregate_report(get_database(), sources, start, granularity)
+
+            self.reports_dir.mkdir(parents=True, exist_ok=True)
+            if REPORT_FORMATS[job["format"]] == "xlsx":
+                write_xlsx(str(tmp_path), job["reportName"], header, rows)
+            else:
+                _write_csv(tmp_path, header, rows)
+
+            os.replace(tmp_path, final_path)
+            report_job_repository.complete_job(job_id, str(final_path), final_path.stat().st_size, len(rows))
+            print(f"[OK] Report {job['filename']} generated")
+
+        except Exception as e:
+            print(f"[ERROR] Report job {job_id} failed: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            report_job_repository.fail_job(job_id, str(e))
+
+
+class ReportCleanupSweeper(IntervalWorker):
+    """Deletes report files older than the retention period on an interval"""
+
+    def __init__(self, interval: int = REPORT_CLEANUP_INTERVAL_SECONDS,
+                 retention_days: int = REPORT_RETENTION_DAYS, reports_dir: str = REPORTS_DIR):
+        super().__init__(interval, name="report-cleanup")
+        self.retention_days = retention_days
+        self.reports_dir = Path(reports_dir)
+
+    def run_once(self) -> int:
+        """One sweep; returns files removed (0 on error)"""
+        try:
+            if not self.reports_dir.is_dir():
+                return 0
+            cutoff = time.time() - self.retention_days * 86400
+            removed = 0
+            for path in self.reports_dir.iterdir():
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            if removed:
+                print(f"[+] Removed {removed} old report files")
+            return removed
+        except Exception as e:
+            logger.error(f"Error cleaning up report files: {e}")
+            return 0
+
+
+# Create singleton instance
+report_worker = ReportWorker()
+report_cleanup_sweeper = ReportCleanupSweeper()
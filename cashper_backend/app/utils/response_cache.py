@@ -0,0 +1,142 @@
+"""
+In-process cache for rendered public JSON responses.
+
+Public content endpoints (home, about page, FAQs) serve data that changes only
+when an admin edits it. Their rendered JSON body is cached under a
+"<section>:<name>" key together with a strong ETag (hash of the body), so
+clients revalidating with If-None-Match get a 304 without a body.
+
+Each section has a version number. Repositories call `invalidate(section)` on
+every write, which bumps the version and drops the section's entries; a body
+rendered from data read before the bump is never stored. The TTL bounds
+staleness across worker processes.
+
+The cache holds at most RESPONSE_CACHE_MAX_ENTRIES bodies (least recently
+used are evicted first) and expired entries are pruned on every store, so
+keys built from request parameters cannot grow memory without bound.
+Routes still map such parameters to a small set of keys where they can.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.config import RESPONSE_CACHE_MAX_ENTRIES
+
+
+CACHE_CONTROL = "public, no-cache"
+
+
+def _section(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class ResponseCache:
+    """Thread-safe, size-bounded LRU/TTL cache of serialized response bodies with per-section versions"""
+
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes, str]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, section: str) -> int:
+        with self._lock:
+            return self._versions.get(section, 0)
+
+    def get_entry(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """Return (body, etag) for `key`, or None if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body, etag = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body, etag
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def set(self, key: str, body: bytes, ttl_seconds: Optional[int] = None,
+            version: Optional[int] = None) -> str:
+        """Store a body and return its ETag.
+
+        When `version` is given and the section was invalidated since, the
+        body is stale and is not stored.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        etag = _etag(body)
+        with self._lock:
+            if version is None or self._versions.get(_section(key), 0) == version:
+                now = time.monotonic()
+                self._prune(now)
+                self._entries[key] = (now + ttl, body, etag)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return etag
+
+    def _prune(self, now: float) -> None:
+        """Drop expired entries (caller holds the lock)"""
+        for key in [key for key, entry in self._entries.items() if entry[0] < now]:
+            del self._entries[key]
+
+    def get_or_set(self, key: str, builder: Callable[[], Any],
+                   ttl_seconds: Optional[int] = None) -> Tuple[bytes, str]:
+        """Return (body, etag) for `key`, rendering `builder()` to JSON on a miss"""
+        entry = self.get_entry(key)
+        if entry is not None:
+            return entry
+        version = self.version(_section(key))
+        body = json.dumps(jsonable_encoder(builder())).encode("utf-8")
+        return body, self.set(key, body, ttl_seconds, version)
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop every entry whose key starts with `prefix` (all entries by default)
+        and bump the version of the affected sections"""
+        with self._lock:
+            sections = {_section(prefix)} if prefix else set(self._versions) | {_section(k) for k in self._entries}
+            for section in sections:
+                self._versions[section] = self._versions.get(section, 0) + 1
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 7232)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def cached_json_response(key: str, builder: Callable[[], Any], request: Optional[Request] = None,
+                         ttl_seconds: Optional[int] = None) -> Response:
+    """Serve `builder()` as JSON, rendering it at most once per TTL/invalidation.
+
+    Responses carry a strong ETag; a request whose If-None-Match matches it
+    gets an empty 304.
+    """
+    body, etag = response_cache.get_or_set(key, builder, ttl_seconds)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if request is not None and _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Create singleton instance
+response_cache = ResponseCache()
@@ -0,0 +1,176 @@
+"""
+Admin search.
+
+Users, insurance policies and loan applications carry a `searchKeys`
+sub-document next to their display fields:
+
+    searchKeys: {
+        name:  "ravi kumar",            lowercased, whitespace collapsed
+        words: ["ravi", "kumar", ...],  name (and purpose) tokens
+        email: "ravi@example.com",      lowercased
+        phone: "9876543210",            digits only, national number
+        ref:   "ins001"                 lowercased policy / application id
+    }
+
+`search_query(term, spec)` turns the text typed in an admin search box into
+anchored prefix matches on those keys. The input is normalized the same way
+and regex-escaped, so "+91 98765" or "a.b@x" match literally, and every
+branch of the `$or` is a case-sensitive `^prefix` regex that MongoDB answers
+from the searchKeys.* indexes instead of scanning the collection. Only keys
+the collection's SearchSpec fills (and indexes) get a branch: one unindexed
+branch would turn the whole `$or` into a collection scan.
+
+With SEARCH_TEXT_INDEX enabled, a text index over the name keys is also
+declared and multi-word terms additionally match through `$text`.
+
+Keys are written by the repositories on create/update (`with_search_keys`,
+`refresh_search_keys`) and filled in for older documents on startup
+(`backfill_search_keys`).
+"""
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from pymongo import UpdateOne
+from app.config import SEARCH_TEXT_INDEX
+
+
+class SearchSpec(NamedTuple):
+    """Source fields for each search key; the first non-empty field wins"""
+    name: Tuple[str, ...]
+    email: Tuple[str, ...] = ("email",)
+    phone: Tuple[str, ...] = ("phone",)
+    ref: Tuple[str, ...] = ()
+    text: Tuple[str, ...] = ()
+
+
+USER_SEARCH = SearchSpec(name=("fullName", "name"))
+POLICY_SEARCH = SearchSpec(name=("customer",), ref=("policyId",))
+LOAN_SEARCH = SearchSpec(
+    name=("customer", "fullName", "full_name", "name"),
+    ref=("application_id", "applicationId"),
+    text=("purpose", "loanPurpose"),
+)
+
+# Collection -> how its documents are keyed
+SEARCH_SPECS: Dict[str, SearchSpec] = {
+    "users": USER_SEARCH,
+    "insurance_policies": POLICY_SEARCH,
+    "admin_loan_applications": LOAN_SEARCH,
+    "short_term_loan_applications": LOAN_SEARCH,
+    "personal_loan_applications": LOAN_SEARCH,
+    "business_loan_applications": LOAN_SEARCH,
+    "home_loan_applications": LOAN_SEARCH,
+}
+
+# Shortest digit run treated as a phone number search
+MIN_PHONE_DIGITS = 3
+
+_BACKFILL_BATCH = 500
+
+
+def normalize_text(value: Any) -> str:
+    """Lowercase with runs of whitespace collapsed to one space"""
+    if value is None:
+        return ""
+    return " ".join(str(value).lower().split())
+
+
+def normalize_phone(value: Any) -> str:
+    """Digits only, without the +91 / leading 0 prefix of Indian numbers"""
+    text = str(value or "").strip()
+    digits = re.sub(r"\D", "", text)
+    if text.startswith("+91"):
+        return digits[2:]
+    if len(digits) > 10 and (digits.startswith("91") or digits.startswith("0")):
+        digits = digits[-10:]
+    return digits
+
+
+def _first(document: Dict[str, Any], fields: Iterable[str]) -> Any:
+    for field in fields:
+        value = document.get(field)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def search_keys(document: Dict[str, Any], spec: SearchSpec) -> Dict[str, Any]:
+    """The searchKeys sub-document for `document`"""
+    name = normalize_text(_first(document, spec.name))
+    words = name.split()
+    for field in spec.text:
+        words.extend(normalize_text(document.get(field)).split())
+    return {
+        "name": name,
+        "words": sorted(set(words)),
+        "email": normalize_text(_first(document, spec.email)),
+        "phone": normalize_phone(_first(document, spec.phone)),
+        "ref": normalize_text(_first(document, spec.ref)) if spec.ref else "",
+    }
+
+
+def with_search_keys(document: Dict[str, Any], spec: SearchSpec) -> Dict[str, Any]:
+    """Set searchKeys on a document about to be inserted; returns the document"""
+    document["searchKeys"] = search_keys(document, spec)
+    return document
+
+
+def touches_search_fields(update: Dict[str, Any], spec: SearchSpec) -> bool:
+    """Whether a $set payload changes any field the keys are built from"""
+    fields = set(spec.name + spec.email + spec.phone + spec.ref + spec.text)
+    return any(field in fields for field in update)
+
+
+def refresh_search_keys(collection, query: Dict[str, Any], spec: SearchSpec) -> None:
+    """Rebuild searchKeys after a partial update of the document matching `query`"""
+    document = collection.find_one(query)
+    if document:
+        collection.update_one({"_id": document["_id"]}, {"$set": {"searchKeys": search_keys(document, spec)}})
+
+
+def search_query(term: Optional[str], spec: SearchSpec) -> Dict[str, Any]:
+    """Filter for an admin search box over documents keyed by `spec`; empty for a blank term.
+
+    Matches the normalized term as a prefix of the name, of any name word,
+    of the email or of the reference id (when `spec` has one), and its
+    digits as a prefix of the phone number (so "98765" finds 9876543210,
+    "43210" does not).
+    """
+    text = normalize_text(term)
+    if not text:
+        return {}
+
+    prefix = {"$regex": f"^{re.escape(text)}"}
+    clauses: List[Dict[str, Any]] = [
+        {"searchKeys.name": prefix},
+        {"searchKeys.email": prefix},
+    ]
+    if spec.ref:
+        clauses.append({"searchKeys.ref": prefix})
+    if " " not in text:
+        clauses.append({"searchKeys.words": prefix})
+
+    digits = normalize_phone(text)
+    if len(digits) >= MIN_PHONE_DIGITS and not re.search(r"[a-z@]", text):
+        clauses.append({"searchKeys.phone": {"$regex": f"^{digits}"}})
+
+    if SEARCH_TEXT_INDEX and " " in text:
+        clauses.append({"$text": {"$search": text}})
+
+    return {"$or": clauses}
+
+
+def backfill_search_keys(db, collection_name: str, spec: Optional[SearchSpec] = None) -> int:
+    """Set searchKeys on documents written before they existed; returns documents updated"""
+    spec = spec or SEARCH_SPECS[collection_name]
+    collection = db[collection_name]
+    projection = {field: 1 for field in spec.name + spec.email + spec.phone + spec.ref + spec.text}
+    updated = 0
+    batch: List[UpdateOne] = []
+    for document in collection.find({"searchKeys": {"$exists": False}}, projection):
+        batch.append(UpdateOne({"_id": document["_id"]}, {"$set": {"searchKeys": search_keys(document, spec)}}))
+        if len(batch) >= _BACKFILL_BATCH:
+            updated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += collection.bulk_write(batch, ordered=False).modified_count
+    return updated
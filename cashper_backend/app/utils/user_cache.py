@@ -0,0 +1,61 @@
+"""
+Short-lived cache of authenticated user documents.
+
+get_current_user resolves the token subject to a user document on every
+authenticated request; a dashboard page fans out to a dozen endpoints with the
+same token. Entries are keyed by user id, bounded in size, expire after a few
+seconds, and are invalidated by every write path that changes a user's
+profile, status or credentials. The TTL bounds staleness on other workers.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from app.config import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES
+
+
+class UserPrincipalCache:
+    """Thread-safe TTL + LRU cache of user documents keyed by user id"""
+
+    def __init__(self, ttl_seconds: int = USER_CACHE_TTL_SECONDS, max_entries: int = USER_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: Any) -> Optional[dict]:
+        """Return a private copy of the cached user (handlers may mutate it)"""
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(user)
+
+    def set(self, user_id: Any, user: dict) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        key = str(user_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(user))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Any) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Create singleton instance
+user_principal_cache = UserPrincipalCache()
@@ -0,0 +1,84 @@
+"""
+Write-behind counter buffer.
+
+Public reads (blog page views) should not turn into one `$inc` per request on a
+hot document. Increments are aggregated in process and written in batches with
+a single unordered `bulk_write`, on an interval from a background thread and
+once more at shutdown. Views recorded between flushes are lost only if the
+process dies without running the shutdown hook.
+"""
+import logging
+import threading
+from typing import Callable, Dict, List
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.utils.interval_worker import IntervalWorker
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer(IntervalWorker):
+    """Thread-safe buffer of pending `$inc` increments keyed by document id"""
+
+    def __init__(self, collection_getter: Callable, field: str, flush_interval: int):
+        super().__init__(flush_interval, name=f"{field}-counter-flush", run_at_start=False,
+                         join_timeout=flush_interval + 5)
+        self.collection_getter = collection_getter
+        self.field = field
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._after_flush: List[Callable[[], None]] = []
+
+    def record(self, doc_id: str, amount: int = 1) -> None:
+        with self._lock:
+            self._pending[doc_id] = self._pending.get(doc_id, 0) + amount
+
+    def pending(self, doc_id: str) -> int:
+        """Increments recorded for `doc_id` that are not written yet"""
+        with self._lock:
+            return self._pending.get(doc_id, 0)
+
+    def after_flush(self, callback: Callable[[], None]) -> None:
+        """Register a callback run by the background thread after a flush that wrote counts"""
+        self._after_flush.append(callback)
+
+    def flush(self) -> int:
+        """Write all pending increments in one bulk_write; returns documents updated"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            operations = [
+                UpdateOne({"_id": ObjectId(doc_id)}, {"$inc": {self.field: amount}})
+                for doc_id, amount in batch.items()
+            ]
+            try:
+                result = self.collection_getter().bulk_write(operations, ordered=False)
+                return result.modified_count
+            except Exception as e:
+                # Put the batch back so the next flush retries it
+                logger.error(f"Error flushing {self.field} counters: {e}")
+                with self._lock:
+                    for doc_id, amount in batch.items():
+                        self._pending[doc_id] = self._pending.get(doc_id, 0) + amount
+                return 0
+
+    def run_once(self) -> int:
+        """Background flush; the after-flush callbacks run when counts were written"""
+        written = self.flush()
+        if written:
+            for callback in self._after_flush:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Error in {self.field} after-flush callback: {e}")
+        return written
+
+    def stop(self) -> int:
+        """Stop the background flusher and write whatever is still pending"""
+        super().stop()
+        return self.flush()
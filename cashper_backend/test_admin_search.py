@@ -0,0 +1,30 @@
+"""
+Admin search filters (app.utils.search): every $or branch must hit an index
+declared for the collection, otherwise MongoDB scans the whole collection.
+"""
+import app.utils.search as search
+from app.utils.search import LOAN_SEARCH, USER_SEARCH, search_query
+
+
+def _fields(query):
+    return [field for clause in query["$or"] for field in clause]
+
+
+def test_user_search_has_no_ref_clause():
+    assert "searchKeys.ref" not in _fields(search_query("ravi", USER_SEARCH))
+    assert "searchKeys.ref" not in _fields(search_query("ravi kumar", USER_SEARCH))
+
+
+def test_user_search_with_text_index_has_no_ref_clause(monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_TEXT_INDEX", True)
+    fields = _fields(search_query("ravi kumar", USER_SEARCH))
+    assert "$text" in fields
+    assert "searchKeys.ref" not in fields
+
+
+def test_loan_search_matches_reference_id():
+    assert "searchKeys.ref" in _fields(search_query("app001", LOAN_SEARCH))
+
+
+def test_blank_term_is_no_filter():
+    assert search_query("   ", USER_SEARCH) == {}